@@ -2,9 +2,9 @@
 Endpoints para gestión de Categorías
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from api.schemas.categoria_schema import (
@@ -13,6 +13,7 @@ from api.schemas.categoria_schema import (
     CategoriaUpdate,
 )
 from crud.categoria_crud import CategoriaCRUD
+from crud.paginacion import LIMITE_MAXIMO
 from database.config import get_db
 
 # IMPORTANTE: Esta línea debe estar aquí
@@ -40,14 +41,32 @@ def crear_categoria(categoria: CategoriaCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[CategoriaResponse])
-def listar_categorias(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_categorias(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """
     Listar todas las categorías activas
+    Paginación por cursor (encabezado X-Next-Cursor); `skip` usa el
+    modo offset heredado
     """
     try:
         crud = CategoriaCRUD(db)
-        categorias = crud.obtener_categorias(skip=skip, limit=limit)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return crud.obtener_categorias(skip=skip, limit=limit)
+        categorias, siguiente = crud.obtener_categorias_pagina(
+            limit=limit, cursor=cursor
+        )
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
         return categorias
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -2,13 +2,15 @@
 Endpoints para gestión de Menús
 """
 
-from typing import List
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from api.schemas.menu_schema import MenuCreate, MenuResponse, MenuUpdate
+from api.schemas.lote_schema import MAX_LOTE, LoteResponse, validar_lote
 from crud.menu_crud import MenuCRUD
+from crud.paginacion import LIMITE_MAXIMO
 from database.config import get_db
 
 router = APIRouter(prefix="/menus", tags=["Menús"])
@@ -26,11 +28,66 @@ def crear_menu(menu: MenuCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error al crear menú: {e}")
 
 
+@router.post(
+    "/bulk",
+    response_model=LoteResponse[MenuResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def crear_menus_bulk(
+    items: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)
+):
+    """
+    Crear varias menús en una sola sentencia y transacción.
+    Si algún elemento es inválido no se crea ninguno y se reportan los
+    errores por índice.
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="La lista está vacía")
+    if len(items) > MAX_LOTE:
+        raise HTTPException(
+            status_code=400, detail=f"Máximo {MAX_LOTE} elementos por lote"
+        )
+
+    validos, errores = validar_lote(items, MenuCreate)
+    if errores:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "mensaje": "Lote inválido: no se creó ningún elemento",
+                "errores": [error.model_dump() for error in errores],
+            },
+        )
+
+    try:
+        crud = MenuCRUD(db)
+        creados = crud.crear_menus_bulk(validos)
+        return {"creados": len(creados), "items": creados}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear menús: {e}")
+
+
 @router.get("/", response_model=List[MenuResponse])
-def listar_menus(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_menus(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     try:
         crud = MenuCRUD(db)
-        return crud.obtener_menus(skip=skip, limit=limit)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return crud.obtener_menus(skip=skip, limit=limit)
+        menus, siguiente = crud.obtener_menus_pagina(limit=limit, cursor=cursor)
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return menus
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al listar menús: {e}")
 
@@ -2,13 +2,15 @@
 Endpoints para gestión de Mesas
 """
 
-from typing import List
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from api.schemas.mesa_schema import MesaCreate, MesaResponse, MesaUpdate
+from api.schemas.lote_schema import MAX_LOTE, LoteResponse, validar_lote
 from crud.mesa_crud import MesaCRUD
+from crud.paginacion import LIMITE_MAXIMO
 from database.config import get_db
 
 router = APIRouter(prefix="/mesas", tags=["Mesas"])
@@ -26,11 +28,66 @@ def crear_mesa(mesa: MesaCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error al crear mesa: {e}")
 
 
+@router.post(
+    "/bulk",
+    response_model=LoteResponse[MesaResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def crear_mesas_bulk(
+    items: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)
+):
+    """
+    Crear varias mesas en una sola sentencia y transacción.
+    Si algún elemento es inválido no se crea ninguno y se reportan los
+    errores por índice.
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="La lista está vacía")
+    if len(items) > MAX_LOTE:
+        raise HTTPException(
+            status_code=400, detail=f"Máximo {MAX_LOTE} elementos por lote"
+        )
+
+    validos, errores = validar_lote(items, MesaCreate)
+    if errores:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "mensaje": "Lote inválido: no se creó ningún elemento",
+                "errores": [error.model_dump() for error in errores],
+            },
+        )
+
+    try:
+        crud = MesaCRUD(db)
+        creados = crud.crear_mesas_bulk(validos)
+        return {"creados": len(creados), "items": creados}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear mesas: {e}")
+
+
 @router.get("/", response_model=List[MesaResponse])
-def listar_mesas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_mesas(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     try:
         crud = MesaCRUD(db)
-        return crud.obtener_mesas(skip=skip, limit=limit)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return crud.obtener_mesas(skip=skip, limit=limit)
+        mesas, siguiente = crud.obtener_mesas_pagina(limit=limit, cursor=cursor)
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return mesas
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al listar mesas: {e}")
 
@@ -2,14 +2,19 @@
 Endpoints para gestión de Reservas
 """
 
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from api.schemas.reserva_schema import ReservaCreate, ReservaResponse, ReservaUpdate
-from crud.reserva_crud import ReservaCRUD
+from api.schemas.lote_schema import MAX_LOTE, LoteResponse, validar_lote
+from crud.reserva_crud import ReservaCRUD, ReservaEnConflicto
+from crud.paginacion import LIMITE_MAXIMO
 from database.config import get_db
+from services.exportacion import FORMATOS_EXPORTACION, exportar
 
 router = APIRouter(prefix="/reservas", tags=["Reservas"])
 
@@ -23,24 +28,155 @@ def crear_reserva(reserva: ReservaCreate, db: Session = Depends(get_db)):
         crud = ReservaCRUD(db)
         nueva = crud.crear_reserva(**reserva.model_dump())
         return nueva
+    except ReservaEnConflicto as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al crear reserva: {e}")
 
 
+@router.post(
+    "/bulk",
+    response_model=LoteResponse[ReservaResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def crear_reservas_bulk(
+    items: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)
+):
+    """
+    Crear varias reservas en una sola sentencia y transacción.
+    Si algún elemento es inválido no se crea ninguno y se reportan los
+    errores por índice.
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="La lista está vacía")
+    if len(items) > MAX_LOTE:
+        raise HTTPException(
+            status_code=400, detail=f"Máximo {MAX_LOTE} elementos por lote"
+        )
+
+    validos, errores = validar_lote(items, ReservaCreate)
+    if errores:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "mensaje": "Lote inválido: no se creó ningún elemento",
+                "errores": [error.model_dump() for error in errores],
+            },
+        )
+
+    try:
+        crud = ReservaCRUD(db)
+        creados = crud.crear_reservas_bulk(validos)
+        return {"creados": len(creados), "items": creados}
+    except ReservaEnConflicto as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear reservas: {e}")
+
+
 @router.get("/", response_model=List[ReservaResponse])
-def listar_reservas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_reservas(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = Query(None, description="inicio_reserva >= desde"),
+    hasta: Optional[datetime] = Query(None, description="inicio_reserva < hasta"),
+    hora_desde: Optional[str] = Query(
+        None, pattern=r"^\d{2}:\d{2}$", description="hora de inicio (UTC) >= hora_desde"
+    ),
+    hora_hasta: Optional[str] = Query(
+        None, pattern=r"^\d{2}:\d{2}$", description="hora de inicio (UTC) < hora_hasta"
+    ),
+    estado: Optional[str] = None,
+    mesa_id: Optional[UUID] = None,
+    usuario_id: Optional[UUID] = None,
+    orden: str = Query("asc", pattern="^(asc|desc)$"),
+    db: Session = Depends(get_db),
+):
     """
-    Listar todas las reservas
+    Listar reservas filtradas por restaurante, rango de inicio, franja
+    horaria, estado, mesa o usuario, ordenadas por inicio_reserva
+    (`orden` asc o desc).
+    Paginación por cursor (encabezado X-Next-Cursor); `skip` usa el
+    modo offset heredado
     """
     try:
         crud = ReservaCRUD(db)
-        return crud.obtener_reservas(skip=skip, limit=limit)
+        filtros = dict(
+            restaurante_id=restaurante_id,
+            desde=desde,
+            hasta=hasta,
+            hora_desde=hora_desde,
+            hora_hasta=hora_hasta,
+            estado=estado,
+            mesa_id=mesa_id,
+            usuario_id=usuario_id,
+        )
+        descendente = orden == "desc"
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return crud.obtener_reservas(
+                skip=skip, limit=limit, descendente=descendente, **filtros
+            )
+        reservas, siguiente = crud.obtener_reservas_pagina(
+            limit=limit, cursor=cursor, descendente=descendente, **filtros
+        )
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return reservas
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al listar reservas: {e}")
 
 
+@router.get("/export", response_class=StreamingResponse)
+def exportar_reservas(
+    formato: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = Query(None, description="inicio_reserva >= desde"),
+    hasta: Optional[datetime] = Query(None, description="inicio_reserva < hasta"),
+    estado: Optional[str] = None,
+    mesa_id: Optional[UUID] = None,
+    usuario_id: Optional[UUID] = None,
+):
+    """
+    Exportar todas las reservas que cumplan los filtros, ordenadas por
+    inicio_reserva, en NDJSON (una reserva por línea) o CSV.
+    Se envían a medida que se leen de un cursor del servidor, sin armar
+    la lista completa en memoria. La sesión la abre y la cierra el
+    propio stream (services.exportacion), no get_db
+    """
+    try:
+        bloques = exportar(
+            formato,
+            restaurante_id=restaurante_id,
+            desde=desde,
+            hasta=hasta,
+            estado=estado,
+            mesa_id=mesa_id,
+            usuario_id=usuario_id,
+        )
+        return StreamingResponse(
+            bloques,
+            media_type=FORMATOS_EXPORTACION[formato],
+            headers={
+                "Content-Disposition": f'attachment; filename="reservas.{formato}"'
+            },
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al exportar reservas: {e}")
+
+
 @router.get("/{reserva_id}", response_model=ReservaResponse)
 def obtener_reserva(reserva_id: UUID, db: Session = Depends(get_db)):
     """
@@ -77,6 +213,10 @@ def actualizar_reserva(
         return actualizada
     except HTTPException:
         raise
+    except ReservaEnConflicto as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al actualizar reserva: {e}")
 
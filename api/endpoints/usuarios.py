@@ -2,9 +2,9 @@
 Endpoints para gestión de Usuarios
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from api.schemas.usuario_schema import (
@@ -12,8 +12,14 @@ from api.schemas.usuario_schema import (
     UsuarioResponse,
     UsuarioUpdate,
     UsuarioLogin,
+    UsuarioLoginResponse,
 )
+from auth.dependencias import ip_cliente, obtener_credencial
+from auth.hashing import ServicioHashSaturado
+from auth.limitador import LimiteExcedido, limitador_login
+from auth.tokens import Credencial, emitir_token, lista_revocacion
 from crud.usuario_crud import UsuarioCRUD
+from crud.paginacion import LIMITE_MAXIMO
 from database.config import get_db
 
 router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
@@ -38,6 +44,12 @@ def crear_usuario(usuario: UsuarioCreate, db: Session = Depends(get_db)):
         return nuevo_usuario
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ServicioHashSaturado as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,14 +58,30 @@ def crear_usuario(usuario: UsuarioCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[UsuarioResponse])
-def listar_usuarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_usuarios(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """
     Listar todos los usuarios activos
+    Paginación por cursor (encabezado X-Next-Cursor); `skip` usa el
+    modo offset heredado
     """
     try:
         crud = UsuarioCRUD(db)
-        usuarios = crud.obtener_usuarios(skip=skip, limit=limit)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return crud.obtener_usuarios(skip=skip, limit=limit)
+        usuarios, siguiente = crud.obtener_usuarios_pagina(limit=limit, cursor=cursor)
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
         return usuarios
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -61,6 +89,31 @@ def listar_usuarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
         )
 
 
+@router.get("/me", response_model=UsuarioResponse)
+def obtener_usuario_actual(
+    credencial: Credencial = Depends(obtener_credencial),
+    db: Session = Depends(get_db),
+):
+    """
+    Obtener el usuario del token de acceso
+    """
+    try:
+        crud = UsuarioCRUD(db)
+        usuario = crud.obtener_usuario(credencial.usuario_id)
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
+            )
+        return usuario
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener usuario: {str(e)}",
+        )
+
+
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
 def obtener_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
     """
@@ -136,6 +189,12 @@ def actualizar_usuario(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except HTTPException:
         raise
+    except ServicioHashSaturado as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -164,12 +223,19 @@ def eliminar_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
         )
 
 
-@router.post("/login", response_model=UsuarioResponse)
-def login(credenciales: UsuarioLogin, db: Session = Depends(get_db)):
+@router.post("/login", response_model=UsuarioLoginResponse)
+def login(
+    credenciales: UsuarioLogin,
+    ip: str = Depends(ip_cliente),
+    db: Session = Depends(get_db),
+):
     """
-    Autenticar un usuario
+    Autenticar un usuario y emitir su token de acceso
     """
     try:
+        # Antes de tocar la base de datos o calcular el hash
+        limitador_login.verificar(credenciales.nombre_usuario, ip)
+
         crud = UsuarioCRUD(db)
         usuario = crud.autenticar_usuario(
             credenciales.nombre_usuario, credenciales.contrasena
@@ -181,11 +247,44 @@ def login(credenciales: UsuarioLogin, db: Session = Depends(get_db)):
                 detail="Credenciales incorrectas",
             )
 
-        return usuario
+        limitador_login.exito(credenciales.nombre_usuario, ip)
+        token, expira = emitir_token(usuario.id_usuario, usuario.es_admin)
+        return UsuarioLoginResponse(
+            **UsuarioResponse.model_validate(usuario).model_dump(),
+            access_token=token,
+            expira_en=expira,
+        )
     except HTTPException:
         raise
+    except LimiteExcedido as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.reintentar_en)},
+        )
+    except ServicioHashSaturado as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al autenticar: {str(e)}",
         )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(credencial: Credencial = Depends(obtener_credencial)):
+    """
+    Revocar el token de acceso actual
+    """
+    try:
+        lista_revocacion.revocar(credencial)
+        return None
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al cerrar sesión: {str(e)}",
+        )
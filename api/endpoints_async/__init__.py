@@ -0,0 +1,3 @@
+"""
+Paquete de endpoints asíncronos (AsyncSession + asyncpg)
+"""
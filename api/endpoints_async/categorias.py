@@ -0,0 +1,163 @@
+"""
+Endpoints asíncronos para gestión de Categorías
+"""
+
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.categoria_schema import (
+    CategoriaCreate,
+    CategoriaResponse,
+    CategoriaUpdate,
+)
+from crud.categoria_crud import CategoriaAsyncCRUD
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+
+router = APIRouter(prefix="/categorias", tags=["Categorías"])
+
+
+@router.post("/", response_model=CategoriaResponse, status_code=status.HTTP_201_CREATED)
+async def crear_categoria(
+    categoria: CategoriaCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear una nueva categoría
+    """
+    try:
+        crud = CategoriaAsyncCRUD(db)
+        nueva_categoria = await crud.crear_categoria(
+            nombre=categoria.nombre, descripcion=categoria.descripcion
+        )
+        return nueva_categoria
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al crear categoría: {str(e)}",
+        )
+
+
+@router.get("/", response_model=List[CategoriaResponse])
+async def listar_categorias(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Listar todas las categorías activas
+    Paginación por cursor (encabezado X-Next-Cursor); `skip` usa el
+    modo offset heredado
+    """
+    try:
+        crud = CategoriaAsyncCRUD(db)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return await crud.obtener_categorias(skip=skip, limit=limit)
+        categorias, siguiente = await crud.obtener_categorias_pagina(
+            limit=limit, cursor=cursor
+        )
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return categorias
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al listar categorías: {str(e)}",
+        )
+
+
+@router.get("/{categoria_id}", response_model=CategoriaResponse)
+async def obtener_categoria(
+    categoria_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtener una categoría por ID
+    """
+    try:
+        crud = CategoriaAsyncCRUD(db)
+        categoria = await crud.obtener_categoria(categoria_id)
+        if not categoria:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada"
+            )
+        return categoria
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener categoría: {str(e)}",
+        )
+
+
+@router.put("/{categoria_id}", response_model=CategoriaResponse)
+async def actualizar_categoria(
+    categoria_id: UUID,
+    categoria: CategoriaUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Actualizar una categoría existente
+    """
+    try:
+        crud = CategoriaAsyncCRUD(db)
+
+        datos_actualizacion = categoria.model_dump(exclude_unset=True)
+
+        if not datos_actualizacion:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No se proporcionaron datos para actualizar",
+            )
+
+        categoria_actualizada = await crud.actualizar_categoria(
+            categoria_id, **datos_actualizacion
+        )
+
+        if not categoria_actualizada:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada"
+            )
+
+        return categoria_actualizada
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al actualizar categoría: {str(e)}",
+        )
+
+
+@router.delete("/{categoria_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_categoria(
+    categoria_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Eliminar una categoría (soft delete)
+    """
+    try:
+        crud = CategoriaAsyncCRUD(db)
+        if not await crud.eliminar_categoria(categoria_id, soft_delete=True):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada"
+            )
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al eliminar categoría: {str(e)}",
+        )
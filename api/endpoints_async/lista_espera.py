@@ -0,0 +1,105 @@
+"""
+Endpoints asíncronos para la lista de espera de reservas
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.lista_espera_schema import ListaEsperaCreate, ListaEsperaResponse
+from crud.lista_espera_crud import ListaEsperaAsyncCRUD
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+
+router = APIRouter(prefix="/lista-espera", tags=["Lista de espera"])
+
+
+@router.post(
+    "/", response_model=ListaEsperaResponse, status_code=status.HTTP_201_CREATED
+)
+async def crear_entrada(
+    entrada: ListaEsperaCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Anotar un grupo en la lista de espera de un turno (restaurante, fecha y
+    hora). Cuando se cancela o elimina una reserva con mesa de ese turno,
+    la mejor entrada que quepa en la mesa pasa a ser una reserva confirmada.
+    """
+    try:
+        crud = ListaEsperaAsyncCRUD(db)
+        return await crud.crear_entrada(**entrada.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al anotar en la lista de espera: {e}"
+        )
+
+
+@router.get("/", response_model=List[ListaEsperaResponse])
+async def listar_entradas(
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = Query(None, description="inicio_reserva >= desde"),
+    hasta: Optional[datetime] = Query(None, description="inicio_reserva < hasta"),
+    estado: Optional[str] = "esperando",
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Listar entradas por turno, en el orden en que se promoverían
+    (prioridad y llegada)
+    """
+    try:
+        crud = ListaEsperaAsyncCRUD(db)
+        return await crud.obtener_entradas(
+            limit=limit,
+            restaurante_id=restaurante_id,
+            desde=desde,
+            hasta=hasta,
+            estado=estado,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al listar la lista de espera: {e}"
+        )
+
+
+@router.get("/{id_espera}", response_model=ListaEsperaResponse)
+async def obtener_entrada(id_espera: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Obtener una entrada (con reserva_id si ya fue promovida)
+    """
+    try:
+        crud = ListaEsperaAsyncCRUD(db)
+        entrada = await crud.obtener_entrada(id_espera)
+        if not entrada:
+            raise HTTPException(status_code=404, detail="Entrada no encontrada")
+        return entrada
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al obtener entrada: {e}")
+
+
+@router.delete("/{id_espera}", status_code=status.HTTP_204_NO_CONTENT)
+async def retirar_entrada(id_espera: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retirar un grupo de la lista de espera
+    """
+    try:
+        crud = ListaEsperaAsyncCRUD(db)
+        if await crud.retirar_entrada(id_espera) is None:
+            if await crud.obtener_entrada(id_espera) is None:
+                raise HTTPException(status_code=404, detail="Entrada no encontrada")
+            raise HTTPException(
+                status_code=409, detail="La entrada ya no está en espera"
+            )
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al retirar entrada: {e}")
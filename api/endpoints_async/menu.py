@@ -0,0 +1,98 @@
+"""
+Endpoints asíncronos para gestión de Menús
+"""
+
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.menu_schema import MenuCreate, MenuResponse, MenuUpdate
+from crud.menu_crud import MenuAsyncCRUD
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+
+router = APIRouter(prefix="/menus", tags=["Menús"])
+
+
+@router.post("/", response_model=MenuResponse, status_code=status.HTTP_201_CREATED)
+async def crear_menu(menu: MenuCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        crud = MenuAsyncCRUD(db)
+        nuevo_menu = await crud.crear_menu(**menu.model_dump())
+        return nuevo_menu
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear menú: {e}")
+
+
+@router.get("/", response_model=List[MenuResponse])
+async def listar_menus(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        crud = MenuAsyncCRUD(db)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return await crud.obtener_menus(skip=skip, limit=limit)
+        menus, siguiente = await crud.obtener_menus_pagina(limit=limit, cursor=cursor)
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return menus
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al listar menús: {e}")
+
+
+@router.get("/{menu_id}", response_model=MenuResponse)
+async def obtener_menu(menu_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        crud = MenuAsyncCRUD(db)
+        menu = await crud.obtener_menu(menu_id)
+        if not menu:
+            raise HTTPException(status_code=404, detail="Menú no encontrado")
+        return menu
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al obtener menú: {e}")
+
+
+@router.put("/{menu_id}", response_model=MenuResponse)
+async def actualizar_menu(
+    menu_id: UUID, menu: MenuUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        crud = MenuAsyncCRUD(db)
+        datos = menu.model_dump(exclude_unset=True)
+        if not datos:
+            raise HTTPException(status_code=400, detail="Sin datos para actualizar")
+
+        actualizado = await crud.actualizar_menu(menu_id, **datos)
+        if not actualizado:
+            raise HTTPException(status_code=404, detail="Menú no encontrado")
+        return actualizado
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al actualizar menú: {e}")
+
+
+@router.delete("/{menu_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_menu(menu_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        crud = MenuAsyncCRUD(db)
+        if not await crud.eliminar_menu(menu_id):
+            raise HTTPException(status_code=404, detail="Menú no encontrado")
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al eliminar menú: {e}")
@@ -0,0 +1,98 @@
+"""
+Endpoints asíncronos para gestión de Mesas
+"""
+
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.mesa_schema import MesaCreate, MesaResponse, MesaUpdate
+from crud.mesa_crud import MesaAsyncCRUD
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+
+router = APIRouter(prefix="/mesas", tags=["Mesas"])
+
+
+@router.post("/", response_model=MesaResponse, status_code=status.HTTP_201_CREATED)
+async def crear_mesa(mesa: MesaCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        crud = MesaAsyncCRUD(db)
+        nueva = await crud.crear_mesa(**mesa.model_dump())
+        return nueva
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear mesa: {e}")
+
+
+@router.get("/", response_model=List[MesaResponse])
+async def listar_mesas(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        crud = MesaAsyncCRUD(db)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return await crud.obtener_mesas(skip=skip, limit=limit)
+        mesas, siguiente = await crud.obtener_mesas_pagina(limit=limit, cursor=cursor)
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return mesas
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al listar mesas: {e}")
+
+
+@router.get("/{mesa_id}", response_model=MesaResponse)
+async def obtener_mesa(mesa_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        crud = MesaAsyncCRUD(db)
+        mesa = await crud.obtener_mesa(mesa_id)
+        if not mesa:
+            raise HTTPException(status_code=404, detail="Mesa no encontrada")
+        return mesa
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al obtener mesa: {e}")
+
+
+@router.put("/{mesa_id}", response_model=MesaResponse)
+async def actualizar_mesa(
+    mesa_id: UUID, mesa: MesaUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        crud = MesaAsyncCRUD(db)
+        datos = mesa.model_dump(exclude_unset=True)
+        if not datos:
+            raise HTTPException(status_code=400, detail="Sin datos para actualizar")
+
+        actualizada = await crud.actualizar_mesa(mesa_id, **datos)
+        if not actualizada:
+            raise HTTPException(status_code=404, detail="Mesa no encontrada")
+        return actualizada
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al actualizar mesa: {e}")
+
+
+@router.delete("/{mesa_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_mesa(mesa_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        crud = MesaAsyncCRUD(db)
+        if not await crud.eliminar_mesa(mesa_id):
+            raise HTTPException(status_code=404, detail="Mesa no encontrada")
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al eliminar mesa: {e}")
@@ -0,0 +1,196 @@
+"""
+Endpoints asíncronos para gestión de Reservas
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.reserva_schema import ReservaCreate, ReservaResponse, ReservaUpdate
+from crud.reserva_crud import ReservaAsyncCRUD, ReservaEnConflicto
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+from services.exportacion import FORMATOS_EXPORTACION, exportar_async
+
+router = APIRouter(prefix="/reservas", tags=["Reservas"])
+
+
+@router.post("/", response_model=ReservaResponse, status_code=status.HTTP_201_CREATED)
+async def crear_reserva(
+    reserva: ReservaCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear una nueva reserva
+    """
+    try:
+        crud = ReservaAsyncCRUD(db)
+        nueva = await crud.crear_reserva(**reserva.model_dump())
+        return nueva
+    except ReservaEnConflicto as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear reserva: {e}")
+
+
+@router.get("/", response_model=List[ReservaResponse])
+async def listar_reservas(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = Query(None, description="inicio_reserva >= desde"),
+    hasta: Optional[datetime] = Query(None, description="inicio_reserva < hasta"),
+    hora_desde: Optional[str] = Query(
+        None, pattern=r"^\d{2}:\d{2}$", description="hora de inicio (UTC) >= hora_desde"
+    ),
+    hora_hasta: Optional[str] = Query(
+        None, pattern=r"^\d{2}:\d{2}$", description="hora de inicio (UTC) < hora_hasta"
+    ),
+    estado: Optional[str] = None,
+    mesa_id: Optional[UUID] = None,
+    usuario_id: Optional[UUID] = None,
+    orden: str = Query("asc", pattern="^(asc|desc)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Listar reservas filtradas por restaurante, rango de inicio, franja
+    horaria, estado, mesa o usuario, ordenadas por inicio_reserva
+    (`orden` asc o desc).
+    Paginación por cursor (encabezado X-Next-Cursor); `skip` usa el
+    modo offset heredado
+    """
+    try:
+        crud = ReservaAsyncCRUD(db)
+        filtros = dict(
+            restaurante_id=restaurante_id,
+            desde=desde,
+            hasta=hasta,
+            hora_desde=hora_desde,
+            hora_hasta=hora_hasta,
+            estado=estado,
+            mesa_id=mesa_id,
+            usuario_id=usuario_id,
+        )
+        descendente = orden == "desc"
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return await crud.obtener_reservas(
+                skip=skip, limit=limit, descendente=descendente, **filtros
+            )
+        reservas, siguiente = await crud.obtener_reservas_pagina(
+            limit=limit, cursor=cursor, descendente=descendente, **filtros
+        )
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return reservas
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al listar reservas: {e}")
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_reservas(
+    formato: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = Query(None, description="inicio_reserva >= desde"),
+    hasta: Optional[datetime] = Query(None, description="inicio_reserva < hasta"),
+    estado: Optional[str] = None,
+    mesa_id: Optional[UUID] = None,
+    usuario_id: Optional[UUID] = None,
+):
+    """
+    Exportar todas las reservas que cumplan los filtros, ordenadas por
+    inicio_reserva, en NDJSON (una reserva por línea) o CSV.
+    Se envían a medida que se leen de un cursor del servidor, sin armar
+    la lista completa en memoria. La sesión la abre y la cierra el
+    propio stream (services.exportacion), no get_async_db
+    """
+    try:
+        bloques = await exportar_async(
+            formato,
+            restaurante_id=restaurante_id,
+            desde=desde,
+            hasta=hasta,
+            estado=estado,
+            mesa_id=mesa_id,
+            usuario_id=usuario_id,
+        )
+        return StreamingResponse(
+            bloques,
+            media_type=FORMATOS_EXPORTACION[formato],
+            headers={
+                "Content-Disposition": f'attachment; filename="reservas.{formato}"'
+            },
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al exportar reservas: {e}")
+
+
+@router.get("/{reserva_id}", response_model=ReservaResponse)
+async def obtener_reserva(reserva_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Obtener una reserva por ID
+    """
+    try:
+        crud = ReservaAsyncCRUD(db)
+        reserva = await crud.obtener_reserva(reserva_id)
+        if not reserva:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+        return reserva
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al obtener reserva: {e}")
+
+
+@router.put("/{reserva_id}", response_model=ReservaResponse)
+async def actualizar_reserva(
+    reserva_id: UUID, reserva: ReservaUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualizar una reserva existente
+    """
+    try:
+        crud = ReservaAsyncCRUD(db)
+        datos = reserva.model_dump(exclude_unset=True)
+        if not datos:
+            raise HTTPException(status_code=400, detail="Sin datos para actualizar")
+
+        actualizada = await crud.actualizar_reserva(reserva_id, **datos)
+        if not actualizada:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+        return actualizada
+    except HTTPException:
+        raise
+    except ReservaEnConflicto as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al actualizar reserva: {e}")
+
+
+@router.delete("/{reserva_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_reserva(reserva_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Eliminar una reserva
+    """
+    try:
+        crud = ReservaAsyncCRUD(db)
+        if not await crud.eliminar_reserva(reserva_id):
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al eliminar reserva: {e}")
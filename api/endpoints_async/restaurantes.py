@@ -0,0 +1,277 @@
+"""
+Endpoints asíncronos para gestión de Restaurantes
+"""
+
+from datetime import date, datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.restaurante_schema import (
+    RestauranteCreate,
+    RestauranteResponse,
+    RestauranteUpdate,
+    DisponibilidadResponse,
+    AsignacionResponse,
+    EstadisticasResponse,
+    TableroResponse,
+)
+from crud.restaurante_crud import RestauranteAsyncCRUD
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+from services.asignacion import asignar_servicio_async, detalle
+from services.disponibilidad import motor_disponibilidad
+from services.estadisticas import estadisticas_restaurante_async
+from services.tablero import tablero_restaurante_async
+
+router = APIRouter(prefix="/restaurantes", tags=["Restaurantes"])
+
+
+@router.post(
+    "/", response_model=RestauranteResponse, status_code=status.HTTP_201_CREATED
+)
+async def crear_restaurante(
+    restaurante: RestauranteCreate, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        crud = RestauranteAsyncCRUD(db)
+        nuevo = await crud.crear_restaurante(**restaurante.model_dump())
+        return nuevo
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al crear restaurante: {e}")
+
+
+@router.get("/", response_model=List[RestauranteResponse])
+async def listar_restaurantes(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        crud = RestauranteAsyncCRUD(db)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return await crud.obtener_restaurantes(skip=skip, limit=limit)
+        restaurantes, siguiente = await crud.obtener_restaurantes_pagina(
+            limit=limit, cursor=cursor
+        )
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return restaurantes
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al listar restaurantes: {e}"
+        )
+
+
+@router.get("/{restaurante_id}", response_model=RestauranteResponse)
+async def obtener_restaurante(
+    restaurante_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        crud = RestauranteAsyncCRUD(db)
+        restaurante = await crud.obtener_restaurante(restaurante_id)
+        if not restaurante:
+            raise HTTPException(status_code=404, detail="Restaurante no encontrado")
+        return restaurante
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al obtener restaurante: {e}"
+        )
+
+
+@router.get("/{restaurante_id}/disponibilidad", response_model=DisponibilidadResponse)
+async def consultar_disponibilidad(
+    restaurante_id: UUID,
+    fecha: date,
+    hora: str = Query(..., pattern=r"^\d{2}:\d{2}$"),
+    personas: int = Query(..., ge=1),
+    duracion: Optional[int] = Query(None, ge=15, le=720),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Mesas libres con capacidad para `personas` el día `fecha` a la `hora`
+    durante `duracion` minutos (por defecto, la del restaurante). Índice en
+    memoria: solo la primera consulta del día lee la base.
+    """
+    try:
+        mesas, duracion = await motor_disponibilidad.mesas_libres_async(
+            db, restaurante_id, fecha, hora, personas, duracion
+        )
+        return DisponibilidadResponse(
+            restaurante_id=restaurante_id,
+            fecha=fecha,
+            hora=hora,
+            personas=personas,
+            duracion_minutos=duracion,
+            mesas=mesas,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al consultar disponibilidad: {e}"
+        )
+
+
+@router.post("/{restaurante_id}/asignacion", response_model=AsignacionResponse)
+async def asignar_mesas(
+    restaurante_id: UUID,
+    fecha: date,
+    desde: Optional[str] = Query(None, pattern=r"^\d{2}:\d{2}$"),
+    hasta: Optional[str] = Query(None, pattern=r"^\d{2}:\d{2}$"),
+    ubicacion: Optional[List[str]] = Query(None),
+    reasignar: bool = False,
+    aplicar: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asignar mesas a las reservas del servicio (`fecha`, franja opcional
+    [`desde`, `hasta`)) minimizando asientos vacíos. Con `aplicar=false`
+    solo devuelve el plan; `ubicacion` limita las zonas a usar.
+    """
+    try:
+        plan, mesas, reservas = await asignar_servicio_async(
+            db,
+            restaurante_id,
+            fecha,
+            desde=desde,
+            hasta=hasta,
+            ubicaciones=ubicacion,
+            reasignar=reasignar,
+            aplicar=aplicar,
+        )
+        return AsignacionResponse(
+            restaurante_id=restaurante_id,
+            fecha=fecha,
+            aplicada=aplicar,
+            metodo=plan.metodo,
+            comensales_asignados=plan.comensales,
+            asientos_desperdiciados=plan.desperdicio,
+            duracion_ms=plan.duracion_ms,
+            asignaciones=detalle(plan, mesas, reservas),
+            sin_mesa=plan.sin_mesa,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al asignar mesas: {e}")
+
+
+@router.get("/{restaurante_id}/estadisticas", response_model=EstadisticasResponse)
+async def obtener_estadisticas(
+    restaurante_id: UUID,
+    desde: Optional[datetime] = Query(None, description="inicio_reserva >= desde"),
+    hasta: Optional[datetime] = Query(None, description="inicio_reserva < hasta"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Ocupación por hora y día de la semana, tamaño de los grupos, métodos
+    de pago, tasa de cancelación y anticipación de las reservas con inicio
+    en [`desde`, `hasta`) (todas si no se indica). Calculadas en forma
+    vectorizada (services.estadisticas).
+    """
+    try:
+        estadisticas = await estadisticas_restaurante_async(
+            db, restaurante_id, desde, hasta
+        )
+        return EstadisticasResponse(
+            restaurante_id=restaurante_id, desde=desde, hasta=hasta, **estadisticas
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al calcular estadísticas: {e}"
+        )
+
+
+@router.get("/{restaurante_id}/tablero", response_model=TableroResponse)
+async def obtener_tablero(
+    restaurante_id: UUID,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Comensales por turno, reservas por estado, uso de cada mesa y reservas
+    por método de pago entre los días `desde` y `hasta` (inclusive; por
+    defecto hoy). Una sola consulta agregada, cacheada hasta la próxima
+    escritura de reservas del restaurante.
+    """
+    try:
+        desde = desde or datetime.now(timezone.utc).date()
+        hasta = hasta or desde
+        tablero, en_cache = await tablero_restaurante_async(
+            db, restaurante_id, desde, hasta
+        )
+        return TableroResponse(
+            restaurante_id=restaurante_id,
+            desde=desde,
+            hasta=hasta,
+            en_cache=en_cache,
+            **tablero,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al armar el tablero: {e}")
+
+
+@router.put("/{restaurante_id}", response_model=RestauranteResponse)
+async def actualizar_restaurante(
+    restaurante_id: UUID,
+    restaurante: RestauranteUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        crud = RestauranteAsyncCRUD(db)
+        datos = restaurante.model_dump(exclude_unset=True)
+        if not datos:
+            raise HTTPException(status_code=400, detail="Sin datos para actualizar")
+
+        actualizado = await crud.actualizar_restaurante(restaurante_id, **datos)
+        if not actualizado:
+            raise HTTPException(status_code=404, detail="Restaurante no encontrado")
+        return actualizado
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al actualizar restaurante: {e}"
+        )
+
+
+@router.delete("/{restaurante_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_restaurante(
+    restaurante_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        crud = RestauranteAsyncCRUD(db)
+        if not await crud.eliminar_restaurante(restaurante_id):
+            raise HTTPException(status_code=404, detail="Restaurante no encontrado")
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al eliminar restaurante: {e}"
+        )
@@ -0,0 +1,298 @@
+"""
+Endpoints asíncronos para gestión de Usuarios
+"""
+
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.usuario_schema import (
+    UsuarioCreate,
+    UsuarioResponse,
+    UsuarioUpdate,
+    UsuarioLogin,
+    UsuarioLoginResponse,
+)
+from auth.dependencias import ip_cliente, obtener_credencial
+from auth.hashing import ServicioHashSaturado
+from auth.limitador import LimiteExcedido, limitador_login
+from auth.tokens import Credencial, emitir_token, lista_revocacion
+from crud.usuario_crud import UsuarioAsyncCRUD
+from crud.paginacion import LIMITE_MAXIMO
+from database.config import get_async_db
+
+router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
+
+
+@router.post("/", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
+async def crear_usuario(
+    usuario: UsuarioCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear un nuevo usuario
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+        nuevo_usuario = await crud.crear_usuario(
+            nombre=usuario.nombre,
+            apellido=usuario.apellido,
+            nombre_usuario=usuario.nombre_usuario,
+            email=usuario.email,
+            contrasena=usuario.contrasena,
+            telefono=usuario.telefono,
+            es_admin=usuario.es_admin,
+        )
+        return nuevo_usuario
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ServicioHashSaturado as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al crear usuario: {str(e)}",
+        )
+
+
+@router.get("/", response_model=List[UsuarioResponse])
+async def listar_usuarios(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Listar todos los usuarios activos
+    Paginación por cursor (encabezado X-Next-Cursor); `skip` usa el
+    modo offset heredado
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+        if skip:
+            if cursor:
+                raise ValueError("No se puede combinar skip con cursor")
+            return await crud.obtener_usuarios(skip=skip, limit=limit)
+        usuarios, siguiente = await crud.obtener_usuarios_pagina(
+            limit=limit, cursor=cursor
+        )
+        if siguiente:
+            response.headers["X-Next-Cursor"] = siguiente
+        return usuarios
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al listar usuarios: {str(e)}",
+        )
+
+
+@router.get("/me", response_model=UsuarioResponse)
+async def obtener_usuario_actual(
+    credencial: Credencial = Depends(obtener_credencial),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Obtener el usuario del token de acceso
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+        usuario = await crud.obtener_usuario(credencial.usuario_id)
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
+            )
+        return usuario
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener usuario: {str(e)}",
+        )
+
+
+@router.get("/{usuario_id}", response_model=UsuarioResponse)
+async def obtener_usuario(usuario_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Obtener un usuario por ID
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+        usuario = await crud.obtener_usuario(usuario_id)
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
+            )
+        return usuario
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener usuario: {str(e)}",
+        )
+
+
+@router.get("/email/{email}", response_model=UsuarioResponse)
+async def obtener_usuario_por_email(
+    email: str, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtener un usuario por email
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+        usuario = await crud.obtener_usuario_por_email(email)
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
+            )
+        return usuario
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener usuario: {str(e)}",
+        )
+
+
+@router.put("/{usuario_id}", response_model=UsuarioResponse)
+async def actualizar_usuario(
+    usuario_id: UUID, usuario: UsuarioUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualizar un usuario existente
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+
+        # Convertir el modelo a diccionario y eliminar campos None
+        datos_actualizacion = usuario.model_dump(exclude_unset=True)
+
+        if not datos_actualizacion:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No se proporcionaron datos para actualizar",
+            )
+
+        usuario_actualizado = await crud.actualizar_usuario(
+            usuario_id, **datos_actualizacion
+        )
+
+        if not usuario_actualizado:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
+            )
+
+        return usuario_actualizado
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
+    except ServicioHashSaturado as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al actualizar usuario: {str(e)}",
+        )
+
+
+@router.delete("/{usuario_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_usuario(usuario_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Eliminar un usuario
+    """
+    try:
+        crud = UsuarioAsyncCRUD(db)
+        if not await crud.eliminar_usuario(usuario_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
+            )
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al eliminar usuario: {str(e)}",
+        )
+
+
+@router.post("/login", response_model=UsuarioLoginResponse)
+async def login(
+    credenciales: UsuarioLogin,
+    ip: str = Depends(ip_cliente),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Autenticar un usuario y emitir su token de acceso
+    """
+    try:
+        # Antes de tocar la base de datos o calcular el hash
+        limitador_login.verificar(credenciales.nombre_usuario, ip)
+
+        crud = UsuarioAsyncCRUD(db)
+        usuario = await crud.autenticar_usuario(
+            credenciales.nombre_usuario, credenciales.contrasena
+        )
+
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Credenciales incorrectas",
+            )
+
+        limitador_login.exito(credenciales.nombre_usuario, ip)
+        token, expira = emitir_token(usuario.id_usuario, usuario.es_admin)
+        return UsuarioLoginResponse(
+            **UsuarioResponse.model_validate(usuario).model_dump(),
+            access_token=token,
+            expira_en=expira,
+        )
+    except HTTPException:
+        raise
+    except LimiteExcedido as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.reintentar_en)},
+        )
+    except ServicioHashSaturado as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al autenticar: {str(e)}",
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(credencial: Credencial = Depends(obtener_credencial)):
+    """
+    Revocar el token de acceso actual
+    """
+    try:
+        await lista_revocacion.revocar_async(credencial)
+        return None
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al cerrar sesión: {str(e)}",
+        )
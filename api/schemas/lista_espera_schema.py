@@ -0,0 +1,45 @@
+"""
+Schemas de Pydantic para ListaEspera
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field, EmailStr
+
+
+class ListaEsperaBase(BaseModel):
+    """Schema base para una entrada de la lista de espera"""
+
+    nombre_completo: str = Field(..., min_length=1, max_length=200)
+    telefono: Optional[str] = Field(None, max_length=20)
+    email: Optional[EmailStr] = None
+    fecha_reserva: datetime
+    hora_reserva: str = Field(..., pattern=r"^\d{2}:\d{2}$")
+    numero_personas: int = Field(..., ge=1)
+    metodo_pago: str = Field(..., max_length=50)
+    observaciones: Optional[str] = None
+    usuario_id: Optional[UUID] = None
+    restaurante_id: UUID
+    duracion_minutos: Optional[int] = Field(None, ge=15, le=720)
+    prioridad: int = Field(0, ge=0, le=100)  # mayor = se promueve antes
+
+
+class ListaEsperaCreate(ListaEsperaBase):
+    """Schema para anotarse en la lista de espera"""
+
+    pass
+
+
+class ListaEsperaResponse(ListaEsperaBase):
+    """Schema de respuesta para una entrada de la lista de espera"""
+
+    id_espera: UUID
+    inicio_reserva: datetime
+    estado: str
+    reserva_id: Optional[UUID] = None
+    fecha_creacion: datetime
+    fecha_edicion: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,51 @@
+"""
+Schemas de Pydantic para creación en lote
+"""
+
+from typing import Any, Dict, Generic, List, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T")
+
+# Máximo de elementos aceptados por request de creación en lote
+MAX_LOTE = 1000
+
+
+class ErrorItemLote(BaseModel):
+    """Errores de validación de un elemento del lote"""
+
+    indice: int
+    errores: List[str]
+
+
+class LoteResponse(BaseModel, Generic[T]):
+    """Schema de respuesta para creación en lote"""
+
+    creados: int
+    items: List[T]
+
+
+def validar_lote(
+    items: List[Dict[str, Any]], schema: Type[BaseModel]
+) -> Tuple[List[dict], List[ErrorItemLote]]:
+    """
+    Validar cada elemento por separado para reportar los errores por índice
+
+    Returns:
+        Tupla con (datos_validos, errores)
+    """
+    validos, errores = [], []
+    for indice, item in enumerate(items):
+        try:
+            validos.append(schema.model_validate(item).model_dump())
+        except ValidationError as e:
+            errores.append(
+                ErrorItemLote(
+                    indice=indice,
+                    errores=[
+                        f"{'.'.join(str(parte) for parte in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ],
+                )
+            )
+    return validos, errores
@@ -25,6 +25,7 @@ class ReservaBase(BaseModel):
     usuario_id: Optional[UUID] = None
     restaurante_id: UUID
     mesa_id: Optional[UUID] = None
+    duracion_minutos: Optional[int] = Field(None, ge=15, le=720)
 
 
 class ReservaCreate(ReservaBase):
@@ -50,12 +51,14 @@ class ReservaUpdate(BaseModel):
     usuario_id: Optional[UUID] = None
     restaurante_id: Optional[UUID] = None
     mesa_id: Optional[UUID] = None
+    duracion_minutos: Optional[int] = Field(None, ge=15, le=720)
 
 
 class ReservaResponse(ReservaBase):
     """Schema de respuesta para reserva"""
 
     id_reserva: UUID
+    inicio_reserva: datetime
     fecha_creacion: datetime
     fecha_edicion: Optional[datetime] = None
 
@@ -2,8 +2,8 @@
 Schemas de Pydantic para Restaurante
 """
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, EmailStr
 
@@ -18,6 +18,7 @@ class RestauranteBase(BaseModel):
     capacidad_maxima: int = Field(..., ge=1)
     horario_apertura: str = Field(..., pattern=r"^\d{2}:\d{2}$")
     horario_cierre: str = Field(..., pattern=r"^\d{2}:\d{2}$")
+    duracion_reserva_min: int = Field(120, ge=15, le=720)
     activo: bool = True
     usuario_admin_id: UUID
 
@@ -38,6 +39,7 @@ class RestauranteUpdate(BaseModel):
     capacidad_maxima: Optional[int] = Field(None, ge=1)
     horario_apertura: Optional[str] = Field(None, pattern=r"^\d{2}:\d{2}$")
     horario_cierre: Optional[str] = Field(None, pattern=r"^\d{2}:\d{2}$")
+    duracion_reserva_min: Optional[int] = Field(None, ge=15, le=720)
     activo: Optional[bool] = None
     usuario_admin_id: Optional[UUID] = None
 
@@ -51,3 +53,158 @@ class RestauranteResponse(RestauranteBase):
 
     class Config:
         from_attributes = True
+
+
+class MesaDisponible(BaseModel):
+    """Mesa libre en una consulta de disponibilidad"""
+
+    id_mesa: UUID
+    numero_mesa: int
+    capacidad: int
+    ubicacion: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DisponibilidadResponse(BaseModel):
+    """Mesas libres de un restaurante para N personas en fecha y hora"""
+
+    restaurante_id: UUID
+    fecha: date
+    hora: str
+    personas: int
+    duracion_minutos: int
+    mesas: List[MesaDisponible]
+
+
+class AsignacionMesa(BaseModel):
+    """Mesa elegida para una reserva en el plan de asignación"""
+
+    id_reserva: UUID
+    hora_reserva: str
+    numero_personas: int
+    id_mesa: UUID
+    numero_mesa: int
+    capacidad: int
+    ubicacion: Optional[str] = None
+
+
+class AsignacionResponse(BaseModel):
+    """Plan de asignación de mesas para un servicio"""
+
+    restaurante_id: UUID
+    fecha: date
+    aplicada: bool
+    metodo: str
+    comensales_asignados: int
+    asientos_desperdiciados: int
+    duracion_ms: float
+    asignaciones: List[AsignacionMesa]
+    sin_mesa: List[UUID]
+
+
+class OcupacionHora(BaseModel):
+    """Reservas vigentes (no canceladas) que empiezan a una hora"""
+
+    hora: int
+    reservas: int
+    comensales: int
+
+
+class OcupacionDia(BaseModel):
+    """Reservas vigentes por día de la semana"""
+
+    dia: str
+    reservas: int
+    comensales: int
+
+
+class TamanoGrupo(BaseModel):
+    personas: int
+    reservas: int
+
+
+class MetodoPagoUso(BaseModel):
+    metodo_pago: str
+    reservas: int
+    proporcion: float
+
+
+class TramoAnticipacion(BaseModel):
+    """Reservas hechas entre desde_h y hasta_h horas antes de su inicio"""
+
+    desde_h: int
+    hasta_h: Optional[int] = None
+    reservas: int
+
+
+class EstadisticasResponse(BaseModel):
+    """Estadísticas de las reservas de un restaurante"""
+
+    restaurante_id: UUID
+    desde: Optional[datetime] = None
+    hasta: Optional[datetime] = None
+    total_reservas: int
+    canceladas: int
+    tasa_cancelacion: Optional[float] = None
+    comensales: int
+    por_hora: List[OcupacionHora]
+    por_dia_semana: List[OcupacionDia]
+    # 7 x 24: [día (lunes = 0)][hora] -> reservas vigentes
+    ocupacion_dia_hora: List[List[int]]
+    tamano_grupo: List[TamanoGrupo]
+    metodos_pago: List[MetodoPagoUso]
+    anticipacion: List[TramoAnticipacion]
+    anticipacion_mediana_h: Optional[float] = None
+
+
+class TableroTurno(BaseModel):
+    """Reservas que empiezan en un mismo momento (día y hora)"""
+
+    inicio: datetime
+    reservas: int
+    vigentes: int
+    comensales: int
+
+
+class TableroEstado(BaseModel):
+    estado: Optional[str] = None
+    reservas: int
+    comensales: int
+
+
+class TableroMesa(BaseModel):
+    """Uso de una mesa en el rango (solo reservas no canceladas)"""
+
+    mesa_id: UUID
+    numero_mesa: int
+    capacidad: int
+    reservas: int
+    comensales: int
+    minutos_ocupados: int
+    # Minutos ocupados / minutos de apertura del rango
+    utilizacion: float
+    # Comensales / asientos de la mesa en sus reservas
+    llenado: Optional[float] = None
+
+
+class TableroMetodoPago(BaseModel):
+    metodo_pago: str
+    reservas: int
+    comensales: int
+
+
+class TableroResponse(BaseModel):
+    """Resúmenes agregados de las reservas de un restaurante en un rango de días"""
+
+    restaurante_id: UUID
+    desde: date
+    hasta: date
+    en_cache: bool
+    total_reservas: int
+    sin_mesa: int
+    por_turno: List[TableroTurno]
+    por_estado: List[TableroEstado]
+    por_mesa: List[TableroMesa]
+    por_metodo_pago: List[TableroMetodoPago]
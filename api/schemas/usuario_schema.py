@@ -76,3 +76,11 @@ class UsuarioLogin(BaseModel):
 
     nombre_usuario: str
     contrasena: str
+
+
+class UsuarioLoginResponse(UsuarioResponse):
+    """Schema para respuesta de login: usuario y token de acceso"""
+
+    access_token: str
+    token_type: str = "bearer"
+    expira_en: datetime
@@ -0,0 +1,92 @@
+"""
+Calibración del costo del hash de contraseñas
+
+Mide en este host cuánto tarda una verificación y elige los parámetros
+que más se acercan a la latencia objetivo sin pasarse, sin bajar nunca
+de los mínimos (100000 iteraciones PBKDF2, N=2^14 en scrypt). Imprime
+las variables de entorno a copiar en .env.
+
+Uso:
+    python -m auth.calibracion --objetivo-ms 250 --algoritmo scrypt
+"""
+
+import argparse
+import secrets
+import statistics
+import time
+from typing import Dict
+
+from auth.security import ALGORITMOS, derivar
+
+MINIMO_PBKDF2 = 100000
+MINIMO_SCRYPT_N = 1 << 14
+
+
+def medir(algoritmo: str, parametros: Dict[str, int], repeticiones: int = 5) -> float:
+    """Mediana en segundos de una derivación con esos parámetros"""
+    salt = secrets.token_bytes(16)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        derivar(algoritmo, parametros, "Calibracion123!", salt)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def calibrar_pbkdf2(objetivo_s: float) -> Dict[str, int]:
+    """
+    El costo de PBKDF2 es lineal en las iteraciones: se extrapola desde
+    una medición base y se ajusta hasta quedar bajo el objetivo
+    """
+    base = medir("pbkdf2-sha256", {"i": MINIMO_PBKDF2})
+    iteraciones = int(MINIMO_PBKDF2 * objetivo_s / base) // 1000 * 1000
+    while (
+        iteraciones > MINIMO_PBKDF2
+        and medir("pbkdf2-sha256", {"i": iteraciones}) > objetivo_s
+    ):
+        iteraciones = int(iteraciones * 0.9) // 1000 * 1000
+    return {"i": max(MINIMO_PBKDF2, iteraciones)}
+
+
+def calibrar_scrypt(objetivo_s: float, r: int = 8, p: int = 1) -> Dict[str, int]:
+    """
+    N debe ser potencia de 2: se duplica mientras la verificación siga
+    por debajo del objetivo (memoria usada: 128 * N * r bytes)
+    """
+    n = MINIMO_SCRYPT_N
+    while medir("scrypt", {"n": n * 2, "r": r, "p": p}) <= objetivo_s:
+        n *= 2
+    return {"n": n, "r": r, "p": p}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objetivo-ms", type=float, default=250)
+    parser.add_argument("--algoritmo", choices=ALGORITMOS, default="pbkdf2-sha256")
+    args = parser.parse_args()
+    objetivo = args.objetivo_ms / 1000
+
+    print(f"⏳ Calibrando {args.algoritmo} para ~{args.objetivo_ms:.0f} ms...")
+    if args.algoritmo == "scrypt":
+        parametros = calibrar_scrypt(objetivo)
+        variables = {
+            "HASH_SCRYPT_N": parametros["n"],
+            "HASH_SCRYPT_R": parametros["r"],
+            "HASH_SCRYPT_P": parametros["p"],
+        }
+    else:
+        parametros = calibrar_pbkdf2(objetivo)
+        variables = {"HASH_PBKDF2_ITERACIONES": parametros["i"]}
+
+    duracion = medir(args.algoritmo, parametros)
+    print(f"📊 Verificación: {duracion * 1000:.0f} ms con {parametros}")
+    if duracion > objetivo:
+        print("⚠️ El mínimo recomendado supera el objetivo en este host")
+    print("\n# Copiar en .env")
+    print(f"HASH_ALGORITMO={args.algoritmo}")
+    for nombre, valor in variables.items():
+        print(f"{nombre}={valor}")
+
+
+if __name__ == "__main__":
+    main()
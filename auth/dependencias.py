@@ -0,0 +1,54 @@
+"""
+Dependencias de FastAPI para autenticación (token de acceso e IP del cliente)
+"""
+
+import os
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from auth.tokens import Credencial, TokenInvalido, verificar_token
+
+# Detrás de un proxy inverso la IP real llega en X-Forwarded-For
+API_DETRAS_DE_PROXY = os.getenv("API_DETRAS_DE_PROXY", "false").lower() in (
+    "1",
+    "true",
+    "si",
+)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def ip_cliente(request: Request) -> str:
+    """
+    IP del cliente (la primera de X-Forwarded-For si API_DETRAS_DE_PROXY)
+    """
+    if API_DETRAS_DE_PROXY:
+        reenviada = request.headers.get("x-forwarded-for")
+        if reenviada:
+            return reenviada.split(",")[0].strip()
+    return request.client.host if request.client else "desconocida"
+
+
+async def obtener_credencial(
+    autorizacion: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Credencial:
+    """
+    Credencial del header `Authorization: Bearer <token>`. Solo valida la
+    firma y la lista de revocación en memoria (sin base de datos).
+    """
+    if autorizacion is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Se requiere un token de acceso",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return verificar_token(autorizacion.credentials)
+    except TokenInvalido as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
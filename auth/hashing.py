@@ -0,0 +1,213 @@
+"""
+Servicio de hashing de contraseñas en un pool de procesos
+
+PBKDF2 ocupa decenas de milisegundos de CPU por operación. Correrlo en el
+proceso de la API compite con el resto de requests; aquí se envía a un
+ProcessPoolExecutor con un límite de operaciones pendientes: al superarlo
+se rechaza de inmediato (ServicioHashSaturado -> 503) en lugar de encolar
+sin fin.
+
+La API síncrona bloquea el hilo que la llama hasta que el worker termina;
+en los endpoints síncronos ese hilo es del threadpool de AnyIO (40 por
+defecto, compartido por todos los endpoints síncronos). Por eso las
+esperas síncronas simultáneas tienen su propio tope, igual a la cantidad
+de workers: una espera más solo ocuparía un hilo aguardando un worker
+libre, así que se rechaza igual que la cola llena.
+
+Variables de entorno: HASH_PROCESOS (workers, por defecto los núcleos) y
+HASH_MAX_EN_COLA (operaciones esperando un worker libre).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from auth.security import PasswordManager
+from monitoring.histograma import Histograma
+from monitoring.metricas import cabecera, linea
+
+HASH_PROCESOS = int(os.getenv("HASH_PROCESOS", str(os.cpu_count() or 2)))
+HASH_MAX_EN_COLA = int(os.getenv("HASH_MAX_EN_COLA", "32"))
+
+
+class ServicioHashSaturado(Exception):
+    """La cola del servicio de hashing está llena"""
+
+
+def _calentar() -> None:
+    """Tarea vacía para arrancar los workers antes del primer login"""
+
+
+class ServicioHash:
+    """Pool de procesos para hash_password/verify_password con cupo acotado"""
+
+    def __init__(
+        self, procesos: int = HASH_PROCESOS, max_en_cola: int = HASH_MAX_EN_COLA
+    ):
+        self.procesos = max(1, procesos)
+        self.max_en_cola = max(0, max_en_cola)
+        self._ejecutor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Hilos bloqueados a la vez en la API síncrona
+        self._esperas_sync = threading.BoundedSemaphore(self.procesos)
+        self.en_curso = 0
+        self.rechazadas = 0
+        self.duracion: Dict[str, Histograma] = {
+            "hash": Histograma(),
+            "verificar": Histograma(),
+        }
+
+    # ---------- CICLO DE VIDA ----------
+    def iniciar(self) -> None:
+        """
+        Crear el pool y arrancar todos sus workers (spawn: no hereda hilos
+        ni conexiones abiertas del proceso de la API)
+        """
+        with self._lock:
+            if self._ejecutor is None:
+                self._ejecutor = ProcessPoolExecutor(
+                    max_workers=self.procesos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            ejecutor = self._ejecutor
+        for tarea in [ejecutor.submit(_calentar) for _ in range(self.procesos)]:
+            tarea.result()
+
+    def detener(self) -> None:
+        with self._lock:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=True, cancel_futures=True)
+
+    # ---------- ENVÍO ----------
+    @property
+    def en_cola(self) -> int:
+        return max(0, self.en_curso - self.procesos)
+
+    def _rechazar(self) -> ServicioHashSaturado:
+        with self._lock:
+            self.rechazadas += 1
+        return ServicioHashSaturado(
+            "Servicio de contraseñas saturado, intenta de nuevo"
+        )
+
+    def _enviar(self, operacion: str, funcion, *args) -> Future:
+        ejecutor = self._ejecutor
+        if ejecutor is None:
+            self.iniciar()
+            ejecutor = self._ejecutor
+
+        with self._lock:
+            lleno = self.en_curso >= self.procesos + self.max_en_cola
+            if not lleno:
+                self.en_curso += 1
+        if lleno:
+            raise self._rechazar()
+
+        inicio = time.perf_counter()
+
+        def _terminar(_):
+            with self._lock:
+                self.en_curso -= 1
+                self.duracion[operacion].observar(time.perf_counter() - inicio)
+
+        try:
+            tarea = ejecutor.submit(funcion, *args)
+        except Exception:
+            with self._lock:
+                self.en_curso -= 1
+            raise
+        tarea.add_done_callback(_terminar)
+        return tarea
+
+    # ---------- API ASÍNCRONA ----------
+    async def hash_password(self, password: str) -> str:
+        return await asyncio.wrap_future(
+            self._enviar("hash", PasswordManager.hash_password, password)
+        )
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        return await asyncio.wrap_future(
+            self._enviar(
+                "verificar", PasswordManager.verify_password, password, password_hash
+            )
+        )
+
+    # ---------- API SÍNCRONA (CRUD síncrono y consola) ----------
+    def _esperar(self, operacion: str, funcion, *args):
+        """Enviar y bloquear el hilo hasta el resultado (a lo sumo `procesos` hilos)"""
+        if not self._esperas_sync.acquire(blocking=False):
+            raise self._rechazar()
+        try:
+            return self._enviar(operacion, funcion, *args).result()
+        finally:
+            self._esperas_sync.release()
+
+    def hash_password_sync(self, password: str) -> str:
+        return self._esperar("hash", PasswordManager.hash_password, password)
+
+    def verify_password_sync(self, password: str, password_hash: str) -> bool:
+        return self._esperar(
+            "verificar", PasswordManager.verify_password, password, password_hash
+        )
+
+    # ---------- MÉTRICAS ----------
+    def resumen(self) -> Dict:
+        with self._lock:
+            return {
+                "procesos": self.procesos,
+                "max_en_cola": self.max_en_cola,
+                "en_curso": self.en_curso,
+                "en_cola": self.en_cola,
+                "rechazadas": self.rechazadas,
+                "duracion": {
+                    operacion: histograma.resumen()
+                    for operacion, histograma in self.duracion.items()
+                },
+            }
+
+    def lineas_metricas(self) -> List[str]:
+        """
+        Métricas del servicio en formato Prometheus
+        """
+        with self._lock:
+            lineas = cabecera(
+                "password_hash_in_flight", "gauge", "Operaciones de hash pendientes"
+            )
+            lineas.append(linea("password_hash_in_flight", self.en_curso))
+            lineas += cabecera(
+                "password_hash_queue_depth", "gauge", "Operaciones esperando worker"
+            )
+            lineas.append(linea("password_hash_queue_depth", self.en_cola))
+            lineas += cabecera(
+                "password_hash_rejected_total", "counter", "Rechazos por cola llena"
+            )
+            lineas.append(linea("password_hash_rejected_total", self.rechazadas))
+
+            nombre = "password_hash_duration_seconds"
+            lineas += cabecera(nombre, "histogram", "Espera + cómputo de cada hash")
+            for operacion, histograma in self.duracion.items():
+                limites = [str(limite) for limite in histograma.limites] + ["+Inf"]
+                for limite, acumulado in zip(limites, histograma.acumulado()):
+                    lineas.append(
+                        linea(
+                            f"{nombre}_bucket",
+                            acumulado,
+                            operacion=operacion,
+                            le=limite,
+                        )
+                    )
+                lineas.append(
+                    linea(f"{nombre}_sum", histograma.suma, operacion=operacion)
+                )
+                lineas.append(
+                    linea(f"{nombre}_count", histograma.total, operacion=operacion)
+                )
+        return lineas
+
+
+servicio_hash = ServicioHash()
@@ -0,0 +1,206 @@
+"""
+Limitador de intentos de login por ventana deslizante
+
+Cada clave (nombre de usuario o IP) guarda solo dos contadores: el de la
+ventana fija actual y el de la anterior. La ventana deslizante se estima
+ponderando la anterior por la fracción que aún cae dentro del intervalo:
+
+    estimado = anterior * (1 - transcurrido / ventana) + actual
+
+Las claves viven en un OrderedDict en orden de último uso con un tope de
+entradas: al superarlo se descartan las menos recientes, y las que no
+tienen actividad en dos ventanas se eliminan al pasar por el frente.
+
+El intento se reserva antes de consultar la base de datos o calcular el
+hash; un login correcto lo devuelve (y limpia el contador del usuario),
+así que en la práctica se limitan los intentos fallidos.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from monitoring.metricas import cabecera, linea
+
+LOGIN_MAX_POR_USUARIO = int(os.getenv("LOGIN_MAX_POR_USUARIO", "5"))
+LOGIN_VENTANA_USUARIO_S = float(os.getenv("LOGIN_VENTANA_USUARIO_S", "300"))
+LOGIN_MAX_POR_IP = int(os.getenv("LOGIN_MAX_POR_IP", "30"))
+LOGIN_VENTANA_IP_S = float(os.getenv("LOGIN_VENTANA_IP_S", "60"))
+LOGIN_MAX_CLAVES = int(os.getenv("LOGIN_MAX_CLAVES", "50000"))
+
+
+class LimiteExcedido(Exception):
+    """Demasiados intentos para una clave; reintentar tras `reintentar_en` s"""
+
+    def __init__(self, mensaje: str, reintentar_en: int):
+        super().__init__(mensaje)
+        self.reintentar_en = reintentar_en
+
+
+class VentanaDeslizante:
+    """Contador por clave con ventana deslizante aproximada y memoria acotada"""
+
+    def __init__(self, limite: int, ventana_s: float, max_claves: int):
+        if limite < 1:
+            raise ValueError(
+                f"El límite de intentos debe ser al menos 1 (recibido: {limite})"
+            )
+        self.limite = limite
+        self.ventana_s = ventana_s
+        self.max_claves = max_claves
+        # clave -> [inicio de la ventana actual, anterior, actual]
+        self._claves: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def _avanzar(self, entrada: List[float], ahora: float) -> None:
+        ventanas = int((ahora - entrada[0]) // self.ventana_s)
+        if ventanas == 1:
+            entrada[1], entrada[2] = entrada[2], 0
+        elif ventanas > 1:
+            entrada[1] = entrada[2] = 0
+        entrada[0] += ventanas * self.ventana_s
+
+    def _podar(self, ahora: float) -> None:
+        while self._claves:
+            entrada = next(iter(self._claves.values()))
+            inactiva = ahora - entrada[0] >= 2 * self.ventana_s
+            if not inactiva and len(self._claves) <= self.max_claves:
+                break
+            self._claves.popitem(last=False)
+
+    def reservar(self, clave: str, ahora: Optional[float] = None) -> Optional[int]:
+        """
+        Contar un intento si cabe en el límite
+
+        Returns:
+            None si se permite; si no, los segundos a esperar
+        """
+        ahora = time.monotonic() if ahora is None else ahora
+        with self._lock:
+            entrada = self._claves.get(clave)
+            if entrada is None:
+                entrada = self._claves[clave] = [ahora, 0, 0]
+            else:
+                self._claves.move_to_end(clave)
+                self._avanzar(entrada, ahora)
+
+            inicio, anterior, actual = entrada
+            peso = 1 - (ahora - inicio) / self.ventana_s
+            if anterior * peso + actual + 1 <= self.limite:
+                entrada[2] += 1
+                self._podar(ahora)
+                return None
+
+            if actual + 1 > self.limite:
+                # Esperar a que la ventana actual pase a ser la anterior y
+                # su peso baje lo suficiente
+                espera = (inicio + self.ventana_s - ahora) + self.ventana_s * (
+                    1 - (self.limite - 1) / actual
+                )
+            else:
+                libre = self.limite - actual - 1
+                espera = self.ventana_s * (1 - libre / anterior) - (ahora - inicio)
+            return max(1, math.ceil(espera))
+
+    def devolver(self, clave: str) -> None:
+        """Descontar un intento reservado (login correcto)"""
+        with self._lock:
+            entrada = self._claves.get(clave)
+            if entrada is not None and entrada[2] > 0:
+                entrada[2] -= 1
+
+    def reiniciar(self, clave: str) -> None:
+        with self._lock:
+            self._claves.pop(clave, None)
+
+
+class LimitadorLogin:
+    """Límites combinados por nombre de usuario y por IP de cliente"""
+
+    def __init__(
+        self,
+        max_por_usuario: int = LOGIN_MAX_POR_USUARIO,
+        ventana_usuario_s: float = LOGIN_VENTANA_USUARIO_S,
+        max_por_ip: int = LOGIN_MAX_POR_IP,
+        ventana_ip_s: float = LOGIN_VENTANA_IP_S,
+        max_claves: int = LOGIN_MAX_CLAVES,
+    ):
+        self.ventanas: Dict[str, VentanaDeslizante] = {
+            "usuario": VentanaDeslizante(
+                max_por_usuario, ventana_usuario_s, max_claves
+            ),
+            "ip": VentanaDeslizante(max_por_ip, ventana_ip_s, max_claves),
+        }
+        self.rechazos: Dict[str, int] = {"usuario": 0, "ip": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _claves(nombre_usuario: str, ip: str) -> Tuple[Tuple[str, str], ...]:
+        return (("ip", ip), ("usuario", nombre_usuario.lower().strip()))
+
+    def verificar(self, nombre_usuario: str, ip: str) -> None:
+        """
+        Reservar un intento para el usuario y la IP
+
+        Raises:
+            LimiteExcedido: si alguna de las dos claves superó su límite
+        """
+        reservadas = []
+        for tipo, clave in self._claves(nombre_usuario, ip):
+            espera = self.ventanas[tipo].reservar(clave)
+            if espera is not None:
+                for tipo_reservado, clave_reservada in reservadas:
+                    self.ventanas[tipo_reservado].devolver(clave_reservada)
+                with self._lock:
+                    self.rechazos[tipo] += 1
+                raise LimiteExcedido(
+                    "Demasiados intentos de inicio de sesión, intenta más tarde",
+                    espera,
+                )
+            reservadas.append((tipo, clave))
+
+    def exito(self, nombre_usuario: str, ip: str) -> None:
+        """
+        Login correcto: el intento no cuenta para la IP y el contador del
+        usuario vuelve a cero
+        """
+        (_, clave_ip), (_, clave_usuario) = self._claves(nombre_usuario, ip)
+        self.ventanas["ip"].devolver(clave_ip)
+        self.ventanas["usuario"].reiniciar(clave_usuario)
+
+    # ---------- MÉTRICAS ----------
+    def resumen(self) -> Dict:
+        return {
+            tipo: {
+                "limite": ventana.limite,
+                "ventana_s": ventana.ventana_s,
+                "claves": len(ventana),
+                "rechazos": self.rechazos[tipo],
+            }
+            for tipo, ventana in self.ventanas.items()
+        }
+
+    def lineas_metricas(self) -> List[str]:
+        """
+        Métricas del limitador en formato Prometheus
+        """
+        lineas = cabecera(
+            "login_throttled_total", "counter", "Logins rechazados por límite"
+        )
+        for tipo, total in self.rechazos.items():
+            lineas.append(linea("login_throttled_total", total, clave=tipo))
+        lineas += cabecera(
+            "login_throttle_keys", "gauge", "Claves con contador de intentos"
+        )
+        for tipo, ventana in self.ventanas.items():
+            lineas.append(linea("login_throttle_keys", len(ventana), clave=tipo))
+        return lineas
+
+
+limitador_login = LimitadorLogin()
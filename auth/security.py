@@ -1,10 +1,101 @@
 """
 Módulo de seguridad para manejo de contraseñas
+
+Formato almacenado (autodescriptivo, estilo PHC):
+
+    $pbkdf2-sha256$i=<iteraciones>$<salt>$<hash>
+    $scrypt$n=<N>,r=<r>,p=<p>$<salt>$<hash>
+
+salt y hash van en base64 sin relleno. El algoritmo y el costo de los
+hashes nuevos salen de HASH_ALGORITMO, HASH_PBKDF2_ITERACIONES y
+HASH_SCRYPT_N/R/P (ver auth/calibracion.py para elegirlos); los hashes
+existentes se verifican con los parámetros que llevan guardados. El
+formato anterior `salt:hash` (PBKDF2 con 100000 iteraciones) se sigue
+aceptando y necesita_rehash() lo marca para actualizarlo.
 """
 
+import base64
 import hashlib
+import hmac
+import os
 import secrets
-from typing import Tuple
+from typing import Dict, Tuple
+
+ALGORITMOS = ("pbkdf2-sha256", "scrypt")
+
+HASH_ALGORITMO = os.getenv("HASH_ALGORITMO", "pbkdf2-sha256")
+HASH_PBKDF2_ITERACIONES = int(os.getenv("HASH_PBKDF2_ITERACIONES", "100000"))
+HASH_SCRYPT_N = int(os.getenv("HASH_SCRYPT_N", "16384"))
+HASH_SCRYPT_R = int(os.getenv("HASH_SCRYPT_R", "8"))
+HASH_SCRYPT_P = int(os.getenv("HASH_SCRYPT_P", "1"))
+
+if HASH_ALGORITMO not in ALGORITMOS:
+    raise ValueError(f"HASH_ALGORITMO debe ser uno de {ALGORITMOS}")
+
+_ITERACIONES_LEGADO = 100000
+_BYTES_SALT = 16
+_BYTES_HASH = 32
+
+
+def _b64(datos: bytes) -> str:
+    return base64.b64encode(datos).decode("ascii").rstrip("=")
+
+
+def _desde_b64(texto: str) -> bytes:
+    return base64.b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def parametros_actuales() -> Dict[str, int]:
+    """Parámetros de costo configurados para HASH_ALGORITMO"""
+    if HASH_ALGORITMO == "scrypt":
+        return {"n": HASH_SCRYPT_N, "r": HASH_SCRYPT_R, "p": HASH_SCRYPT_P}
+    return {"i": HASH_PBKDF2_ITERACIONES}
+
+
+def derivar(algoritmo: str, parametros: Dict[str, int], password: str, salt: bytes):
+    """Derivar la clave de `password` con el algoritmo y costo indicados"""
+    if algoritmo == "pbkdf2-sha256":
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), salt, parametros["i"], _BYTES_HASH
+        )
+    if algoritmo == "scrypt":
+        n, r, p = parametros["n"], parametros["r"], parametros["p"]
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r + (1 << 20),
+            dklen=_BYTES_HASH,
+        )
+    raise ValueError(f"Algoritmo de hash desconocido: {algoritmo}")
+
+
+def formatear(algoritmo: str, parametros: Dict[str, int], salt: bytes, clave: bytes):
+    texto = ",".join(f"{nombre}={valor}" for nombre, valor in parametros.items())
+    return f"${algoritmo}${texto}${_b64(salt)}${_b64(clave)}"
+
+
+def analizar(password_hash: str) -> Tuple[str, Dict[str, int], bytes, bytes]:
+    """
+    Separar un hash almacenado en (algoritmo, parámetros, salt, hash).
+    El formato legado se devuelve como pbkdf2-sha256 con salt en texto.
+    """
+    if not password_hash.startswith("$"):
+        salt, hash_hex = password_hash.split(":")
+        return (
+            "pbkdf2-sha256",
+            {"i": _ITERACIONES_LEGADO},
+            salt.encode("utf-8"),
+            bytes.fromhex(hash_hex),
+        )
+    _, algoritmo, texto, salt, clave = password_hash.split("$")
+    parametros = {}
+    for par in texto.split(","):
+        nombre, valor = par.split("=")
+        parametros[nombre] = int(valor)
+    return algoritmo, parametros, _desde_b64(salt), _desde_b64(clave)
 
 
 class PasswordManager:
@@ -19,13 +110,12 @@ class PasswordManager:
             password: Contraseña en texto plano
 
         Returns:
-            Hash de la contraseña con salt
+            Hash autodescriptivo con algoritmo, costo y salt
         """
-        salt = secrets.token_hex(32)
-        password_hash = hashlib.pbkdf2_hmac(
-            "sha256", password.encode("utf-8"), salt.encode("utf-8"), 100000
-        )
-        return f"{salt}:{password_hash.hex()}"
+        salt = secrets.token_bytes(_BYTES_SALT)
+        parametros = parametros_actuales()
+        clave = derivar(HASH_ALGORITMO, parametros, password, salt)
+        return formatear(HASH_ALGORITMO, parametros, salt, clave)
 
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
@@ -34,19 +124,33 @@ class PasswordManager:
 
         Args:
             password: Contraseña en texto plano
-            password_hash: Hash almacenado
+            password_hash: Hash almacenado (formato nuevo o legado)
 
         Returns:
             True si la contraseña es correcta, False en caso contrario
         """
         try:
-            salt, hash_part = password_hash.split(":")
-            password_hash_check = hashlib.pbkdf2_hmac(
-                "sha256", password.encode("utf-8"), salt.encode("utf-8"), 100000
-            )
-            return password_hash_check.hex() == hash_part
-        except (ValueError, AttributeError):
+            algoritmo, parametros, salt, clave = analizar(password_hash)
+            calculada = derivar(algoritmo, parametros, password, salt)
+        except (ValueError, KeyError, AttributeError):
             return False
+        return hmac.compare_digest(calculada, clave)
+
+    @staticmethod
+    def necesita_rehash(password_hash: str) -> bool:
+        """
+        True si el hash no usa el algoritmo y costo configurados
+        (incluye el formato legado `salt:hash`)
+        """
+        try:
+            algoritmo, parametros, _, _ = analizar(password_hash)
+        except (ValueError, AttributeError):
+            return True
+        return (
+            not password_hash.startswith("$")
+            or algoritmo != HASH_ALGORITMO
+            or parametros != parametros_actuales()
+        )
 
     @staticmethod
     def validate_password_strength(password: str) -> Tuple[bool, str]:
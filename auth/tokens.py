@@ -0,0 +1,257 @@
+"""
+Tokens de acceso firmados con HMAC
+
+El login emite un token `<payload>.<firma>` (base64url) con el usuario, su
+rol, la expiración y un identificador único (jti). Validarlo es recalcular
+un HMAC-SHA256 y leer un set en memoria: no toca la base de datos ni
+vuelve a verificar la contraseña.
+
+El logout agrega el jti a tokens_revocados; cada instancia mantiene en
+memoria los jti revocados no expirados y los recarga cada
+TOKEN_REVOCACION_INTERVALO_S segundos (una revocación hecha en otra
+instancia tarda como máximo ese intervalo en aplicarse aquí). Si una
+recarga falla (por ejemplo, la base no responde al arrancar) se reintenta
+cada TOKEN_REVOCACION_REINTENTO_S segundos hasta lograrla.
+
+Variables de entorno: TOKEN_SECRETO (obligatorio con varias instancias o
+workers), TOKEN_DURACION_S, TOKEN_REVOCACION_INTERVALO_S y
+TOKEN_REVOCACION_REINTENTO_S.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database.config import async_engine, engine
+from database.models.token_revocado import TokenRevocado
+
+TOKEN_DURACION_S = int(os.getenv("TOKEN_DURACION_S", "3600"))
+TOKEN_REVOCACION_INTERVALO_S = float(os.getenv("TOKEN_REVOCACION_INTERVALO_S", "30"))
+TOKEN_REVOCACION_REINTENTO_S = float(os.getenv("TOKEN_REVOCACION_REINTENTO_S", "5"))
+
+_secreto = os.getenv("TOKEN_SECRETO")
+if not _secreto:
+    print("⚠️ TOKEN_SECRETO no definido: los tokens no sobreviven a un reinicio")
+    _secreto = secrets.token_hex(32)
+_CLAVE = _secreto.encode("utf-8")
+
+
+class TokenInvalido(ValueError):
+    """Token mal formado, con firma incorrecta, expirado o revocado"""
+
+
+@dataclass(frozen=True)
+class Credencial:
+    """Datos del usuario autenticado extraídos del token"""
+
+    usuario_id: uuid.UUID
+    es_admin: bool
+    jti: str
+    expira: datetime
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).decode("ascii").rstrip("=")
+
+
+def _desde_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def _firmar(payload: str) -> str:
+    return _b64(hmac.new(_CLAVE, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def emitir_token(usuario_id: uuid.UUID, es_admin: bool) -> Tuple[str, datetime]:
+    """
+    Crear un token de acceso
+
+    Returns:
+        Tupla con (token, fecha de expiración)
+    """
+    expira = int(time.time()) + TOKEN_DURACION_S
+    datos = {
+        "sub": str(usuario_id),
+        "adm": bool(es_admin),
+        "exp": expira,
+        "jti": secrets.token_hex(16),
+    }
+    payload = _b64(json.dumps(datos, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_firmar(payload)}", datetime.fromtimestamp(expira, timezone.utc)
+
+
+def verificar_token(token: str) -> Credencial:
+    """
+    Validar firma, expiración y revocación de un token
+
+    Raises:
+        TokenInvalido: si el token no es aceptable
+    """
+    try:
+        payload, firma = token.split(".")
+        if not hmac.compare_digest(firma, _firmar(payload)):
+            raise TokenInvalido("Firma inválida")
+        datos = json.loads(_desde_b64(payload))
+        credencial = Credencial(
+            usuario_id=uuid.UUID(datos["sub"]),
+            es_admin=bool(datos["adm"]),
+            jti=datos["jti"],
+            expira=datetime.fromtimestamp(datos["exp"], timezone.utc),
+        )
+        vencimiento = datos["exp"]
+    except TokenInvalido:
+        raise
+    except (ValueError, TypeError, KeyError, UnicodeEncodeError, binascii.Error):
+        raise TokenInvalido("Token mal formado")
+    if vencimiento <= time.time():
+        raise TokenInvalido("Token expirado")
+    if lista_revocacion.revocado(credencial.jti):
+        raise TokenInvalido("Token revocado")
+    return credencial
+
+
+# ---------- LISTA DE REVOCACIÓN ----------
+def _consulta_vigentes():
+    return select(TokenRevocado.jti).where(
+        TokenRevocado.expira > datetime.now(timezone.utc)
+    )
+
+
+def _purga():
+    return delete(TokenRevocado).where(
+        TokenRevocado.expira <= datetime.now(timezone.utc)
+    )
+
+
+def _insercion(credencial: Credencial):
+    return (
+        pg_insert(TokenRevocado)
+        .values(
+            jti=credencial.jti,
+            usuario_id=credencial.usuario_id,
+            expira=credencial.expira,
+        )
+        .on_conflict_do_nothing(index_elements=["jti"])
+    )
+
+
+def _cargar_sincrono() -> Set[str]:
+    with engine.begin() as connection:
+        connection.execute(_purga())
+        return set(connection.execute(_consulta_vigentes()).scalars())
+
+
+class ListaRevocacion:
+    """jti revocados en memoria, recargados periódicamente desde la base"""
+
+    def __init__(
+        self,
+        intervalo: float = TOKEN_REVOCACION_INTERVALO_S,
+        reintento: float = TOKEN_REVOCACION_REINTENTO_S,
+    ):
+        self.intervalo = intervalo
+        self.reintento = min(reintento, intervalo)
+        self._al_dia = False
+        self._revocados: Set[str] = set()
+        self._locales: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._tarea: Optional[asyncio.Task] = None
+        self.ultima_carga: Optional[datetime] = None
+
+    def revocado(self, jti: str) -> bool:
+        return jti in self._revocados
+
+    def __len__(self) -> int:
+        return len(self._revocados)
+
+    async def recargar(self) -> None:
+        """
+        Reemplazar el set con los jti vigentes (y purgar los expirados)
+        """
+        if async_engine is not None:
+            async with async_engine.begin() as connection:
+                await connection.execute(_purga())
+                resultado = await connection.execute(_consulta_vigentes())
+                revocados = set(resultado.scalars())
+        else:
+            revocados = await asyncio.to_thread(_cargar_sincrono)
+        # Las revocaciones hechas aquí se conservan aunque la consulta haya
+        # empezado antes de confirmarlas
+        ahora = datetime.now(timezone.utc)
+        with self._lock:
+            self._locales = {
+                jti: expira for jti, expira in self._locales.items() if expira > ahora
+            }
+            # Se reemplaza el set completo: verificar_token lo lee sin locks
+            self._revocados = revocados | set(self._locales)
+        self.ultima_carga = ahora
+        self._al_dia = True
+
+    def revocar(self, credencial: Credencial) -> None:
+        """
+        Registrar la revocación (versión síncrona, para endpoints def)
+        """
+        with engine.begin() as connection:
+            connection.execute(_insercion(credencial))
+        self._agregar(credencial)
+
+    async def revocar_async(self, credencial: Credencial) -> None:
+        if async_engine is not None:
+            async with async_engine.begin() as connection:
+                await connection.execute(_insercion(credencial))
+            self._agregar(credencial)
+        else:
+            await asyncio.to_thread(self.revocar, credencial)
+
+    def _agregar(self, credencial: Credencial) -> None:
+        with self._lock:
+            self._locales[credencial.jti] = credencial.expira
+            self._revocados = self._revocados | {credencial.jti}
+
+    async def _bucle(self) -> None:
+        while True:
+            # Tras un fallo se reintenta pronto: hasta entonces solo se
+            # conocen las revocaciones hechas en esta instancia
+            await asyncio.sleep(self.intervalo if self._al_dia else self.reintento)
+            try:
+                await self.recargar()
+            except Exception as e:
+                self._al_dia = False
+                print(f"⚠️ Error al recargar tokens revocados: {e}")
+
+    async def iniciar(self) -> None:
+        """
+        Primera carga y tarea periódica de recarga. La tarea arranca
+        aunque la primera carga falle (el error se propaga igual)
+        """
+        try:
+            await self.recargar()
+        finally:
+            if self._tarea is None:
+                self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+
+lista_revocacion = ListaRevocacion()
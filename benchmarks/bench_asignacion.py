@@ -0,0 +1,170 @@
+"""
+Benchmark: asignación automática de mesas en días sintéticos
+
+Genera días con N comensales (por defecto 600) repartidos en almuerzo y
+cena sobre un salón de mesas de 2, 4, 6 y 8, y compara:
+
+    primera_libre  cada reserva, en orden de llegada, a la primera mesa
+                   libre con capacidad suficiente (lo que haría un
+                   anfitrión sin plan)
+    heuristica     pasadas voraces de services.asignacion (con la misma
+                   llegada)
+    exacto         ramificación y poda (solo en instancias pequeñas, donde
+                   se compara contra la heurística)
+
+No escribe en la base de datos (DATABASE_URL solo se usa para importar
+los modelos).
+
+Uso:
+    python -m benchmarks.bench_asignacion --comensales 600 --dias 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+from services.asignacion import MesaPlan, ReservaPlan, asignar
+from services.disponibilidad import RESERVA_DURACION_MIN
+
+SALON = ((2, 20), (4, 24), (6, 10), (8, 6))  # (capacidad, cantidad)
+TAMANOS = (1, 2, 2, 2, 3, 4, 4, 4, 5, 6, 6, 7, 8)
+FRANJAS = ((12 * 60, 15 * 60), (19 * 60, 22 * 60 + 30))
+
+
+def _mesas(salon=SALON):
+    mesas, numero = [], 1
+    for capacidad, cantidad in salon:
+        for _ in range(cantidad):
+            mesas.append(MesaPlan(uuid.uuid4(), numero, capacidad, "Salón"))
+            numero += 1
+    return mesas
+
+
+def _dia(azar, comensales):
+    reservas, total = [], 0
+    while total < comensales:
+        desde, hasta = FRANJAS[azar.random() < 0.65]
+        inicio = azar.randrange(desde, hasta, 15)
+        personas = azar.choice(TAMANOS)
+        reservas.append(
+            ReservaPlan(uuid.uuid4(), inicio, inicio + RESERVA_DURACION_MIN, personas)
+        )
+        total += personas
+    return reservas
+
+
+def primera_libre(reservas, mesas):
+    """Orden de llegada, primera mesa libre que alcance"""
+    ocupadas = {mesa.id_mesa: [] for mesa in mesas}
+    comensales = desperdicio = 0
+    for reserva in reservas:
+        for mesa in mesas:
+            if mesa.capacidad < reserva.personas:
+                continue
+            if all(
+                fin <= reserva.inicio or reserva.fin <= inicio
+                for inicio, fin in ocupadas[mesa.id_mesa]
+            ):
+                ocupadas[mesa.id_mesa].append((reserva.inicio, reserva.fin))
+                comensales += reserva.personas
+                desperdicio += mesa.capacidad - reserva.personas
+                break
+    return comensales, desperdicio
+
+
+def _medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+def dias_completos(azar, dias, comensales):
+    mesas = _mesas()
+    asientos = sum(mesa.capacidad for mesa in mesas)
+    print(
+        f"\n📊 {dias} días de {comensales}+ comensales, {len(mesas)} mesas "
+        f"({asientos} asientos), turnos de {RESERVA_DURACION_MIN} min"
+    )
+    print(
+        f"{'estrategia':<14} {'sentados':>9} {'desperdicio':>12} "
+        f"{'% eficiencia':>12} {'ms':>9}"
+    )
+    filas = {"primera_libre": [], "heuristica": []}
+    for _ in range(dias):
+        reservas = _dia(azar, comensales)
+        llegada = sorted(reservas, key=lambda r: azar.random())
+        (sentados, desperdicio), ms = _medir(lambda: primera_libre(llegada, mesas))
+        filas["primera_libre"].append((sentados, desperdicio, ms))
+        plan, ms = _medir(lambda: asignar(llegada, mesas, exacta_max=0))
+        filas["heuristica"].append((plan.comensales, plan.desperdicio, ms))
+
+    for nombre, valores in filas.items():
+        sentados = statistics.mean(v[0] for v in valores)
+        desperdicio = statistics.mean(v[1] for v in valores)
+        eficiencia = sentados / (sentados + desperdicio) * 100
+        ms = statistics.mean(v[2] for v in valores)
+        print(
+            f"{nombre:<14} {sentados:>9.0f} {desperdicio:>12.0f} "
+            f"{eficiencia:>11.1f}% {ms:>9.2f}"
+        )
+
+
+def instancias_pequenas(azar, instancias, reservas_por_instancia):
+    """Heurística contra óptimo en servicios chicos (4 mesas)"""
+    mesas = _mesas(((2, 1), (4, 2), (6, 1)))
+    optimas, brecha, nodos, ms_h, ms_e = 0, [], [], [], []
+    for _ in range(instancias):
+        reservas = []
+        for _ in range(reservas_por_instancia):
+            inicio = azar.randrange(19 * 60, 22 * 60, 30)
+            reservas.append(
+                ReservaPlan(
+                    uuid.uuid4(),
+                    inicio,
+                    inicio + RESERVA_DURACION_MIN,
+                    azar.choice(TAMANOS[:10]),
+                )
+            )
+        heuristico, ms = _medir(lambda: asignar(reservas, mesas, exacta_max=0))
+        ms_h.append(ms)
+        exacto, ms = _medir(lambda: asignar(reservas, mesas))
+        ms_e.append(ms)
+        nodos.append(exacto.nodos)
+        if (heuristico.comensales, -heuristico.desperdicio) == (
+            exacto.comensales,
+            -exacto.desperdicio,
+        ):
+            optimas += 1
+        brecha.append(exacto.comensales - heuristico.comensales)
+
+    print(f"\n📊 {instancias} servicios de {reservas_por_instancia} reservas, 4 mesas")
+    print(f"   heurística óptima en {optimas}/{instancias}")
+    print(
+        f"   comensales ganados por el exacto: media {statistics.mean(brecha):.2f},"
+        f" máx {max(brecha)}"
+    )
+    print(
+        f"   tiempo medio: heurística {statistics.mean(ms_h):.3f} ms, "
+        f"exacto {statistics.mean(ms_e):.2f} ms "
+        f"({statistics.mean(nodos):.0f} nodos)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--comensales", type=int, default=600)
+    parser.add_argument("--dias", type=int, default=5)
+    parser.add_argument("--instancias", type=int, default=200)
+    parser.add_argument("--reservas-pequenas", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    dias_completos(azar, args.dias, args.comensales)
+    instancias_pequenas(azar, args.instancias, args.reservas_pequenas)
+
+
+if __name__ == "__main__":
+    main()
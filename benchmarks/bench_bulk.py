@@ -0,0 +1,162 @@
+"""
+Benchmark: alta fila a fila vs. alta por lote (mesas y menús)
+
+Crea un usuario, restaurante y categoría temporales, inserta N mesas y
+M platos con crear_mesa/crear_menu y luego con crear_*_bulk, y compara
+tiempo y número de sentencias SQL. Al final borra todo lo que creó.
+
+Uso (requiere DATABASE_URL):
+    python -m benchmarks.bench_bulk --mesas 60 --menus 200
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from crud.categoria_crud import CategoriaCRUD
+from crud.menu_crud import MenuCRUD
+from crud.mesa_crud import MesaCRUD
+from crud.restaurante_crud import RestauranteCRUD
+from crud.usuario_crud import UsuarioCRUD
+from database.config import SessionLocal
+from database.instrumentacion import finalizar_medicion, iniciar_medicion
+from database.models.all_models import Categoria, Menu, Mesa, Restaurante, Usuario
+
+
+def _medir(funcion):
+    token = iniciar_medicion()
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+    return duracion, finalizar_medicion(token).total
+
+
+def _datos_mesas(cantidad, restaurante_id, desde):
+    return [
+        dict(
+            numero_mesa=desde + i,
+            capacidad=4,
+            ubicacion="Salón",
+            activa=True,
+            restaurante_id=restaurante_id,
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _datos_menus(cantidad, restaurante_id, categoria_id, prefijo):
+    return [
+        dict(
+            nombre=f"{prefijo} {i}",
+            descripcion=None,
+            precio=10.5,
+            disponible=True,
+            tiempo_preparacion=15,
+            ingredientes=None,
+            alergenos=None,
+            categoria_id=categoria_id,
+            restaurante_id=restaurante_id,
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _imprimir(nombre, fila_a_fila, lote, cantidad):
+    (t_fila, q_fila), (t_lote, q_lote) = fila_a_fila, lote
+    print(f"\n📊 {nombre} ({cantidad} filas)")
+    print(f"   Fila a fila: {t_fila * 1000:9.1f} ms  {q_fila:5d} sentencias")
+    print(f"   Por lote:    {t_lote * 1000:9.1f} ms  {q_lote:5d} sentencias")
+    if t_lote:
+        print(f"   Aceleración: x{t_fila / t_lote:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mesas", type=int, default=60)
+    parser.add_argument("--menus", type=int, default=200)
+    args = parser.parse_args()
+
+    sufijo = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    usuario_id = restaurante_id = categoria_id = None
+    try:
+        usuario = UsuarioCRUD(db).crear_usuario(
+            nombre="Bench",
+            apellido="Bulk",
+            nombre_usuario=f"bench_{sufijo}",
+            email=f"bench_{sufijo}@example.com",
+            contrasena="Benchmark123!",
+        )
+        usuario_id = usuario.id_usuario
+        restaurante_id = (
+            RestauranteCRUD(db)
+            .crear_restaurante(
+                nombre=f"Bench {sufijo}",
+                direccion="Calle 1",
+                telefono=None,
+                email=None,
+                capacidad_maxima=500,
+                horario_apertura="08:00",
+                horario_cierre="22:00",
+                activo=True,
+                usuario_admin_id=usuario_id,
+            )
+            .id_restaurante
+        )
+        categoria_id = CategoriaCRUD(db).crear_categoria(f"Bench {sufijo}").id_categoria
+
+        mesas, menus = MesaCRUD(db), MenuCRUD(db)
+
+        _imprimir(
+            "Mesas",
+            _medir(
+                lambda: [
+                    mesas.crear_mesa(**datos)
+                    for datos in _datos_mesas(args.mesas, restaurante_id, 1)
+                ]
+            ),
+            _medir(
+                lambda: mesas.crear_mesas_bulk(
+                    _datos_mesas(args.mesas, restaurante_id, args.mesas + 1)
+                )
+            ),
+            args.mesas,
+        )
+        _imprimir(
+            "Menús",
+            _medir(
+                lambda: [
+                    menus.crear_menu(**datos)
+                    for datos in _datos_menus(
+                        args.menus, restaurante_id, categoria_id, "Fila"
+                    )
+                ]
+            ),
+            _medir(
+                lambda: menus.crear_menus_bulk(
+                    _datos_menus(args.menus, restaurante_id, categoria_id, "Lote")
+                )
+            ),
+            args.menus,
+        )
+    finally:
+        db.rollback()
+        if restaurante_id is not None:
+            db.execute(delete(Menu).where(Menu.restaurante_id == restaurante_id))
+            db.execute(delete(Mesa).where(Mesa.restaurante_id == restaurante_id))
+            db.execute(
+                delete(Restaurante).where(Restaurante.id_restaurante == restaurante_id)
+            )
+        if categoria_id is not None:
+            db.execute(delete(Categoria).where(Categoria.id_categoria == categoria_id))
+        if usuario_id is not None:
+            db.execute(delete(Usuario).where(Usuario.id_usuario == usuario_id))
+        db.commit()
+        db.close()
+        print("\n🧹 Datos del benchmark eliminados")
+
+
+if __name__ == "__main__":
+    main()
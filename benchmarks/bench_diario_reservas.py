@@ -0,0 +1,157 @@
+"""
+Benchmark: persistencia de las reservas en memoria (instantánea + diario)
+
+1. Escribe un diario de N operaciones (80 % altas, 10 % cambios, 10 %
+   bajas) a través de Restaurante sin esperar cada fsync.
+2. Mide operaciones durables por segundo (cada una espera su fsync) con
+   1 y con varios hilos: con commit en grupo varios hilos comparten fsync.
+3. Arranque repitiendo el diario completo (registros por segundo).
+4. Compacta y mide el arranque desde la instantánea.
+
+No usa la base de datos; todo se escribe en un directorio temporal que se
+borra al terminar (--directorio para usar otro disco).
+
+Uso:
+    python -m benchmarks.bench_diario_reservas --operaciones 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+
+from src.persistencia import Persistencia
+from src.restaurante import METODOS_PAGO, Restaurante
+
+HORAS = list(range(12, 23))
+
+
+def _escribir(directorio, cantidad, azar):
+    restaurante = Restaurante("bench")
+    persistencia = Persistencia(directorio, sincrono=False, compactar_cada=0)
+    persistencia.abrir(restaurante)
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(cantidad):
+            tirada = azar.random()
+            if tirada < 0.8 or restaurante.contador_id < 10:
+                restaurante.agregar_reserva(
+                    f"Cliente {i}", azar.choice(HORAS), azar.choice(METODOS_PAGO)
+                )
+            elif tirada < 0.9:
+                restaurante.actualizar_reserva(
+                    azar.randrange(1, restaurante.contador_id),
+                    hora=azar.choice(HORAS),
+                )
+            else:
+                restaurante.eliminar_reserva_por_id(
+                    azar.randrange(1, restaurante.contador_id)
+                )
+    persistencia.sincronizar()
+    segundos = time.perf_counter() - inicio
+    tandas = persistencia._diario.tandas
+    persistencia.cerrar()
+    return restaurante, segundos, tandas
+
+
+def _durables(directorio, hilos, por_hilo):
+    """Altas que esperan su fsync, repartidas entre varios hilos"""
+    persistencia = Persistencia(directorio, sincrono=True, compactar_cada=0)
+    persistencia.abrir(Restaurante("bench"))
+    base = persistencia._diario.tandas
+
+    def trabajar(desde):
+        for i in range(desde, desde + por_hilo):
+            persistencia.alta(i, "Durable", 12, "efectivo")
+
+    trabajadores = [
+        threading.Thread(target=trabajar, args=(10**8 + h * por_hilo,))
+        for h in range(hilos)
+    ]
+    inicio = time.perf_counter()
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+    tandas = persistencia._diario.tandas - base
+    persistencia.cerrar()
+    return hilos * por_hilo / segundos, hilos * por_hilo / max(tandas, 1)
+
+
+def _arrancar(directorio):
+    restaurante = Restaurante("bench")
+    persistencia = Persistencia(directorio, compactar_cada=0)
+    carga = persistencia.abrir(restaurante)
+    return restaurante, persistencia, carga
+
+
+def _mb(ruta):
+    return os.path.getsize(ruta) / 1e6 if os.path.exists(ruta) else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operaciones", type=int, default=1000000)
+    parser.add_argument("--durables", type=int, default=400)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--directorio", default=None)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    with tempfile.TemporaryDirectory(dir=args.directorio) as base:
+        directorio = os.path.join(base, "datos")
+        original, segundos, tandas = _escribir(directorio, args.operaciones, azar)
+        ruta_diario = os.path.join(directorio, "diario")
+        print(f"\n📝 Diario de {args.operaciones} operaciones")
+        print(
+            f"  escritura: {args.operaciones / segundos:,.0f} ops/s en {tandas} fsync "
+            f"({_mb(ruta_diario):.1f} MB)"
+        )
+
+        print(f"\n🔒 Operaciones durables (cada una espera su fsync)")
+        for hilos in (1, args.hilos):
+            por_segundo, por_fsync = _durables(
+                os.path.join(base, f"durables_{hilos}"),
+                hilos,
+                max(1, args.durables // hilos),
+            )
+            print(
+                f"  {hilos:>2} hilo(s): {por_segundo:,.0f} ops/s, "
+                f"{por_fsync:.1f} registros por fsync"
+            )
+
+        restaurante, persistencia, carga = _arrancar(directorio)
+        assert [str(r) for r in restaurante.reservas] == [
+            str(r) for r in original.reservas
+        ], "el diario no reconstruye el mismo estado"
+        print(f"\n🚀 Arranque solo con diario ({carga['reservas']} reservas)")
+        print(
+            f"  {carga['segundos']:.2f} s, "
+            f"{carga['repetidos'] / carga['segundos']:,.0f} registros/s repetidos"
+        )
+
+        inicio = time.perf_counter()
+        persistencia.compactar()
+        t_compactar = time.perf_counter() - inicio
+        persistencia.cerrar()
+        restaurante, persistencia, carga = _arrancar(directorio)
+        persistencia.cerrar()
+        assert restaurante.contador_id == original.contador_id
+        print(
+            f"\n📦 Instantánea ({_mb(os.path.join(directorio, 'instantanea')):.1f} MB, "
+            f"escrita en {t_compactar:.2f} s)"
+        )
+        print(
+            f"  arranque: {carga['segundos']:.2f} s, "
+            f"{carga['instantanea'] / carga['segundos']:,.0f} reservas/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: estadísticas de reservas (recorrido en Python vs. NumPy)
+
+Genera N filas como las de ReservaCRUD.obtener_columnas_estadisticas y
+calcula ocupación por hora y día, tamaño de grupo, métodos de pago, tasa
+de cancelación y anticipación de dos formas:
+
+    recorrido   un bucle por fila con diccionarios (como las estadísticas
+                de la consola antes de los contadores)
+    numpy       services.columnas (columnas_de_filas + calcular)
+
+No usa la base de datos ni necesita DATABASE_URL.
+
+Uso:
+    python -m benchmarks.bench_estadisticas --reservas 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from services.columnas import (
+    TRAMOS_ANTICIPACION_H,
+    calcular,
+    columnas_de_filas,
+)
+
+METODOS = ("efectivo", "transferencia", "tarjeta credito")
+ESTADOS = ("pendiente", "confirmada", "cancelada", "completada")
+
+
+def _filas(azar, cantidad):
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc).timestamp()
+    filas = []
+    for _ in range(cantidad):
+        inicio = base + azar.randrange(365) * 86400 + azar.randrange(12, 23) * 3600
+        filas.append(
+            (
+                inicio,
+                inicio - azar.expovariate(1 / 72) * 3600,
+                azar.randint(1, 8),
+                azar.choice(METODOS),
+                azar.choices(ESTADOS, weights=(3, 5, 1, 3))[0] == "cancelada",
+            )
+        )
+    return filas
+
+
+def recorrido(filas):
+    por_hora, por_dia, grupos, metodos, tramos = {}, {}, {}, {}, {}
+    canceladas = 0
+    for inicio, creacion, personas, metodo, cancelada in filas:
+        metodos[metodo] = metodos.get(metodo, 0) + 1
+        horas = (inicio - creacion) / 3600
+        tramo = sum(1 for limite in TRAMOS_ANTICIPACION_H[1:] if horas >= limite)
+        tramos[tramo] = tramos.get(tramo, 0) + 1
+        if cancelada:
+            canceladas += 1
+            continue
+        momento = datetime.fromtimestamp(inicio, timezone.utc)
+        clave = (momento.weekday(), momento.hour)
+        por_hora[clave] = por_hora.get(clave, 0) + 1
+        por_dia[clave[0]] = por_dia.get(clave[0], 0) + personas
+        grupos[personas] = grupos.get(personas, 0) + 1
+    return por_hora, por_dia, grupos, metodos, tramos, canceladas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--reservas", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    print(f"\n📊 Estadísticas completas de N reservas")
+    print(
+        f"{'reservas':>10} {'recorrido ms':>13} {'numpy ms':>9} "
+        f"{'(carga ms':>10} {'cálculo ms)':>12}"
+    )
+    for cantidad in args.reservas:
+        filas = _filas(azar, cantidad)
+
+        inicio = time.perf_counter()
+        _, _, _, _, _, canceladas = recorrido(filas)
+        t_recorrido = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        columnas = columnas_de_filas(filas)
+        t_carga = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        resultado = calcular(columnas)
+        t_calculo = time.perf_counter() - inicio
+
+        assert resultado["canceladas"] == canceladas
+        print(
+            f"{cantidad:>10} {t_recorrido * 1000:>13.1f} "
+            f"{(t_carga + t_calculo) * 1000:>9.1f} "
+            f"{t_carga * 1000:>10.1f} {t_calculo * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark: exportación de reservas (páginas con OFFSET vs. cursor del servidor)
+
+Inserta N reservas temporales en un restaurante nuevo y las exporta
+completas de dos formas, midiendo tiempo y memoria máxima (tracemalloc,
+en una segunda pasada para no distorsionar el tiempo):
+
+    paginas     GET /reservas con skip: páginas de --pagina objetos Reserva
+                validados con ReservaResponse y serializados
+    stream      ReservaCRUD.exportar_reservas + services.exportacion
+                (yield_per, una tanda en memoria a la vez)
+
+Al final borra todo lo que creó.
+
+Uso (requiere DATABASE_URL):
+    python -m benchmarks.bench_exportacion --reservas 200000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+from api.schemas.reserva_schema import ReservaResponse
+from crud.reserva_crud import ReservaCRUD
+from database.config import SessionLocal
+from database.models.all_models import Reserva, Restaurante, Usuario
+from services.exportacion import formatear
+
+METODOS = ("efectivo", "transferencia", "tarjeta credito")
+
+
+def _crear_datos(db, cantidad, azar):
+    sufijo = uuid.uuid4().hex[:8]
+    usuario_id = db.execute(
+        insert(Usuario)
+        .values(
+            nombre="Bench",
+            apellido="Exportacion",
+            nombre_usuario=f"bench_{sufijo}",
+            email=f"bench_{sufijo}@example.com",
+            contrasena="-",
+        )
+        .returning(Usuario.id_usuario)
+    ).scalar_one()
+    restaurante_id = db.execute(
+        insert(Restaurante)
+        .values(
+            nombre=f"Bench {sufijo}",
+            direccion="Calle 1",
+            capacidad_maxima=100,
+            horario_apertura="12:00",
+            horario_cierre="23:00",
+            usuario_admin_id=usuario_id,
+        )
+        .returning(Restaurante.id_restaurante)
+    ).scalar_one()
+
+    inicio = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    filas = [
+        dict(
+            nombre_completo=f"Cliente {i}",
+            email=f"cliente{i}@example.com",
+            fecha_reserva=inicio + timedelta(days=azar.randrange(365)),
+            hora_reserva=f"{azar.randrange(12, 23):02d}:00",
+            numero_personas=azar.randint(1, 8),
+            metodo_pago=azar.choice(METODOS),
+            restaurante_id=restaurante_id,
+        )
+        for i in range(cantidad)
+    ]
+    for desde in range(0, cantidad, 5000):
+        db.execute(insert(Reserva), filas[desde : desde + 5000])
+    db.commit()
+    return usuario_id, restaurante_id
+
+
+def por_paginas(db, restaurante_id, pagina):
+    crud = ReservaCRUD(db)
+    total = skip = 0
+    while True:
+        reservas = crud.obtener_reservas(
+            skip=skip, limit=pagina, restaurante_id=restaurante_id
+        )
+        for reserva in reservas:
+            total += len(ReservaResponse.model_validate(reserva).model_dump_json())
+        db.expunge_all()
+        if len(reservas) < pagina:
+            return total
+        skip += pagina
+
+
+def por_stream(db, restaurante_id, formato):
+    tandas = ReservaCRUD(db).exportar_reservas(formato, restaurante_id=restaurante_id)
+    total = sum(len(bloque) for bloque in formatear(tandas, formato))
+    db.commit()
+    return total
+
+
+def _medir(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, default=200000)
+    parser.add_argument("--pagina", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    usuario_id = restaurante_id = None
+    try:
+        print(f"⏳ Insertando {args.reservas} reservas...")
+        usuario_id, restaurante_id = _crear_datos(
+            db, args.reservas, random.Random(args.semilla)
+        )
+
+        print(f"\n📤 Exportación de {args.reservas} reservas")
+        print(f"{'modo':>14} {'segundos':>9} {'filas/s':>10} {'pico MB':>8}")
+        for nombre, funcion in (
+            (
+                f"paginas {args.pagina}",
+                lambda: por_paginas(db, restaurante_id, args.pagina),
+            ),
+            ("stream ndjson", lambda: por_stream(db, restaurante_id, "ndjson")),
+            ("stream csv", lambda: por_stream(db, restaurante_id, "csv")),
+        ):
+            segundos, pico = _medir(funcion)
+            print(
+                f"{nombre:>14} {segundos:>9.2f} "
+                f"{args.reservas / segundos:>10,.0f} {pico:>8.1f}"
+            )
+    finally:
+        db.rollback()
+        if restaurante_id is not None:
+            db.execute(delete(Reserva).where(Reserva.restaurante_id == restaurante_id))
+            db.execute(
+                delete(Restaurante).where(Restaurante.id_restaurante == restaurante_id)
+            )
+        if usuario_id is not None:
+            db.execute(delete(Usuario).where(Usuario.id_usuario == usuario_id))
+        db.commit()
+        db.close()
+        print("\n🧹 Datos del benchmark eliminados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: promoción desde la lista de espera (montículos vs. recorrido)
+
+Llena un turno con N entradas en espera (grupos de 1 a 8, prioridades de
+0 a 3) y mide cuánto cuesta elegir y sacar la mejor entrada que cabe en
+mesas liberadas de 2, 4 o 6 asientos:
+
+    recorrido   buscar la mejor en la lista completa (O(n) por promoción)
+    monticulos  services.lista_espera.ColasEspera (O(log n) por promoción)
+
+No usa la base de datos (DATABASE_URL solo se usa para importar los
+modelos).
+
+Uso:
+    python -m benchmarks.bench_lista_espera --entradas 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from services.lista_espera import ColasEspera, candidata
+
+CAPACIDADES = (2, 4, 6)
+
+
+def _entradas(azar, cantidad):
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id_espera=uuid.uuid4(),
+            numero_personas=azar.randint(1, 8),
+            prioridad=azar.randint(0, 3),
+            fecha_creacion=base + timedelta(seconds=i),
+        )
+        for i in range(cantidad)
+    ]
+
+
+def recorrido(entradas, capacidades):
+    pendientes = [candidata(fila) for fila in entradas]
+    sacadas = []
+    for capacidad in capacidades:
+        mejor = None
+        for posicion, entrada in enumerate(pendientes):
+            if entrada.personas <= capacidad and (
+                mejor is None or entrada < pendientes[mejor]
+            ):
+                mejor = posicion
+        if mejor is not None:
+            sacadas.append(pendientes.pop(mejor).id_espera)
+    return sacadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--entradas", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--promociones", type=int, default=500)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    print(f"\n📊 {args.promociones} promociones por turno")
+    print(
+        f"{'entradas':>10} {'recorrido µs':>13} {'montículos µs':>14} {'carga ms':>9}"
+    )
+    for cantidad in args.entradas:
+        entradas = _entradas(azar, cantidad)
+        capacidades = [azar.choice(CAPACIDADES) for _ in range(args.promociones)]
+
+        inicio = time.perf_counter()
+        esperado = recorrido(entradas, capacidades)
+        t_recorrido = time.perf_counter() - inicio
+
+        colas = ColasEspera(ttl_s=float("inf"))
+        turno = (uuid.uuid4(), datetime(2030, 1, 1, 20, tzinfo=timezone.utc))
+        inicio = time.perf_counter()
+        colas.cargar(turno, entradas)
+        t_carga = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        obtenido = [
+            entrada.id_espera
+            for entrada in (colas.sacar(turno, c) for c in capacidades)
+            if entrada is not None
+        ]
+        t_monticulos = time.perf_counter() - inicio
+
+        assert obtenido == esperado, "los montículos no eligieron lo mismo"
+        print(
+            f"{cantidad:>10} {t_recorrido / args.promociones * 1e6:>13.1f} "
+            f"{t_monticulos / args.promociones * 1e6:>14.2f} {t_carga * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: verificación de contraseñas en login bajo carga concurrente
+
+Simula C clientes haciendo login a la vez (verify_password PBKDF2) mientras
+una sonda mide cuánto se retrasa el event loop, que es lo que sufre el resto
+de requests (p. ej. crear una reserva). Compara tres estrategias:
+
+    en_linea  PBKDF2 directo en el event loop
+    hilos     asyncio.to_thread (comportamiento anterior del CRUD async)
+    procesos  ServicioHash (pool de procesos con cupo acotado)
+
+No toca la base de datos.
+
+Uso:
+    python -m benchmarks.bench_login_hash --clientes 32 --logins 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from auth.hashing import HASH_PROCESOS, ServicioHash, ServicioHashSaturado
+from auth.security import PasswordManager
+
+CONTRASENA = "Benchmark123!"
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def _sonda(retrasos, detener, intervalo=0.01):
+    """Mide cuánto tarda el loop en despertar una tarea que duerme `intervalo`"""
+    while not detener.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(intervalo)
+        retrasos.append(time.perf_counter() - inicio - intervalo)
+
+
+async def _correr(verificar, clientes, logins, password_hash):
+    latencias, retrasos, rechazos = [], [], 0
+    detener = asyncio.Event()
+
+    async def cliente():
+        nonlocal rechazos
+        for _ in range(logins):
+            inicio = time.perf_counter()
+            try:
+                assert await verificar(CONTRASENA, password_hash)
+            except ServicioHashSaturado:
+                rechazos += 1
+                continue
+            latencias.append(time.perf_counter() - inicio)
+
+    sonda = asyncio.create_task(_sonda(retrasos, detener))
+    inicio = time.perf_counter()
+    await asyncio.gather(*[cliente() for _ in range(clientes)])
+    total = time.perf_counter() - inicio
+    detener.set()
+    await sonda
+    return total, latencias, retrasos, rechazos
+
+
+def _imprimir(nombre, total, latencias, retrasos, rechazos):
+    print(
+        f"   {nombre:<9} {len(latencias) / total:8.1f}/s  "
+        f"{statistics.median(latencias) * 1000:8.0f}ms  "
+        f"{_percentil(latencias, 0.99) * 1000:8.0f}ms  "
+        f"{_percentil(retrasos, 0.99) * 1000:9.1f}ms  {rechazos:6d}"
+    )
+
+
+async def _principal(args):
+    password_hash = PasswordManager.hash_password(CONTRASENA)
+
+    async def en_linea(contrasena, guardado):
+        return PasswordManager.verify_password(contrasena, guardado)
+
+    async def hilos(contrasena, guardado):
+        return await asyncio.to_thread(
+            PasswordManager.verify_password, contrasena, guardado
+        )
+
+    servicio = ServicioHash(procesos=args.procesos, max_en_cola=args.max_en_cola)
+    servicio.iniciar()
+    try:
+        print(
+            f"\n📊 {args.clientes} clientes x {args.logins} logins "
+            f"({servicio.procesos} procesos, cola máx. {servicio.max_en_cola})"
+        )
+        print(
+            f"   {'Estrategia':<9} {'Logins':>10}  {'p50':>10}  {'p99':>10}  "
+            f"{'Lag p99':>11}  {'503s':>6}"
+        )
+        for nombre, verificar in (
+            ("en_linea", en_linea),
+            ("hilos", hilos),
+            ("procesos", servicio.verify_password),
+        ):
+            _imprimir(
+                nombre,
+                *await _correr(verificar, args.clientes, args.logins, password_hash),
+            )
+    finally:
+        servicio.detener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=4)
+    parser.add_argument("--procesos", type=int, default=HASH_PROCESOS)
+    parser.add_argument("--max-en-cola", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(_principal(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: paginación OFFSET vs. cursor (keyset) en reservas
+
+Inserta N reservas temporales para un restaurante nuevo y mide cuánto
+tarda una página de GET /reservas a distintas profundidades con cada
+estrategia. Al final borra todo lo que creó.
+
+Uso (requiere DATABASE_URL):
+    python -m benchmarks.bench_paginacion --reservas 50000 --limit 100
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select
+
+from crud.paginacion import armar_pagina, consulta_pagina, codificar_cursor
+from crud.reserva_crud import _ORDEN_RESERVAS
+from database.config import SessionLocal
+from database.models.all_models import Reserva, Restaurante, Usuario
+
+
+def _crear_datos(db, cantidad):
+    sufijo = uuid.uuid4().hex[:8]
+    usuario_id = db.execute(
+        insert(Usuario)
+        .values(
+            nombre="Bench",
+            apellido="Paginacion",
+            nombre_usuario=f"bench_{sufijo}",
+            email=f"bench_{sufijo}@example.com",
+            contrasena="-",
+        )
+        .returning(Usuario.id_usuario)
+    ).scalar_one()
+    restaurante_id = db.execute(
+        insert(Restaurante)
+        .values(
+            nombre=f"Bench {sufijo}",
+            direccion="Calle 1",
+            capacidad_maxima=100,
+            horario_apertura="08:00",
+            horario_cierre="22:00",
+            usuario_admin_id=usuario_id,
+        )
+        .returning(Restaurante.id_restaurante)
+    ).scalar_one()
+
+    inicio = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    filas = [
+        dict(
+            nombre_completo=f"Cliente {i}",
+            fecha_reserva=inicio + timedelta(minutes=15 * (i // 3)),
+            hora_reserva="19:30",
+            numero_personas=2,
+            metodo_pago="efectivo",
+            estado="pendiente",
+            restaurante_id=restaurante_id,
+        )
+        for i in range(cantidad)
+    ]
+    for desde in range(0, cantidad, 5000):
+        db.execute(insert(Reserva), filas[desde : desde + 5000])
+    db.commit()
+    return usuario_id, restaurante_id
+
+
+def _cronometrar(db, consulta, repeticiones=5):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = db.scalars(consulta).all()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    usuario_id = restaurante_id = None
+    try:
+        print(f"⏳ Insertando {args.reservas} reservas...")
+        usuario_id, restaurante_id = _crear_datos(db, args.reservas)
+        # Mismo listado que GET /reservas (todas las reservas)
+        base = select(Reserva)
+        total = db.scalar(select(func.count()).select_from(Reserva))
+
+        print(f"\n📊 Página de {args.limit} filas según profundidad")
+        print(f"   {'Fila inicial':>12}  {'OFFSET':>10}  {'Cursor':>10}")
+        for profundidad in (0, 1000, 10000, total - args.limit):
+            if profundidad < 0 or profundidad >= total:
+                continue
+            t_offset, pagina = _cronometrar(
+                db,
+                base.order_by(*_ORDEN_RESERVAS).offset(profundidad).limit(args.limit),
+            )
+
+            cursor = None
+            if profundidad:
+                anterior = db.scalars(
+                    base.order_by(*_ORDEN_RESERVAS).offset(profundidad - 1).limit(1)
+                ).one()
+                cursor = codificar_cursor(
+                    [getattr(anterior, clave.key) for clave in _ORDEN_RESERVAS]
+                )
+            t_cursor, filas = _cronometrar(
+                db, consulta_pagina(base, _ORDEN_RESERVAS, args.limit, cursor)
+            )
+            filas, _ = armar_pagina(filas, _ORDEN_RESERVAS, args.limit)
+            assert [r.id_reserva for r in filas] == [r.id_reserva for r in pagina]
+
+            print(
+                f"   {profundidad:>12}  {t_offset * 1000:8.2f}ms  "
+                f"{t_cursor * 1000:8.2f}ms"
+            )
+    finally:
+        db.rollback()
+        if restaurante_id is not None:
+            db.execute(delete(Reserva).where(Reserva.restaurante_id == restaurante_id))
+            db.execute(
+                delete(Restaurante).where(Restaurante.id_restaurante == restaurante_id)
+            )
+        if usuario_id is not None:
+            db.execute(delete(Usuario).where(Usuario.id_usuario == usuario_id))
+        db.commit()
+        db.close()
+        print("\n🧹 Datos del benchmark eliminados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark: reservas concurrentes sobre pocas mesas
+
+Lanza N altas de reserva en paralelo (hilos con su propia sesión) contra
+unas pocas mesas y horas, de modo que muchas compiten por el mismo hueco,
+y compara tres formas de crear la reserva:
+
+    sin_verificar    INSERT directo (comportamiento anterior)
+    verificar        consultar solapes y luego insertar, sin bloqueo
+    con_bloqueo      ReservaCRUD.crear_reserva (bloqueo por mesa y día)
+
+Informa reservas/s, altas aceptadas, rechazos (409) y reservas que quedaron
+solapadas con otra en la misma mesa. Cada estrategia usa un día distinto.
+Al final borra todo lo que creó.
+
+Uso (requiere DATABASE_URL):
+    python -m benchmarks.bench_reservas_concurrentes --reservas 400 --mesas 4
+"""
+
+import argparse
+import queue
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+
+from crud.reserva_crud import (
+    ReservaCRUD,
+    ReservaEnConflicto,
+    _comprobar_solapes,
+    _consulta_solapes,
+    _completar_periodos,
+    _datos_reserva,
+)
+from crud.mesa_crud import MesaCRUD
+from crud.restaurante_crud import RestauranteCRUD
+from crud.usuario_crud import UsuarioCRUD
+from database.config import SessionLocal
+from database.models.all_models import Mesa, Reserva, Restaurante, Usuario
+
+HORAS = ("19:00", "19:30", "20:00", "20:30", "21:00", "21:30", "22:00")
+
+
+def _con_periodo(datos):
+    datos = dict(datos)
+    _completar_periodos([datos], {})
+    return datos
+
+
+def sin_verificar(db, datos):
+    db.add(Reserva(**_con_periodo(datos)))
+    db.commit()
+
+
+def verificar(db, datos):
+    datos = _con_periodo(datos)
+    existentes = db.execute(_consulta_solapes([datos])).all()
+    _comprobar_solapes([datos], existentes)
+    db.add(Reserva(**datos))
+    db.commit()
+
+
+def con_bloqueo(db, datos):
+    ReservaCRUD(db).crear_reserva(**datos)
+
+
+ESTRATEGIAS = {
+    "sin_verificar": sin_verificar,
+    "verificar": verificar,
+    "con_bloqueo": con_bloqueo,
+}
+
+
+def _solicitudes(cantidad, mesas, restaurante_id, fecha, azar):
+    return [
+        _datos_reserva(
+            nombre_completo=f"Bench {i}",
+            telefono=None,
+            email=None,
+            fecha_reserva=fecha,
+            hora_reserva=azar.choice(HORAS),
+            numero_personas=2,
+            metodo_pago="efectivo",
+            estado="confirmada",
+            observaciones=None,
+            usuario_id=None,
+            restaurante_id=restaurante_id,
+            mesa_id=azar.choice(mesas),
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _correr(estrategia, solicitudes, hilos):
+    conteo = {"aceptadas": 0, "rechazadas": 0, "errores": 0}
+    lock = threading.Lock()
+    sesiones = queue.Queue()
+    for _ in range(hilos):
+        sesiones.put(SessionLocal())
+
+    def reservar(datos):
+        db = sesiones.get()
+        try:
+            estrategia(db, datos)
+            resultado = "aceptadas"
+        except ReservaEnConflicto:
+            resultado = "rechazadas"
+        except Exception:
+            resultado = "errores"
+        finally:
+            db.rollback()
+            sesiones.put(db)
+        with lock:
+            conteo[resultado] += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        list(ejecutor.map(reservar, solicitudes))
+    duracion = time.perf_counter() - inicio
+    while not sesiones.empty():
+        sesiones.get().close()
+    return duracion, conteo["aceptadas"], conteo["rechazadas"], conteo["errores"]
+
+
+def _solapadas(db, restaurante_id, fecha):
+    """Reservas que se solapan con alguna anterior de la misma mesa"""
+    filas = db.execute(
+        select(Reserva.mesa_id, Reserva.periodo).where(
+            Reserva.restaurante_id == restaurante_id,
+            Reserva.fecha_reserva == fecha,
+        )
+    ).all()
+    por_mesa = {}
+    for mesa_id, periodo in filas:
+        por_mesa.setdefault(mesa_id, []).append((periodo.lower, periodo.upper))
+    total = 0
+    for periodos in por_mesa.values():
+        periodos.sort()
+        fin_libre = None
+        for inicio, fin in periodos:
+            if fin_libre is not None and inicio < fin_libre:
+                total += 1
+            else:
+                fin_libre = fin
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, default=400)
+    parser.add_argument("--mesas", type=int, default=4)
+    parser.add_argument("--hilos", type=int, default=32)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    sufijo = uuid.uuid4().hex[:8]
+    azar = random.Random(args.semilla)
+    db = SessionLocal()
+    usuario_id = restaurante_id = None
+    try:
+        usuario_id = (
+            UsuarioCRUD(db)
+            .crear_usuario(
+                nombre="Bench",
+                apellido="Reservas",
+                nombre_usuario=f"bench_{sufijo}",
+                email=f"bench_{sufijo}@example.com",
+                contrasena="Benchmark123!",
+            )
+            .id_usuario
+        )
+        restaurante_id = (
+            RestauranteCRUD(db)
+            .crear_restaurante(
+                nombre=f"Bench {sufijo}",
+                direccion="Calle 1",
+                telefono=None,
+                email=None,
+                capacidad_maxima=100,
+                horario_apertura="12:00",
+                horario_cierre="23:59",
+                activo=True,
+                usuario_admin_id=usuario_id,
+            )
+            .id_restaurante
+        )
+        mesas = [
+            mesa["id_mesa"]
+            for mesa in MesaCRUD(db).crear_mesas_bulk(
+                [
+                    dict(
+                        numero_mesa=i + 1,
+                        capacidad=4,
+                        ubicacion="Salón",
+                        activa=True,
+                        restaurante_id=restaurante_id,
+                    )
+                    for i in range(args.mesas)
+                ]
+            )
+        ]
+
+        print(
+            f"\n📊 {args.reservas} reservas en {args.hilos} hilos sobre "
+            f"{args.mesas} mesas y {len(HORAS)} horas"
+        )
+        print(
+            f"{'estrategia':<14} {'reservas/s':>11} {'aceptadas':>10} "
+            f"{'409':>6} {'errores':>8} {'solapadas':>10}"
+        )
+        base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        for indice, (nombre, estrategia) in enumerate(ESTRATEGIAS.items()):
+            fecha = base + timedelta(days=indice)
+            solicitudes = _solicitudes(
+                args.reservas, mesas, restaurante_id, fecha, azar
+            )
+            duracion, aceptadas, rechazadas, errores = _correr(
+                estrategia, solicitudes, args.hilos
+            )
+            solapadas = _solapadas(db, restaurante_id, fecha)
+            print(
+                f"{nombre:<14} {args.reservas / duracion:>11.0f} {aceptadas:>10} "
+                f"{rechazadas:>6} {errores:>8} {solapadas:>10}"
+            )
+    finally:
+        db.rollback()
+        if restaurante_id is not None:
+            db.execute(delete(Reserva).where(Reserva.restaurante_id == restaurante_id))
+            db.execute(delete(Mesa).where(Mesa.restaurante_id == restaurante_id))
+            db.execute(
+                delete(Restaurante).where(Restaurante.id_restaurante == restaurante_id)
+            )
+        if usuario_id is not None:
+            db.execute(delete(Usuario).where(Usuario.id_usuario == usuario_id))
+        db.commit()
+        db.close()
+        print("\n🧹 Datos del benchmark eliminados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: motor de reservas en memoria (src.restaurante) con N reservas
+
+Carga N reservas en un Restaurante y mide el costo por operación de:
+
+    alta          agregar_reserva
+    por_id        obtener_reserva_por_id
+    contar_hora   contar_por_hora (lo que usa SistemaReservas para el cupo)
+    baja          eliminar_reserva_por_id
+    cambio_hora   actualizar_reserva moviendo la reserva de hora
+
+y lo compara con la versión anterior basada en una lista (recorrido
+completo para buscar, contar y eliminar), que solo se corre hasta
+--max-lista reservas. Con índices el costo por operación no debería
+crecer con N. También informa la memoria por reserva.
+
+No usa la base de datos.
+
+Uso:
+    python -m benchmarks.bench_restaurante_memoria --reservas 1000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+
+from src.restaurante import METODOS_PAGO, Restaurante
+
+HORAS = list(range(12, 23))
+
+
+class _Lista:
+    """Operaciones de la versión anterior (lista de reservas)"""
+
+    def __init__(self, reservas):
+        self.reservas = list(reservas)
+
+    def obtener(self, id_reserva):
+        for reserva in self.reservas:
+            if reserva.id_reserva == id_reserva:
+                return reserva
+        return None
+
+    def contar(self, hora):
+        return sum(1 for reserva in self.reservas if reserva.hora == hora)
+
+    def eliminar(self, id_reserva):
+        for i, reserva in enumerate(self.reservas):
+            if reserva.id_reserva == id_reserva:
+                self.reservas.pop(i)
+                return True
+        return False
+
+
+def _cargar(azar, cantidad):
+    restaurante = Restaurante("bench")
+    for i in range(cantidad):
+        restaurante.agregar_reserva(
+            f"Cliente {i}", azar.choice(HORAS), azar.choice(METODOS_PAGO)
+        )
+    return restaurante
+
+
+def _por_op(funcion, argumentos):
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcion(argumento)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e6
+
+
+def _bytes_por_reserva(cantidad):
+    tracemalloc.start()
+    restaurante = _cargar(random.Random(0), cantidad)
+    usados, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del restaurante
+    return usados / cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--reservas", type=int, nargs="+", default=[1000, 10000, 100000, 1000000]
+    )
+    parser.add_argument("--operaciones", type=int, default=2000)
+    parser.add_argument("--max-lista", type=int, default=100000)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    ops = args.operaciones
+    print(f"\n📊 µs por operación ({ops} operaciones de cada tipo)")
+    print(
+        f"{'reservas':>10} {'alta':>7} {'por_id':>7} {'contar_hora':>12} "
+        f"{'baja':>7} {'cambio_hora':>12} │ {'lista por_id':>13} "
+        f"{'lista contar':>13} {'lista baja':>11}"
+    )
+    for cantidad in args.reservas:
+        restaurante = _cargar(azar, cantidad)
+        ids = azar.sample(range(1, cantidad + 1), min(ops, cantidad))
+        horas = [azar.choice(HORAS) for _ in range(ops)]
+        lista = _Lista(restaurante.reservas) if cantidad <= args.max_lista else None
+
+        t_alta = _por_op(
+            lambda hora: restaurante.agregar_reserva("Nuevo", hora, "efectivo"),
+            horas,
+        )
+        t_id = _por_op(restaurante.obtener_reserva_por_id, ids)
+        t_contar = _por_op(restaurante.contar_por_hora, horas)
+        t_cambio = _por_op(
+            lambda id_reserva: restaurante.actualizar_reserva(
+                id_reserva, hora=azar.choice(HORAS)
+            ),
+            ids,
+        )
+        # eliminar_reserva_por_id imprime cada baja
+        with contextlib.redirect_stdout(io.StringIO()):
+            t_baja = _por_op(restaurante.eliminar_reserva_por_id, ids)
+
+        if lista is not None:
+            pocas = ids[: max(1, min(len(ids), 200))]
+            columnas_lista = (
+                f"{_por_op(lista.obtener, pocas):>13.1f} "
+                f"{_por_op(lista.contar, horas[: len(pocas)]):>13.1f} "
+                f"{_por_op(lista.eliminar, pocas):>11.1f}"
+            )
+        else:
+            columnas_lista = f"{'-':>13} {'-':>13} {'-':>11}"
+
+        print(
+            f"{cantidad:>10} {t_alta:>7.2f} {t_id:>7.2f} {t_contar:>12.2f} "
+            f"{t_baja:>7.2f} {t_cambio:>12.2f} │ {columnas_lista}"
+        )
+        del restaurante, lista
+
+    muestra = min(max(args.reservas), 100000)
+    print(
+        f"\n💾 {_bytes_por_reserva(muestra):.0f} bytes por reserva ({muestra} reservas)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark: tablero del restaurante (traer todas las filas vs. GROUP BY)
+
+Inserta N reservas temporales repartidas en --dias días y 20 mesas de un
+restaurante nuevo y mide el tablero del rango completo de tres formas:
+
+    filas       traer cada reserva (ORM) y contar en Python
+    agregado    services.tablero: una consulta GROUPING SETS en Postgres
+    cache       la misma llamada con el resultado ya cacheado
+
+Al final borra todo lo que creó.
+
+Uso (requiere DATABASE_URL):
+    python -m benchmarks.bench_tablero --reservas 100000 --dias 30
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+
+from database.config import SessionLocal
+from database.models.all_models import Mesa, Reserva, Restaurante, Usuario
+from services.tablero import _rango, cache_tablero, tablero_restaurante
+
+MESAS = 20
+METODOS = ("efectivo", "transferencia", "tarjeta credito")
+ESTADOS = ("pendiente", "confirmada", "cancelada", "completada")
+
+
+def _crear_datos(db, cantidad, dias, azar):
+    sufijo = uuid.uuid4().hex[:8]
+    usuario_id = db.execute(
+        insert(Usuario)
+        .values(
+            nombre="Bench",
+            apellido="Tablero",
+            nombre_usuario=f"bench_{sufijo}",
+            email=f"bench_{sufijo}@example.com",
+            contrasena="-",
+        )
+        .returning(Usuario.id_usuario)
+    ).scalar_one()
+    restaurante_id = db.execute(
+        insert(Restaurante)
+        .values(
+            nombre=f"Bench {sufijo}",
+            direccion="Calle 1",
+            capacidad_maxima=100,
+            horario_apertura="12:00",
+            horario_cierre="23:00",
+            usuario_admin_id=usuario_id,
+        )
+        .returning(Restaurante.id_restaurante)
+    ).scalar_one()
+    mesas = db.scalars(
+        insert(Mesa).returning(Mesa.id_mesa),
+        [
+            dict(
+                numero_mesa=numero,
+                capacidad=azar.choice((2, 4, 6)),
+                restaurante_id=restaurante_id,
+            )
+            for numero in range(1, MESAS + 1)
+        ],
+    ).all()
+
+    inicio = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    filas = [
+        dict(
+            nombre_completo=f"Cliente {i}",
+            fecha_reserva=inicio + timedelta(days=azar.randrange(dias)),
+            hora_reserva=f"{azar.randrange(12, 23):02d}:{azar.choice((0, 30)):02d}",
+            numero_personas=azar.randint(1, 6),
+            metodo_pago=azar.choice(METODOS),
+            estado=azar.choices(ESTADOS, weights=(3, 5, 1, 3))[0],
+            restaurante_id=restaurante_id,
+            mesa_id=azar.choice(mesas) if azar.random() < 0.8 else None,
+        )
+        for i in range(cantidad)
+    ]
+    for desde in range(0, cantidad, 5000):
+        db.execute(insert(Reserva), filas[desde : desde + 5000])
+    db.commit()
+    return usuario_id, restaurante_id
+
+
+def por_filas(db, restaurante_id, desde, hasta):
+    """Lo que haría un cliente con obtener_reservas: todo a Python"""
+    inicio, fin = _rango(desde, hasta)
+    turnos, estados, mesas, metodos = {}, {}, {}, {}
+    for reserva in db.scalars(
+        select(Reserva).where(
+            Reserva.restaurante_id == restaurante_id,
+            Reserva.inicio_reserva >= inicio,
+            Reserva.inicio_reserva < fin,
+        )
+    ):
+        personas = 0 if reserva.estado == "cancelada" else reserva.numero_personas
+        turnos[reserva.inicio_reserva] = (
+            turnos.get(reserva.inicio_reserva, 0) + personas
+        )
+        estados[reserva.estado] = estados.get(reserva.estado, 0) + 1
+        mesas[reserva.mesa_id] = mesas.get(reserva.mesa_id, 0) + 1
+        metodos[reserva.metodo_pago] = metodos.get(reserva.metodo_pago, 0) + 1
+    return turnos, estados, mesas, metodos
+
+
+def _mejor(funcion, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, default=100000)
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    usuario_id = restaurante_id = None
+    try:
+        print(f"⏳ Insertando {args.reservas} reservas...")
+        usuario_id, restaurante_id = _crear_datos(
+            db, args.reservas, args.dias, random.Random(args.semilla)
+        )
+        desde = date(2030, 1, 1)
+        hasta = desde + timedelta(days=args.dias - 1)
+
+        def filas():
+            resultado = por_filas(db, restaurante_id, desde, hasta)
+            db.expunge_all()
+            return resultado
+
+        def agregado():
+            cache_tablero.invalidar(restaurante_id)
+            return tablero_restaurante(db, restaurante_id, desde, hasta)
+
+        t_filas, (_, estados, _, _) = _mejor(filas, args.repeticiones)
+        t_agregado, (tablero, _) = _mejor(agregado, args.repeticiones)
+        t_cache, (_, en_cache) = _mejor(
+            lambda: tablero_restaurante(db, restaurante_id, desde, hasta),
+            args.repeticiones,
+        )
+        assert en_cache
+        assert {g["estado"]: g["reservas"] for g in tablero["por_estado"]} == estados
+
+        print(f"\n📊 Tablero de {args.dias} días ({args.reservas} reservas)")
+        print(f"   filas     {t_filas * 1000:10.1f} ms  ({args.reservas} filas)")
+        filas_agregado = (
+            len(tablero["por_turno"])
+            + len(tablero["por_estado"])
+            + len(tablero["por_mesa"])
+            + len(tablero["por_metodo_pago"])
+        )
+        print(f"   agregado  {t_agregado * 1000:10.1f} ms  ({filas_agregado} filas)")
+        print(f"   cache     {t_cache * 1000:10.3f} ms")
+    finally:
+        db.rollback()
+        if restaurante_id is not None:
+            db.execute(delete(Reserva).where(Reserva.restaurante_id == restaurante_id))
+            db.execute(delete(Mesa).where(Mesa.restaurante_id == restaurante_id))
+            db.execute(
+                delete(Restaurante).where(Restaurante.id_restaurante == restaurante_id)
+            )
+        if usuario_id is not None:
+            db.execute(delete(Usuario).where(Usuario.id_usuario == usuario_id))
+        db.commit()
+        db.close()
+        print("\n🧹 Datos del benchmark eliminados")
+
+
+if __name__ == "__main__":
+    main()
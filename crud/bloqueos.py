@@ -0,0 +1,53 @@
+"""
+Bloqueos consultivos de PostgreSQL por mesa y día
+
+Antes de escribir una reserva con mesa se toma pg_advisory_xact_lock sobre
+la pareja (mesa, día): dos reservas para la misma mesa y día se serializan
+(la segunda ve a la primera al comprobar solapes) mientras que las de
+mesas o días distintos no se esperan entre sí. El bloqueo se libera solo
+al confirmar o deshacer la transacción.
+
+Cuando se toman varios (lotes, asignación) se piden en orden de clave
+para que dos transacciones no puedan esperarse mutuamente.
+"""
+
+import hashlib
+from datetime import date
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_BLOQUEO = select(func.pg_advisory_xact_lock(bindparam("clave")))
+
+
+def clave_bloqueo(mesa_id: UUID, dia: date) -> int:
+    """Entero de 64 bits con signo (lo que espera pg_advisory_xact_lock)"""
+    resumen = hashlib.blake2b(
+        mesa_id.bytes + dia.isoformat().encode("ascii"), digest_size=8
+    ).digest()
+    return int.from_bytes(resumen, "big", signed=True)
+
+
+def _claves(parejas: Iterable[Tuple[UUID, date]]) -> List[int]:
+    return sorted({clave_bloqueo(mesa_id, dia) for mesa_id, dia in parejas})
+
+
+def bloquear(db: Session, parejas: Iterable[Tuple[UUID, date]]) -> None:
+    """
+    Tomar (esperando si hace falta) los bloqueos de las parejas (mesa, día)
+    en la transacción actual de la sesión
+    """
+    for clave in _claves(parejas):
+        db.execute(_BLOQUEO, {"clave": clave})
+
+
+async def bloquear_async(
+    db: "AsyncSession", parejas: Iterable[Tuple[UUID, date]]
+) -> None:
+    for clave in _claves(parejas):
+        await db.execute(_BLOQUEO, {"clave": clave})
@@ -1,8 +1,28 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from crud.paginacion import armar_pagina, consulta_pagina
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
 from database.models.categoria import Categoria
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden estable (e indexado) de los listados y clave del cursor
+_ORDEN_CATEGORIAS = (Categoria.id_categoria,)
+
+
+def _condicion_categoria(categoria_id: UUID):
+    return (Categoria.id_categoria == categoria_id) & (Categoria.activa == True)
+
 
 class CategoriaCRUD:
     def __init__(self, db: Session):
@@ -21,10 +41,14 @@ class CategoriaCRUD:
         if self.obtener_categoria_por_nombre(nombre):
             raise ValueError("Ya existe una categoría con ese nombre")
 
-        categoria = Categoria(
+        datos = dict(
             nombre=nombre.strip(),
             descripcion=descripcion.strip() if descripcion else None,
         )
+        if CRUD_MODO_RETURNING:
+            return ejecutar(self.db, sentencia_insertar(Categoria, datos))
+
+        categoria = Categoria(**datos)
         self.db.add(categoria)
         self.db.commit()
         self.db.refresh(categoria)
@@ -57,18 +81,36 @@ class CategoriaCRUD:
         return (
             self.db.query(Categoria)
             .filter(Categoria.activa == True)
+            .order_by(*_ORDEN_CATEGORIAS)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def obtener_categorias_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Categoria], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = self.db.scalars(
+            consulta_pagina(
+                select(Categoria).where(Categoria.activa == True),
+                _ORDEN_CATEGORIAS,
+                limit,
+                cursor,
+            )
+        )
+        return armar_pagina(list(resultado), _ORDEN_CATEGORIAS, limit)
+
     def actualizar_categoria(self, categoria_id: UUID, **kwargs) -> Optional[Categoria]:
         """
         Actualizar una categoría con validaciones.
         """
-        categoria = self.obtener_categoria(categoria_id)
-        if not categoria:
-            return None
+        if not CRUD_MODO_RETURNING:
+            categoria = self.obtener_categoria(categoria_id)
+            if not categoria:
+                return None
 
         if "nombre" in kwargs:
             nombre = kwargs["nombre"]
@@ -84,6 +126,14 @@ class CategoriaCRUD:
         if "descripcion" in kwargs and kwargs["descripcion"]:
             kwargs["descripcion"] = kwargs["descripcion"].strip()
 
+        if CRUD_MODO_RETURNING:
+            return ejecutar(
+                self.db,
+                sentencia_actualizar(
+                    Categoria, _condicion_categoria(categoria_id), kwargs
+                ),
+            )
+
         for key, value in kwargs.items():
             if hasattr(categoria, key):
                 setattr(categoria, key, value)
@@ -97,6 +147,15 @@ class CategoriaCRUD:
         Eliminar una categoría.
         Por defecto hace un soft delete (activa=False).
         """
+        if CRUD_MODO_RETURNING:
+            condicion = _condicion_categoria(categoria_id)
+            sentencia = (
+                sentencia_actualizar(Categoria, condicion, {"activa": False})
+                if soft_delete
+                else sentencia_eliminar(Categoria, condicion)
+            )
+            return ejecutar(self.db, sentencia) is not None
+
         categoria = self.obtener_categoria(categoria_id)
         if not categoria:
             return False
@@ -109,3 +168,156 @@ class CategoriaCRUD:
             self.db.commit()
 
         return True
+
+
+class CategoriaAsyncCRUD:
+    """Versión asíncrona de CategoriaCRUD sobre AsyncSession"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    async def crear_categoria(self, nombre: str, descripcion: str = None) -> Categoria:
+        """
+        Crear una nueva categoría con validaciones.
+        """
+        if not nombre or len(nombre.strip()) == 0:
+            raise ValueError("El nombre de la categoría es obligatorio")
+
+        if len(nombre) > 100:
+            raise ValueError("El nombre no puede exceder 100 caracteres")
+
+        if await self.obtener_categoria_por_nombre(nombre):
+            raise ValueError("Ya existe una categoría con ese nombre")
+
+        datos = dict(
+            nombre=nombre.strip(),
+            descripcion=descripcion.strip() if descripcion else None,
+        )
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(self.db, sentencia_insertar(Categoria, datos))
+
+        categoria = Categoria(**datos)
+        self.db.add(categoria)
+        await self.db.commit()
+        await self.db.refresh(categoria)
+        return categoria
+
+    async def obtener_categoria(self, categoria_id: UUID) -> Optional[Categoria]:
+        """
+        Obtener una categoría por ID.
+        """
+        return await self.db.scalar(
+            select(Categoria).where(
+                Categoria.id_categoria == categoria_id, Categoria.activa == True
+            )
+        )
+
+    async def obtener_categoria_por_nombre(self, nombre: str) -> Optional[Categoria]:
+        """
+        Obtener una categoría por nombre.
+        """
+        return await self.db.scalar(
+            select(Categoria).where(
+                Categoria.nombre == nombre.strip(), Categoria.activa == True
+            )
+        )
+
+    async def obtener_categorias(
+        self, skip: int = 0, limit: int = 100
+    ) -> List[Categoria]:
+        """
+        Obtener lista de categorías activas con paginación.
+        """
+        resultado = await self.db.scalars(
+            select(Categoria)
+            .where(Categoria.activa == True)
+            .order_by(*_ORDEN_CATEGORIAS)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(resultado)
+
+    async def obtener_categorias_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Categoria], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = await self.db.scalars(
+            consulta_pagina(
+                select(Categoria).where(Categoria.activa == True),
+                _ORDEN_CATEGORIAS,
+                limit,
+                cursor,
+            )
+        )
+        return armar_pagina(list(resultado), _ORDEN_CATEGORIAS, limit)
+
+    async def actualizar_categoria(
+        self, categoria_id: UUID, **kwargs
+    ) -> Optional[Categoria]:
+        """
+        Actualizar una categoría con validaciones.
+        """
+        if not CRUD_MODO_RETURNING:
+            categoria = await self.obtener_categoria(categoria_id)
+            if not categoria:
+                return None
+
+        if "nombre" in kwargs:
+            nombre = kwargs["nombre"]
+            if not nombre or len(nombre.strip()) == 0:
+                raise ValueError("El nombre de la categoría es obligatorio")
+            if len(nombre) > 100:
+                raise ValueError("El nombre no puede exceder 100 caracteres")
+            existente = await self.obtener_categoria_por_nombre(nombre)
+            if existente and existente.id_categoria != categoria_id:
+                raise ValueError("Ya existe una categoría con ese nombre")
+            kwargs["nombre"] = nombre.strip()
+
+        if "descripcion" in kwargs and kwargs["descripcion"]:
+            kwargs["descripcion"] = kwargs["descripcion"].strip()
+
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(
+                self.db,
+                sentencia_actualizar(
+                    Categoria, _condicion_categoria(categoria_id), kwargs
+                ),
+            )
+
+        for key, value in kwargs.items():
+            if hasattr(categoria, key):
+                setattr(categoria, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(categoria)
+        return categoria
+
+    async def eliminar_categoria(
+        self, categoria_id: UUID, soft_delete: bool = True
+    ) -> bool:
+        """
+        Eliminar una categoría.
+        Por defecto hace un soft delete (activa=False).
+        """
+        if CRUD_MODO_RETURNING:
+            condicion = _condicion_categoria(categoria_id)
+            sentencia = (
+                sentencia_actualizar(Categoria, condicion, {"activa": False})
+                if soft_delete
+                else sentencia_eliminar(Categoria, condicion)
+            )
+            return await ejecutar_async(self.db, sentencia) is not None
+
+        categoria = await self.obtener_categoria(categoria_id)
+        if not categoria:
+            return False
+
+        if soft_delete:
+            categoria.activa = False
+        else:
+            await self.db.delete(categoria)
+        await self.db.commit()
+
+        return True
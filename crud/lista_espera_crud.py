@@ -0,0 +1,192 @@
+"""
+Operaciones CRUD para ListaEspera
+
+Aquí se anotan, consultan y retiran entradas; la promoción a reserva la
+hace ReservaCRUD al cancelar o eliminar una reserva con mesa.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from uuid import UUID
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_insertar,
+)
+from database.models.lista_espera import ListaEspera
+from services.disponibilidad import inicio_reserva
+from services.lista_espera import ESTADOS_ESPERA, colas_espera
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden de la cola: turno, prioridad y llegada
+_ORDEN_ESPERA = (
+    ListaEspera.inicio_reserva,
+    ListaEspera.prioridad.desc(),
+    ListaEspera.fecha_creacion,
+)
+
+
+def _datos_espera(
+    nombre_completo: str,
+    telefono: Optional[str],
+    email: Optional[str],
+    fecha_reserva,
+    hora_reserva: str,
+    numero_personas: int,
+    metodo_pago: str,
+    observaciones: Optional[str],
+    usuario_id: Optional[UUID],
+    restaurante_id: UUID,
+    duracion_minutos: Optional[int] = None,
+    prioridad: int = 0,
+) -> dict:
+    """
+    Validar y normalizar una entrada de la lista de espera
+    (compartido por el CRUD síncrono y asíncrono)
+    """
+    if numero_personas <= 0:
+        raise ValueError("El número de personas debe ser mayor que 0")
+    if duracion_minutos is not None and duracion_minutos <= 0:
+        raise ValueError("La duración debe ser mayor que 0")
+
+    return dict(
+        nombre_completo=nombre_completo.strip(),
+        telefono=telefono,
+        email=email,
+        fecha_reserva=fecha_reserva,
+        hora_reserva=hora_reserva,
+        inicio_reserva=inicio_reserva(fecha_reserva, hora_reserva),
+        numero_personas=numero_personas,
+        metodo_pago=metodo_pago.lower().strip(),
+        observaciones=observaciones,
+        usuario_id=usuario_id,
+        restaurante_id=restaurante_id,
+        duracion_minutos=duracion_minutos,
+        prioridad=prioridad,
+    )
+
+
+def _consulta_entradas(
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    estado: Optional[str] = "esperando",
+):
+    """select() de entradas filtradas; [desde, hasta) acota el turno"""
+    if desde is not None and hasta is not None and desde >= hasta:
+        raise ValueError("'desde' debe ser anterior a 'hasta'")
+    if estado is not None and estado not in ESTADOS_ESPERA:
+        raise ValueError(f"Estado inválido (válidos: {', '.join(ESTADOS_ESPERA)})")
+
+    consulta = select(ListaEspera)
+    if restaurante_id is not None:
+        consulta = consulta.where(ListaEspera.restaurante_id == restaurante_id)
+    if estado is not None:
+        consulta = consulta.where(ListaEspera.estado == estado)
+    if desde is not None:
+        consulta = consulta.where(ListaEspera.inicio_reserva >= desde)
+    if hasta is not None:
+        consulta = consulta.where(ListaEspera.inicio_reserva < hasta)
+    return consulta.order_by(*_ORDEN_ESPERA)
+
+
+def _sentencia_retirar(id_espera: UUID):
+    """Solo se retira lo que sigue esperando"""
+    return (
+        update(ListaEspera)
+        .where(ListaEspera.id_espera == id_espera, ListaEspera.estado == "esperando")
+        .values(estado="retirada")
+        .returning(*ListaEspera.__table__.c)
+    )
+
+
+def _turno(entrada):
+    return entrada.restaurante_id, entrada.inicio_reserva
+
+
+class ListaEsperaCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---------- CREAR ----------
+    def crear_entrada(self, **datos) -> ListaEspera:
+        datos = _datos_espera(**datos)
+        if CRUD_MODO_RETURNING:
+            entrada = ejecutar(self.db, sentencia_insertar(ListaEspera, datos))
+        else:
+            try:
+                entrada = ListaEspera(**datos)
+                self.db.add(entrada)
+                self.db.commit()
+                self.db.refresh(entrada)
+            except Exception:
+                self.db.rollback()
+                raise
+        colas_espera.agregar(_turno(entrada), entrada)
+        return entrada
+
+    # ---------- OBTENER ----------
+    def obtener_entrada(self, id_espera: UUID) -> Optional[ListaEspera]:
+        return self.db.scalar(
+            select(ListaEspera).where(ListaEspera.id_espera == id_espera)
+        )
+
+    def obtener_entradas(self, limit: int = 100, **filtros) -> List[ListaEspera]:
+        """
+        Entradas en el orden en que se promoverían dentro de cada turno.
+        Los filtros son los de _consulta_entradas.
+        """
+        return list(self.db.scalars(_consulta_entradas(**filtros).limit(limit)))
+
+    # ---------- RETIRAR ----------
+    def retirar_entrada(self, id_espera: UUID):
+        """
+        Sacar de la lista una entrada que sigue esperando (None si no existe
+        o ya no espera). El montículo la descarta al llegar a ella.
+        """
+        return ejecutar(self.db, _sentencia_retirar(id_espera))
+
+
+class ListaEsperaAsyncCRUD:
+    """Versión asíncrona de ListaEsperaCRUD sobre AsyncSession"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    # ---------- CREAR ----------
+    async def crear_entrada(self, **datos) -> ListaEspera:
+        datos = _datos_espera(**datos)
+        if CRUD_MODO_RETURNING:
+            entrada = await ejecutar_async(
+                self.db, sentencia_insertar(ListaEspera, datos)
+            )
+        else:
+            try:
+                entrada = ListaEspera(**datos)
+                self.db.add(entrada)
+                await self.db.commit()
+                await self.db.refresh(entrada)
+            except Exception:
+                await self.db.rollback()
+                raise
+        colas_espera.agregar(_turno(entrada), entrada)
+        return entrada
+
+    # ---------- OBTENER ----------
+    async def obtener_entrada(self, id_espera: UUID) -> Optional[ListaEspera]:
+        return await self.db.scalar(
+            select(ListaEspera).where(ListaEspera.id_espera == id_espera)
+        )
+
+    async def obtener_entradas(self, limit: int = 100, **filtros) -> List[ListaEspera]:
+        resultado = await self.db.scalars(_consulta_entradas(**filtros).limit(limit))
+        return list(resultado)
+
+    # ---------- RETIRAR ----------
+    async def retirar_entrada(self, id_espera: UUID):
+        return await ejecutar_async(self.db, _sentencia_retirar(id_espera))
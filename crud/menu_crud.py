@@ -2,11 +2,58 @@
 Operaciones CRUD para Menu
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
+from crud.paginacion import armar_pagina, consulta_pagina
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
 from database.models.menu import Menu
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden estable (e indexado) de los listados y clave del cursor
+_ORDEN_MENUS = (Menu.id_menu,)
+
+
+def _datos_menu(
+    nombre: str,
+    descripcion: Optional[str],
+    precio: float,
+    disponible: bool,
+    tiempo_preparacion: Optional[int],
+    ingredientes: Optional[str],
+    alergenos: Optional[str],
+    categoria_id: UUID,
+    restaurante_id: UUID,
+) -> dict:
+    """
+    Validar y normalizar los datos de un menú
+    (compartido por el CRUD síncrono y asíncrono)
+    """
+    if precio <= 0:
+        raise ValueError("El precio debe ser mayor a 0")
+
+    return dict(
+        nombre=nombre.strip(),
+        descripcion=descripcion,
+        precio=precio,
+        disponible=disponible,
+        tiempo_preparacion=tiempo_preparacion,
+        ingredientes=ingredientes,
+        alergenos=alergenos,
+        categoria_id=categoria_id,
+        restaurante_id=restaurante_id,
+    )
+
 
 class MenuCRUD:
     def __init__(self, db: Session):
@@ -25,11 +72,8 @@ class MenuCRUD:
         categoria_id: UUID,
         restaurante_id: UUID,
     ) -> Menu:
-        if precio <= 0:
-            raise ValueError("El precio debe ser mayor a 0")
-
-        menu = Menu(
-            nombre=nombre.strip(),
+        datos = _datos_menu(
+            nombre=nombre,
             descripcion=descripcion,
             precio=precio,
             disponible=disponible,
@@ -39,20 +83,69 @@ class MenuCRUD:
             categoria_id=categoria_id,
             restaurante_id=restaurante_id,
         )
+        if CRUD_MODO_RETURNING:
+            return ejecutar(self.db, sentencia_insertar(Menu, datos))
+
+        menu = Menu(**datos)
         self.db.add(menu)
         self.db.commit()
         self.db.refresh(menu)
         return menu
 
+    def crear_menus_bulk(self, lote: List[dict]) -> List[dict]:
+        """
+        Insertar varias filas con un INSERT multi-fila en una sola transacción
+        (si una fila falla no se inserta ninguna).
+        Devuelve las filas insertadas como diccionarios para no recargar
+        cada objeto después del commit.
+        """
+        filas = []
+        for indice, datos in enumerate(lote):
+            try:
+                filas.append(_datos_menu(**datos))
+            except ValueError as e:
+                raise ValueError(f"Elemento {indice}: {e}")
+
+        try:
+            creados = [
+                dict(fila)
+                for fila in self.db.execute(
+                    insert(Menu.__table__).returning(*Menu.__table__.c), filas
+                ).mappings()
+            ]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return creados
+
     # ---------- OBTENER ----------
     def obtener_menu(self, menu_id: UUID) -> Optional[Menu]:
         return self.db.query(Menu).filter(Menu.id_menu == menu_id).first()
 
     def obtener_menus(self, skip: int = 0, limit: int = 100) -> List[Menu]:
-        return self.db.query(Menu).offset(skip).limit(limit).all()
+        return (
+            self.db.query(Menu).order_by(*_ORDEN_MENUS).offset(skip).limit(limit).all()
+        )
+
+    def obtener_menus_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Menu], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = self.db.scalars(
+            consulta_pagina(select(Menu), _ORDEN_MENUS, limit, cursor)
+        )
+        return armar_pagina(list(resultado), _ORDEN_MENUS, limit)
 
     # ---------- ACTUALIZAR ----------
     def actualizar_menu(self, menu_id: UUID, **kwargs) -> Optional[Menu]:
+        if CRUD_MODO_RETURNING:
+            return ejecutar(
+                self.db, sentencia_actualizar(Menu, Menu.id_menu == menu_id, kwargs)
+            )
+
         menu = self.obtener_menu(menu_id)
         if not menu:
             return None
@@ -67,9 +160,91 @@ class MenuCRUD:
 
     # ---------- ELIMINAR ----------
     def eliminar_menu(self, menu_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                ejecutar(self.db, sentencia_eliminar(Menu, Menu.id_menu == menu_id))
+                is not None
+            )
+
         menu = self.obtener_menu(menu_id)
         if menu:
             self.db.delete(menu)
             self.db.commit()
             return True
         return False
+
+
+class MenuAsyncCRUD:
+    """Versión asíncrona de MenuCRUD sobre AsyncSession"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    # ---------- CREAR ----------
+    async def crear_menu(self, **datos) -> Menu:
+        datos = _datos_menu(**datos)
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(self.db, sentencia_insertar(Menu, datos))
+
+        menu = Menu(**datos)
+        self.db.add(menu)
+        await self.db.commit()
+        await self.db.refresh(menu)
+        return menu
+
+    # ---------- OBTENER ----------
+    async def obtener_menu(self, menu_id: UUID) -> Optional[Menu]:
+        return await self.db.scalar(select(Menu).where(Menu.id_menu == menu_id))
+
+    async def obtener_menus(self, skip: int = 0, limit: int = 100) -> List[Menu]:
+        resultado = await self.db.scalars(
+            select(Menu).order_by(*_ORDEN_MENUS).offset(skip).limit(limit)
+        )
+        return list(resultado)
+
+    async def obtener_menus_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Menu], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = await self.db.scalars(
+            consulta_pagina(select(Menu), _ORDEN_MENUS, limit, cursor)
+        )
+        return armar_pagina(list(resultado), _ORDEN_MENUS, limit)
+
+    # ---------- ACTUALIZAR ----------
+    async def actualizar_menu(self, menu_id: UUID, **kwargs) -> Optional[Menu]:
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(
+                self.db, sentencia_actualizar(Menu, Menu.id_menu == menu_id, kwargs)
+            )
+
+        menu = await self.obtener_menu(menu_id)
+        if not menu:
+            return None
+
+        for key, value in kwargs.items():
+            if hasattr(menu, key):
+                setattr(menu, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(menu)
+        return menu
+
+    # ---------- ELIMINAR ----------
+    async def eliminar_menu(self, menu_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                await ejecutar_async(
+                    self.db, sentencia_eliminar(Menu, Menu.id_menu == menu_id)
+                )
+                is not None
+            )
+
+        menu = await self.obtener_menu(menu_id)
+        if menu:
+            await self.db.delete(menu)
+            await self.db.commit()
+            return True
+        return False
@@ -2,10 +2,50 @@
 Operaciones CRUD para Mesa
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
+from crud.paginacion import armar_pagina, consulta_pagina
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
 from database.models.mesa import Mesa
+from services.disponibilidad import invalida_locales
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden estable (e indexado) de los listados y clave del cursor
+_ORDEN_MESAS = (Mesa.id_mesa,)
+
+
+def _datos_mesa(
+    numero_mesa: int,
+    capacidad: int,
+    ubicacion: Optional[str],
+    activa: bool,
+    restaurante_id: UUID,
+) -> dict:
+    """
+    Validar y normalizar los datos de una mesa
+    (compartido por el CRUD síncrono y asíncrono)
+    """
+    if capacidad <= 0:
+        raise ValueError("La capacidad debe ser mayor a 0")
+
+    return dict(
+        numero_mesa=numero_mesa,
+        capacidad=capacidad,
+        ubicacion=ubicacion,
+        activa=activa,
+        restaurante_id=restaurante_id,
+    )
 
 
 class MesaCRUD:
@@ -13,6 +53,7 @@ class MesaCRUD:
         self.db = db
 
     # ---------- CREAR ----------
+    @invalida_locales
     def crear_mesa(
         self,
         numero_mesa: int,
@@ -21,30 +62,78 @@ class MesaCRUD:
         activa: bool,
         restaurante_id: UUID,
     ) -> Mesa:
-        if capacidad <= 0:
-            raise ValueError("La capacidad debe ser mayor a 0")
-
-        mesa = Mesa(
+        datos = _datos_mesa(
             numero_mesa=numero_mesa,
             capacidad=capacidad,
             ubicacion=ubicacion,
             activa=activa,
             restaurante_id=restaurante_id,
         )
+        if CRUD_MODO_RETURNING:
+            return ejecutar(self.db, sentencia_insertar(Mesa, datos))
+
+        mesa = Mesa(**datos)
         self.db.add(mesa)
         self.db.commit()
         self.db.refresh(mesa)
         return mesa
 
+    @invalida_locales
+    def crear_mesas_bulk(self, lote: List[dict]) -> List[dict]:
+        """
+        Insertar varias filas con un INSERT multi-fila en una sola transacción
+        (si una fila falla no se inserta ninguna).
+        Devuelve las filas insertadas como diccionarios para no recargar
+        cada objeto después del commit.
+        """
+        filas = []
+        for indice, datos in enumerate(lote):
+            try:
+                filas.append(_datos_mesa(**datos))
+            except ValueError as e:
+                raise ValueError(f"Elemento {indice}: {e}")
+
+        try:
+            creados = [
+                dict(fila)
+                for fila in self.db.execute(
+                    insert(Mesa.__table__).returning(*Mesa.__table__.c), filas
+                ).mappings()
+            ]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return creados
+
     # ---------- OBTENER ----------
     def obtener_mesa(self, mesa_id: UUID) -> Optional[Mesa]:
         return self.db.query(Mesa).filter(Mesa.id_mesa == mesa_id).first()
 
     def obtener_mesas(self, skip: int = 0, limit: int = 100) -> List[Mesa]:
-        return self.db.query(Mesa).offset(skip).limit(limit).all()
+        return (
+            self.db.query(Mesa).order_by(*_ORDEN_MESAS).offset(skip).limit(limit).all()
+        )
+
+    def obtener_mesas_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Mesa], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = self.db.scalars(
+            consulta_pagina(select(Mesa), _ORDEN_MESAS, limit, cursor)
+        )
+        return armar_pagina(list(resultado), _ORDEN_MESAS, limit)
 
     # ---------- ACTUALIZAR ----------
+    @invalida_locales
     def actualizar_mesa(self, mesa_id: UUID, **kwargs) -> Optional[Mesa]:
+        if CRUD_MODO_RETURNING:
+            return ejecutar(
+                self.db, sentencia_actualizar(Mesa, Mesa.id_mesa == mesa_id, kwargs)
+            )
+
         mesa = self.obtener_mesa(mesa_id)
         if not mesa:
             return None
@@ -58,10 +147,96 @@ class MesaCRUD:
         return mesa
 
     # ---------- ELIMINAR ----------
+    @invalida_locales
     def eliminar_mesa(self, mesa_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                ejecutar(self.db, sentencia_eliminar(Mesa, Mesa.id_mesa == mesa_id))
+                is not None
+            )
+
         mesa = self.obtener_mesa(mesa_id)
         if mesa:
             self.db.delete(mesa)
             self.db.commit()
             return True
         return False
+
+
+class MesaAsyncCRUD:
+    """Versión asíncrona de MesaCRUD sobre AsyncSession"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    # ---------- CREAR ----------
+    @invalida_locales
+    async def crear_mesa(self, **datos) -> Mesa:
+        datos = _datos_mesa(**datos)
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(self.db, sentencia_insertar(Mesa, datos))
+
+        mesa = Mesa(**datos)
+        self.db.add(mesa)
+        await self.db.commit()
+        await self.db.refresh(mesa)
+        return mesa
+
+    # ---------- OBTENER ----------
+    async def obtener_mesa(self, mesa_id: UUID) -> Optional[Mesa]:
+        return await self.db.scalar(select(Mesa).where(Mesa.id_mesa == mesa_id))
+
+    async def obtener_mesas(self, skip: int = 0, limit: int = 100) -> List[Mesa]:
+        resultado = await self.db.scalars(
+            select(Mesa).order_by(*_ORDEN_MESAS).offset(skip).limit(limit)
+        )
+        return list(resultado)
+
+    async def obtener_mesas_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Mesa], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = await self.db.scalars(
+            consulta_pagina(select(Mesa), _ORDEN_MESAS, limit, cursor)
+        )
+        return armar_pagina(list(resultado), _ORDEN_MESAS, limit)
+
+    # ---------- ACTUALIZAR ----------
+    @invalida_locales
+    async def actualizar_mesa(self, mesa_id: UUID, **kwargs) -> Optional[Mesa]:
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(
+                self.db, sentencia_actualizar(Mesa, Mesa.id_mesa == mesa_id, kwargs)
+            )
+
+        mesa = await self.obtener_mesa(mesa_id)
+        if not mesa:
+            return None
+
+        for key, value in kwargs.items():
+            if hasattr(mesa, key):
+                setattr(mesa, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(mesa)
+        return mesa
+
+    # ---------- ELIMINAR ----------
+    @invalida_locales
+    async def eliminar_mesa(self, mesa_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                await ejecutar_async(
+                    self.db, sentencia_eliminar(Mesa, Mesa.id_mesa == mesa_id)
+                )
+                is not None
+            )
+
+        mesa = await self.obtener_mesa(mesa_id)
+        if mesa:
+            await self.db.delete(mesa)
+            await self.db.commit()
+            return True
+        return False
@@ -0,0 +1,109 @@
+"""
+Paginación por cursor (keyset)
+
+Cada listado se ordena por una clave estable e indexada (la clave primaria,
+o inicio_reserva + id_reserva en reservas). El cursor es opaco: codifica en
+base64 los valores de esa clave de la última fila de la página, y la página
+siguiente empieza con WHERE (clave) > (valores) en lugar de OFFSET, así que
+su costo no crece con la profundidad y no salta ni repite filas si se
+insertan otras entre páginas.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+
+LIMITE_MAXIMO = 1000
+
+
+def _a_json(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, uuid.UUID):
+        return str(valor)
+    return valor
+
+
+def _desde_json(valor: Any, columna) -> Any:
+    """Valor del cursor con el tipo de la columna (ValueError si no lo tiene)"""
+    tipo = columna.type.python_type
+    if tipo in (uuid.UUID, datetime):
+        if not isinstance(valor, str):
+            raise ValueError
+        return uuid.UUID(valor) if tipo is uuid.UUID else datetime.fromisoformat(valor)
+    if type(valor) is not tipo:
+        raise ValueError
+    return valor
+
+
+def codificar_cursor(valores: Sequence[Any], descendente: bool = False) -> str:
+    datos = {"v": [_a_json(valor) for valor in valores]}
+    if descendente:
+        datos["desc"] = True
+    texto = json.dumps(datos, separators=(",", ":"))
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(
+    cursor: str, claves: Sequence, descendente: bool = False
+) -> List[Any]:
+    """
+    Valores de la clave de orden guardados en el cursor
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        valores = datos["v"]
+        if not isinstance(valores, list) or len(valores) != len(claves):
+            raise ValueError
+        valores = [_desde_json(valor, clave) for valor, clave in zip(valores, claves)]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise ValueError("Cursor de paginación inválido")
+    if datos.get("desc", False) != descendente:
+        raise ValueError("El cursor no corresponde al orden solicitado")
+    return valores
+
+
+def consulta_pagina(
+    consulta,
+    claves: Sequence,
+    limit: int,
+    cursor: Optional[str],
+    descendente: bool = False,
+):
+    """
+    Aplicar a un select() el orden por `claves`, el punto de partida del
+    cursor y el límite (una fila extra para saber si hay página siguiente)
+    """
+    if cursor:
+        valores = decodificar_cursor(cursor, claves, descendente)
+        if len(claves) == 1:
+            izquierda, derecha = claves[0], valores[0]
+        else:
+            izquierda, derecha = tuple_(*claves), tuple_(*valores)
+        consulta = consulta.where(
+            izquierda < derecha if descendente else izquierda > derecha
+        )
+    orden = [clave.desc() for clave in claves] if descendente else claves
+    return consulta.order_by(*orden).limit(limit + 1)
+
+
+def armar_pagina(
+    filas: List[Any], claves: Sequence, limit: int, descendente: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Recortar la fila extra y generar el cursor de la página siguiente
+    (None si es la última)
+    """
+    if len(filas) <= limit:
+        return filas, None
+    filas = filas[:limit]
+    ultima = filas[-1]
+    return filas, codificar_cursor(
+        [getattr(ultima, clave.key) for clave in claves], descendente
+    )
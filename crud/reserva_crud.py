@@ -2,10 +2,507 @@
 Operaciones CRUD para Reserva
 """
 
-from typing import List, Optional
+import os
+from datetime import date, datetime, time, timedelta
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID
+from sqlalchemy import (
+    DateTime,
+    Text,
+    Time,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, Range
 from sqlalchemy.orm import Session
+from crud.bloqueos import bloquear, bloquear_async
+from crud.paginacion import armar_pagina, consulta_pagina
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
+from database.models.lista_espera import ListaEspera
+from database.models.mesa import Mesa
 from database.models.reserva import Reserva
+from database.models.restaurante import Restaurante
+from services.disponibilidad import (
+    RESERVA_DURACION_MIN,
+    inicio_reserva,
+    minutos,
+    motor_disponibilidad,
+)
+from services.lista_espera import colas_espera, consulta_turno
+from services.tablero import cache_tablero
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden estable (e indexado) de los listados y clave del cursor
+_ORDEN_RESERVAS = (Reserva.inicio_reserva, Reserva.id_reserva)
+
+ESTADOS_RESERVA = ("pendiente", "confirmada", "cancelada", "completada")
+
+# Columnas de la exportación (las de ReservaResponse) y filas por tanda
+# que trae cada vuelta del cursor del servidor
+COLUMNAS_EXPORTACION = (
+    "id_reserva",
+    "restaurante_id",
+    "mesa_id",
+    "usuario_id",
+    "nombre_completo",
+    "telefono",
+    "email",
+    "fecha_reserva",
+    "hora_reserva",
+    "inicio_reserva",
+    "duracion_minutos",
+    "numero_personas",
+    "metodo_pago",
+    "estado",
+    "observaciones",
+    "fecha_creacion",
+    "fecha_edicion",
+)
+EXPORTACION_TANDA = int(os.getenv("EXPORTACION_TANDA", "2000"))
+
+# Campos que determinan qué mesa y horario ocupa una reserva
+_CAMPOS_MESA = (
+    "mesa_id",
+    "fecha_reserva",
+    "hora_reserva",
+    "duracion_minutos",
+    "estado",
+)
+_CAMPOS_PERIODO = ("fecha_reserva", "hora_reserva", "duracion_minutos")
+
+
+class ReservaEnConflicto(Exception):
+    """La mesa ya tiene una reserva que se solapa con el horario pedido"""
+
+    def __init__(self, mensaje: str, reserva_id: UUID):
+        super().__init__(mensaje)
+        self.reserva_id = reserva_id
+
+
+# Hora del día (UTC) a la que empieza la reserva
+_hora_inicio = cast(func.timezone("UTC", Reserva.inicio_reserva), Time)
+
+
+def _como_hora(hora: str) -> time:
+    return time(*divmod(minutos(hora), 60))
+
+
+def _consulta_reservas(
+    restaurante_id: Optional[UUID] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    estado: Optional[str] = None,
+    mesa_id: Optional[UUID] = None,
+    usuario_id: Optional[UUID] = None,
+    hora_desde: Optional[str] = None,
+    hora_hasta: Optional[str] = None,
+):
+    """
+    select() de reservas con los filtros indicados (todos opcionales).
+    [desde, hasta) acota el inicio de la reserva (rango sobre el índice);
+    [hora_desde, hora_hasta) la hora de inicio (UTC) dentro de cada día.
+    """
+    if desde is not None and hasta is not None and desde >= hasta:
+        raise ValueError("'desde' debe ser anterior a 'hasta'")
+    if hora_desde is not None and hora_hasta is not None:
+        if minutos(hora_desde) >= minutos(hora_hasta):
+            raise ValueError("'hora_desde' debe ser anterior a 'hora_hasta'")
+    if estado is not None and estado not in ESTADOS_RESERVA:
+        raise ValueError(f"Estado inválido (válidos: {', '.join(ESTADOS_RESERVA)})")
+
+    consulta = select(Reserva)
+    if restaurante_id is not None:
+        consulta = consulta.where(Reserva.restaurante_id == restaurante_id)
+    if mesa_id is not None:
+        consulta = consulta.where(Reserva.mesa_id == mesa_id)
+    if usuario_id is not None:
+        consulta = consulta.where(Reserva.usuario_id == usuario_id)
+    if estado is not None:
+        consulta = consulta.where(Reserva.estado == estado)
+    if desde is not None:
+        consulta = consulta.where(Reserva.inicio_reserva >= desde)
+    if hasta is not None:
+        consulta = consulta.where(Reserva.inicio_reserva < hasta)
+    if hora_desde is not None:
+        consulta = consulta.where(_hora_inicio >= _como_hora(hora_desde))
+    if hora_hasta is not None:
+        consulta = consulta.where(_hora_inicio < _como_hora(hora_hasta))
+    return consulta
+
+
+def _consulta_columnas(
+    restaurante_id: UUID,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+):
+    """
+    Lo que usan las estadísticas, una fila por reserva: inicio y creación
+    como segundos epoch (double, sin armar datetimes; NaN si no hay fecha
+    de creación), personas, método de pago y si está cancelada
+    """
+    return _consulta_reservas(
+        restaurante_id=restaurante_id, desde=desde, hasta=hasta
+    ).with_only_columns(
+        func.date_part("epoch", Reserva.inicio_reserva),
+        func.coalesce(
+            func.date_part("epoch", Reserva.fecha_creacion), literal(float("nan"))
+        ),
+        Reserva.numero_personas,
+        Reserva.metodo_pago,
+        Reserva.estado == "cancelada",
+    )
+
+
+def _como_texto(columna):
+    """
+    La columna ya convertida a texto por Postgres (fechas en ISO 8601,
+    como las escribe en JSON)
+    """
+    if isinstance(columna.type, DateTime):
+        return func.json_build_array(columna).op("->>", return_type=Text)(0)
+    if isinstance(columna.type, PG_UUID):
+        return cast(columna, Text)
+    return columna
+
+
+def _consulta_exportacion(formato: str, **filtros):
+    """
+    Reservas listas para escribir, en el orden indexado de los listados y
+    con los filtros de _consulta_reservas. Postgres arma el texto (no se
+    construyen objetos Reserva, UUID ni datetime en Python):
+
+    - ndjson: una columna con el objeto JSON de cada reserva
+    - csv: las columnas de COLUMNAS_EXPORTACION como texto
+    """
+    columnas = [getattr(Reserva, c) for c in COLUMNAS_EXPORTACION]
+    if formato == "ndjson":
+        pares = [v for c in columnas for v in (literal(c.key), c)]
+        seleccion = [cast(func.json_build_object(*pares), Text)]
+    elif formato == "csv":
+        seleccion = [_como_texto(c) for c in columnas]
+    else:
+        raise ValueError("Formato inválido (válidos: ndjson, csv)")
+    return (
+        _consulta_reservas(**filtros)
+        .with_only_columns(*seleccion)
+        .order_by(*_ORDEN_RESERVAS)
+    )
+
+
+def _datos_reserva(
+    nombre_completo: str,
+    telefono: Optional[str],
+    email: Optional[str],
+    fecha_reserva,
+    hora_reserva: str,
+    numero_personas: int,
+    metodo_pago: str,
+    estado: str,
+    observaciones: Optional[str],
+    usuario_id: Optional[UUID],
+    restaurante_id: UUID,
+    mesa_id: Optional[UUID],
+    duracion_minutos: Optional[int] = None,
+) -> dict:
+    """
+    Validar y normalizar los datos de una reserva
+    (compartido por el CRUD síncrono y asíncrono). Sin duración, el CRUD
+    usa la del restaurante al completar el periodo.
+    """
+    if numero_personas <= 0:
+        raise ValueError("El número de personas debe ser mayor que 0")
+    if duracion_minutos is not None and duracion_minutos <= 0:
+        raise ValueError("La duración debe ser mayor que 0")
+    minutos(hora_reserva)
+
+    return dict(
+        nombre_completo=nombre_completo.strip(),
+        telefono=telefono,
+        email=email,
+        fecha_reserva=fecha_reserva,
+        hora_reserva=hora_reserva,
+        numero_personas=numero_personas,
+        metodo_pago=metodo_pago.lower().strip(),
+        estado=estado,
+        observaciones=observaciones,
+        usuario_id=usuario_id,
+        restaurante_id=restaurante_id,
+        mesa_id=mesa_id,
+        duracion_minutos=duracion_minutos,
+    )
+
+
+# ---------- PERIODO Y SOLAPES POR MESA ----------
+def periodo_reserva(fecha_reserva, hora_reserva: str, duracion_minutos: int) -> Range:
+    """Rango [inicio, inicio + duración) que ocupa la reserva"""
+    inicio = inicio_reserva(fecha_reserva, hora_reserva)
+    return Range(inicio, inicio + timedelta(minutes=duracion_minutos), bounds="[)")
+
+
+def _consulta_duraciones(restaurante_ids: Iterable[UUID]):
+    return select(Restaurante.id_restaurante, Restaurante.duracion_reserva_min).where(
+        Restaurante.id_restaurante.in_(restaurante_ids)
+    )
+
+
+def _sin_duracion(filas: List[dict]) -> set:
+    return {f["restaurante_id"] for f in filas if f["duracion_minutos"] is None}
+
+
+def _completar_periodos(filas: List[dict], duraciones: Dict[UUID, int]) -> None:
+    """
+    Fijar duración (la del restaurante si falta), periodo e inicio de
+    cada fila
+    """
+    for fila in filas:
+        if fila["duracion_minutos"] is None:
+            fila["duracion_minutos"] = (
+                duraciones.get(fila["restaurante_id"]) or RESERVA_DURACION_MIN
+            )
+        fila["periodo"] = periodo_reserva(
+            fila["fecha_reserva"], fila["hora_reserva"], fila["duracion_minutos"]
+        )
+        fila["inicio_reserva"] = fila["periodo"].lower
+
+
+def _ocupa_mesa(datos: dict) -> bool:
+    return datos.get("mesa_id") is not None and datos.get("estado") != "cancelada"
+
+
+def _se_solapan(a: Range, b: Range) -> bool:
+    return a.lower < b.upper and b.lower < a.upper
+
+
+def _parejas(datos: dict) -> List[Tuple[UUID, date]]:
+    """(mesa, día UTC) de cada día que toca el periodo, para bloquear"""
+    periodo = datos["periodo"]
+    dia, ultimo = (
+        periodo.lower.date(),
+        (periodo.upper - timedelta(microseconds=1)).date(),
+    )
+    parejas = []
+    while dia <= ultimo:
+        parejas.append((datos["mesa_id"], dia))
+        dia += timedelta(days=1)
+    return parejas
+
+
+def _consulta_solapes(nuevas: List[dict], excluir=()):
+    """Reservas vigentes cuya mesa y periodo se solapan con alguna nueva"""
+    consulta = select(Reserva.id_reserva, Reserva.mesa_id, Reserva.periodo).where(
+        or_(
+            *(
+                (Reserva.mesa_id == datos["mesa_id"])
+                & Reserva.periodo.overlaps(datos["periodo"])
+                for datos in nuevas
+            )
+        ),
+        Reserva.estado != "cancelada",
+    )
+    if excluir:
+        consulta = consulta.where(Reserva.id_reserva.not_in(excluir))
+    return consulta
+
+
+def _comprobar_solapes(nuevas: List[dict], existentes) -> None:
+    """
+    Verificar que ninguna reserva nueva se solape con las existentes ni con
+    otra nueva de la misma mesa
+
+    Raises:
+        ReservaEnConflicto: con el índice del elemento si hay varias
+    """
+    ocupadas: Dict[UUID, List[Tuple[Range, Optional[UUID]]]] = {}
+    for fila in existentes:
+        if fila.periodo is not None:
+            ocupadas.setdefault(fila.mesa_id, []).append(
+                (fila.periodo, fila.id_reserva)
+            )
+    for indice, datos in enumerate(nuevas):
+        if not _ocupa_mesa(datos):
+            continue
+        intervalos = ocupadas.setdefault(datos["mesa_id"], [])
+        for periodo, reserva_id in intervalos:
+            if _se_solapan(periodo, datos["periodo"]):
+                prefijo = f"Elemento {indice}: " if len(nuevas) > 1 else ""
+                raise ReservaEnConflicto(
+                    f"{prefijo}La mesa ya está reservada en ese horario", reserva_id
+                )
+        intervalos.append((datos["periodo"], datos.get("id_reserva")))
+
+
+def _consulta_campos_mesa(reserva_id: UUID):
+    return select(*(getattr(Reserva, campo) for campo in _CAMPOS_MESA)).where(
+        Reserva.id_reserva == reserva_id
+    )
+
+
+def _preparar_cambio(actual, cambios: dict) -> Tuple[dict, Optional[dict]]:
+    """
+    Para una actualización: campos extra a escribir (periodo e inicio
+    recalculados si cambian fecha, hora o duración) y los datos de mesa a
+    comprobar (None si no pasa a ocupar otra mesa u otro horario)
+    """
+    antes = {campo: getattr(actual, campo) for campo in _CAMPOS_MESA}
+    despues = {**antes, **{k: v for k, v in cambios.items() if k in _CAMPOS_MESA}}
+    extra = {}
+    if set(_CAMPOS_PERIODO) & cambios.keys():
+        if not despues["duracion_minutos"] or despues["duracion_minutos"] <= 0:
+            raise ValueError("La duración debe ser mayor que 0")
+        extra["periodo"] = periodo_reserva(
+            *(despues[campo] for campo in _CAMPOS_PERIODO)
+        )
+        extra["inicio_reserva"] = extra["periodo"].lower
+    if not _ocupa_mesa(despues):
+        return extra, None
+    despues["periodo"] = periodo_reserva(*(despues[campo] for campo in _CAMPOS_PERIODO))
+    if _ocupa_mesa(antes) and antes["mesa_id"] == despues["mesa_id"]:
+        try:
+            mismo = (
+                periodo_reserva(*(antes[c] for c in _CAMPOS_PERIODO))
+                == despues["periodo"]
+            )
+        except ValueError:
+            mismo = False
+        if mismo:
+            return extra, None
+    return extra, despues
+
+
+def _consulta_solapadas(
+    desde: datetime,
+    hasta: datetime,
+    restaurante_id: Optional[UUID] = None,
+    mesa_id: Optional[UUID] = None,
+    incluir_canceladas: bool = False,
+):
+    """
+    Reservas cuyo periodo corta [desde, hasta): && sobre el índice GiST
+    de periodo, sin recorrer días completos
+    """
+    if desde >= hasta:
+        raise ValueError("'desde' debe ser anterior a 'hasta'")
+    consulta = select(Reserva).where(
+        Reserva.periodo.overlaps(Range(desde, hasta, bounds="[)"))
+    )
+    if restaurante_id is not None:
+        consulta = consulta.where(Reserva.restaurante_id == restaurante_id)
+    if mesa_id is not None:
+        consulta = consulta.where(Reserva.mesa_id == mesa_id)
+    if not incluir_canceladas:
+        consulta = consulta.where(Reserva.estado != "cancelada")
+    return consulta.order_by(*_ORDEN_RESERVAS)
+
+
+def _consulta_mesa_ocupada(
+    mesa_id: UUID, desde: datetime, hasta: datetime, excluir: Optional[UUID] = None
+):
+    condicion = (
+        (Reserva.mesa_id == mesa_id)
+        & Reserva.periodo.overlaps(Range(desde, hasta, bounds="[)"))
+        & (Reserva.estado != "cancelada")
+    )
+    if excluir is not None:
+        condicion &= Reserva.id_reserva != excluir
+    return select(exists().where(condicion))
+
+
+# ---------- LISTA DE ESPERA ----------
+# Columnas que devuelve el DELETE para saber qué mesa y turno libera
+_COLUMNAS_BAJA = (
+    Reserva.id_reserva,
+    Reserva.restaurante_id,
+    Reserva.inicio_reserva,
+    Reserva.mesa_id,
+    Reserva.estado,
+)
+
+
+def _reflejar(reserva) -> None:
+    """
+    Tras el commit de una reserva creada o modificada (objeto ORM, Row o
+    dict): actualizar el motor de disponibilidad e invalidar el tablero
+    """
+    motor_disponibilidad.registrar(reserva)
+    cache_tablero.invalidar(
+        reserva["restaurante_id"]
+        if isinstance(reserva, dict)
+        else reserva.restaurante_id
+    )
+
+
+def _mesa_liberada(fila) -> Optional[Tuple[UUID, datetime, UUID]]:
+    """(restaurante, inicio, mesa) que deja libre una reserva que ocupaba mesa"""
+    if fila is None or fila.mesa_id is None:
+        return None
+    return fila.restaurante_id, fila.inicio_reserva, fila.mesa_id
+
+
+def _consulta_capacidad(mesa_id: UUID):
+    return select(Mesa.capacidad).where(Mesa.id_mesa == mesa_id)
+
+
+def _consulta_en_espera(id_espera: UUID):
+    """
+    La entrada si sigue esperando, bloqueada hasta el commit (la que otra
+    transacción ya está promoviendo se salta)
+    """
+    return (
+        select(ListaEspera.__table__)
+        .where(ListaEspera.id_espera == id_espera, ListaEspera.estado == "esperando")
+        .with_for_update(skip_locked=True)
+    )
+
+
+def _datos_promocion(entrada, mesa_id: UUID) -> dict:
+    return _datos_reserva(
+        nombre_completo=entrada.nombre_completo,
+        telefono=entrada.telefono,
+        email=entrada.email,
+        fecha_reserva=entrada.fecha_reserva,
+        hora_reserva=entrada.hora_reserva,
+        numero_personas=entrada.numero_personas,
+        metodo_pago=entrada.metodo_pago,
+        estado="confirmada",
+        observaciones=entrada.observaciones,
+        usuario_id=entrada.usuario_id,
+        restaurante_id=entrada.restaurante_id,
+        mesa_id=mesa_id,
+        duracion_minutos=entrada.duracion_minutos,
+    )
+
+
+def _sentencia_promover(id_espera: UUID, reserva_id: UUID):
+    return (
+        update(ListaEspera)
+        .where(ListaEspera.id_espera == id_espera)
+        .values(estado="promovida", reserva_id=reserva_id)
+    )
 
 
 class ReservaCRUD:
@@ -27,64 +524,572 @@ class ReservaCRUD:
         usuario_id: Optional[UUID],
         restaurante_id: UUID,
         mesa_id: Optional[UUID],
+        duracion_minutos: Optional[int] = None,
     ) -> Reserva:
-        if numero_personas <= 0:
-            raise ValueError("El número de personas debe ser mayor que 0")
-
-        reserva = Reserva(
-            nombre_completo=nombre_completo.strip(),
+        datos = _datos_reserva(
+            nombre_completo=nombre_completo,
             telefono=telefono,
             email=email,
             fecha_reserva=fecha_reserva,
             hora_reserva=hora_reserva,
             numero_personas=numero_personas,
-            metodo_pago=metodo_pago.lower().strip(),
+            metodo_pago=metodo_pago,
             estado=estado,
             observaciones=observaciones,
             usuario_id=usuario_id,
             restaurante_id=restaurante_id,
             mesa_id=mesa_id,
+            duracion_minutos=duracion_minutos,
         )
-
-        self.db.add(reserva)
-        self.db.commit()
-        self.db.refresh(reserva)
+        try:
+            self._completar([datos])
+            self._verificar_mesas([datos])
+            if CRUD_MODO_RETURNING:
+                reserva = ejecutar(self.db, sentencia_insertar(Reserva, datos))
+            else:
+                reserva = Reserva(**datos)
+                self.db.add(reserva)
+                self.db.commit()
+                self.db.refresh(reserva)
+        except Exception:
+            self.db.rollback()
+            raise
+        _reflejar(reserva)
         return reserva
 
+    def _verificar_mesas(self, nuevas: List[dict], excluir=()) -> None:
+        """
+        Bloquear las parejas (mesa, día) de las reservas con mesa y comprobar
+        solapes dentro de la transacción actual (hasta el commit nadie más
+        puede escribir en esas mesas y días)
+
+        Raises:
+            ReservaEnConflicto: si alguna se solapa
+        """
+        con_mesa = [datos for datos in nuevas if _ocupa_mesa(datos)]
+        if not con_mesa:
+            return
+        bloquear(self.db, [pareja for datos in con_mesa for pareja in _parejas(datos)])
+        existentes = self.db.execute(_consulta_solapes(con_mesa, excluir)).all()
+        _comprobar_solapes(nuevas, existentes)
+
+    def _completar(self, filas: List[dict]) -> None:
+        restaurantes = _sin_duracion(filas)
+        duraciones = (
+            dict(self.db.execute(_consulta_duraciones(restaurantes)).all())
+            if restaurantes
+            else {}
+        )
+        _completar_periodos(filas, duraciones)
+
+    def crear_reservas_bulk(self, lote: List[dict]) -> List[dict]:
+        """
+        Insertar varias filas con un INSERT multi-fila en una sola transacción
+        (si una fila falla no se inserta ninguna).
+        Devuelve las filas insertadas como diccionarios para no recargar
+        cada objeto después del commit.
+        """
+        filas = []
+        for indice, datos in enumerate(lote):
+            try:
+                filas.append(_datos_reserva(**datos))
+            except ValueError as e:
+                raise ValueError(f"Elemento {indice}: {e}")
+
+        try:
+            self._completar(filas)
+            self._verificar_mesas(filas)
+            creados = [
+                dict(fila)
+                for fila in self.db.execute(
+                    insert(Reserva.__table__).returning(*Reserva.__table__.c), filas
+                ).mappings()
+            ]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        for fila in creados:
+            _reflejar(fila)
+        return creados
+
     # ---------- OBTENER ----------
     def obtener_reserva(self, reserva_id: UUID) -> Optional[Reserva]:
         return self.db.query(Reserva).filter(Reserva.id_reserva == reserva_id).first()
 
-    def obtener_reservas(self, skip: int = 0, limit: int = 100) -> List[Reserva]:
-        return self.db.query(Reserva).offset(skip).limit(limit).all()
+    def obtener_reservas(
+        self, skip: int = 0, limit: int = 100, descendente: bool = False, **filtros
+    ) -> List[Reserva]:
+        """
+        Listado con OFFSET (modo heredado). Los filtros son los de
+        _consulta_reservas.
+        """
+        orden = (
+            [clave.desc() for clave in _ORDEN_RESERVAS]
+            if descendente
+            else _ORDEN_RESERVAS
+        )
+        resultado = self.db.scalars(
+            _consulta_reservas(**filtros).order_by(*orden).offset(skip).limit(limit)
+        )
+        return list(resultado)
+
+    def obtener_reservas_pagina(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        descendente: bool = False,
+        **filtros,
+    ) -> Tuple[List[Reserva], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = self.db.scalars(
+            consulta_pagina(
+                _consulta_reservas(**filtros),
+                _ORDEN_RESERVAS,
+                limit,
+                cursor,
+                descendente,
+            )
+        )
+        return armar_pagina(list(resultado), _ORDEN_RESERVAS, limit, descendente)
+
+    def obtener_reservas_por_restaurante(
+        self, restaurante_id: UUID, limit: int = 100
+    ) -> List[Reserva]:
+        return self.obtener_reservas(
+            limit=limit, descendente=True, restaurante_id=restaurante_id
+        )
+
+    def obtener_columnas_estadisticas(
+        self,
+        restaurante_id: UUID,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> List[tuple]:
+        """Filas de _consulta_columnas (services.estadisticas las vectoriza)"""
+        return self.db.execute(_consulta_columnas(restaurante_id, desde, hasta)).all()
 
-    def obtener_reservas_por_restaurante(self, restaurante_id: UUID) -> List[Reserva]:
-        return (
-            self.db.query(Reserva)
-            .filter(Reserva.restaurante_id == restaurante_id)
-            .order_by(Reserva.fecha_reserva.desc())
-            .all()
+    def exportar_reservas(
+        self, formato: str, tanda: int = EXPORTACION_TANDA, **filtros
+    ) -> Iterator[Sequence[tuple]]:
+        """
+        Tandas de filas de _consulta_exportacion leídas con un cursor del
+        servidor (yield_per): en memoria hay una tanda a la vez. La
+        consulta se valida y ejecuta al llamar; las filas llegan al
+        recorrer el iterador, con la sesión todavía abierta.
+        """
+        resultado = self.db.execute(
+            _consulta_exportacion(formato, **filtros).execution_options(yield_per=tanda)
+        )
+        return resultado.partitions()
+
+    def obtener_reservas_solapadas(
+        self, desde: datetime, hasta: datetime, **filtros
+    ) -> List[Reserva]:
+        """
+        Reservas que ocupan algún momento de [desde, hasta). Filtros:
+        restaurante_id, mesa_id, incluir_canceladas.
+        """
+        return list(self.db.scalars(_consulta_solapadas(desde, hasta, **filtros)))
+
+    def mesa_ocupada(
+        self,
+        mesa_id: UUID,
+        desde: datetime,
+        hasta: datetime,
+        excluir: Optional[UUID] = None,
+    ) -> bool:
+        """¿Alguna reserva vigente de la mesa corta [desde, hasta)?"""
+        return bool(
+            self.db.scalar(_consulta_mesa_ocupada(mesa_id, desde, hasta, excluir))
         )
 
     # ---------- ACTUALIZAR ----------
     def actualizar_reserva(self, reserva_id: UUID, **kwargs) -> Optional[Reserva]:
-        reserva = self.obtener_reserva(reserva_id)
-        if not reserva:
-            return None
+        try:
+            if CRUD_MODO_RETURNING:
+                extra = self._verificar_cambio(reserva_id, kwargs)
+                if extra is None:
+                    return None
+                kwargs.update(extra)
+                reserva = ejecutar(
+                    self.db,
+                    sentencia_actualizar(
+                        Reserva, Reserva.id_reserva == reserva_id, kwargs
+                    ),
+                )
+            else:
+                reserva = self.obtener_reserva(reserva_id)
+                if not reserva:
+                    return None
+                kwargs.update(self._verificar_cambio(reserva_id, kwargs, reserva))
 
-        for key, value in kwargs.items():
-            if hasattr(reserva, key):
-                setattr(reserva, key, value)
+                for key, value in kwargs.items():
+                    if hasattr(reserva, key):
+                        setattr(reserva, key, value)
 
-        self.db.commit()
-        self.db.refresh(reserva)
+                self.db.commit()
+                self.db.refresh(reserva)
+        except Exception:
+            self.db.rollback()
+            raise
+        if reserva is not None:
+            _reflejar(reserva)
+            if "restaurante_id" in kwargs:
+                # El tablero del restaurante anterior tampoco vale
+                cache_tablero.invalidar_todo()
+            if kwargs.get("estado") == "cancelada":
+                if isinstance(reserva, Reserva):
+                    # Que la promoción (otras transacciones en la misma
+                    # sesión) no expire la instancia que se devuelve
+                    self.db.expunge(reserva)
+                self._promover_espera(_mesa_liberada(reserva))
         return reserva
 
+    def _verificar_cambio(
+        self, reserva_id: UUID, cambios: dict, actual=None
+    ) -> Optional[dict]:
+        """
+        Si la actualización toca mesa, día, hora, duración o estado,
+        recalcular el periodo y comprobar solapes con la reserva ya
+        modificada.
+
+        Returns:
+            Campos extra a escribir (periodo e inicio), o None si la reserva no existe
+        """
+        if not set(_CAMPOS_MESA) & cambios.keys():
+            return {}
+        if actual is None:
+            actual = self.db.execute(_consulta_campos_mesa(reserva_id)).first()
+            if actual is None:
+                return None
+        extra, despues = _preparar_cambio(actual, cambios)
+        if despues is not None:
+            self._verificar_mesas([despues], excluir=[reserva_id])
+        return extra
+
     # ---------- ELIMINAR ----------
     def eliminar_reserva(self, reserva_id: UUID) -> bool:
-        reserva = self.obtener_reserva(reserva_id)
-        if reserva:
-            self.db.delete(reserva)
-            self.db.commit()
-            return True
-        return False
+        if CRUD_MODO_RETURNING:
+            baja = ejecutar(
+                self.db,
+                sentencia_eliminar(
+                    Reserva, Reserva.id_reserva == reserva_id, *_COLUMNAS_BAJA
+                ),
+            )
+        else:
+            # Tras el commit la instancia borrada queda fuera de la sesión
+            # y conserva los atributos ya cargados
+            baja = self.obtener_reserva(reserva_id)
+            if baja:
+                self.db.delete(baja)
+                self.db.commit()
+        if baja is None:
+            return False
+        motor_disponibilidad.quitar(reserva_id)
+        cache_tablero.invalidar(baja.restaurante_id)
+        if baja.estado != "cancelada":
+            self._promover_espera(_mesa_liberada(baja))
+        return True
+
+    # ---------- LISTA DE ESPERA ----------
+    def _promover_espera(self, liberada) -> None:
+        """
+        Dar la mesa que dejó libre una reserva cancelada o eliminada a la
+        mejor entrada de la lista de espera de su turno que quepa en ella
+        (services.lista_espera). La baja ya está confirmada: si la
+        promoción falla solo se avisa.
+        """
+        if liberada is None:
+            return
+        restaurante_id, inicio, mesa_id = liberada
+        turno = (restaurante_id, inicio)
+        try:
+            if not colas_espera.cargada(turno):
+                colas_espera.cargar(turno, self.db.execute(consulta_turno(turno)).all())
+            capacidad = self.db.scalar(_consulta_capacidad(mesa_id)) or 0
+            aplazadas = []
+            while (candidata := colas_espera.sacar(turno, capacidad)) is not None:
+                entrada = self.db.execute(
+                    _consulta_en_espera(candidata.id_espera)
+                ).first()
+                if entrada is None:  # retirada o promovida en otro lado
+                    self.db.rollback()
+                    continue
+                datos = _datos_promocion(entrada, mesa_id)
+                try:
+                    self._completar([datos])
+                    self._verificar_mesas([datos])
+                except ReservaEnConflicto:
+                    # No cabe en el hueco (dura más): sigue esperando
+                    self.db.rollback()
+                    aplazadas.append(candidata)
+                    continue
+                reserva = self.db.execute(sentencia_insertar(Reserva, datos)).first()
+                self.db.execute(
+                    _sentencia_promover(entrada.id_espera, reserva.id_reserva)
+                )
+                self.db.commit()
+                _reflejar(reserva)
+                colas_espera.promovida()
+                break
+            self.db.rollback()
+            for candidata in aplazadas:
+                colas_espera.devolver(turno, candidata)
+        except Exception as e:
+            self.db.rollback()
+            colas_espera.descartar(turno)
+            print(f"⚠️ No se pudo promover la lista de espera: {e}")
+
+
+class ReservaAsyncCRUD:
+    """Versión asíncrona de ReservaCRUD sobre AsyncSession"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    # ---------- CREAR ----------
+    async def crear_reserva(self, **datos) -> Reserva:
+        datos = _datos_reserva(**datos)
+        try:
+            await self._completar([datos])
+            await self._verificar_mesas([datos])
+            if CRUD_MODO_RETURNING:
+                reserva = await ejecutar_async(
+                    self.db, sentencia_insertar(Reserva, datos)
+                )
+            else:
+                reserva = Reserva(**datos)
+                self.db.add(reserva)
+                await self.db.commit()
+                await self.db.refresh(reserva)
+        except Exception:
+            await self.db.rollback()
+            raise
+        _reflejar(reserva)
+        return reserva
+
+    async def _verificar_mesas(self, nuevas: List[dict], excluir=()) -> None:
+        con_mesa = [datos for datos in nuevas if _ocupa_mesa(datos)]
+        if not con_mesa:
+            return
+        await bloquear_async(
+            self.db, [pareja for datos in con_mesa for pareja in _parejas(datos)]
+        )
+        existentes = (await self.db.execute(_consulta_solapes(con_mesa, excluir))).all()
+        _comprobar_solapes(nuevas, existentes)
+
+    async def _completar(self, filas: List[dict]) -> None:
+        restaurantes = _sin_duracion(filas)
+        duraciones = (
+            dict((await self.db.execute(_consulta_duraciones(restaurantes))).all())
+            if restaurantes
+            else {}
+        )
+        _completar_periodos(filas, duraciones)
+
+    # ---------- OBTENER ----------
+    async def obtener_reserva(self, reserva_id: UUID) -> Optional[Reserva]:
+        return await self.db.scalar(
+            select(Reserva).where(Reserva.id_reserva == reserva_id)
+        )
+
+    async def obtener_reservas(
+        self, skip: int = 0, limit: int = 100, descendente: bool = False, **filtros
+    ) -> List[Reserva]:
+        orden = (
+            [clave.desc() for clave in _ORDEN_RESERVAS]
+            if descendente
+            else _ORDEN_RESERVAS
+        )
+        resultado = await self.db.scalars(
+            _consulta_reservas(**filtros).order_by(*orden).offset(skip).limit(limit)
+        )
+        return list(resultado)
+
+    async def obtener_reservas_pagina(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        descendente: bool = False,
+        **filtros,
+    ) -> Tuple[List[Reserva], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = await self.db.scalars(
+            consulta_pagina(
+                _consulta_reservas(**filtros),
+                _ORDEN_RESERVAS,
+                limit,
+                cursor,
+                descendente,
+            )
+        )
+        return armar_pagina(list(resultado), _ORDEN_RESERVAS, limit, descendente)
+
+    async def obtener_reservas_por_restaurante(
+        self, restaurante_id: UUID, limit: int = 100
+    ) -> List[Reserva]:
+        return await self.obtener_reservas(
+            limit=limit, descendente=True, restaurante_id=restaurante_id
+        )
+
+    async def obtener_columnas_estadisticas(
+        self,
+        restaurante_id: UUID,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> List[tuple]:
+        resultado = await self.db.execute(
+            _consulta_columnas(restaurante_id, desde, hasta)
+        )
+        return resultado.all()
+
+    async def exportar_reservas(
+        self, formato: str, tanda: int = EXPORTACION_TANDA, **filtros
+    ) -> AsyncIterator[Sequence[tuple]]:
+        resultado = await self.db.stream(
+            _consulta_exportacion(formato, **filtros).execution_options(yield_per=tanda)
+        )
+        return resultado.partitions()
+
+    async def obtener_reservas_solapadas(
+        self, desde: datetime, hasta: datetime, **filtros
+    ) -> List[Reserva]:
+        resultado = await self.db.scalars(_consulta_solapadas(desde, hasta, **filtros))
+        return list(resultado)
+
+    async def mesa_ocupada(
+        self,
+        mesa_id: UUID,
+        desde: datetime,
+        hasta: datetime,
+        excluir: Optional[UUID] = None,
+    ) -> bool:
+        return bool(
+            await self.db.scalar(_consulta_mesa_ocupada(mesa_id, desde, hasta, excluir))
+        )
+
+    # ---------- ACTUALIZAR ----------
+    async def actualizar_reserva(self, reserva_id: UUID, **kwargs) -> Optional[Reserva]:
+        try:
+            if CRUD_MODO_RETURNING:
+                extra = await self._verificar_cambio(reserva_id, kwargs)
+                if extra is None:
+                    return None
+                kwargs.update(extra)
+                reserva = await ejecutar_async(
+                    self.db,
+                    sentencia_actualizar(
+                        Reserva, Reserva.id_reserva == reserva_id, kwargs
+                    ),
+                )
+            else:
+                reserva = await self.obtener_reserva(reserva_id)
+                if not reserva:
+                    return None
+                kwargs.update(await self._verificar_cambio(reserva_id, kwargs, reserva))
+
+                for key, value in kwargs.items():
+                    if hasattr(reserva, key):
+                        setattr(reserva, key, value)
+
+                await self.db.commit()
+                await self.db.refresh(reserva)
+        except Exception:
+            await self.db.rollback()
+            raise
+        if reserva is not None:
+            _reflejar(reserva)
+            if "restaurante_id" in kwargs:
+                # El tablero del restaurante anterior tampoco vale
+                cache_tablero.invalidar_todo()
+            if kwargs.get("estado") == "cancelada":
+                if isinstance(reserva, Reserva):
+                    self.db.expunge(reserva)
+                await self._promover_espera(_mesa_liberada(reserva))
+        return reserva
+
+    async def _verificar_cambio(
+        self, reserva_id: UUID, cambios: dict, actual=None
+    ) -> Optional[dict]:
+        if not set(_CAMPOS_MESA) & cambios.keys():
+            return {}
+        if actual is None:
+            actual = (await self.db.execute(_consulta_campos_mesa(reserva_id))).first()
+            if actual is None:
+                return None
+        extra, despues = _preparar_cambio(actual, cambios)
+        if despues is not None:
+            await self._verificar_mesas([despues], excluir=[reserva_id])
+        return extra
+
+    # ---------- ELIMINAR ----------
+    async def eliminar_reserva(self, reserva_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            baja = await ejecutar_async(
+                self.db,
+                sentencia_eliminar(
+                    Reserva, Reserva.id_reserva == reserva_id, *_COLUMNAS_BAJA
+                ),
+            )
+        else:
+            baja = await self.obtener_reserva(reserva_id)
+            if baja:
+                await self.db.delete(baja)
+                await self.db.commit()
+        if baja is None:
+            return False
+        motor_disponibilidad.quitar(reserva_id)
+        cache_tablero.invalidar(baja.restaurante_id)
+        if baja.estado != "cancelada":
+            await self._promover_espera(_mesa_liberada(baja))
+        return True
+
+    # ---------- LISTA DE ESPERA ----------
+    async def _promover_espera(self, liberada) -> None:
+        if liberada is None:
+            return
+        restaurante_id, inicio, mesa_id = liberada
+        turno = (restaurante_id, inicio)
+        try:
+            if not colas_espera.cargada(turno):
+                filas = (await self.db.execute(consulta_turno(turno))).all()
+                colas_espera.cargar(turno, filas)
+            capacidad = await self.db.scalar(_consulta_capacidad(mesa_id)) or 0
+            aplazadas = []
+            while (candidata := colas_espera.sacar(turno, capacidad)) is not None:
+                entrada = (
+                    await self.db.execute(_consulta_en_espera(candidata.id_espera))
+                ).first()
+                if entrada is None:
+                    await self.db.rollback()
+                    continue
+                datos = _datos_promocion(entrada, mesa_id)
+                try:
+                    await self._completar([datos])
+                    await self._verificar_mesas([datos])
+                except ReservaEnConflicto:
+                    await self.db.rollback()
+                    aplazadas.append(candidata)
+                    continue
+                reserva = (
+                    await self.db.execute(sentencia_insertar(Reserva, datos))
+                ).first()
+                await self.db.execute(
+                    _sentencia_promover(entrada.id_espera, reserva.id_reserva)
+                )
+                await self.db.commit()
+                _reflejar(reserva)
+                colas_espera.promovida()
+                break
+            await self.db.rollback()
+            for candidata in aplazadas:
+                colas_espera.devolver(turno, candidata)
+        except Exception as e:
+            await self.db.rollback()
+            colas_espera.descartar(turno)
+            print(f"⚠️ No se pudo promover la lista de espera: {e}")
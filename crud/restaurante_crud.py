@@ -2,10 +2,62 @@
 Operaciones CRUD para Restaurante
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from crud.paginacion import armar_pagina, consulta_pagina
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
 from database.models.restaurante import Restaurante
+from services.disponibilidad import RESERVA_DURACION_MIN, invalida_locales
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden estable (e indexado) de los listados y clave del cursor
+_ORDEN_RESTAURANTES = (Restaurante.id_restaurante,)
+
+
+def _datos_restaurante(
+    nombre: str,
+    direccion: str,
+    telefono: Optional[str],
+    email: Optional[str],
+    capacidad_maxima: int,
+    horario_apertura: str,
+    horario_cierre: str,
+    activo: bool,
+    usuario_admin_id: UUID,
+    duracion_reserva_min: int = RESERVA_DURACION_MIN,
+) -> dict:
+    """
+    Validar y normalizar los datos de un restaurante
+    (compartido por el CRUD síncrono y asíncrono)
+    """
+    if capacidad_maxima <= 0:
+        raise ValueError("La capacidad máxima debe ser mayor a 0")
+    if duracion_reserva_min <= 0:
+        raise ValueError("La duración de las reservas debe ser mayor a 0")
+
+    return dict(
+        nombre=nombre.strip(),
+        direccion=direccion.strip(),
+        telefono=telefono,
+        email=email,
+        capacidad_maxima=capacidad_maxima,
+        horario_apertura=horario_apertura,
+        horario_cierre=horario_cierre,
+        activo=activo,
+        usuario_admin_id=usuario_admin_id,
+        duracion_reserva_min=duracion_reserva_min,
+    )
 
 
 class RestauranteCRUD:
@@ -24,13 +76,11 @@ class RestauranteCRUD:
         horario_cierre: str,
         activo: bool,
         usuario_admin_id: UUID,
+        duracion_reserva_min: int = RESERVA_DURACION_MIN,
     ) -> Restaurante:
-        if capacidad_maxima <= 0:
-            raise ValueError("La capacidad máxima debe ser mayor a 0")
-
-        restaurante = Restaurante(
-            nombre=nombre.strip(),
-            direccion=direccion.strip(),
+        datos = _datos_restaurante(
+            nombre=nombre,
+            direccion=direccion,
             telefono=telefono,
             email=email,
             capacidad_maxima=capacidad_maxima,
@@ -38,7 +88,12 @@ class RestauranteCRUD:
             horario_cierre=horario_cierre,
             activo=activo,
             usuario_admin_id=usuario_admin_id,
+            duracion_reserva_min=duracion_reserva_min,
         )
+        if CRUD_MODO_RETURNING:
+            return ejecutar(self.db, sentencia_insertar(Restaurante, datos))
+
+        restaurante = Restaurante(**datos)
         self.db.add(restaurante)
         self.db.commit()
         self.db.refresh(restaurante)
@@ -55,12 +110,38 @@ class RestauranteCRUD:
     def obtener_restaurantes(
         self, skip: int = 0, limit: int = 100
     ) -> List[Restaurante]:
-        return self.db.query(Restaurante).offset(skip).limit(limit).all()
+        return (
+            self.db.query(Restaurante)
+            .order_by(*_ORDEN_RESTAURANTES)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def obtener_restaurantes_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Restaurante], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = self.db.scalars(
+            consulta_pagina(select(Restaurante), _ORDEN_RESTAURANTES, limit, cursor)
+        )
+        return armar_pagina(list(resultado), _ORDEN_RESTAURANTES, limit)
 
     # ---------- ACTUALIZAR ----------
+    @invalida_locales
     def actualizar_restaurante(
         self, restaurante_id: UUID, **kwargs
     ) -> Optional[Restaurante]:
+        if CRUD_MODO_RETURNING:
+            return ejecutar(
+                self.db,
+                sentencia_actualizar(
+                    Restaurante, Restaurante.id_restaurante == restaurante_id, kwargs
+                ),
+            )
+
         restaurante = self.obtener_restaurante(restaurante_id)
         if not restaurante:
             return None
@@ -74,10 +155,112 @@ class RestauranteCRUD:
         return restaurante
 
     # ---------- ELIMINAR ----------
+    @invalida_locales
     def eliminar_restaurante(self, restaurante_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                ejecutar(
+                    self.db,
+                    sentencia_eliminar(
+                        Restaurante, Restaurante.id_restaurante == restaurante_id
+                    ),
+                )
+                is not None
+            )
+
         restaurante = self.obtener_restaurante(restaurante_id)
         if restaurante:
             self.db.delete(restaurante)
             self.db.commit()
             return True
         return False
+
+
+class RestauranteAsyncCRUD:
+    """Versión asíncrona de RestauranteCRUD sobre AsyncSession"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    # ---------- CREAR ----------
+    async def crear_restaurante(self, **datos) -> Restaurante:
+        datos = _datos_restaurante(**datos)
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(self.db, sentencia_insertar(Restaurante, datos))
+
+        restaurante = Restaurante(**datos)
+        self.db.add(restaurante)
+        await self.db.commit()
+        await self.db.refresh(restaurante)
+        return restaurante
+
+    # ---------- OBTENER ----------
+    async def obtener_restaurante(self, restaurante_id: UUID) -> Optional[Restaurante]:
+        return await self.db.scalar(
+            select(Restaurante).where(Restaurante.id_restaurante == restaurante_id)
+        )
+
+    async def obtener_restaurantes(
+        self, skip: int = 0, limit: int = 100
+    ) -> List[Restaurante]:
+        resultado = await self.db.scalars(
+            select(Restaurante).order_by(*_ORDEN_RESTAURANTES).offset(skip).limit(limit)
+        )
+        return list(resultado)
+
+    async def obtener_restaurantes_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Restaurante], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = await self.db.scalars(
+            consulta_pagina(select(Restaurante), _ORDEN_RESTAURANTES, limit, cursor)
+        )
+        return armar_pagina(list(resultado), _ORDEN_RESTAURANTES, limit)
+
+    # ---------- ACTUALIZAR ----------
+    @invalida_locales
+    async def actualizar_restaurante(
+        self, restaurante_id: UUID, **kwargs
+    ) -> Optional[Restaurante]:
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(
+                self.db,
+                sentencia_actualizar(
+                    Restaurante, Restaurante.id_restaurante == restaurante_id, kwargs
+                ),
+            )
+
+        restaurante = await self.obtener_restaurante(restaurante_id)
+        if not restaurante:
+            return None
+
+        for key, value in kwargs.items():
+            if hasattr(restaurante, key):
+                setattr(restaurante, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(restaurante)
+        return restaurante
+
+    # ---------- ELIMINAR ----------
+    @invalida_locales
+    async def eliminar_restaurante(self, restaurante_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                await ejecutar_async(
+                    self.db,
+                    sentencia_eliminar(
+                        Restaurante, Restaurante.id_restaurante == restaurante_id
+                    ),
+                )
+                is not None
+            )
+
+        restaurante = await self.obtener_restaurante(restaurante_id)
+        if restaurante:
+            await self.db.delete(restaurante)
+            await self.db.commit()
+            return True
+        return False
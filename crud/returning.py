@@ -0,0 +1,96 @@
+"""
+Escrituras en una sola sentencia con RETURNING
+
+Con CRUD_MODO_RETURNING activo, crear/actualizar/eliminar ejecutan un
+único INSERT/UPDATE/DELETE ... RETURNING en lugar de SELECT + commit +
+refresh. La fila devuelta (un Row con acceso por atributo) alimenta
+directamente el esquema de respuesta, y "no encontrado" sale de que la
+sentencia no afectó ninguna fila.
+"""
+
+import os
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+CRUD_MODO_RETURNING = os.getenv("CRUD_MODO_RETURNING", "false").lower() in (
+    "1",
+    "true",
+    "si",
+)
+
+
+def _columnas(modelo):
+    return modelo.__table__.c
+
+
+def sentencia_insertar(modelo, datos: Dict[str, Any]):
+    """
+    INSERT ... RETURNING con todas las columnas (defaults incluidos)
+    """
+    return insert(modelo).values(**datos).returning(*_columnas(modelo))
+
+
+def sentencia_actualizar(modelo, condicion, valores: Dict[str, Any]):
+    """
+    UPDATE ... RETURNING solo con las claves que son columnas del modelo.
+    Sin valores que aplicar se devuelve la fila actual con un SELECT.
+    """
+    columnas = _columnas(modelo)
+    valores = {clave: valor for clave, valor in valores.items() if clave in columnas}
+    if not valores:
+        return select(*columnas).where(condicion)
+    return update(modelo).where(condicion).values(**valores).returning(*columnas)
+
+
+def sentencia_eliminar(modelo, condicion, *columnas):
+    """
+    DELETE ... RETURNING de la clave primaria (o de las columnas indicadas).
+
+    Igual que session.delete(), las filas hijas con clave foránea opcional
+    quedan desvinculadas (NULL); se hace en un CTE de la misma sentencia.
+    """
+    tabla = modelo.__table__
+    clave = list(tabla.primary_key)[0]
+    sentencia = delete(modelo).where(condicion).returning(*(columnas or (clave,)))
+
+    for hija in tabla.metadata.sorted_tables:
+        for fk in hija.foreign_keys:
+            if fk.column.table is tabla and fk.parent.nullable:
+                sentencia = sentencia.add_cte(
+                    update(hija)
+                    .where(fk.parent.in_(select(clave).where(condicion)))
+                    .values({fk.parent.name: None})
+                    .cte(f"desvincular_{hija.name}_{fk.parent.name}")
+                )
+    return sentencia
+
+
+def ejecutar(db: Session, sentencia) -> Optional[Row]:
+    """
+    Ejecutar la sentencia, confirmar y devolver la fila afectada (o None)
+    """
+    try:
+        fila = db.execute(sentencia).first()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return fila
+
+
+async def ejecutar_async(db: "AsyncSession", sentencia) -> Optional[Row]:
+    """
+    Versión asíncrona de ejecutar()
+    """
+    try:
+        fila = (await db.execute(sentencia)).first()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return fila
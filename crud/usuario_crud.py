@@ -3,13 +3,38 @@ Operaciones CRUD para Usuario
 """
 
 import re
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from uuid import UUID
 
+from auth.hashing import servicio_hash
 from auth.security import PasswordManager
+from crud.paginacion import armar_pagina, consulta_pagina
+from crud.returning import (
+    CRUD_MODO_RETURNING,
+    ejecutar,
+    ejecutar_async,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
 from database.models.usuario import Usuario
+from sqlalchemy import exists, select, update
 from sqlalchemy.orm import Session
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Orden estable (e indexado) de los listados y clave del cursor
+_ORDEN_USUARIOS = (Usuario.id_usuario,)
+
+
+def _condicion_usuario(usuario_id: UUID):
+    return (Usuario.id_usuario == usuario_id) & (Usuario.activo == True)
+
+
+def _consulta_usuario_existe(usuario_id: UUID):
+    return select(exists().where(_condicion_usuario(usuario_id)))
+
 
 class UsuarioCRUD:
     def __init__(self, db: Session):
@@ -67,17 +92,21 @@ class UsuarioCRUD:
         if telefono and not self._validar_telefono(telefono):
             raise ValueError("Formato de teléfono inválido")
 
-        usuario = Usuario(
+        datos = dict(
             nombre=nombre.strip(),
             apellido=apellido.strip(),
             nombre_usuario=nombre_usuario.lower().strip(),
             email=email.lower().strip(),
-            contrasena=PasswordManager.hash_password(
+            contrasena=servicio_hash.hash_password_sync(
                 contrasena
             ),  # 🔑 aquí guardamos el hash
             telefono=telefono.strip() if telefono else None,
             es_admin=es_admin,
         )
+        if CRUD_MODO_RETURNING:
+            return ejecutar(self.db, sentencia_insertar(Usuario, datos))
+
+        usuario = Usuario(**datos)
         self.db.add(usuario)
         self.db.commit()
         self.db.refresh(usuario)
@@ -114,11 +143,28 @@ class UsuarioCRUD:
         return (
             self.db.query(Usuario)
             .filter(Usuario.activo == True)
+            .order_by(*_ORDEN_USUARIOS)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def obtener_usuarios_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Usuario], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = self.db.scalars(
+            consulta_pagina(
+                select(Usuario).where(Usuario.activo == True),
+                _ORDEN_USUARIOS,
+                limit,
+                cursor,
+            )
+        )
+        return armar_pagina(list(resultado), _ORDEN_USUARIOS, limit)
+
     # ------------------ AUTENTICAR ------------------
     def autenticar_usuario(
         self, nombre_usuario: str, contrasena: str
@@ -128,15 +174,43 @@ class UsuarioCRUD:
             usuario = self.obtener_usuario_por_email(nombre_usuario)
         if not usuario or not usuario.activo:
             return None
-        if PasswordManager.verify_password(contrasena, usuario.contrasena):
-            return usuario
-        return None
+        if not servicio_hash.verify_password_sync(contrasena, usuario.contrasena):
+            return None
+        if PasswordManager.necesita_rehash(usuario.contrasena):
+            self._actualizar_hash(usuario, contrasena)
+        return usuario
+
+    def _actualizar_hash(self, usuario: Usuario, contrasena: str) -> None:
+        """
+        Reemplazar un hash legado o con costo desactualizado tras un login
+        válido. Solo si nadie cambió la contraseña mientras tanto; un fallo
+        aquí no impide el login.
+        """
+        try:
+            self.db.execute(
+                update(Usuario)
+                .where(
+                    Usuario.id_usuario == usuario.id_usuario,
+                    Usuario.contrasena == usuario.contrasena,
+                )
+                .values(contrasena=servicio_hash.hash_password_sync(contrasena))
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"⚠️ No se pudo actualizar el hash del usuario: {e}")
 
     # ------------------ ACTUALIZAR ------------------
     def actualizar_usuario(self, usuario_id: UUID, **kwargs) -> Optional[Usuario]:
-        usuario = self.obtener_usuario(usuario_id)
-        if not usuario:
-            return None
+        if not CRUD_MODO_RETURNING:
+            usuario = self.obtener_usuario(usuario_id)
+            if not usuario:
+                return None
+        elif "contrasena" in kwargs:
+            # El hash es lo caro: no calcularlo para un usuario inexistente
+            if not self.db.scalar(_consulta_usuario_existe(usuario_id)):
+                return None
 
         if "email" in kwargs:
             email = kwargs["email"]
@@ -166,7 +240,13 @@ class UsuarioCRUD:
             es_valida, mensaje = PasswordManager.validate_password_strength(contrasena)
             if not es_valida:
                 raise ValueError(f"Contraseña inválida: {mensaje}")
-            kwargs["contrasena"] = PasswordManager.hash_password(contrasena)
+            kwargs["contrasena"] = servicio_hash.hash_password_sync(contrasena)
+
+        if CRUD_MODO_RETURNING:
+            return ejecutar(
+                self.db,
+                sentencia_actualizar(Usuario, _condicion_usuario(usuario_id), kwargs),
+            )
 
         for key, value in kwargs.items():
             if hasattr(usuario, key):
@@ -178,6 +258,14 @@ class UsuarioCRUD:
 
     # ------------------ ELIMINAR ------------------
     def eliminar_usuario(self, usuario_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                ejecutar(
+                    self.db, sentencia_eliminar(Usuario, _condicion_usuario(usuario_id))
+                )
+                is not None
+            )
+
         usuario = self.obtener_usuario(usuario_id)
         if usuario:
             self.db.delete(usuario)
@@ -186,6 +274,14 @@ class UsuarioCRUD:
         return False
 
     def desactivar_usuario(self, usuario_id: UUID) -> Optional[Usuario]:
+        if CRUD_MODO_RETURNING:
+            return ejecutar(
+                self.db,
+                sentencia_actualizar(
+                    Usuario, _condicion_usuario(usuario_id), {"activo": False}
+                ),
+            )
+
         usuario = self.obtener_usuario(usuario_id)
         if not usuario:
             return None
@@ -219,3 +315,229 @@ class UsuarioCRUD:
             )
             .first()
         )
+
+
+class UsuarioAsyncCRUD:
+    """
+    Versión asíncrona de UsuarioCRUD sobre AsyncSession.
+    El hash PBKDF2 se espera sin bloquear el event loop (pool de procesos).
+    """
+
+    _validar_email = UsuarioCRUD._validar_email
+    _validar_telefono = UsuarioCRUD._validar_telefono
+    _validar_nombre_usuario = UsuarioCRUD._validar_nombre_usuario
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    # ------------------ CREAR ------------------
+    async def crear_usuario(
+        self,
+        nombre: str,
+        apellido: str,
+        nombre_usuario: str,
+        email: str,
+        contrasena: str,
+        telefono: Optional[str] = None,
+        es_admin: bool = False,
+    ) -> Usuario:
+        if not nombre.strip():
+            raise ValueError("El nombre es obligatorio")
+        if not apellido.strip():
+            raise ValueError("El apellido es obligatorio")
+        if len(nombre) > 100 or len(apellido) > 100:
+            raise ValueError("Nombre o apellido demasiado largo")
+
+        if not nombre_usuario or not self._validar_nombre_usuario(nombre_usuario):
+            raise ValueError(
+                "El nombre de usuario debe tener entre 3-20 caracteres y solo contener letras, números y guiones bajos"
+            )
+        if await self.obtener_usuario_por_nombre_usuario(nombre_usuario):
+            raise ValueError("El nombre de usuario ya existe")
+
+        if not email or not self._validar_email(email):
+            raise ValueError("Email inválido")
+        if await self.obtener_usuario_por_email(email):
+            raise ValueError("El email ya está registrado")
+
+        if not contrasena:
+            raise ValueError("La contraseña es obligatoria")
+        es_valida, mensaje = PasswordManager.validate_password_strength(contrasena)
+        if not es_valida:
+            raise ValueError(f"Contraseña inválida: {mensaje}")
+
+        if telefono and not self._validar_telefono(telefono):
+            raise ValueError("Formato de teléfono inválido")
+
+        datos = dict(
+            nombre=nombre.strip(),
+            apellido=apellido.strip(),
+            nombre_usuario=nombre_usuario.lower().strip(),
+            email=email.lower().strip(),
+            contrasena=await servicio_hash.hash_password(contrasena),
+            telefono=telefono.strip() if telefono else None,
+            es_admin=es_admin,
+        )
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(self.db, sentencia_insertar(Usuario, datos))
+
+        usuario = Usuario(**datos)
+        self.db.add(usuario)
+        await self.db.commit()
+        await self.db.refresh(usuario)
+        return usuario
+
+    # ------------------ OBTENER ------------------
+    async def obtener_usuario(self, usuario_id: UUID) -> Optional[Usuario]:
+        return await self.db.scalar(
+            select(Usuario).where(
+                Usuario.id_usuario == usuario_id, Usuario.activo == True
+            )
+        )
+
+    async def obtener_usuario_por_email(self, email: str) -> Optional[Usuario]:
+        return await self.db.scalar(
+            select(Usuario).where(
+                Usuario.email == email.lower().strip(), Usuario.activo == True
+            )
+        )
+
+    async def obtener_usuario_por_nombre_usuario(
+        self, nombre_usuario: str
+    ) -> Optional[Usuario]:
+        return await self.db.scalar(
+            select(Usuario).where(
+                Usuario.nombre_usuario == nombre_usuario.lower().strip(),
+                Usuario.activo == True,
+            )
+        )
+
+    async def obtener_usuarios(self, skip: int = 0, limit: int = 100) -> List[Usuario]:
+        resultado = await self.db.scalars(
+            select(Usuario)
+            .where(Usuario.activo == True)
+            .order_by(*_ORDEN_USUARIOS)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(resultado)
+
+    async def obtener_usuarios_pagina(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Usuario], Optional[str]]:
+        """
+        Página por cursor y cursor de la página siguiente
+        """
+        resultado = await self.db.scalars(
+            consulta_pagina(
+                select(Usuario).where(Usuario.activo == True),
+                _ORDEN_USUARIOS,
+                limit,
+                cursor,
+            )
+        )
+        return armar_pagina(list(resultado), _ORDEN_USUARIOS, limit)
+
+    # ------------------ AUTENTICAR ------------------
+    async def autenticar_usuario(
+        self, nombre_usuario: str, contrasena: str
+    ) -> Optional[Usuario]:
+        usuario = await self.obtener_usuario_por_nombre_usuario(nombre_usuario)
+        if not usuario:
+            usuario = await self.obtener_usuario_por_email(nombre_usuario)
+        if not usuario or not usuario.activo:
+            return None
+        if not await servicio_hash.verify_password(contrasena, usuario.contrasena):
+            return None
+        if PasswordManager.necesita_rehash(usuario.contrasena):
+            await self._actualizar_hash(usuario, contrasena)
+        return usuario
+
+    async def _actualizar_hash(self, usuario: Usuario, contrasena: str) -> None:
+        try:
+            nuevo = await servicio_hash.hash_password(contrasena)
+            await self.db.execute(
+                update(Usuario)
+                .where(
+                    Usuario.id_usuario == usuario.id_usuario,
+                    Usuario.contrasena == usuario.contrasena,
+                )
+                .values(contrasena=nuevo)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            print(f"⚠️ No se pudo actualizar el hash del usuario: {e}")
+
+    # ------------------ ACTUALIZAR ------------------
+    async def actualizar_usuario(self, usuario_id: UUID, **kwargs) -> Optional[Usuario]:
+        if not CRUD_MODO_RETURNING:
+            usuario = await self.obtener_usuario(usuario_id)
+            if not usuario:
+                return None
+        elif "contrasena" in kwargs:
+            # El hash es lo caro: no calcularlo para un usuario inexistente
+            if not await self.db.scalar(_consulta_usuario_existe(usuario_id)):
+                return None
+
+        if "email" in kwargs:
+            email = kwargs["email"]
+            if not self._validar_email(email):
+                raise ValueError("Email inválido")
+            existente = await self.obtener_usuario_por_email(email)
+            if existente and existente.id_usuario != usuario_id:
+                raise ValueError("El email ya está registrado")
+            kwargs["email"] = email.lower().strip()
+
+        if "telefono" in kwargs and kwargs["telefono"]:
+            if not self._validar_telefono(kwargs["telefono"]):
+                raise ValueError("Formato de teléfono inválido")
+            kwargs["telefono"] = kwargs["telefono"].strip()
+
+        if "nombre_usuario" in kwargs:
+            nombre_usuario = kwargs["nombre_usuario"]
+            if not self._validar_nombre_usuario(nombre_usuario):
+                raise ValueError("Nombre de usuario inválido")
+            existente = await self.obtener_usuario_por_nombre_usuario(nombre_usuario)
+            if existente and existente.id_usuario != usuario_id:
+                raise ValueError("El nombre de usuario ya está en uso")
+            kwargs["nombre_usuario"] = nombre_usuario.lower().strip()
+
+        if "contrasena" in kwargs:
+            contrasena = kwargs["contrasena"]
+            es_valida, mensaje = PasswordManager.validate_password_strength(contrasena)
+            if not es_valida:
+                raise ValueError(f"Contraseña inválida: {mensaje}")
+            kwargs["contrasena"] = await servicio_hash.hash_password(contrasena)
+
+        if CRUD_MODO_RETURNING:
+            return await ejecutar_async(
+                self.db,
+                sentencia_actualizar(Usuario, _condicion_usuario(usuario_id), kwargs),
+            )
+
+        for key, value in kwargs.items():
+            if hasattr(usuario, key):
+                setattr(usuario, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(usuario)
+        return usuario
+
+    # ------------------ ELIMINAR ------------------
+    async def eliminar_usuario(self, usuario_id: UUID) -> bool:
+        if CRUD_MODO_RETURNING:
+            return (
+                await ejecutar_async(
+                    self.db, sentencia_eliminar(Usuario, _condicion_usuario(usuario_id))
+                )
+                is not None
+            )
+
+        usuario = await self.obtener_usuario(usuario_id)
+        if usuario:
+            await self.db.delete(usuario)
+            await self.db.commit()
+            return True
+        return False
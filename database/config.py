@@ -6,9 +6,13 @@ import os
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from database.instrumentacion import instrumentar_engine
+from database.pool import opciones_pool
+
 load_dotenv()
 
 
@@ -24,12 +28,50 @@ engine = create_engine(
     pool_pre_ping=True,  # Verificar conexión antes de usar
     pool_recycle=300,  # Reciclar conexiones cada 5 minutos
     connect_args={"sslmode": "require"},  # Requerir SSL para Neon
+    **opciones_pool(),  # Perfil de pool (DB_POOL_PERFIL)
 )
+instrumentar_engine(engine)  # Conteo y tiempos de consultas por request
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def _url_async(url: str):
+    """
+    Convertir la URL síncrona a una URL para el driver asyncpg.
+    asyncpg no entiende sslmode/channel_binding en la URL; el SSL se
+    pasa mediante connect_args.
+    """
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .difference_update_query(["sslmode", "channel_binding"])
+    )
+
+
+# Motor asíncrono (opcional: requiere asyncpg)
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        _url_async(DATABASE_URL),
+        echo=False,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"ssl": "require"},  # Requerir SSL para Neon
+        **opciones_pool(asincrono=True),
+    )
+    instrumentar_engine(async_engine)
+    # expire_on_commit=False: en modo asíncrono no se permiten cargas
+    # perezosas después del commit
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+except ImportError:
+    async_engine = None
+    AsyncSessionLocal = None
+
+
 Base = declarative_base()
 
 
@@ -44,6 +86,16 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Generador de sesiones asíncronas de base de datos
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("El modo asíncrono requiere el paquete asyncpg")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """
     Crear todas las tablas definidas en los modelos
@@ -2,17 +2,18 @@
 Script para inicializar la base de datos
 """
 
-from database.config import create_tables, engine
+from database.config import engine
+from database.migraciones import aplicar_migraciones
 from database.models.all_models import *
 
 def init_database():
     """
-    Inicializar la base de datos creando todas las tablas
+    Inicializar la base de datos aplicando las migraciones pendientes
     """
     try:
-        print("Creando tablas en la base de datos...")
-        create_tables()
-        print("✅ Tablas creadas exitosamente!")
+        print("Aplicando migraciones en la base de datos...")
+        aplicar_migraciones()
+        print("✅ Tablas e índices creados exitosamente!")
         return True
     except Exception as e:
         print(f"❌ Error al crear las tablas: {e}")
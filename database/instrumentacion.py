@@ -0,0 +1,142 @@
+"""
+Instrumentación de consultas SQL por request
+
+Los eventos del engine cuentan y cronometran cada sentencia dentro del
+request en curso (ContextVar), detectan sentencias repetidas (N+1) y
+registran las consultas lentas con la forma de sus parámetros.
+"""
+
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+SQL_LENTA_MS = float(os.getenv("SQL_LENTA_MS", "200"))
+SQL_N_MAS_1_UMBRAL = int(os.getenv("SQL_N_MAS_1_UMBRAL", "5"))
+
+logger_lentas = logging.getLogger("restaurante.sql.lentas")
+logger_n_mas_1 = logging.getLogger("restaurante.sql.n_mas_1")
+
+
+class EstadisticasConsultas:
+    """Consultas ejecutadas durante un request"""
+
+    __slots__ = ("total", "tiempo_s", "por_sentencia")
+
+    def __init__(self):
+        self.total = 0
+        self.tiempo_s = 0.0
+        self.por_sentencia: Counter = Counter()
+
+    def registrar(self, sentencia: str, duracion: float) -> None:
+        self.total += 1
+        self.tiempo_s += duracion
+        self.por_sentencia[sentencia] += 1
+
+    def repetidas(self, umbral: int = SQL_N_MAS_1_UMBRAL) -> List[tuple]:
+        """
+        Sentencias idénticas ejecutadas al menos `umbral` veces (posible N+1)
+        """
+        return [
+            (sentencia, veces)
+            for sentencia, veces in self.por_sentencia.most_common()
+            if veces >= umbral
+        ]
+
+
+_consultas_request: ContextVar[Optional[EstadisticasConsultas]] = ContextVar(
+    "consultas_request", default=None
+)
+
+
+def iniciar_medicion() -> Token:
+    return _consultas_request.set(EstadisticasConsultas())
+
+
+def finalizar_medicion(token: Token) -> EstadisticasConsultas:
+    estadisticas = _consultas_request.get()
+    _consultas_request.reset(token)
+    return estadisticas
+
+
+def medicion_actual() -> Optional[EstadisticasConsultas]:
+    return _consultas_request.get()
+
+
+def _forma(valor: Any) -> Any:
+    if isinstance(valor, dict):
+        return {clave: type(v).__name__ for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [type(v).__name__ for v in valor]
+    return type(valor).__name__
+
+
+def forma_parametros(parametros: Any, executemany: bool) -> Any:
+    """
+    Tipos de los parámetros, sin sus valores (no se registran datos personales)
+    """
+    # Con insertmanyvalues cada lote llega como un solo dict aunque
+    # executemany sea verdadero
+    if executemany and isinstance(parametros, (list, tuple)) and parametros:
+        return {"filas": len(parametros), "forma": _forma(parametros[0])}
+    return _forma(parametros)
+
+
+def instrumentar_engine(engine) -> None:
+    """
+    Registrar los eventos de medición en un engine (síncrono o asíncrono)
+    """
+    engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        duracion = time.perf_counter() - conn.info["inicio_consulta"].pop()
+
+        estadisticas = _consultas_request.get()
+        if estadisticas is not None:
+            estadisticas.registrar(statement, duracion)
+
+        if duracion * 1000 >= SQL_LENTA_MS:
+            logger_lentas.warning(
+                "Consulta lenta (%.1f ms): %s | parámetros: %s",
+                duracion * 1000,
+                statement,
+                forma_parametros(parameters, executemany),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(contexto):
+        # Descartar el inicio pendiente si la sentencia falló
+        conn = contexto.connection
+        if conn is not None and conn.info.get("inicio_consulta"):
+            conn.info["inicio_consulta"].pop()
+
+
+def resumen_encabezados(
+    estadisticas: EstadisticasConsultas, ruta: str
+) -> Dict[str, str]:
+    """
+    Encabezados de respuesta con el costo SQL del request
+    """
+    encabezados = {
+        "Server-Timing": (
+            f'db;dur={estadisticas.tiempo_s * 1000:.2f};desc="{estadisticas.total} consultas"'
+        ),
+        "X-DB-Queries": str(estadisticas.total),
+    }
+    repetidas = estadisticas.repetidas()
+    if repetidas:
+        encabezados["X-DB-N-Plus-1"] = str(len(repetidas))
+        for sentencia, veces in repetidas:
+            logger_n_mas_1.warning(
+                "Posible N+1 en %s: %d ejecuciones de %s", ruta, veces, sentencia
+            )
+    return encabezados
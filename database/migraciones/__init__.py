@@ -0,0 +1,159 @@
+"""
+Sistema de migraciones versionadas
+
+Cada migración es un módulo mNNNN_<nombre>.py de este paquete que define:
+    VERSION        número de versión (entero creciente)
+    DESCRIPCION    texto corto
+    TRANSACCIONAL  False si usa sentencias que no admiten transacción
+                   (CREATE INDEX CONCURRENTLY)
+    aplicar(conexion)
+
+Las versiones aplicadas se registran en la tabla schema_migraciones.
+"""
+
+import importlib
+import pkgutil
+import re
+from typing import List, Set
+
+from sqlalchemy import text
+
+TABLA_VERSIONES = "schema_migraciones"
+
+# Clave del advisory lock que serializa migraciones entre instancias
+_CLAVE_LOCK = 7_402_117
+
+
+def cargar_migraciones() -> list:
+    """
+    Importar los módulos de migración ordenados por versión
+    """
+    migraciones = [
+        importlib.import_module(f"{__name__}.{modulo.name}")
+        for modulo in pkgutil.iter_modules(__path__)
+        if re.match(r"^m\d{4}_", modulo.name)
+    ]
+    return sorted(migraciones, key=lambda m: m.VERSION)
+
+
+def versiones_aplicadas(conexion) -> Set[int]:
+    conexion.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {TABLA_VERSIONES} ("
+            " version INTEGER PRIMARY KEY,"
+            " descripcion TEXT NOT NULL,"
+            " aplicada_en TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+    )
+    return set(
+        conexion.execute(text(f"SELECT version FROM {TABLA_VERSIONES}")).scalars()
+    )
+
+
+def _registrar(conexion, migracion) -> None:
+    conexion.execute(
+        text(
+            f"INSERT INTO {TABLA_VERSIONES} (version, descripcion) "
+            "VALUES (:version, :descripcion)"
+        ),
+        {"version": migracion.VERSION, "descripcion": migracion.DESCRIPCION},
+    )
+
+
+def crear_indice_concurrente(conexion, nombre: str, definicion: str) -> None:
+    """
+    Crear un índice sin bloquear escrituras. Si una ejecución anterior dejó
+    el índice inválido (build interrumpido), se elimina y se reconstruye.
+
+    definicion: "ON tabla (columnas) [WHERE condicion]"
+    """
+    invalido = conexion.execute(
+        text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :nombre"
+        ),
+        {"nombre": nombre},
+    ).scalar()
+    if invalido:
+        conexion.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}"))
+    conexion.execute(
+        text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {nombre} {definicion}")
+    )
+
+
+def rellenar_por_lotes(
+    conexion, tabla: str, clave: str, asignacion: str, condicion: str, lote: int
+) -> int:
+    """
+    UPDATE tabla SET asignacion WHERE condicion, recorriendo la tabla por
+    su clave primaria (UUID) en lotes de `lote` filas. Con la conexión en
+    AUTOCOMMIT cada lote es su propia transacción y solo bloquea sus
+    filas, así que las escrituras no esperan al relleno completo.
+
+    Returns:
+        Cantidad de filas actualizadas
+    """
+    # Devuelve la última clave recorrida (NULL al terminar) y cuántas
+    # filas del lote se actualizaron
+    sentencia = text(f"""
+        WITH lote AS (
+            SELECT {clave} FROM {tabla}
+            WHERE {clave} > :ultimo
+            ORDER BY {clave}
+            LIMIT :lote
+        ), actualizadas AS (
+            UPDATE {tabla} t
+            SET {asignacion}
+            FROM lote
+            WHERE t.{clave} = lote.{clave} AND ({condicion})
+            RETURNING 1
+        )
+        SELECT
+            (SELECT {clave} FROM lote ORDER BY {clave} DESC LIMIT 1),
+            (SELECT count(*) FROM actualizadas)
+        """)
+    ultimo, total = "00000000-0000-0000-0000-000000000000", 0
+    while True:
+        ultimo, actualizadas = conexion.execute(
+            sentencia, {"ultimo": ultimo, "lote": lote}
+        ).one()
+        total += actualizadas
+        if ultimo is None:
+            return total
+        ultimo = str(ultimo)
+
+
+def aplicar_migraciones(engine=None) -> List[int]:
+    """
+    Aplicar las migraciones pendientes en orden
+
+    Returns:
+        Lista de versiones aplicadas en esta ejecución
+    """
+    if engine is None:
+        from database.config import engine
+
+    aplicadas_ahora = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        lock.execute(text("SELECT pg_advisory_lock(:clave)"), {"clave": _CLAVE_LOCK})
+        try:
+            aplicadas = versiones_aplicadas(lock)
+            for migracion in cargar_migraciones():
+                if migracion.VERSION in aplicadas:
+                    continue
+                print(f"⏳ Migración {migracion.VERSION:04d}: {migracion.DESCRIPCION}")
+                if getattr(migracion, "TRANSACCIONAL", True):
+                    with engine.begin() as conexion:
+                        migracion.aplicar(conexion)
+                        _registrar(conexion, migracion)
+                else:
+                    # Cada sentencia se confirma por separado; las
+                    # migraciones no transaccionales deben ser idempotentes
+                    migracion.aplicar(lock)
+                    _registrar(lock, migracion)
+                aplicadas_ahora.append(migracion.VERSION)
+        finally:
+            lock.execute(
+                text("SELECT pg_advisory_unlock(:clave)"), {"clave": _CLAVE_LOCK}
+            )
+    return aplicadas_ahora
@@ -0,0 +1,12 @@
+"""
+Aplicar migraciones pendientes: python -m database.migraciones
+"""
+
+from database.migraciones import aplicar_migraciones
+
+if __name__ == "__main__":
+    aplicadas = aplicar_migraciones()
+    if aplicadas:
+        print(f"✅ Migraciones aplicadas: {', '.join(map(str, aplicadas))}")
+    else:
+        print("✅ La base de datos está al día")
@@ -0,0 +1,136 @@
+"""
+Esquema inicial: las tablas tal como estaban antes de las migraciones
+
+El DDL queda escrito aquí en lugar de generarse desde los modelos: los
+modelos siguen cambiando (columnas e índices nuevos que agregan las
+migraciones siguientes) y esta migración debe crear siempre el mismo
+esquema. IF NOT EXISTS la hace segura sobre bases creadas antes de las
+migraciones con create_all.
+"""
+
+from sqlalchemy import text
+
+VERSION = 1
+DESCRIPCION = "Esquema inicial"
+TRANSACCIONAL = True
+
+SENTENCIAS = (
+    """
+    CREATE TABLE IF NOT EXISTS categorias (
+        id_categoria UUID NOT NULL,
+        nombre VARCHAR(100) NOT NULL,
+        descripcion TEXT,
+        activa BOOLEAN,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        PRIMARY KEY (id_categoria),
+        UNIQUE (nombre)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_categorias_id_categoria"
+    " ON categorias (id_categoria)",
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id_usuario UUID NOT NULL,
+        nombre VARCHAR(100) NOT NULL,
+        apellido VARCHAR(100) NOT NULL,
+        nombre_usuario VARCHAR(50) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        telefono VARCHAR(20),
+        contrasena VARCHAR(255) NOT NULL,
+        es_admin BOOLEAN,
+        activo BOOLEAN,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        PRIMARY KEY (id_usuario)
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_usuarios_nombre_usuario"
+    " ON usuarios (nombre_usuario)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_usuarios_email ON usuarios (email)",
+    "CREATE INDEX IF NOT EXISTS ix_usuarios_id_usuario ON usuarios (id_usuario)",
+    """
+    CREATE TABLE IF NOT EXISTS restaurantes (
+        id_restaurante UUID NOT NULL,
+        nombre VARCHAR(200) NOT NULL,
+        direccion TEXT NOT NULL,
+        telefono VARCHAR(20),
+        email VARCHAR(255),
+        capacidad_maxima INTEGER,
+        horario_apertura VARCHAR(10) NOT NULL,
+        horario_cierre VARCHAR(10) NOT NULL,
+        activo BOOLEAN,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        usuario_admin_id UUID NOT NULL,
+        PRIMARY KEY (id_restaurante),
+        FOREIGN KEY (usuario_admin_id) REFERENCES usuarios (id_usuario)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_restaurantes_id_restaurante"
+    " ON restaurantes (id_restaurante)",
+    """
+    CREATE TABLE IF NOT EXISTS menus (
+        id_menu UUID NOT NULL,
+        nombre VARCHAR(200) NOT NULL,
+        descripcion TEXT,
+        precio NUMERIC(10, 2) NOT NULL,
+        disponible BOOLEAN,
+        tiempo_preparacion INTEGER,
+        ingredientes TEXT,
+        alergenos TEXT,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        categoria_id UUID NOT NULL,
+        restaurante_id UUID NOT NULL,
+        PRIMARY KEY (id_menu),
+        FOREIGN KEY (categoria_id) REFERENCES categorias (id_categoria),
+        FOREIGN KEY (restaurante_id) REFERENCES restaurantes (id_restaurante)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_menus_id_menu ON menus (id_menu)",
+    """
+    CREATE TABLE IF NOT EXISTS mesas (
+        id_mesa UUID NOT NULL,
+        numero_mesa INTEGER NOT NULL,
+        capacidad INTEGER NOT NULL,
+        ubicacion VARCHAR(100),
+        activa BOOLEAN,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        restaurante_id UUID NOT NULL,
+        PRIMARY KEY (id_mesa),
+        FOREIGN KEY (restaurante_id) REFERENCES restaurantes (id_restaurante)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_mesas_id_mesa ON mesas (id_mesa)",
+    """
+    CREATE TABLE IF NOT EXISTS reservas (
+        id_reserva UUID NOT NULL,
+        nombre_completo VARCHAR(200) NOT NULL,
+        telefono VARCHAR(20),
+        email VARCHAR(255),
+        fecha_reserva TIMESTAMP WITH TIME ZONE NOT NULL,
+        hora_reserva VARCHAR(10) NOT NULL,
+        numero_personas INTEGER NOT NULL,
+        metodo_pago VARCHAR(50) NOT NULL,
+        estado VARCHAR(20),
+        observaciones TEXT,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        usuario_id UUID,
+        restaurante_id UUID NOT NULL,
+        mesa_id UUID,
+        PRIMARY KEY (id_reserva),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios (id_usuario),
+        FOREIGN KEY (restaurante_id) REFERENCES restaurantes (id_restaurante),
+        FOREIGN KEY (mesa_id) REFERENCES mesas (id_mesa)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_reservas_id_reserva ON reservas (id_reserva)",
+)
+
+
+def aplicar(conexion):
+    for sentencia in SENTENCIAS:
+        conexion.execute(text(sentencia))
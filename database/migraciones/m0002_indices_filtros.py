@@ -0,0 +1,30 @@
+"""
+Índices compuestos y parciales para los filtros más usados
+"""
+
+from database.migraciones import crear_indice_concurrente
+
+VERSION = 2
+DESCRIPCION = "Índices compuestos y parciales para filtros frecuentes"
+TRANSACCIONAL = False  # CREATE INDEX CONCURRENTLY
+
+INDICES = {
+    # Reservas por restaurante ordenadas por fecha
+    "ix_reservas_restaurante_fecha": "ON reservas (restaurante_id, fecha_reserva)",
+    "ix_reservas_fecha": "ON reservas (fecha_reserva)",
+    "ix_reservas_mesa": "ON reservas (mesa_id)",
+    "ix_reservas_usuario": "ON reservas (usuario_id)",
+    "ix_mesas_restaurante": "ON mesas (restaurante_id)",
+    "ix_menus_restaurante": "ON menus (restaurante_id)",
+    "ix_menus_categoria": "ON menus (categoria_id)",
+    # Parciales sobre filas activas (activo == True / activa == True)
+    "ix_usuarios_activos": "ON usuarios (id_usuario) WHERE activo",
+    "ix_usuarios_admin_activos": "ON usuarios (nombre_usuario) WHERE es_admin AND activo",
+    "ix_categorias_activas": "ON categorias (id_categoria) WHERE activa",
+    "ix_categorias_activas_nombre": "ON categorias (nombre) WHERE activa",
+}
+
+
+def aplicar(conexion):
+    for nombre, definicion in INDICES.items():
+        crear_indice_concurrente(conexion, nombre, definicion)
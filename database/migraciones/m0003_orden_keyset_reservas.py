@@ -0,0 +1,21 @@
+"""
+Índice para la paginación por cursor de reservas
+
+El listado se ordena por (fecha_reserva, id_reserva); este índice cubre el
+orden completo y reemplaza a ix_reservas_fecha, que queda como su prefijo.
+"""
+
+from sqlalchemy import text
+
+from database.migraciones import crear_indice_concurrente
+
+VERSION = 3
+DESCRIPCION = "Índice (fecha_reserva, id_reserva) para paginación por cursor"
+TRANSACCIONAL = False  # CREATE/DROP INDEX CONCURRENTLY
+
+
+def aplicar(conexion):
+    crear_indice_concurrente(
+        conexion, "ix_reservas_fecha_id", "ON reservas (fecha_reserva, id_reserva)"
+    )
+    conexion.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_reservas_fecha"))
@@ -0,0 +1,36 @@
+"""
+Índices de los filtros de reservas en el orden del listado
+
+Los filtros por restaurante, mesa y usuario se paginan por
+(fecha_reserva, id_reserva); con la clave del filtro como prefijo, el
+índice resuelve filtro, rango de fechas y orden sin ordenar en memoria.
+Reemplazan a los índices de una sola columna (o de dos) que cubrían solo
+el filtro.
+"""
+
+from sqlalchemy import text
+
+from database.migraciones import crear_indice_concurrente
+
+VERSION = 4
+DESCRIPCION = "Índices (filtro, fecha_reserva, id_reserva) para listar reservas"
+TRANSACCIONAL = False  # CREATE/DROP INDEX CONCURRENTLY
+
+INDICES = {
+    "ix_reservas_restaurante_fecha_id": "ON reservas (restaurante_id, fecha_reserva, id_reserva)",
+    "ix_reservas_mesa_fecha_id": "ON reservas (mesa_id, fecha_reserva, id_reserva)",
+    "ix_reservas_usuario_fecha_id": "ON reservas (usuario_id, fecha_reserva, id_reserva)",
+}
+
+REEMPLAZADOS = (
+    "ix_reservas_restaurante_fecha",
+    "ix_reservas_mesa",
+    "ix_reservas_usuario",
+)
+
+
+def aplicar(conexion):
+    for nombre, definicion in INDICES.items():
+        crear_indice_concurrente(conexion, nombre, definicion)
+    for nombre in REEMPLAZADOS:
+        conexion.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}"))
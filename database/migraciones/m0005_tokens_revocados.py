@@ -0,0 +1,32 @@
+"""
+Tabla de tokens de acceso revocados (logout)
+
+Solo guarda los tokens revocados que aún no expiran; el resto de tokens
+se valida por firma sin tocar la base de datos.
+"""
+
+from sqlalchemy import text
+
+VERSION = 5
+DESCRIPCION = "Tabla tokens_revocados"
+TRANSACCIONAL = True
+
+SENTENCIAS = (
+    """
+    CREATE TABLE IF NOT EXISTS tokens_revocados (
+        jti VARCHAR(32) NOT NULL,
+        usuario_id UUID NOT NULL,
+        expira TIMESTAMP WITH TIME ZONE NOT NULL,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (jti),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios (id_usuario) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tokens_revocados_expira"
+    " ON tokens_revocados (expira)",
+)
+
+
+def aplicar(conexion):
+    for sentencia in SENTENCIAS:
+        conexion.execute(text(sentencia))
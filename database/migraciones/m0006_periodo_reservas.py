@@ -0,0 +1,56 @@
+"""
+Duración de las reservas y rango de ocupación indexado
+
+- restaurantes.duracion_reserva_min: duración por defecto de sus reservas
+- reservas.duracion_minutos: duración de cada reserva (se fija al crearla)
+- reservas.periodo: tstzrange [inicio, inicio + duración) con índice GiST,
+  para buscar solapes con && sin recorrer el día completo
+
+El inicio es el día de fecha_reserva (en UTC) a la hora_reserva; las filas
+con una hora no interpretable quedan con periodo NULL. El relleno recorre
+reservas por clave primaria en lotes de LOTE filas y confirma cada lote por
+separado (ver rellenar_por_lotes), así que no bloquea las escrituras.
+"""
+
+from sqlalchemy import text
+
+from database.migraciones import crear_indice_concurrente, rellenar_por_lotes
+
+VERSION = 6
+DESCRIPCION = "Duración de reservas y periodo tstzrange con índice GiST"
+TRANSACCIONAL = False  # CREATE INDEX CONCURRENTLY
+
+COLUMNAS = (
+    "ALTER TABLE restaurantes ADD COLUMN IF NOT EXISTS"
+    " duracion_reserva_min INTEGER NOT NULL DEFAULT 120",
+    "ALTER TABLE reservas ADD COLUMN IF NOT EXISTS"
+    " duracion_minutos INTEGER NOT NULL DEFAULT 120",
+    "ALTER TABLE reservas ADD COLUMN IF NOT EXISTS periodo TSTZRANGE",
+)
+
+_INICIO = (
+    "((date_trunc('day', fecha_reserva AT TIME ZONE 'UTC') + hora_reserva::time)"
+    " AT TIME ZONE 'UTC')"
+)
+
+LOTE = 5000
+
+RELLENO = f"""periodo = tstzrange(
+    {_INICIO}, {_INICIO} + make_interval(mins => duracion_minutos), '[)'
+)"""
+
+RELLENO_CONDICION = (
+    "periodo IS NULL AND hora_reserva ~ '^([01]?[0-9]|2[0-3]):[0-5]?[0-9]$'"
+)
+
+
+def aplicar(conexion):
+    for sentencia in COLUMNAS:
+        conexion.execute(text(sentencia))
+    rellenas = rellenar_por_lotes(
+        conexion, "reservas", "id_reserva", RELLENO, RELLENO_CONDICION, LOTE
+    )
+    print(f"   ↳ periodo rellenado en {rellenas} reservas")
+    crear_indice_concurrente(
+        conexion, "ix_reservas_periodo", "ON reservas USING gist (periodo)"
+    )
@@ -0,0 +1,100 @@
+"""
+Inicio de la reserva como timestamp indexado
+
+reservas.inicio_reserva guarda el instante en que empieza la reserva (día
+de fecha_reserva en UTC a la hora_reserva), el mismo que lower(periodo).
+Los listados se ordenan y filtran por él en lugar de por fecha_reserva, y
+disponibilidad y asignación cargan el día por rango sobre la columna sin
+interpretar hora_reserva.
+
+El relleno de las filas existentes no bloquea la tabla: recorre reservas
+por clave primaria en lotes de LOTE filas y cada lote se confirma por
+separado, así que solo bloquea las filas del lote en curso. Las filas con
+una hora no interpretable (periodo NULL) toman fecha_reserva.
+
+La columna pasa a NOT NULL con un CHECK NOT VALID que se valida aparte
+(sin bloquear escrituras); con él, SET NOT NULL no vuelve a recorrer la
+tabla. Los índices (filtro, inicio_reserva, id_reserva) reemplazan a los
+de fecha_reserva de las migraciones 0003 y 0004.
+"""
+
+from sqlalchemy import text
+
+from database.migraciones import crear_indice_concurrente, rellenar_por_lotes
+
+VERSION = 7
+DESCRIPCION = "Columna inicio_reserva con relleno por lotes e índices de listado"
+TRANSACCIONAL = False  # relleno por lotes y CREATE/DROP INDEX CONCURRENTLY
+
+LOTE = 5000
+
+_INICIO = "COALESCE(lower(periodo), fecha_reserva)"
+
+# Filas escritas sin inicio mientras corría el relleno (por instancias
+# anteriores a esta versión)
+RELLENO_RESTANTES = (
+    f"UPDATE reservas SET inicio_reserva = {_INICIO} WHERE inicio_reserva IS NULL"
+)
+
+CHECK = "ck_reservas_inicio_no_nulo"
+
+INDICES = {
+    "ix_reservas_inicio_id": "ON reservas (inicio_reserva, id_reserva)",
+    "ix_reservas_restaurante_inicio_id": "ON reservas (restaurante_id, inicio_reserva, id_reserva)",
+    "ix_reservas_mesa_inicio_id": "ON reservas (mesa_id, inicio_reserva, id_reserva)",
+    "ix_reservas_usuario_inicio_id": "ON reservas (usuario_id, inicio_reserva, id_reserva)",
+}
+
+REEMPLAZADOS = (
+    "ix_reservas_fecha_id",
+    "ix_reservas_restaurante_fecha_id",
+    "ix_reservas_mesa_fecha_id",
+    "ix_reservas_usuario_fecha_id",
+)
+
+
+def rellenar(conexion, lote: int = LOTE) -> int:
+    """
+    Rellenar inicio_reserva por lotes (conexión en AUTOCOMMIT: cada lote
+    es su propia transacción). Devuelve cuántas filas se rellenaron.
+    """
+    return rellenar_por_lotes(
+        conexion,
+        "reservas",
+        "id_reserva",
+        f"inicio_reserva = {_INICIO}",
+        "inicio_reserva IS NULL",
+        lote,
+    )
+
+
+def _hacer_no_nulo(conexion) -> None:
+    existe = conexion.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :nombre"),
+        {"nombre": CHECK},
+    ).scalar()
+    if not existe:
+        conexion.execute(
+            text(
+                f"ALTER TABLE reservas ADD CONSTRAINT {CHECK}"
+                " CHECK (inicio_reserva IS NOT NULL) NOT VALID"
+            )
+        )
+    conexion.execute(text(RELLENO_RESTANTES))
+    conexion.execute(text(f"ALTER TABLE reservas VALIDATE CONSTRAINT {CHECK}"))
+    conexion.execute(
+        text("ALTER TABLE reservas ALTER COLUMN inicio_reserva SET NOT NULL")
+    )
+    conexion.execute(text(f"ALTER TABLE reservas DROP CONSTRAINT IF EXISTS {CHECK}"))
+
+
+def aplicar(conexion):
+    conexion.execute(
+        text("ALTER TABLE reservas ADD COLUMN IF NOT EXISTS inicio_reserva TIMESTAMPTZ")
+    )
+    print(f"   ↳ inicio_reserva rellenado en {rellenar(conexion)} reservas")
+    _hacer_no_nulo(conexion)
+    for nombre, definicion in INDICES.items():
+        crear_indice_concurrente(conexion, nombre, definicion)
+    for nombre in REEMPLAZADOS:
+        conexion.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}"))
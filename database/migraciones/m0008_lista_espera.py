@@ -0,0 +1,50 @@
+"""
+Tabla lista_espera
+
+Grupos que esperan mesa para un turno (restaurante + inicio_reserva) ya
+completo. Se promueven a reserva cuando una reserva del mismo turno con
+mesa se cancela o se elimina.
+"""
+
+from sqlalchemy import text
+
+VERSION = 8
+DESCRIPCION = "Tabla lista_espera"
+TRANSACCIONAL = True
+
+SENTENCIAS = (
+    """
+    CREATE TABLE IF NOT EXISTS lista_espera (
+        id_espera UUID NOT NULL,
+        nombre_completo VARCHAR(200) NOT NULL,
+        telefono VARCHAR(20),
+        email VARCHAR(255),
+        fecha_reserva TIMESTAMP WITH TIME ZONE NOT NULL,
+        hora_reserva VARCHAR(10) NOT NULL,
+        inicio_reserva TIMESTAMP WITH TIME ZONE NOT NULL,
+        duracion_minutos INTEGER,
+        numero_personas INTEGER NOT NULL,
+        metodo_pago VARCHAR(50) NOT NULL,
+        observaciones TEXT,
+        prioridad INTEGER DEFAULT '0' NOT NULL,
+        estado VARCHAR(20) DEFAULT 'esperando' NOT NULL,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        fecha_edicion TIMESTAMP WITH TIME ZONE,
+        usuario_id UUID,
+        restaurante_id UUID NOT NULL,
+        reserva_id UUID,
+        PRIMARY KEY (id_espera),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios (id_usuario) ON DELETE SET NULL,
+        FOREIGN KEY (restaurante_id)
+            REFERENCES restaurantes (id_restaurante) ON DELETE CASCADE,
+        FOREIGN KEY (reserva_id) REFERENCES reservas (id_reserva) ON DELETE SET NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_lista_espera_turno"
+    " ON lista_espera (restaurante_id, inicio_reserva) WHERE estado = 'esperando'",
+)
+
+
+def aplicar(conexion):
+    for sentencia in SENTENCIAS:
+        conexion.execute(text(sentencia))
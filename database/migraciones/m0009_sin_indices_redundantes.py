@@ -0,0 +1,23 @@
+"""
+Quitar índices parciales que repetían la clave primaria
+
+ix_usuarios_activos (id_usuario) e ix_categorias_activas (id_categoria)
+(creados por la migración 0002) solo duplicaban el índice de la clave
+primaria: ninguna consulta los usaba y encarecían cada escritura.
+"""
+
+from sqlalchemy import text
+
+VERSION = 9
+DESCRIPCION = "Quitar índices parciales redundantes con la clave primaria"
+TRANSACCIONAL = False  # DROP INDEX CONCURRENTLY
+
+ELIMINADOS = (
+    "ix_usuarios_activos",
+    "ix_categorias_activas",
+)
+
+
+def aplicar(conexion):
+    for nombre in ELIMINADOS:
+        conexion.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}"))
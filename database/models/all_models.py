@@ -8,6 +8,8 @@ from .mesa import Mesa
 from .reserva import Reserva
 from .categoria import Categoria
 from .menu import Menu
+from .token_revocado import TokenRevocado
+from .lista_espera import ListaEspera
 
 __all__ = [
     "Usuario",
@@ -15,5 +17,7 @@ __all__ = [
     "Mesa",
     "Reserva",
     "Categoria",
-    "Menu"
+    "Menu",
+    "TokenRevocado",
+    "ListaEspera",
 ]
@@ -6,7 +6,7 @@ import uuid
 from typing import Any
 
 from database.config import Base
-from sqlalchemy import Column, DateTime, String, Text, Boolean
+from sqlalchemy import Column, DateTime, String, Text, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +14,13 @@ from sqlalchemy.sql import func
 
 class Categoria(Base):
     __tablename__ = "categorias"
+    __table_args__ = (
+        Index(
+            "ix_categorias_activas_nombre",
+            "nombre",
+            postgresql_where=text("activa"),
+        ),
+    )
 
     id_categoria = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
@@ -0,0 +1,63 @@
+"""
+Modelo de ListaEspera
+"""
+
+import uuid
+
+from database.config import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func, text
+
+
+class ListaEspera(Base):
+    __tablename__ = "lista_espera"
+    __table_args__ = (
+        # Cola de cada turno: solo las entradas que siguen esperando
+        Index(
+            "ix_lista_espera_turno",
+            "restaurante_id",
+            "inicio_reserva",
+            postgresql_where=text("estado = 'esperando'"),
+        ),
+    )
+
+    id_espera = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    nombre_completo = Column(String(200), nullable=False)
+    telefono = Column(String(20), nullable=True)
+    email = Column(String(255), nullable=True)
+    fecha_reserva = Column(DateTime(timezone=True), nullable=False)
+    hora_reserva = Column(String(10), nullable=False)  # "19:30"
+    # Turno pedido: día de fecha_reserva (UTC) a la hora_reserva
+    inicio_reserva = Column(DateTime(timezone=True), nullable=False)
+    duracion_minutos = Column(Integer, nullable=True)
+    numero_personas = Column(Integer, nullable=False)
+    metodo_pago = Column(String(50), nullable=False)
+    observaciones = Column(Text, nullable=True)
+    prioridad = Column(Integer, nullable=False, default=0, server_default="0")
+    estado = Column(
+        String(20), nullable=False, default="esperando", server_default="esperando"
+    )  # "esperando", "promovida", "retirada"
+    fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_edicion = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Claves foráneas
+    usuario_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("usuarios.id_usuario", ondelete="SET NULL"),
+        nullable=True,
+    )
+    restaurante_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("restaurantes.id_restaurante", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # Reserva creada al promoverla
+    reserva_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("reservas.id_reserva", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    def __repr__(self):
+        return f"<ListaEspera(id_espera={self.id_espera}, nombre='{self.nombre_completo}', inicio={self.inicio_reserva}, estado='{self.estado}')>"
@@ -6,7 +6,7 @@ import uuid
 from typing import Any
 
 from database.config import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +14,10 @@ from sqlalchemy.sql import func
 
 class Menu(Base):
     __tablename__ = "menus"
+    __table_args__ = (
+        Index("ix_menus_restaurante", "restaurante_id"),
+        Index("ix_menus_categoria", "categoria_id"),
+    )
 
     id_menu = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
@@ -6,7 +6,7 @@ import uuid
 from typing import Any
 
 from database.config import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +14,7 @@ from sqlalchemy.sql import func
 
 class Mesa(Base):
     __tablename__ = "mesas"
+    __table_args__ = (Index("ix_mesas_restaurante", "restaurante_id"),)
 
     id_mesa = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
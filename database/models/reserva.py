@@ -6,14 +6,48 @@ import uuid
 from typing import Any
 
 from database.config import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    Boolean,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import TSTZRANGE, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 
+def _inicio_por_defecto(context) -> Any:
+    """Inicio calculado para inserciones que no lo traen (fuera del CRUD)"""
+    from services.disponibilidad import inicio_reserva
+
+    parametros = context.get_current_parameters()
+    return inicio_reserva(parametros["fecha_reserva"], parametros["hora_reserva"])
+
+
 class Reserva(Base):
     __tablename__ = "reservas"
+    __table_args__ = (
+        Index("ix_reservas_inicio_id", "inicio_reserva", "id_reserva"),
+        Index(
+            "ix_reservas_restaurante_inicio_id",
+            "restaurante_id",
+            "inicio_reserva",
+            "id_reserva",
+        ),
+        Index("ix_reservas_mesa_inicio_id", "mesa_id", "inicio_reserva", "id_reserva"),
+        Index(
+            "ix_reservas_usuario_inicio_id",
+            "usuario_id",
+            "inicio_reserva",
+            "id_reserva",
+        ),
+        Index("ix_reservas_periodo", "periodo", postgresql_using="gist"),
+    )
 
     id_reserva = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
@@ -23,6 +57,15 @@ class Reserva(Base):
     email = Column(String(255), nullable=True)
     fecha_reserva = Column(DateTime(timezone=True), nullable=False)
     hora_reserva = Column(String(10), nullable=False)  # "19:30"
+    # Día de fecha_reserva (UTC) a la hora_reserva: clave de orden y de rangos
+    inicio_reserva = Column(
+        DateTime(timezone=True), nullable=False, default=_inicio_por_defecto
+    )
+    duracion_minutos = Column(
+        Integer, nullable=False, default=120, server_default="120"
+    )
+    # [inicio, inicio + duración) calculado al escribir; NULL si la hora no es válida
+    periodo = Column(TSTZRANGE, nullable=True)
     numero_personas = Column(Integer, nullable=False, default=1)
     metodo_pago = Column(
         String(50), nullable=False
@@ -24,7 +24,10 @@ class Restaurante(Base):
     email = Column(String(255), nullable=True)
     capacidad_maxima = Column(Integer, default=50)
     horario_apertura = Column(String(10), nullable=False)  # "12:00"
-    horario_cierre = Column(String(10), nullable=False)    # "22:00"
+    horario_cierre = Column(String(10), nullable=False)  # "22:00"
+    duracion_reserva_min = Column(
+        Integer, nullable=False, default=120, server_default="120"
+    )  # duración por defecto de una reserva, en minutos
     activo = Column(Boolean, default=True)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
     fecha_edicion = Column(DateTime(timezone=True), onupdate=func.now())
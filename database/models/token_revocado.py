@@ -0,0 +1,25 @@
+"""
+Modelo de TokenRevocado
+"""
+
+from database.config import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+
+class TokenRevocado(Base):
+    __tablename__ = "tokens_revocados"
+    __table_args__ = (Index("ix_tokens_revocados_expira", "expira"),)
+
+    jti = Column(String(32), primary_key=True)
+    usuario_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("usuarios.id_usuario", ondelete="CASCADE"),
+        nullable=False,
+    )
+    expira = Column(DateTime(timezone=True), nullable=False)
+    fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<TokenRevocado(jti='{self.jti}', expira={self.expira})>"
@@ -4,7 +4,7 @@ Modelo de Usuario
 
 import uuid
 from database.config import Base
-from sqlalchemy import Column, DateTime, String, Boolean
+from sqlalchemy import Column, DateTime, String, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,6 +12,13 @@ from sqlalchemy.sql import func
 
 class Usuario(Base):
     __tablename__ = "usuarios"
+    __table_args__ = (
+        Index(
+            "ix_usuarios_admin_activos",
+            "nombre_usuario",
+            postgresql_where=text("es_admin AND activo"),
+        ),
+    )
 
     id_usuario = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
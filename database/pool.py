@@ -0,0 +1,189 @@
+"""
+Perfiles del pool de conexiones y estadísticas del pool en vivo
+
+El perfil se elige con DB_POOL_PERFIL y cada valor puede sobrescribirse
+con DB_POOL_CLASE, DB_POOL_SIZE, DB_MAX_OVERFLOW y DB_POOL_TIMEOUT.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from monitoring.histograma import Histograma
+from monitoring.metricas import cabecera, linea
+
+# clase: "queue" (FIFO), "lifo" (QueuePool LIFO) o "null" (PgBouncer externo)
+PERFILES_POOL = {
+    "default": {
+        "clase": "queue",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+    },
+    "pico": {"clase": "queue", "pool_size": 20, "max_overflow": 20, "pool_timeout": 10},
+    "lifo": {"clase": "lifo", "pool_size": 10, "max_overflow": 20, "pool_timeout": 10},
+    "pgbouncer": {"clase": "null"},
+}
+
+
+class EstadisticasPool:
+    """Tiempos de espera del checkout y timeouts de un pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.espera = Histograma()
+        self.timeouts = 0
+
+    def registrar_espera(self, segundos: float) -> None:
+        with self._lock:
+            self.espera.observar(segundos)
+
+    def registrar_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def resumen(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"timeouts": self.timeouts, "espera_checkout": self.espera.resumen()}
+
+
+class _MedicionCheckout:
+    """Mixin que mide cuánto espera cada checkout de conexión"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estadisticas = EstadisticasPool()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except PoolTimeoutError:
+            self.estadisticas.registrar_timeout()
+            raise
+        self.estadisticas.registrar_espera(time.perf_counter() - inicio)
+        return conexion
+
+
+class QueuePoolMedido(_MedicionCheckout, QueuePool):
+    pass
+
+
+class AsyncQueuePoolMedido(_MedicionCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class NullPoolMedido(_MedicionCheckout, NullPool):
+    pass
+
+
+def _entero_env(nombre: str, defecto: int) -> int:
+    valor = os.getenv(nombre)
+    return int(valor) if valor else defecto
+
+
+def configuracion_pool() -> Dict[str, Any]:
+    """
+    Resolver el perfil activo aplicando las sobrescrituras del entorno
+    """
+    nombre = os.getenv("DB_POOL_PERFIL", "default").lower()
+    if nombre not in PERFILES_POOL:
+        raise ValueError(
+            f"Perfil de pool desconocido: {nombre} "
+            f"(disponibles: {', '.join(PERFILES_POOL)})"
+        )
+
+    perfil = {"perfil": nombre, **PERFILES_POOL[nombre]}
+    perfil["clase"] = os.getenv("DB_POOL_CLASE", perfil["clase"]).lower()
+    if perfil["clase"] not in ("queue", "lifo", "null"):
+        raise ValueError("DB_POOL_CLASE debe ser queue, lifo o null")
+    if perfil["clase"] != "null":
+        perfil["pool_size"] = _entero_env("DB_POOL_SIZE", perfil.get("pool_size", 5))
+        perfil["max_overflow"] = _entero_env(
+            "DB_MAX_OVERFLOW", perfil.get("max_overflow", 10)
+        )
+        perfil["pool_timeout"] = _entero_env(
+            "DB_POOL_TIMEOUT", perfil.get("pool_timeout", 30)
+        )
+    return perfil
+
+
+def opciones_pool(asincrono: bool = False) -> Dict[str, Any]:
+    """
+    Argumentos de create_engine/create_async_engine para el perfil activo
+    """
+    perfil = configuracion_pool()
+    if perfil["clase"] == "null":
+        return {"poolclass": NullPoolMedido}
+
+    return {
+        "poolclass": AsyncQueuePoolMedido if asincrono else QueuePoolMedido,
+        "pool_size": perfil["pool_size"],
+        "max_overflow": perfil["max_overflow"],
+        "pool_timeout": perfil["pool_timeout"],
+        "pool_use_lifo": perfil["clase"] == "lifo",
+    }
+
+
+def resumen_pool(engine) -> Dict[str, Any]:
+    """
+    Estado en vivo del pool de un engine (síncrono o asíncrono)
+    """
+    pool = getattr(engine, "sync_engine", engine).pool
+    datos: Dict[str, Any] = {"clase": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        limite = pool.size() + pool._max_overflow
+        datos.update(
+            tamano=pool.size(),
+            max_overflow=pool._max_overflow,
+            conexiones_en_uso=pool.checkedout(),
+            conexiones_libres=pool.checkedin(),
+            overflow_en_uso=max(0, pool.overflow()),
+            utilizacion=round(pool.checkedout() / limite, 3) if limite else 0.0,
+        )
+
+    estadisticas = getattr(pool, "estadisticas", None)
+    if estadisticas is not None:
+        datos.update(estadisticas.resumen())
+    return datos
+
+
+def lineas_metricas_pool(motores: Dict[str, Any]) -> List[str]:
+    """
+    Métricas del pool en formato Prometheus para cada engine {nombre: engine}
+    """
+    resumenes = {nombre: resumen_pool(motor) for nombre, motor in motores.items()}
+
+    lineas = cabecera("db_pool_connections", "gauge", "Conexiones del pool por estado")
+    for nombre, datos in resumenes.items():
+        for estado in ("conexiones_en_uso", "conexiones_libres", "overflow_en_uso"):
+            if estado in datos:
+                lineas.append(
+                    linea(
+                        "db_pool_connections",
+                        datos[estado],
+                        engine=nombre,
+                        estado=estado,
+                    )
+                )
+
+    lineas += cabecera("db_pool_timeouts_total", "counter", "Timeouts de checkout")
+    for nombre, datos in resumenes.items():
+        lineas.append(linea("db_pool_timeouts_total", datos["timeouts"], engine=nombre))
+
+    metrica = "db_pool_checkout_wait_seconds"
+    lineas += cabecera(metrica, "histogram", "Espera del checkout")
+    for nombre, datos in resumenes.items():
+        espera = datos["espera_checkout"]
+        for limite, acumulado in espera["cubetas"].items():
+            lineas.append(
+                linea(f"{metrica}_bucket", acumulado, engine=nombre, le=limite)
+            )
+        lineas.append(linea(f"{metrica}_sum", espera["suma_s"], engine=nombre))
+        lineas.append(linea(f"{metrica}_count", espera["total"], engine=nombre))
+    return lineas
@@ -2,12 +2,30 @@
 Sistema de Gestión de Restaurante - API REST con FastAPI
 """
 
+import asyncio
+import importlib
+import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import uvicorn
 
-from database.config import create_tables, test_connection
+from auth.hashing import servicio_hash
+from auth.limitador import limitador_login
+from auth.tokens import lista_revocacion
+from database.config import async_engine, engine
+from database.migraciones import aplicar_migraciones
+from database.pool import lineas_metricas_pool, resumen_pool
+from monitoring.metricas import registro_metricas
+from monitoring.middleware import ConsultasSQLMiddleware, MetricasHTTPMiddleware
+from monitoring.salud import monitor_salud
+from services.disponibilidad import motor_disponibilidad
+from services.lista_espera import colas_espera
+from services.tablero import cache_tablero
+
+# Modo asíncrono: endpoints async def sobre AsyncSession (requiere asyncpg)
+API_MODO_ASYNC = os.getenv("API_MODO_ASYNC", "false").lower() in ("1", "true", "si")
 
 
 # Lifespan event handler (reemplaza on_event)
@@ -19,23 +37,40 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Iniciando Sistema de Gestión de Restaurante...")
 
-    # Verificar conexión a la base de datos
-    if test_connection():
+    # Verificar conexión a la base de datos y arrancar el monitor de salud
+    estado = await monitor_salud.iniciar()
+    if estado["database"] == "conectada":
         print("✅ Conexión a la base de datos exitosa")
     else:
-        print("❌ Error de conexión a la base de datos")
+        print(f"❌ Error de conexión a la base de datos: {estado['ultimo_error']}")
+
+    # Aplicar migraciones pendientes (tablas e índices)
+    try:
+        await asyncio.to_thread(aplicar_migraciones)
+        print("✅ Esquema de base de datos al día")
+    except Exception as e:
+        print(f"❌ Error al aplicar migraciones: {e}")
 
-    # Crear tablas si no existen
+    # Cargar los tokens revocados y arrancar su recarga periódica
     try:
-        create_tables()
-        print("✅ Tablas verificadas/creadas correctamente")
+        await lista_revocacion.iniciar()
+        print(f"✅ Tokens revocados cargados: {len(lista_revocacion)}")
     except Exception as e:
-        print(f"❌ Error al crear tablas: {e}")
+        print(f"❌ Error al cargar tokens revocados (se reintenta): {e}")
+
+    # Arrancar los workers del servicio de contraseñas antes del primer login
+    await asyncio.to_thread(servicio_hash.iniciar)
+    print(f"✅ Servicio de contraseñas con {servicio_hash.procesos} procesos")
 
     yield  # La aplicación se ejecuta aquí
 
     # Shutdown
     print("👋 Cerrando Sistema de Gestión de Restaurante...")
+    await monitor_salud.detener()
+    await lista_revocacion.detener()
+    await asyncio.to_thread(servicio_hash.detener)
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 # Crear instancia de FastAPI con lifespan
@@ -55,8 +90,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Conteo y tiempo de consultas SQL por request (Server-Timing)
+app.add_middleware(ConsultasSQLMiddleware)
+
+# Métricas Prometheus por ruta (más externo para medir el request completo)
+app.add_middleware(MetricasHTTPMiddleware)
+
 
 # Ruta raíz
 @app.get("/", tags=["General"])
@@ -76,6 +118,7 @@ async def root():
             "mesas": "/mesas",
             "menus": "/menus",
             "reservas": "/reservas",
+            "lista_espera": "/lista-espera",
         },
     }
 
@@ -84,65 +127,140 @@ async def root():
 @app.get("/health", tags=["General"])
 async def health_check():
     """
-    Endpoint para verificar el estado de la API
+    Endpoint para verificar el estado de la API (estado cacheado por el
+    monitor de salud, sin consultar la base de datos)
     """
-    return {
-        "status": "OK",
-        "database": "conectada" if test_connection() else "desconectada",
-    }
+    return monitor_salud.estado()
 
 
-# ======================
-#   CARGA DE ENDPOINTS
-# ======================
+@app.get("/health/deep", tags=["General"])
+async def health_check_deep():
+    """
+    Forzar una verificación real de la base de datos
+    """
+    await monitor_salud.verificar_ahora()
+    return monitor_salud.estado()
+
+
+@app.get("/health/pool", tags=["General"])
+async def pool_stats():
+    """
+    Estadísticas en vivo del pool de conexiones
+    """
+    datos = {"sincrono": resumen_pool(engine)}
+    if async_engine is not None:
+        datos["asincrono"] = resumen_pool(async_engine)
+    return datos
+
+
+@app.get("/health/hash", tags=["General"])
+async def hash_stats():
+    """
+    Estado del servicio de hashing de contraseñas (cola y latencias)
+    """
+    return servicio_hash.resumen()
+
+
+@app.get("/health/disponibilidad", tags=["General"])
+async def disponibilidad_stats():
+    """
+    Tamaño del índice en memoria de disponibilidad de mesas
+    """
+    return motor_disponibilidad.resumen()
+
+
+@app.get("/health/espera", tags=["General"])
+async def espera_stats():
+    """
+    Colas de la lista de espera cargadas en memoria y promociones
+    """
+    return colas_espera.resumen()
+
+
+@app.get("/health/tablero", tags=["General"])
+async def tablero_stats():
+    """
+    Caché de tableros por restaurante: entradas, aciertos e invalidaciones
+    """
+    return cache_tablero.resumen()
+
+
+@app.get("/health/login", tags=["General"])
+async def login_stats():
+    """
+    Límites de intentos de login: claves activas y rechazos
+    """
+    return limitador_login.resumen()
 
-try:
-    from api.endpoints import usuarios
 
-    app.include_router(usuarios.router)
-    print("✅ Router de usuarios cargado")
-except Exception as e:
-    print(f"⚠️ No se pudo cargar router de usuarios: {e}")
+# Métricas del pool de conexiones en /metrics
+_motores = {"sincrono": engine}
+if async_engine is not None:
+    _motores["asincrono"] = async_engine
+registro_metricas.registrar_coleccionista(lambda: lineas_metricas_pool(_motores))
+registro_metricas.registrar_coleccionista(servicio_hash.lineas_metricas)
+registro_metricas.registrar_coleccionista(limitador_login.lineas_metricas)
 
-try:
-    from api.endpoints import categorias
 
-    app.include_router(categorias.router)
-    print("✅ Router de categorías cargado")
-except Exception as e:
-    print(f"⚠️ No se pudo cargar router de categorías: {e}")
+@app.get("/metrics", tags=["General"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Métricas en formato de texto de Prometheus
+    """
+    return PlainTextResponse(
+        registro_metricas.exponer(), media_type="text/plain; version=0.0.4"
+    )
 
-try:
-    from api.endpoints import restaurantes
 
-    app.include_router(restaurantes.router)
-    print("✅ Router de restaurantes cargado")
-except Exception as e:
-    print(f"⚠️ No se pudo cargar router de restaurantes: {e}")
+# ======================
+#   CARGA DE ENDPOINTS
+# ======================
 
-try:
-    from api.endpoints import mesas
+ROUTERS = [
+    ("usuarios", "usuarios"),
+    ("categorias", "categorías"),
+    ("restaurantes", "restaurantes"),
+    ("mesas", "mesas"),
+    ("menu", "menús"),
+    ("reservas", "reservas"),
+    ("lista_espera", "lista de espera"),
+]
 
-    app.include_router(mesas.router)
-    print("✅ Router de mesas cargado")
-except Exception as e:
-    print(f"⚠️ No se pudo cargar router de mesas: {e}")
 
-try:
-    from api.endpoints import menu
+def _rutas_no_cubiertas(router_sync: APIRouter, router_async: APIRouter) -> APIRouter:
+    """
+    Router con las rutas síncronas que no tienen versión asíncrona
+    """
+    cubiertas = {(ruta.path, m) for ruta in router_async.routes for m in ruta.methods}
+    extra = APIRouter()
+    extra.routes = [
+        ruta
+        for ruta in router_sync.routes
+        if not any((ruta.path, m) in cubiertas for m in ruta.methods)
+    ]
+    return extra
 
-    app.include_router(menu.router)
-    print("✅ Router de menús cargado")
-except Exception as e:
-    print(f"⚠️ No se pudo cargar router de menús: {e}")
 
-try:
-    from api.endpoints import reservas
+if API_MODO_ASYNC and async_engine is None:
+    print("⚠️ API_MODO_ASYNC requiere asyncpg; se usarán los endpoints síncronos")
+    API_MODO_ASYNC = False
 
-    app.include_router(reservas.router)
-    print("✅ Router de reservas cargado")
-except Exception as e:
-    print(f"⚠️ No se pudo cargar router de reservas: {e}")
+for modulo, nombre in ROUTERS:
+    try:
+        router = importlib.import_module(f"api.endpoints.{modulo}").router
+        if API_MODO_ASYNC:
+            router_async = importlib.import_module(
+                f"api.endpoints_async.{modulo}"
+            ).router
+            # Las rutas solo síncronas se registran primero para que las rutas
+            # fijas no queden ocultas por las rutas con parámetros
+            app.include_router(_rutas_no_cubiertas(router, router_async))
+            app.include_router(router_async)
+        else:
+            app.include_router(router)
+        print(f"✅ Router de {nombre} cargado")
+    except Exception as e:
+        print(f"⚠️ No se pudo cargar router de {nombre}: {e}")
 
 
 # Configuración de Uvicorn
@@ -7,7 +7,8 @@ from typing import Optional
 
 from auth.security import PasswordManager
 from crud.usuario_crud import UsuarioCRUD
-from database.config import SessionLocal, create_tables
+from database.config import SessionLocal
+from database.migraciones import aplicar_migraciones
 from database.models.usuario import Usuario
 
 
@@ -574,7 +575,7 @@ class SistemaRestaurante:
 
     # =================== EJECUTAR SISTEMA ===================
     def ejecutar(self) -> None:
-        create_tables()
+        aplicar_migraciones()
         if not self.mostrar_pantalla_login():
             print("Acceso denegado. Hasta luego!")
             return
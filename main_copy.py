@@ -1,3 +1,6 @@
+import os
+
+from src.persistencia import Persistencia
 from src.sistema_reservas import SistemaReservas
 
 
@@ -117,8 +120,24 @@ def main():
     # Crear instancia del sistema de reservas
     sistema = SistemaReservas("Mi Restaurante")
 
+    # Reservas guardadas de sesiones anteriores (instantánea + diario)
+    persistencia = Persistencia(os.getenv("RESERVAS_DATOS_DIR", "datos_reservas"))
+    carga = persistencia.abrir(sistema)
+    if carga["reservas"]:
+        print(
+            f"💾 {carga['reservas']} reservas cargadas en {carga['segundos'] * 1000:.0f} ms"
+        )
+
     print("¡Bienvenido al Sistema de Reservas!")
 
+    try:
+        _bucle_principal(sistema)
+    finally:
+        persistencia.cerrar()
+
+
+def _bucle_principal(sistema):
+    """Menú hasta que se elige salir"""
     while True:
         mostrar_menu_principal()
 
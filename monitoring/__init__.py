@@ -0,0 +1,3 @@
+"""
+Paquete de monitoreo (métricas, histogramas y salud del servicio)
+"""
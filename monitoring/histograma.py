@@ -0,0 +1,85 @@
+"""
+Histograma de cubetas fijas para latencias
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+# Límites superiores en segundos (estilo Prometheus)
+CUBETAS_LATENCIA = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histograma:
+    """
+    Histograma con cubetas fijas. No usa locks: quien lo comparta entre
+    hilos debe serializar las llamadas a observar().
+    """
+
+    __slots__ = ("limites", "cuentas", "suma", "total")
+
+    def __init__(self, limites: Sequence[float] = CUBETAS_LATENCIA):
+        self.limites = tuple(limites)
+        # Una cubeta extra para valores mayores al último límite (+Inf)
+        self.cuentas = [0] * (len(self.limites) + 1)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.cuentas[bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def acumulado(self) -> List[int]:
+        """
+        Cuentas acumuladas por cubeta (la última corresponde a +Inf)
+        """
+        acumulado = []
+        corriente = 0
+        for cuenta in self.cuentas:
+            corriente += cuenta
+            acumulado.append(corriente)
+        return acumulado
+
+    def percentil(self, p: float) -> Optional[float]:
+        """
+        Estimar un percentil (0-100) con el límite superior de la cubeta
+
+        None si cae en la cubeta +Inf: solo se sabe que supera el último
+        límite (y infinito no se puede serializar en JSON).
+        """
+        if not self.total:
+            return 0.0
+        objetivo = self.total * p / 100
+        for limite, cuenta in zip(self.limites, self.acumulado()):
+            if cuenta >= objetivo:
+                return limite
+        return None
+
+    def resumen(self) -> Dict[str, float]:
+        return {
+            "total": self.total,
+            "suma_s": round(self.suma, 6),
+            "promedio_s": round(self.suma / self.total, 6) if self.total else 0.0,
+            "p50_s": self.percentil(50),
+            "p95_s": self.percentil(95),
+            "p99_s": self.percentil(99),
+            "cubetas": {
+                str(limite): cuenta
+                for limite, cuenta in zip(self.limites + ("+Inf",), self.acumulado())
+            },
+        }
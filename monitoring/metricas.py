@@ -0,0 +1,108 @@
+"""
+Métricas HTTP en formato de texto de Prometheus
+
+Los contadores se actualizan solo desde el middleware ASGI, que corre en
+el hilo del event loop; por eso no necesitan locks.
+"""
+
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from monitoring.histograma import Histograma
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def linea(nombre: str, valor, **etiquetas) -> str:
+    """
+    Una muestra en formato Prometheus: nombre{etiqueta="valor"} valor
+    """
+    if etiquetas:
+        pares = ",".join(f'{k}="{_escapar(v)}"' for k, v in etiquetas.items())
+        return f"{nombre}{{{pares}}} {valor}"
+    return f"{nombre} {valor}"
+
+
+def cabecera(nombre: str, tipo: str, ayuda: str) -> List[str]:
+    return [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+
+
+class MetricasRuta:
+    """Requests por código de estado e histograma de latencia de una ruta"""
+
+    __slots__ = ("por_status", "duracion")
+
+    def __init__(self):
+        self.por_status: Dict[int, int] = {}
+        self.duracion = Histograma()
+
+
+class RegistroMetricas:
+    """Registro de métricas HTTP por método y plantilla de ruta"""
+
+    def __init__(self):
+        self.en_vuelo = 0
+        self.rutas: Dict[Tuple[str, str], MetricasRuta] = {}
+        self._coleccionistas: List[Callable[[], Iterable[str]]] = []
+
+    def observar(self, metodo: str, ruta: str, status: int, duracion: float) -> None:
+        metricas = self.rutas.get((metodo, ruta))
+        if metricas is None:
+            metricas = self.rutas[(metodo, ruta)] = MetricasRuta()
+        metricas.por_status[status] = metricas.por_status.get(status, 0) + 1
+        metricas.duracion.observar(duracion)
+
+    def registrar_coleccionista(self, coleccionista: Callable[[], Iterable[str]]):
+        """
+        Registrar una función que devuelve líneas adicionales en formato
+        Prometheus (pool de conexiones, hashing, etc.)
+        """
+        self._coleccionistas.append(coleccionista)
+        return coleccionista
+
+    def exponer(self) -> str:
+        lineas = cabecera("http_requests_in_flight", "gauge", "Requests HTTP en curso")
+        lineas.append(linea("http_requests_in_flight", self.en_vuelo))
+
+        lineas += cabecera("http_requests_total", "counter", "Requests HTTP atendidos")
+        for (metodo, ruta), metricas in self.rutas.items():
+            for status, total in metricas.por_status.items():
+                lineas.append(
+                    linea(
+                        "http_requests_total",
+                        total,
+                        method=metodo,
+                        route=ruta,
+                        status=status,
+                    )
+                )
+
+        nombre = "http_request_duration_seconds"
+        lineas += cabecera(nombre, "histogram", "Latencia de requests HTTP")
+        for (metodo, ruta), metricas in self.rutas.items():
+            histograma = metricas.duracion
+            limites = [str(limite) for limite in histograma.limites] + ["+Inf"]
+            for limite, acumulado in zip(limites, histograma.acumulado()):
+                lineas.append(
+                    linea(
+                        f"{nombre}_bucket",
+                        acumulado,
+                        method=metodo,
+                        route=ruta,
+                        le=limite,
+                    )
+                )
+            lineas.append(
+                linea(f"{nombre}_sum", histograma.suma, method=metodo, route=ruta)
+            )
+            lineas.append(
+                linea(f"{nombre}_count", histograma.total, method=metodo, route=ruta)
+            )
+
+        for coleccionista in self._coleccionistas:
+            lineas.extend(coleccionista())
+        return "\n".join(lineas) + "\n"
+
+
+registro_metricas = RegistroMetricas()
@@ -0,0 +1,86 @@
+"""
+Middlewares ASGI de monitoreo
+"""
+
+import time
+
+from database.instrumentacion import (
+    finalizar_medicion,
+    iniciar_medicion,
+    medicion_actual,
+    resumen_encabezados,
+)
+from monitoring.metricas import RegistroMetricas, registro_metricas
+
+
+class ConsultasSQLMiddleware:
+    """
+    Mide las consultas SQL de cada request y las expone en los encabezados
+    Server-Timing, X-DB-Queries y X-DB-N-Plus-1
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        token = iniciar_medicion()
+        estadisticas = medicion_actual()
+
+        async def send_con_encabezados(mensaje):
+            if mensaje["type"] == "http.response.start":
+                encabezados = resumen_encabezados(estadisticas, scope["path"])
+                encabezados[
+                    "Server-Timing"
+                ] += f", total;dur={(time.perf_counter() - inicio) * 1000:.2f}"
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                    (nombre.lower().encode("latin-1"), valor.encode("latin-1"))
+                    for nombre, valor in encabezados.items()
+                ]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, send_con_encabezados)
+        finally:
+            finalizar_medicion(token)
+
+
+class MetricasHTTPMiddleware:
+    """
+    Registra requests en vuelo, códigos de estado y latencia por plantilla
+    de ruta (/reservas/{reserva_id}, no la ruta cruda)
+    """
+
+    def __init__(self, app, registro: RegistroMetricas = registro_metricas):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+
+        async def send_con_status(mensaje):
+            nonlocal status
+            if mensaje["type"] == "http.response.start":
+                status = mensaje["status"]
+            await send(mensaje)
+
+        self.registro.en_vuelo += 1
+        try:
+            await self.app(scope, receive, send_con_status)
+        finally:
+            self.registro.en_vuelo -= 1
+            # El router deja la ruta resuelta en el scope; las rutas que no
+            # existen se agrupan para no crear una serie por cada URL
+            ruta = getattr(scope.get("route"), "path", None) or "sin_ruta"
+            self.registro.observar(
+                scope["method"], ruta, status, time.perf_counter() - inicio
+            )
@@ -0,0 +1,123 @@
+"""
+Monitor de salud de la base de datos en segundo plano
+
+La verificación (SELECT 1) corre en una tarea periódica y el resultado
+queda cacheado, de modo que /health no toca la base de datos.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from database.config import async_engine, engine
+
+HEALTH_INTERVALO_S = float(os.getenv("HEALTH_INTERVALO_S", "5"))
+HEALTH_TIMEOUT_S = float(os.getenv("HEALTH_TIMEOUT_S", "3"))
+
+
+def _ping_sincrono() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _ping() -> None:
+    if async_engine is not None:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    else:
+        await asyncio.to_thread(_ping_sincrono)
+
+
+class MonitorSalud:
+    """Verifica la base de datos periódicamente y cachea el último estado"""
+
+    def __init__(
+        self, intervalo: float = HEALTH_INTERVALO_S, timeout: float = HEALTH_TIMEOUT_S
+    ):
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self._tarea: Optional[asyncio.Task] = None
+        self._verificacion: Optional[asyncio.Task] = None
+        self._ultima_verificacion = 0.0
+        self._estado: Dict[str, Any] = {
+            "status": "OK",
+            "database": "desconocida",
+            "latencia_ms": None,
+            "ultima_verificacion": None,
+            "ultimo_error": None,
+        }
+
+    async def _verificar(self) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(_ping(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            error = f"Timeout tras {self.timeout}s"
+        except Exception as e:
+            error = str(e)
+        latencia_ms = round((time.perf_counter() - inicio) * 1000, 2)
+
+        self._ultima_verificacion = time.monotonic()
+        # Se reemplaza el diccionario completo: /health lo lee sin locks
+        self._estado = {
+            "status": "OK",
+            "database": "desconectada" if error else "conectada",
+            "latencia_ms": latencia_ms,
+            "ultima_verificacion": datetime.now(timezone.utc).isoformat(),
+            "ultimo_error": error or self._estado["ultimo_error"],
+        }
+        return self._estado
+
+    async def verificar_ahora(self) -> Dict[str, Any]:
+        """
+        Forzar una verificación real. Las llamadas concurrentes comparten
+        la misma verificación en curso.
+        """
+        if self._verificacion is None or self._verificacion.done():
+            self._verificacion = asyncio.ensure_future(self._verificar())
+        return await asyncio.shield(self._verificacion)
+
+    def estado(self) -> Dict[str, Any]:
+        """
+        Último estado cacheado (sin acceso a la base de datos)
+        """
+        edad = time.monotonic() - self._ultima_verificacion
+        return {
+            **self._estado,
+            "edad_s": round(edad, 3) if self._ultima_verificacion else None,
+            "obsoleto": edad > 3 * self.intervalo,
+        }
+
+    async def _bucle(self) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo)
+            try:
+                await self.verificar_ahora()
+            except Exception as e:
+                print(f"⚠️ Error en el monitor de salud: {e}")
+
+    async def iniciar(self) -> Dict[str, Any]:
+        """
+        Hacer la primera verificación y arrancar la tarea periódica
+        """
+        estado = await self.verificar_ahora()
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._bucle())
+        return estado
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+
+monitor_salud = MonitorSalud()
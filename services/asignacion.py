@@ -0,0 +1,551 @@
+"""
+Asignación automática de mesas para un servicio
+
+Dadas las reservas de un restaurante en un día (o una franja del día) y
+sus mesas activas, elige una mesa para cada reserva sin mesa. Objetivo,
+en este orden:
+
+1. sentar la mayor cantidad de comensales;
+2. desperdiciar la menor cantidad de asientos (capacidad - personas).
+
+Dos reservas no comparten mesa si sus intervalos se solapan. Las reservas
+que ya tienen mesa la conservan (salvo reasignar=True) y ocupan su hueco,
+igual que las del día anterior que pasan de medianoche y las del día
+siguiente que pueden cortar los turnos tardíos.
+
+Método: varias pasadas voraces y se queda la mejor según el objetivo:
+best-fit con grupos grandes primero (la mesa más chica que alcance y,
+entre iguales, la que deja menos hueco libre alrededor), best-fit en
+orden de hora y primera mesa libre en orden de llegada. Ninguna domina a
+las otras; con la última el plan nunca sienta menos que un anfitrión sin
+plan. Si quedan pocas reservas por asignar (ASIGNACION_EXACTA_MAX) se
+busca el óptimo con ramificación y poda partiendo de la mejor pasada,
+con un tope de nodos para acotar el tiempo.
+"""
+
+import os
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from crud.bloqueos import bloquear, bloquear_async
+from database.models.mesa import Mesa
+from database.models.reserva import Reserva
+from database.models.restaurante import Restaurante
+from services.disponibilidad import (
+    RESERVA_DURACION_MIN,
+    _DIA,
+    _rango_dia,
+    minutos,
+    motor_disponibilidad,
+)
+from services.tablero import cache_tablero
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+ASIGNACION_EXACTA_MAX = int(os.getenv("ASIGNACION_EXACTA_MAX", "12"))
+ASIGNACION_MAX_NODOS = int(os.getenv("ASIGNACION_MAX_NODOS", "200000"))
+
+
+@dataclass(frozen=True)
+class ReservaPlan:
+    id_reserva: UUID
+    inicio: int  # minutos desde las 00:00 del día (negativo: día anterior)
+    fin: int
+    personas: int
+    mesa_id: Optional[UUID] = None  # mesa ya asignada (fija)
+
+
+@dataclass(frozen=True)
+class MesaPlan:
+    id_mesa: UUID
+    numero_mesa: int
+    capacidad: int
+    ubicacion: Optional[str] = None
+
+
+@dataclass
+class Plan:
+    """Resultado: reserva -> mesa para las reservas que se asignaron"""
+
+    asignaciones: Dict[UUID, UUID]
+    sin_mesa: List[UUID]
+    comensales: int
+    desperdicio: int
+    metodo: str
+    nodos: int = 0
+    duracion_ms: float = 0.0
+
+
+@dataclass
+class _Ocupacion:
+    """Intervalos (inicio, fin) ocupados por mesa, ordenados por inicio"""
+
+    por_mesa: Dict[UUID, List[Tuple[int, int]]] = field(default_factory=dict)
+
+    def libre(self, mesa_id: UUID, inicio: int, fin: int) -> bool:
+        intervalos = self.por_mesa.get(mesa_id)
+        if not intervalos:
+            return True
+        posicion = bisect_left(intervalos, (fin,))
+        # Sin solapes entre sí, solo el anterior puede cortar [inicio, fin)
+        return posicion == 0 or intervalos[posicion - 1][1] <= inicio
+
+    def hueco(self, mesa_id: UUID, inicio: int, fin: int) -> int:
+        """Minutos libres que quedarían pegados al intervalo en esa mesa"""
+        intervalos = self.por_mesa.get(mesa_id, [])
+        posicion = bisect_left(intervalos, (fin,))
+        antes = inicio - intervalos[posicion - 1][1] if posicion else inicio
+        despues = intervalos[posicion][0] - fin if posicion < len(intervalos) else 0
+        return antes + despues
+
+    def ocupar(self, mesa_id: UUID, inicio: int, fin: int) -> None:
+        insort(self.por_mesa.setdefault(mesa_id, []), (inicio, fin))
+
+    def liberar(self, mesa_id: UUID, inicio: int, fin: int) -> None:
+        intervalos = self.por_mesa[mesa_id]
+        del intervalos[bisect_left(intervalos, (inicio, fin))]
+
+    def copia(self) -> "_Ocupacion":
+        return _Ocupacion(
+            {mesa_id: list(intervalos) for mesa_id, intervalos in self.por_mesa.items()}
+        )
+
+
+def _preparar(reservas: Sequence[ReservaPlan], mesas: Sequence[MesaPlan], reasignar):
+    """
+    Ocupación fija, reservas a asignar (en el orden recibido) y mesas de
+    menor a mayor capacidad
+    """
+    por_id = {mesa.id_mesa: mesa for mesa in mesas}
+    ocupacion = _Ocupacion()
+    pendientes = []
+    for reserva in reservas:
+        if reserva.mesa_id is not None and not reasignar:
+            ocupacion.ocupar(reserva.mesa_id, reserva.inicio, reserva.fin)
+        else:
+            pendientes.append(reserva)
+    ordenadas = sorted(
+        (mesa for mesa in por_id.values()), key=lambda m: (m.capacidad, m.numero_mesa)
+    )
+    return ocupacion, pendientes, ordenadas
+
+
+def _grandes_primero(pendientes) -> list:
+    """Los grupos grandes son los que menos mesas admiten"""
+    return sorted(pendientes, key=lambda r: (-r.personas, r.inicio, r.fin))
+
+
+def _heuristica(
+    ocupacion: _Ocupacion, pendientes, mesas, mejor_ajuste: bool = True
+) -> Dict[UUID, MesaPlan]:
+    """
+    Una pasada voraz en el orden de `pendientes`: la mesa más chica que
+    alcance y, con mejor_ajuste, entre las de esa capacidad la que deja
+    menos hueco (si no, la primera libre). Ocupa lo que asigna.
+    """
+    asignadas: Dict[UUID, MesaPlan] = {}
+    for reserva in pendientes:
+        elegida, mejor = None, None
+        for mesa in mesas:
+            if mesa.capacidad < reserva.personas:
+                continue
+            if elegida is not None and mesa.capacidad > elegida.capacidad:
+                break
+            if not ocupacion.libre(mesa.id_mesa, reserva.inicio, reserva.fin):
+                continue
+            if not mejor_ajuste:
+                elegida = mesa
+                break
+            hueco = ocupacion.hueco(mesa.id_mesa, reserva.inicio, reserva.fin)
+            if mejor is None or hueco < mejor:
+                elegida, mejor = mesa, hueco
+        if elegida is not None:
+            ocupacion.ocupar(elegida.id_mesa, reserva.inicio, reserva.fin)
+            asignadas[reserva.id_reserva] = elegida
+    return asignadas
+
+
+def _mejor_heuristica(ocupacion: _Ocupacion, pendientes, mesas):
+    """
+    La mejor de las pasadas voraces según _valor (sin tocar `ocupacion`).
+    En empate gana la primera.
+    """
+    pasadas = (
+        (_grandes_primero(pendientes), True),
+        (sorted(pendientes, key=lambda r: (r.inicio, -r.personas, r.fin)), True),
+        (pendientes, False),  # orden de llegada, primera mesa libre
+    )
+    mejor, mejor_valor = {}, None
+    for orden, mejor_ajuste in pasadas:
+        asignadas = _heuristica(ocupacion.copia(), orden, mesas, mejor_ajuste)
+        valor = _valor(pendientes, asignadas)
+        if mejor_valor is None or valor > mejor_valor:
+            mejor, mejor_valor = asignadas, valor
+    return mejor
+
+
+def _valor(pendientes, asignadas: Dict[UUID, MesaPlan]) -> Tuple[int, int]:
+    """(comensales sentados, -asientos desperdiciados): mayor es mejor"""
+    comensales = desperdicio = 0
+    for reserva in pendientes:
+        mesa = asignadas.get(reserva.id_reserva)
+        if mesa is not None:
+            comensales += reserva.personas
+            desperdicio += mesa.capacidad - reserva.personas
+    return comensales, -desperdicio
+
+
+def _exacto(ocupacion: _Ocupacion, pendientes, mesas, inicial, max_nodos):
+    """
+    Ramificación y poda sobre las reservas pendientes (en el orden de la
+    heurística). Cota: sentar a todos los restantes con el mínimo
+    desperdicio posible para cada uno.
+    """
+    minimo = []
+    for reserva in pendientes:
+        aptas = [m.capacidad for m in mesas if m.capacidad >= reserva.personas]
+        minimo.append(aptas[0] - reserva.personas if aptas else None)
+    # Cotas acumuladas desde cada posición hasta el final
+    resto_comensales = [0] * (len(pendientes) + 1)
+    resto_desperdicio = [0] * (len(pendientes) + 1)
+    for i in range(len(pendientes) - 1, -1, -1):
+        cabe = minimo[i] is not None
+        resto_comensales[i] = resto_comensales[i + 1] + (
+            pendientes[i].personas if cabe else 0
+        )
+        resto_desperdicio[i] = resto_desperdicio[i + 1] + (minimo[i] if cabe else 0)
+
+    mejor_valor = _valor(pendientes, inicial)
+    mejor = dict(inicial)
+    actual: Dict[UUID, MesaPlan] = {}
+    nodos = 0
+    completo = True
+
+    def buscar(i: int, comensales: int, desperdicio: int) -> None:
+        nonlocal mejor_valor, mejor, nodos, completo
+        nodos += 1
+        if nodos > max_nodos:
+            completo = False
+            return
+        cota = (
+            comensales + resto_comensales[i],
+            -(desperdicio + resto_desperdicio[i]),
+        )
+        if cota <= mejor_valor:
+            return
+        if i == len(pendientes):
+            mejor_valor, mejor = (comensales, -desperdicio), dict(actual)
+            return
+        reserva = pendientes[i]
+        probadas = set()
+        for mesa in mesas:
+            if mesa.capacidad < reserva.personas:
+                continue
+            if not ocupacion.libre(mesa.id_mesa, reserva.inicio, reserva.fin):
+                continue
+            # Mesas equivalentes (misma capacidad y sin ocupación) dan el
+            # mismo subárbol: basta probar una
+            if not ocupacion.por_mesa.get(mesa.id_mesa):
+                if mesa.capacidad in probadas:
+                    continue
+                probadas.add(mesa.capacidad)
+            ocupacion.ocupar(mesa.id_mesa, reserva.inicio, reserva.fin)
+            actual[reserva.id_reserva] = mesa
+            buscar(
+                i + 1,
+                comensales + reserva.personas,
+                desperdicio + mesa.capacidad - reserva.personas,
+            )
+            del actual[reserva.id_reserva]
+            ocupacion.liberar(mesa.id_mesa, reserva.inicio, reserva.fin)
+            if not completo:
+                return
+        buscar(i + 1, comensales, desperdicio)  # dejarla sin mesa
+
+    buscar(0, 0, 0)
+    return mejor, nodos, completo
+
+
+def asignar(
+    reservas: Sequence[ReservaPlan],
+    mesas: Sequence[MesaPlan],
+    reasignar: bool = False,
+    exacta_max: int = ASIGNACION_EXACTA_MAX,
+    max_nodos: int = ASIGNACION_MAX_NODOS,
+) -> Plan:
+    """
+    Calcular la asignación de mesas (sin tocar la base de datos)
+    """
+    inicio = time.perf_counter()
+    ocupacion, pendientes, ordenadas = _preparar(reservas, mesas, reasignar)
+    asignadas = _mejor_heuristica(ocupacion, pendientes, ordenadas)
+    metodo, nodos = "heuristica", 0
+
+    if 0 < len(pendientes) <= exacta_max:
+        # La búsqueda parte de la ocupación fija
+        asignadas, nodos, completo = _exacto(
+            ocupacion, _grandes_primero(pendientes), ordenadas, asignadas, max_nodos
+        )
+        metodo = "exacto" if completo else "heuristica+busqueda"
+
+    comensales, desperdicio = _valor(pendientes, asignadas)
+    return Plan(
+        asignaciones={
+            id_reserva: mesa.id_mesa for id_reserva, mesa in asignadas.items()
+        },
+        sin_mesa=[r.id_reserva for r in pendientes if r.id_reserva not in asignadas],
+        comensales=comensales,
+        desperdicio=-desperdicio,
+        metodo=metodo,
+        nodos=nodos,
+        duracion_ms=round((time.perf_counter() - inicio) * 1000, 3),
+    )
+
+
+# ---------- ACCESO A DATOS ----------
+ESTADOS_ASIGNABLES = ("pendiente", "confirmada")
+
+
+def _consulta_existe(restaurante_id: UUID):
+    return select(Restaurante.id_restaurante).where(
+        Restaurante.id_restaurante == restaurante_id
+    )
+
+
+def _consulta_reservas(restaurante_id: UUID, dia: date):
+    """
+    Reservas del día y, como ocupación fija, las con mesa del día anterior
+    y del siguiente: pueden cruzar medianoche (ver _ventana en
+    services.disponibilidad)
+    """
+    inicio, fin = _rango_dia(dia)
+    return (
+        select(
+            Reserva.id_reserva,
+            Reserva.restaurante_id,
+            Reserva.hora_reserva,
+            Reserva.inicio_reserva,
+            Reserva.numero_personas,
+            Reserva.duracion_minutos,
+            Reserva.estado,
+            Reserva.mesa_id,
+        ).where(
+            Reserva.restaurante_id == restaurante_id,
+            Reserva.inicio_reserva >= inicio - timedelta(days=1),
+            Reserva.inicio_reserva < fin + timedelta(days=1),
+            ((Reserva.inicio_reserva >= inicio) & (Reserva.inicio_reserva < fin))
+            | Reserva.mesa_id.is_not(None),
+            Reserva.estado != "cancelada",
+        )
+        # Orden de llegada (la pasada de primera mesa libre lo usa)
+        .order_by(Reserva.fecha_creacion, Reserva.id_reserva)
+    )
+
+
+def _consulta_mesas(restaurante_id: UUID, ubicaciones: Optional[List[str]]):
+    consulta = select(
+        Mesa.id_mesa, Mesa.numero_mesa, Mesa.capacidad, Mesa.ubicacion
+    ).where(Mesa.restaurante_id == restaurante_id, Mesa.activa == True)
+    if ubicaciones:
+        consulta = consulta.where(Mesa.ubicacion.in_(ubicaciones))
+    return consulta
+
+
+def _armar(filas, mesas, dia, desde, hasta, reasignar):
+    """
+    Pasar filas a ReservaPlan/MesaPlan. Se asignan las reservas pendientes
+    o confirmadas del día en la franja [desde, hasta) sin mesa (o todas
+    ellas si reasignar); el resto de las que tienen mesa, incluidas las de
+    los días vecinos, solo ocupa su hueco.
+    """
+    desde = minutos(desde) if desde is not None else 0
+    hasta = minutos(hasta) if hasta is not None else _DIA
+    cero = _rango_dia(dia)[0]
+    mesas = [MesaPlan(*mesa) for mesa in mesas]
+    del_plan = {mesa.id_mesa for mesa in mesas}
+    por_id, reservas = {}, []
+    for fila in filas:
+        inicio = _minuto_desde(cero, fila.inicio_reserva)
+        # Al reasignar solo se mueven las sentadas en mesas del plan (las
+        # de otras ubicaciones conservan la suya)
+        movible = (
+            fila.estado in ESTADOS_ASIGNABLES
+            and desde <= inicio < hasta
+            and (fila.mesa_id is None or (reasignar and fila.mesa_id in del_plan))
+        )
+        if not movible and fila.mesa_id is None:
+            continue
+        por_id[fila.id_reserva] = fila
+        reservas.append(
+            ReservaPlan(
+                fila.id_reserva,
+                inicio,
+                inicio + (fila.duracion_minutos or RESERVA_DURACION_MIN),
+                fila.numero_personas,
+                None if movible else fila.mesa_id,
+            )
+        )
+    return reservas, mesas, por_id
+
+
+def _minuto_desde(cero: datetime, instante: datetime) -> int:
+    """Minutos de `instante` desde `cero` (negativos si es anterior)"""
+    return int((instante - cero).total_seconds() // 60)
+
+
+def _parejas_bloqueo(mesas, dia: date) -> List[Tuple[UUID, date]]:
+    """
+    (mesa, día) a bloquear: el día del plan y el siguiente, que es el que
+    bloquea una reserva de esa mesa que empieza después de medianoche (ver
+    crud.reserva_crud._parejas). Las del día anterior que llegan a este
+    bloquean también este día.
+    """
+    siguiente = dia + timedelta(days=1)
+    return [(mesa.id_mesa, d) for mesa in mesas for d in (dia, siguiente)]
+
+
+def _sentencia_aplicar(reasignar: bool):
+    tabla = Reserva.__table__
+    condicion = tabla.c.id_reserva == bindparam("b_id")
+    if not reasignar:
+        # No pisar una mesa puesta a mano mientras se calculaba el plan
+        condicion = condicion & tabla.c.mesa_id.is_(None)
+    return update(tabla).where(condicion).values(mesa_id=bindparam("b_mesa"))
+
+
+def _cambios(
+    plan: Plan, por_id, mesas: Sequence[MesaPlan]
+) -> Dict[UUID, Optional[UUID]]:
+    """
+    Reservas cuya mesa cambia (None: pierde la mesa al reasignar). Nunca
+    se quita una mesa que no forma parte del plan.
+    """
+    cambios = {
+        id_reserva: mesa_id
+        for id_reserva, mesa_id in plan.asignaciones.items()
+        if por_id[id_reserva].mesa_id != mesa_id
+    }
+    del_plan = {mesa.id_mesa for mesa in mesas}
+    for id_reserva in plan.sin_mesa:
+        if por_id[id_reserva].mesa_id in del_plan:
+            cambios[id_reserva] = None
+    return cambios
+
+
+def _notificar(cambios: Dict[UUID, Optional[UUID]], por_id) -> None:
+    for id_reserva, mesa_id in cambios.items():
+        motor_disponibilidad.registrar(
+            {**por_id[id_reserva]._asdict(), "mesa_id": mesa_id}
+        )
+    for restaurante_id in {por_id[id_reserva].restaurante_id for id_reserva in cambios}:
+        cache_tablero.invalidar(restaurante_id)
+
+
+def detalle(plan: Plan, mesas: Dict[UUID, MesaPlan], por_id) -> List[dict]:
+    """Asignaciones del plan con los datos de reserva y mesa, por hora"""
+    filas = []
+    for id_reserva, mesa_id in plan.asignaciones.items():
+        reserva, mesa = por_id[id_reserva], mesas[mesa_id]
+        filas.append(
+            {
+                "id_reserva": id_reserva,
+                "hora_reserva": reserva.hora_reserva,
+                "numero_personas": reserva.numero_personas,
+                "id_mesa": mesa_id,
+                "numero_mesa": mesa.numero_mesa,
+                "capacidad": mesa.capacidad,
+                "ubicacion": mesa.ubicacion,
+            }
+        )
+    filas.sort(key=lambda fila: (fila["hora_reserva"], fila["numero_mesa"]))
+    return filas
+
+
+def asignar_servicio(
+    db: Session,
+    restaurante_id: UUID,
+    dia: date,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    ubicaciones: Optional[List[str]] = None,
+    reasignar: bool = False,
+    aplicar: bool = False,
+) -> Tuple[Plan, Dict[UUID, MesaPlan], Dict]:
+    """
+    Leer reservas y mesas, calcular el plan y (si aplicar) guardarlo con
+    un único UPDATE por lotes. Al aplicar, las mesas quedan bloqueadas para
+    ese día y el siguiente (crud.bloqueos) desde la lectura de reservas
+    hasta el commit.
+
+    Returns:
+        Tupla con (plan, mesas por id, filas de reserva por id)
+
+    Raises:
+        LookupError: si el restaurante no existe
+        ValueError: si desde/hasta no son horas válidas
+    """
+    if db.execute(_consulta_existe(restaurante_id)).first() is None:
+        raise LookupError("Restaurante no encontrado")
+    mesas = db.execute(_consulta_mesas(restaurante_id, ubicaciones)).all()
+    if aplicar:
+        # Nadie reserva esas mesas ese día hasta guardar el plan
+        bloquear(db, _parejas_bloqueo(mesas, dia))
+    filas = db.execute(_consulta_reservas(restaurante_id, dia)).all()
+    reservas, mesas, por_id = _armar(filas, mesas, dia, desde, hasta, reasignar)
+    plan = asignar(reservas, mesas)
+    cambios = _cambios(plan, por_id, mesas)
+    if aplicar:
+        try:
+            if cambios:
+                db.execute(
+                    _sentencia_aplicar(reasignar),
+                    [{"b_id": r, "b_mesa": m} for r, m in cambios.items()],
+                )
+            db.commit()  # libera los bloqueos aunque no haya cambios
+        except Exception:
+            db.rollback()
+            raise
+        _notificar(cambios, por_id)
+    return plan, {mesa.id_mesa: mesa for mesa in mesas}, por_id
+
+
+async def asignar_servicio_async(
+    db: "AsyncSession",
+    restaurante_id: UUID,
+    dia: date,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    ubicaciones: Optional[List[str]] = None,
+    reasignar: bool = False,
+    aplicar: bool = False,
+) -> Tuple[Plan, Dict[UUID, MesaPlan], Dict]:
+    if (await db.execute(_consulta_existe(restaurante_id))).first() is None:
+        raise LookupError("Restaurante no encontrado")
+    mesas = (await db.execute(_consulta_mesas(restaurante_id, ubicaciones))).all()
+    if aplicar:
+        await bloquear_async(db, _parejas_bloqueo(mesas, dia))
+    filas = (await db.execute(_consulta_reservas(restaurante_id, dia))).all()
+    reservas, mesas, por_id = _armar(filas, mesas, dia, desde, hasta, reasignar)
+    plan = asignar(reservas, mesas)
+    cambios = _cambios(plan, por_id, mesas)
+    if aplicar:
+        try:
+            if cambios:
+                await db.execute(
+                    _sentencia_aplicar(reasignar),
+                    [{"b_id": r, "b_mesa": m} for r, m in cambios.items()],
+                )
+            await db.commit()  # libera los bloqueos aunque no haya cambios
+        except Exception:
+            await db.rollback()
+            raise
+        _notificar(cambios, por_id)
+    return plan, {mesa.id_mesa: mesa for mesa in mesas}, por_id
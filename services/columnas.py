@@ -0,0 +1,220 @@
+"""
+Estadísticas de reservas en forma columnar (NumPy), sin base de datos
+
+Las reservas se cargan una vez en arreglos por columna (hora, día de la
+semana, personas, método de pago, cancelada, anticipación) y cada
+estadística es una operación vectorizada sobre ellos (bincount, unique,
+searchsorted) en lugar de un recorrido fila por fila en Python.
+
+Dos orígenes:
+
+- filas de la base (ReservaCRUD.obtener_columnas_estadisticas, ver
+  services.estadisticas): inicio y creación llegan como segundos epoch,
+  así que no se arma ningún datetime
+- el motor en memoria de la consola (src.restaurante), que solo conoce
+  hora y método de pago: las estadísticas por día y de anticipación
+  quedan vacías
+
+Este módulo no importa la capa de datos, así que la consola lo usa sin
+DATABASE_URL.
+
+Horas y días son los de inicio_reserva (hora local del restaurante
+guardada como UTC, ver services.disponibilidad).
+"""
+
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.restaurante import METODOS_PAGO
+
+DIAS_SEMANA = (
+    "lunes",
+    "martes",
+    "miércoles",
+    "jueves",
+    "viernes",
+    "sábado",
+    "domingo",
+)
+
+# Límites (horas) de los tramos de anticipación; el primero incluye las
+# reservas cargadas después de su inicio
+TRAMOS_ANTICIPACION_H = (0, 1, 6, 24, 72, 168, 720)
+
+_DIA = 86400
+# 1970-01-01 fue jueves (3 con lunes = 0)
+_DIA_EPOCH = 3
+
+
+@dataclass
+class Columnas:
+    """Una posición por reserva; None si el origen no tiene ese dato"""
+
+    hora: np.ndarray  # int8, 0-23
+    metodo: np.ndarray  # int32, índice en metodos (texto libre: sin tope)
+    metodos: Tuple[str, ...]
+    personas: np.ndarray  # int32
+    cancelada: np.ndarray  # bool
+    dia_semana: Optional[np.ndarray] = None  # int8, lunes = 0
+    anticipacion_h: Optional[np.ndarray] = None  # float64, NaN si no se sabe
+
+    def __len__(self) -> int:
+        return len(self.hora)
+
+
+def columnas_de_filas(filas: Sequence[tuple]) -> Columnas:
+    """
+    Filas de ReservaCRUD.obtener_columnas_estadisticas:
+    (inicio_s, creacion_s, personas, metodo_pago, cancelada).
+    Cada columna se copia directo a su arreglo (sin transponer las filas).
+    """
+    cantidad = len(filas)
+    if not cantidad:
+        return _vacias()
+
+    def columna(posicion, tipo):
+        return np.fromiter(map(itemgetter(posicion), filas), tipo, count=cantidad)
+
+    inicio = columna(0, np.float64)
+    segundos = np.floor(inicio).astype(np.int64)
+    codigos: Dict[str, int] = {}
+    metodo = np.fromiter(
+        (codigos.setdefault(m, len(codigos)) for m in map(itemgetter(3), filas)),
+        np.int32,
+        count=cantidad,
+    )
+    return Columnas(
+        hora=((segundos % _DIA) // 3600).astype(np.int8),
+        metodo=metodo,
+        metodos=tuple(codigos),
+        personas=columna(2, np.int32),
+        cancelada=columna(4, bool),
+        dia_semana=((segundos // _DIA + _DIA_EPOCH) % 7).astype(np.int8),
+        anticipacion_h=(inicio - columna(1, np.float64)) / 3600,
+    )
+
+
+def columnas_de_memoria(restaurante) -> Columnas:
+    """Reservas de un src.restaurante.Restaurante (una persona cada una)"""
+    reservas = restaurante.reservas
+    cantidad = len(reservas)
+    indice = {metodo: i for i, metodo in enumerate(METODOS_PAGO)}
+    return Columnas(
+        hora=np.fromiter((r.hora for r in reservas), np.int8, count=cantidad),
+        metodo=np.fromiter(
+            (indice[r.metodo_pago] for r in reservas), np.int32, count=cantidad
+        ),
+        metodos=METODOS_PAGO,
+        personas=np.ones(cantidad, dtype=np.int32),
+        cancelada=np.zeros(cantidad, dtype=bool),
+    )
+
+
+def _vacias() -> Columnas:
+    return Columnas(
+        hora=np.empty(0, dtype=np.int8),
+        metodo=np.empty(0, dtype=np.int32),
+        metodos=(),
+        personas=np.empty(0, dtype=np.int32),
+        cancelada=np.empty(0, dtype=bool),
+        dia_semana=np.empty(0, dtype=np.int8),
+        anticipacion_h=np.empty(0, dtype=np.float64),
+    )
+
+
+def calcular(columnas: Columnas) -> Dict:
+    """Todas las estadísticas de un conjunto de columnas"""
+    total = len(columnas)
+    vigente = ~columnas.cancelada
+    personas = columnas.personas[vigente]
+    canceladas = int(columnas.cancelada.sum())
+
+    # Ocupación: solo reservas no canceladas
+    hora = columnas.hora[vigente]
+    reservas_hora = np.bincount(hora, minlength=24)
+    comensales_hora = np.bincount(hora, weights=personas, minlength=24)
+    por_hora = [
+        {
+            "hora": h,
+            "reservas": int(reservas_hora[h]),
+            "comensales": int(comensales_hora[h]),
+        }
+        for h in np.flatnonzero(reservas_hora).tolist()
+    ]
+
+    por_dia_semana, ocupacion_dia_hora = [], []
+    if columnas.dia_semana is not None:
+        dia = columnas.dia_semana[vigente]
+        reservas_dia = np.bincount(dia, minlength=7)
+        comensales_dia = np.bincount(dia, weights=personas, minlength=7)
+        por_dia_semana = [
+            {
+                "dia": DIAS_SEMANA[d],
+                "reservas": int(reservas_dia[d]),
+                "comensales": int(comensales_dia[d]),
+            }
+            for d in range(7)
+        ]
+        ocupacion_dia_hora = (
+            np.bincount(dia.astype(np.int32) * 24 + hora, minlength=7 * 24)
+            .reshape(7, 24)
+            .tolist()
+        )
+
+    tamanos, grupos = np.unique(personas, return_counts=True)
+    tamano_grupo = [
+        {"personas": p, "reservas": c}
+        for p, c in zip(tamanos.tolist(), grupos.tolist())
+    ]
+
+    por_metodo = np.bincount(columnas.metodo, minlength=len(columnas.metodos))
+    metodos_pago = [
+        {
+            "metodo_pago": metodo,
+            "reservas": int(cantidad),
+            "proporcion": round(float(cantidad) / total, 4),
+        }
+        for metodo, cantidad in zip(columnas.metodos, por_metodo.tolist())
+        if cantidad
+    ]
+
+    anticipacion, mediana = [], None
+    if columnas.anticipacion_h is not None:
+        horas = columnas.anticipacion_h[~np.isnan(columnas.anticipacion_h)]
+        limites = np.array(TRAMOS_ANTICIPACION_H[1:], dtype=np.float64)
+        # Tramo de cada reserva: 0 = menos de 1 h (o negativa), último = 720 h o más
+        conteo = np.bincount(
+            np.searchsorted(limites, horas, side="right"),
+            minlength=len(TRAMOS_ANTICIPACION_H),
+        )
+        anticipacion = [
+            {
+                "desde_h": desde,
+                "hasta_h": hasta,
+                "reservas": int(cantidad),
+            }
+            for desde, hasta, cantidad in zip(
+                TRAMOS_ANTICIPACION_H,
+                TRAMOS_ANTICIPACION_H[1:] + (None,),
+                conteo.tolist(),
+            )
+        ]
+        if len(horas):
+            mediana = round(float(np.median(horas)), 2)
+
+    return {
+        "total_reservas": total,
+        "canceladas": canceladas,
+        "tasa_cancelacion": round(canceladas / total, 4) if total else None,
+        "comensales": int(personas.sum()),
+        "por_hora": por_hora,
+        "por_dia_semana": por_dia_semana,
+        "ocupacion_dia_hora": ocupacion_dia_hora,
+        "tamano_grupo": tamano_grupo,
+        "metodos_pago": metodos_pago,
+        "anticipacion": anticipacion,
+        "anticipacion_mediana_h": mediana,
+    }
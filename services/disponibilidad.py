@@ -0,0 +1,508 @@
+"""
+Motor de disponibilidad de mesas
+
+Responde "qué mesas admiten N personas en tal fecha y hora" sin consultar
+la base de datos en cada request. Por restaurante se cachean el horario y
+las mesas activas; por restaurante y día, un índice de intervalos con las
+reservas que ocupan cada mesa (listas ordenadas por inicio, búsqueda con
+bisect). Ambos se cargan la primera vez que se consultan y luego:
+
+- las escrituras de reservas de este proceso los actualizan en el acto
+  (registrar / quitar, llamados desde el CRUD tras el commit);
+- las escrituras de mesas y restaurantes invalidan los datos fijos;
+- cada día cargado caduca a los DISPONIBILIDAD_TTL_S segundos, lo que
+  acota el desfase frente a escrituras hechas por otras instancias.
+
+Una reserva ocupa su mesa desde inicio_reserva (el día de fecha_reserva
+en UTC a la hora_reserva) y durante duracion_minutos (al crearla, por defecto la
+duracion_reserva_min del restaurante; RESERVA_DURACION_MIN si falta).
+Las reservas canceladas o sin mesa no ocupan nada.
+
+Si el restaurante cierra después de medianoche (18:00-02:00) el cierre se
+guarda como minutos del día siguiente (26:00). Una hora anterior a la
+apertura (00:30) es la madrugada del servicio del día anterior, y las
+ventanas que cruzan medianoche miran también las reservas de los días
+vecinos.
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import SimpleNamespace
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.models.mesa import Mesa
+from database.models.reserva import Reserva
+from database.models.restaurante import Restaurante
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+RESERVA_DURACION_MIN = int(os.getenv("RESERVA_DURACION_MIN", "120"))
+DISPONIBILIDAD_TTL_S = float(os.getenv("DISPONIBILIDAD_TTL_S", "60"))
+DISPONIBILIDAD_MAX_DIAS = int(os.getenv("DISPONIBILIDAD_MAX_DIAS", "2000"))
+
+_DIA = 24 * 60
+
+# Intervalo ocupado: (inicio, fin, id_reserva) en minutos desde las 00:00
+Intervalo = Tuple[int, int, UUID]
+ClaveDia = Tuple[UUID, date]
+
+
+@dataclass(frozen=True)
+class MesaLibre:
+    """Datos de una mesa que necesita la respuesta de disponibilidad"""
+
+    id_mesa: UUID
+    numero_mesa: int
+    capacidad: int
+    ubicacion: Optional[str]
+
+
+@dataclass
+class _Local:
+    apertura: int
+    cierre: int  # más de 24 * 60 si cierra después de medianoche
+    duracion: int  # duración por defecto de una reserva
+    mesas: Tuple[MesaLibre, ...]  # ordenadas por capacidad y número
+
+
+@dataclass
+class _Dia:
+    cargado_en: float
+    por_mesa: Dict[UUID, List[Intervalo]]
+    max_duracion: int = 0  # acota hacia atrás la búsqueda de solapes
+
+
+def minutos(hora: str) -> int:
+    """'19:30' -> 1170"""
+    try:
+        horas, mins = (int(parte) for parte in hora.split(":"))
+    except ValueError:
+        raise ValueError(f"Hora inválida: {hora}")
+    if not 0 <= horas < 24 or not 0 <= mins < 60:
+        raise ValueError(f"Hora inválida: {hora}")
+    return horas * 60 + mins
+
+
+def dia_de(fecha_reserva: datetime) -> date:
+    if fecha_reserva.tzinfo is not None:
+        fecha_reserva = fecha_reserva.astimezone(timezone.utc)
+    return fecha_reserva.date()
+
+
+def inicio_reserva(fecha_reserva: datetime, hora_reserva: str) -> datetime:
+    """Instante (UTC) en que empieza la reserva: día de fecha_reserva + hora"""
+    dia = dia_de(fecha_reserva)
+    return datetime(dia.year, dia.month, dia.day, tzinfo=timezone.utc) + timedelta(
+        minutes=minutos(hora_reserva)
+    )
+
+
+def minuto_del_dia(instante: datetime) -> int:
+    """Minutos desde las 00:00 (UTC) de un inicio de reserva"""
+    instante = instante.astimezone(timezone.utc)
+    return instante.hour * 60 + instante.minute
+
+
+def _rango_dia(dia: date) -> Tuple[datetime, datetime]:
+    inicio = datetime(dia.year, dia.month, dia.day, tzinfo=timezone.utc)
+    return inicio, inicio + timedelta(days=1)
+
+
+def _ocupa(reserva) -> bool:
+    return reserva.mesa_id is not None and reserva.estado != "cancelada"
+
+
+def _duracion(reserva) -> int:
+    return getattr(reserva, "duracion_minutos", None) or RESERVA_DURACION_MIN
+
+
+def _intervalo(reserva) -> Intervalo:
+    inicio = minuto_del_dia(reserva.inicio_reserva)
+    return inicio, inicio + _duracion(reserva), reserva.id_reserva
+
+
+# ---------- CONSULTAS DE CARGA ----------
+def _consulta_restaurante(restaurante_id: UUID):
+    return select(
+        Restaurante.horario_apertura,
+        Restaurante.horario_cierre,
+        Restaurante.duracion_reserva_min,
+    ).where(Restaurante.id_restaurante == restaurante_id)
+
+
+def _consulta_mesas(restaurante_id: UUID):
+    return (
+        select(Mesa.id_mesa, Mesa.numero_mesa, Mesa.capacidad, Mesa.ubicacion)
+        .where(Mesa.restaurante_id == restaurante_id, Mesa.activa == True)
+        .order_by(Mesa.capacidad, Mesa.numero_mesa)
+    )
+
+
+def _consulta_reservas_dia(restaurante_id: UUID, dia: date):
+    desde, hasta = _rango_dia(dia)
+    return select(
+        Reserva.id_reserva,
+        Reserva.mesa_id,
+        Reserva.inicio_reserva,
+        Reserva.duracion_minutos,
+        Reserva.estado,
+    ).where(
+        Reserva.restaurante_id == restaurante_id,
+        Reserva.inicio_reserva >= desde,
+        Reserva.inicio_reserva < hasta,
+        Reserva.mesa_id.is_not(None),
+        Reserva.estado != "cancelada",
+    )
+
+
+def _armar_local(horario, mesas) -> _Local:
+    """Horario en minutos y mesas activas de un restaurante"""
+    apertura, cierre = minutos(horario.horario_apertura), minutos(
+        horario.horario_cierre
+    )
+    if cierre <= apertura:  # cierra después de medianoche (día siguiente)
+        cierre += _DIA
+    return _Local(
+        apertura,
+        cierre,
+        horario.duracion_reserva_min or RESERVA_DURACION_MIN,
+        tuple(MesaLibre(*mesa) for mesa in mesas),
+    )
+
+
+def _armar_dia(reservas) -> _Dia:
+    por_mesa: Dict[UUID, List[Intervalo]] = {}
+    max_duracion = 0
+    for reserva in reservas:
+        por_mesa.setdefault(reserva.mesa_id, []).append(_intervalo(reserva))
+        max_duracion = max(max_duracion, _duracion(reserva))
+    for intervalos in por_mesa.values():
+        intervalos.sort()
+    return _Dia(time.monotonic(), por_mesa, max_duracion)
+
+
+class MotorDisponibilidad:
+    """Índice en memoria de ocupación de mesas por restaurante y día"""
+
+    def __init__(
+        self,
+        ttl_s: float = DISPONIBILIDAD_TTL_S,
+        max_dias: int = DISPONIBILIDAD_MAX_DIAS,
+    ):
+        self.ttl_s = ttl_s
+        self.max_dias = max_dias
+        self._locales: Dict[UUID, _Local] = {}
+        self._dias: "OrderedDict[ClaveDia, _Dia]" = OrderedDict()
+        # id_reserva -> (día, mesa, intervalo) para actualizar sin datos viejos
+        self._ubicacion: Dict[UUID, Tuple[ClaveDia, UUID, Intervalo]] = {}
+        self._escrituras = 0
+        self._lock = threading.Lock()
+
+    # ---------- ESTADO EN CACHÉ ----------
+    def _local(self, restaurante_id: UUID) -> Optional[_Local]:
+        return self._locales.get(restaurante_id)
+
+    def _dia(self, clave: ClaveDia) -> Optional[_Dia]:
+        dia = self._dias.get(clave)
+        if dia is None:
+            return None
+        if time.monotonic() - dia.cargado_en > self.ttl_s:
+            self._descartar_dia(clave)
+            return None
+        self._dias.move_to_end(clave)
+        return dia
+
+    def _descartar_dia(self, clave: ClaveDia) -> None:
+        dia = self._dias.pop(clave)
+        for intervalos in dia.por_mesa.values():
+            for intervalo in intervalos:
+                self._ubicacion.pop(intervalo[2], None)
+
+    def _guardar_dia(self, clave: ClaveDia, dia: _Dia) -> None:
+        if clave in self._dias:
+            self._descartar_dia(clave)
+        self._dias[clave] = dia
+        for mesa_id, intervalos in dia.por_mesa.items():
+            for intervalo in intervalos:
+                self._ubicacion[intervalo[2]] = (clave, mesa_id, intervalo)
+        while len(self._dias) > self.max_dias:
+            self._descartar_dia(next(iter(self._dias)))
+
+    # ---------- CARGA ----------
+    def _en_cache(self, restaurante_id: UUID, dia: date):
+        with self._lock:
+            return (
+                self._local(restaurante_id),
+                self._dia((restaurante_id, dia)),
+                self._escrituras,
+            )
+
+    def _guardar(
+        self, restaurante_id: UUID, dia: date, local, ocupacion, escrituras: int
+    ) -> Tuple[_Local, _Dia]:
+        """
+        Guardar en caché lo que se acaba de leer de la base (filas) y
+        devolver el horario y la ocupación listos para consultar
+        """
+        with self._lock:
+            if not isinstance(local, _Local):
+                local = self._locales[restaurante_id] = _armar_local(*local)
+            if not isinstance(ocupacion, _Dia):
+                ocupacion = _armar_dia(ocupacion)
+                if escrituras != self._escrituras:
+                    # Hubo escrituras durante la carga que pueden no estar
+                    # en la foto leída: se usa una vez y se recarga después
+                    ocupacion.cargado_en = float("-inf")
+                self._guardar_dia((restaurante_id, dia), ocupacion)
+            return local, ocupacion
+
+    def _cargar(
+        self, db: Session, restaurante_id: UUID, dia: date
+    ) -> Tuple[_Local, _Dia]:
+        local, ocupacion, escrituras = self._en_cache(restaurante_id, dia)
+        if local is None:
+            horario = db.execute(_consulta_restaurante(restaurante_id)).first()
+            if horario is None:
+                raise LookupError("Restaurante no encontrado")
+            local = (horario, db.execute(_consulta_mesas(restaurante_id)).all())
+        if ocupacion is None:
+            ocupacion = db.execute(_consulta_reservas_dia(restaurante_id, dia)).all()
+        return self._guardar(restaurante_id, dia, local, ocupacion, escrituras)
+
+    async def _cargar_async(
+        self, db: "AsyncSession", restaurante_id: UUID, dia: date
+    ) -> Tuple[_Local, _Dia]:
+        local, ocupacion, escrituras = self._en_cache(restaurante_id, dia)
+        if local is None:
+            horario = (await db.execute(_consulta_restaurante(restaurante_id))).first()
+            if horario is None:
+                raise LookupError("Restaurante no encontrado")
+            local = (horario, (await db.execute(_consulta_mesas(restaurante_id))).all())
+        if ocupacion is None:
+            ocupacion = (
+                await db.execute(_consulta_reservas_dia(restaurante_id, dia))
+            ).all()
+        return self._guardar(restaurante_id, dia, local, ocupacion, escrituras)
+
+    # ---------- CONSULTA ----------
+    def _libres(
+        self,
+        local: _Local,
+        ocupaciones: List[Tuple[_Dia, int]],
+        inicio: int,
+        fin: int,
+        personas: int,
+    ) -> List[MesaLibre]:
+        """
+        ocupaciones: (día, desplazamiento en minutos de su 00:00 respecto
+        del día pedido), el pedido primero
+        """
+        with self._lock:
+            return [
+                mesa
+                for mesa in local.mesas
+                if mesa.capacidad >= personas
+                and not any(
+                    _solapa(
+                        ocupacion.por_mesa.get(mesa.id_mesa, ()),
+                        inicio - desplazamiento,
+                        fin - desplazamiento,
+                        ocupacion.max_duracion,
+                    )
+                    for ocupacion, desplazamiento in ocupaciones
+                )
+            ]
+
+    def mesas_libres(
+        self,
+        db: Session,
+        restaurante_id: UUID,
+        dia: date,
+        hora: str,
+        personas: int,
+        duracion: Optional[int] = None,
+    ) -> Tuple[List[MesaLibre], int]:
+        """
+        Mesas activas con capacidad para `personas` y sin reservas que se
+        solapen con [hora, hora + duración). Ordenadas de menor a mayor
+        capacidad. Sin `duracion` se usa la del restaurante.
+
+        Returns:
+            Tupla con (mesas libres, duración usada en minutos)
+
+        Raises:
+            LookupError: si el restaurante no existe
+            ValueError: hora inválida o fuera del horario
+        """
+        minutos(hora)
+        local, ocupacion = self._cargar(db, restaurante_id, dia)
+        inicio, fin, duracion, vecinos = _ventana(local, hora, duracion)
+        ocupaciones = [(ocupacion, 0)]
+        for dias in vecinos:
+            _, vecino = self._cargar(db, restaurante_id, dia + timedelta(days=dias))
+            ocupaciones.append((vecino, dias * _DIA))
+        return self._libres(local, ocupaciones, inicio, fin, personas), duracion
+
+    async def mesas_libres_async(
+        self,
+        db: "AsyncSession",
+        restaurante_id: UUID,
+        dia: date,
+        hora: str,
+        personas: int,
+        duracion: Optional[int] = None,
+    ) -> Tuple[List[MesaLibre], int]:
+        minutos(hora)
+        local, ocupacion = await self._cargar_async(db, restaurante_id, dia)
+        inicio, fin, duracion, vecinos = _ventana(local, hora, duracion)
+        ocupaciones = [(ocupacion, 0)]
+        for dias in vecinos:
+            _, vecino = await self._cargar_async(
+                db, restaurante_id, dia + timedelta(days=dias)
+            )
+            ocupaciones.append((vecino, dias * _DIA))
+        return self._libres(local, ocupaciones, inicio, fin, personas), duracion
+
+    # ---------- ACTUALIZACIÓN INCREMENTAL ----------
+    def registrar(self, reserva) -> None:
+        """
+        Reflejar una reserva creada o modificada (objeto ORM, Row o dict).
+        Solo toca días ya cargados.
+        """
+        if isinstance(reserva, dict):
+            reserva = SimpleNamespace(**reserva)
+        with self._lock:
+            self._escrituras += 1
+            self._quitar(reserva.id_reserva)
+            if not _ocupa(reserva):
+                return
+            clave = (reserva.restaurante_id, dia_de(reserva.inicio_reserva))
+            dia = self._dias.get(clave)
+            if dia is None:
+                return
+            intervalo = _intervalo(reserva)
+            insort(dia.por_mesa.setdefault(reserva.mesa_id, []), intervalo)
+            dia.max_duracion = max(dia.max_duracion, intervalo[1] - intervalo[0])
+            self._ubicacion[reserva.id_reserva] = (clave, reserva.mesa_id, intervalo)
+
+    def quitar(self, reserva_id: UUID) -> None:
+        """Reflejar una reserva eliminada"""
+        with self._lock:
+            self._escrituras += 1
+            self._quitar(reserva_id)
+
+    def _quitar(self, reserva_id: UUID) -> None:
+        ubicacion = self._ubicacion.pop(reserva_id, None)
+        if ubicacion is None:
+            return
+        clave, mesa_id, intervalo = ubicacion
+        dia = self._dias.get(clave)
+        if dia is not None:
+            intervalos = dia.por_mesa.get(mesa_id, [])
+            posicion = bisect_left(intervalos, intervalo)
+            if posicion < len(intervalos) and intervalos[posicion] == intervalo:
+                del intervalos[posicion]
+
+    def invalidar_locales(self) -> None:
+        """
+        Olvidar horarios y mesas (tras escribir mesas o restaurantes); se
+        recargan en la siguiente consulta
+        """
+        with self._lock:
+            self._locales.clear()
+
+    def resumen(self) -> Dict:
+        with self._lock:
+            return {
+                "restaurantes": len(self._locales),
+                "dias": len(self._dias),
+                "reservas": len(self._ubicacion),
+                "ttl_s": self.ttl_s,
+                "duracion_defecto_min": RESERVA_DURACION_MIN,
+            }
+
+
+def _ventana(
+    local: _Local, hora: str, duracion: Optional[int]
+) -> Tuple[int, int, int, List[int]]:
+    """
+    [inicio, fin) en minutos desde las 00:00 del día pedido, duración y
+    días vecinos (-1, +1) cuyas reservas pueden solaparse con la ventana.
+    Una hora anterior a la apertura cuenta como madrugada del servicio
+    del día anterior.
+
+    Raises:
+        ValueError: si la reserva no empieza y termina dentro del horario
+    """
+    duracion = duracion or local.duracion
+    inicio = minutos(hora)
+    fin = inicio + duracion
+    servicio = inicio if inicio >= local.apertura else inicio + _DIA
+    if servicio < local.apertura or servicio + duracion > local.cierre:
+        raise ValueError(
+            "La reserva debe empezar y terminar dentro del horario "
+            f"del restaurante ({duracion} min)"
+        )
+    vecinos = []
+    if local.cierre > _DIA:  # las reservas de la noche anterior pasan de las 00:00
+        vecinos.append(-1)
+    if fin > _DIA:
+        vecinos.append(1)
+    return inicio, fin, duracion, vecinos
+
+
+def _solapa(
+    intervalos: List[Intervalo], inicio: int, fin: int, max_duracion: int
+) -> bool:
+    """
+    ¿Algún intervalo ocupado corta [inicio, fin)? Ninguno dura más que
+    max_duracion, así que solo pueden cortar los que empiezan en
+    (inicio - max_duracion, fin).
+    """
+    posicion = bisect_left(intervalos, (inicio - max_duracion + 1,))
+    while posicion < len(intervalos) and intervalos[posicion][0] < fin:
+        if intervalos[posicion][1] > inicio:
+            return True
+        posicion += 1
+    return False
+
+
+motor_disponibilidad = MotorDisponibilidad()
+
+
+def invalida_locales(metodo):
+    """
+    Decorador para las escrituras de mesas y restaurantes (síncronas o
+    asíncronas): al terminar, el motor vuelve a leer horarios y mesas
+    """
+    if inspect.iscoroutinefunction(metodo):
+
+        @functools.wraps(metodo)
+        async def envoltura_async(*args, **kwargs):
+            try:
+                return await metodo(*args, **kwargs)
+            finally:
+                motor_disponibilidad.invalidar_locales()
+
+        return envoltura_async
+
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            motor_disponibilidad.invalidar_locales()
+
+    return envoltura
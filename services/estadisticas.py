@@ -0,0 +1,53 @@
+"""
+Estadísticas de reservas de un restaurante de la base
+
+Lee las columnas con ReservaCRUD.obtener_columnas_estadisticas y las
+calcula con services.columnas (el cálculo no depende de la base).
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from crud.reserva_crud import ReservaAsyncCRUD, ReservaCRUD
+from crud.restaurante_crud import RestauranteAsyncCRUD, RestauranteCRUD
+from services.columnas import calcular, columnas_de_filas
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def estadisticas_restaurante(
+    db: Session,
+    restaurante_id: UUID,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+) -> Dict:
+    """
+    Estadísticas de las reservas del restaurante con inicio en
+    [desde, hasta) (todas si no se indica).
+
+    Raises:
+        LookupError: si el restaurante no existe
+        ValueError: si desde no es anterior a hasta
+    """
+    if RestauranteCRUD(db).obtener_restaurante(restaurante_id) is None:
+        raise LookupError("Restaurante no encontrado")
+    filas = ReservaCRUD(db).obtener_columnas_estadisticas(restaurante_id, desde, hasta)
+    return calcular(columnas_de_filas(filas))
+
+
+async def estadisticas_restaurante_async(
+    db: "AsyncSession",
+    restaurante_id: UUID,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+) -> Dict:
+    if await RestauranteAsyncCRUD(db).obtener_restaurante(restaurante_id) is None:
+        raise LookupError("Restaurante no encontrado")
+    filas = await ReservaAsyncCRUD(db).obtener_columnas_estadisticas(
+        restaurante_id, desde, hasta
+    )
+    return calcular(columnas_de_filas(filas))
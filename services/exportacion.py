@@ -0,0 +1,153 @@
+"""
+Exportación de reservas en NDJSON o CSV
+
+Las filas llegan en tandas desde un cursor del servidor
+(ReservaCRUD.exportar_reservas) y cada tanda se convierte en un solo
+bloque de bytes para la StreamingResponse, así que la memoria usada no
+depende de cuántas reservas se exporten.
+
+Postgres ya entrega el texto de cada fila (el objeto JSON en NDJSON, las
+columnas como texto en CSV, con fechas en ISO 8601): aquí solo se unen
+líneas. En CSV los valores nulos quedan vacíos.
+
+exportar / exportar_async abren y cierran su propia sesión dentro del
+generador que recorre la StreamingResponse: el cursor no depende de
+cuándo cierre FastAPI las dependencias del endpoint (según la versión,
+antes o después de enviar la respuesta). La consulta se ejecuta antes de
+devolver el generador, así que un error de consulta llega al endpoint
+como excepción; si la lectura falla a mitad de la exportación el estado
+200 ya se envió: la respuesta se corta y el cliente recibe un archivo
+incompleto.
+"""
+
+import csv
+import io
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+from crud.reserva_crud import (
+    COLUMNAS_EXPORTACION,
+    EXPORTACION_TANDA,
+    ReservaAsyncCRUD,
+    ReservaCRUD,
+)
+from database.config import AsyncSessionLocal, SessionLocal
+
+FORMATOS_EXPORTACION: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _tanda_ndjson(filas: Sequence[tuple]) -> bytes:
+    return "".join([fila[0] + "\n" for fila in filas]).encode()
+
+
+class _TandaCSV:
+    """Escribe filas con csv.writer sobre un búfer que se vacía en cada tanda"""
+
+    def __init__(self):
+        self._bufer = io.StringIO()
+        self._escritor = csv.writer(self._bufer, lineterminator="\n")
+
+    def _vaciar(self) -> bytes:
+        datos = self._bufer.getvalue().encode()
+        self._bufer.seek(0)
+        self._bufer.truncate()
+        return datos
+
+    def encabezado(self) -> bytes:
+        self._escritor.writerow(COLUMNAS_EXPORTACION)
+        return self._vaciar()
+
+    def __call__(self, filas: Sequence[tuple]) -> bytes:
+        self._escritor.writerows(filas)
+        return self._vaciar()
+
+
+def _formateador(formato: str) -> Callable[[Sequence[tuple]], bytes]:
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(
+            f"Formato inválido (válidos: {', '.join(FORMATOS_EXPORTACION)})"
+        )
+    return _tanda_ndjson if formato == "ndjson" else _TandaCSV()
+
+
+def formatear(tandas: Iterable[Sequence[tuple]], formato: str) -> Iterator[bytes]:
+    """Un bloque de bytes por tanda (más el encabezado en CSV)"""
+    convertir = _formateador(formato)
+
+    def bloques():
+        if isinstance(convertir, _TandaCSV):
+            yield convertir.encabezado()
+        for filas in tandas:
+            yield convertir(filas)
+
+    return bloques()
+
+
+def formatear_async(
+    tandas: AsyncIterator[Sequence[tuple]], formato: str
+) -> AsyncIterator[bytes]:
+    convertir = _formateador(formato)
+
+    async def bloques():
+        if isinstance(convertir, _TandaCSV):
+            yield convertir.encabezado()
+        async for filas in tandas:
+            yield convertir(filas)
+
+    return bloques()
+
+
+def _bloques_con_sesion(abrir_sesion, formato: str, tanda: int, filtros):
+    with abrir_sesion() as db:
+        tandas = ReservaCRUD(db).exportar_reservas(formato, tanda, **filtros)
+        yield None  # consulta ejecutada
+        yield from formatear(tandas, formato)
+
+
+def exportar(
+    formato: str,
+    tanda: int = EXPORTACION_TANDA,
+    abrir_sesion: Optional[Callable] = None,
+    **filtros,
+) -> Iterator[bytes]:
+    """
+    Bloques del archivo exportado leídos con una sesión propia, que se
+    cierra al terminar el recorrido (o al descartar el generador)
+
+    Raises:
+        ValueError: formato o filtros inválidos (antes de enviar nada)
+    """
+    bloques = _bloques_con_sesion(abrir_sesion or SessionLocal, formato, tanda, filtros)
+    next(bloques)
+    return bloques
+
+
+async def _bloques_con_sesion_async(abrir_sesion, formato: str, tanda: int, filtros):
+    async with abrir_sesion() as db:
+        tandas = await ReservaAsyncCRUD(db).exportar_reservas(formato, tanda, **filtros)
+        yield None  # consulta ejecutada
+        async for bloque in formatear_async(tandas, formato):
+            yield bloque
+
+
+async def exportar_async(
+    formato: str,
+    tanda: int = EXPORTACION_TANDA,
+    abrir_sesion: Optional[Callable] = None,
+    **filtros,
+) -> AsyncIterator[bytes]:
+    bloques = _bloques_con_sesion_async(
+        abrir_sesion or AsyncSessionLocal, formato, tanda, filtros
+    )
+    await bloques.__anext__()
+    return bloques
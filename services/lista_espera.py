@@ -0,0 +1,170 @@
+"""
+Colas de espera por turno
+
+Cuando un turno (restaurante + inicio_reserva) está completo, los grupos
+pueden anotarse en la lista de espera (tabla lista_espera). Al cancelarse
+o eliminarse una reserva con mesa de ese turno, se promueve la mejor
+entrada que quepa en la mesa liberada: la de mayor prioridad y, a igual
+prioridad, la que se anotó antes.
+
+Por turno se guarda en memoria un montículo (heapq) por tamaño de grupo,
+así que elegir y sacar la mejor entrada que cabe en una mesa de C
+asientos cuesta O(log n) más una comparación por cada tamaño distinto
+<= C (unos pocos). Las colas se cargan de la base la primera vez que se
+necesitan y caducan a los ESPERA_TTL_S segundos; la base manda: al
+promover se vuelve a leer la entrada y se descarta si ya no espera
+(retirada o promovida por otra instancia).
+"""
+
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from database.models.lista_espera import ListaEspera
+
+ESPERA_TTL_S = float(os.getenv("ESPERA_TTL_S", "60"))
+ESPERA_MAX_TURNOS = int(os.getenv("ESPERA_MAX_TURNOS", "2000"))
+
+ESTADOS_ESPERA = ("esperando", "promovida", "retirada")
+
+Turno = Tuple[UUID, datetime]  # (restaurante_id, inicio_reserva)
+
+
+class Candidata(NamedTuple):
+    """Entrada del montículo; el orden de los campos es el de la cola"""
+
+    prioridad: int  # negada: heapq saca la menor
+    solicitada: datetime
+    id_espera: UUID
+    personas: int
+
+
+def candidata(fila) -> Candidata:
+    return Candidata(
+        -fila.prioridad, fila.fecha_creacion, fila.id_espera, fila.numero_personas
+    )
+
+
+@dataclass
+class _Cola:
+    cargada_en: float
+    por_personas: Dict[int, List[Candidata]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return sum(len(monticulo) for monticulo in self.por_personas.values())
+
+
+def consulta_turno(turno: Turno):
+    """Entradas que siguen esperando en el turno (índice parcial)"""
+    restaurante_id, inicio = turno
+    return select(
+        ListaEspera.id_espera,
+        ListaEspera.numero_personas,
+        ListaEspera.prioridad,
+        ListaEspera.fecha_creacion,
+    ).where(
+        ListaEspera.restaurante_id == restaurante_id,
+        ListaEspera.inicio_reserva == inicio,
+        ListaEspera.estado == "esperando",
+    )
+
+
+class ColasEspera:
+    """Montículos en memoria de la lista de espera por turno"""
+
+    def __init__(
+        self, ttl_s: float = ESPERA_TTL_S, max_turnos: int = ESPERA_MAX_TURNOS
+    ):
+        self.ttl_s = ttl_s
+        self.max_turnos = max_turnos
+        self._colas: "OrderedDict[Turno, _Cola]" = OrderedDict()
+        self._promovidas = 0
+        self._lock = threading.Lock()
+
+    def _cola(self, turno: Turno) -> Optional[_Cola]:
+        cola = self._colas.get(turno)
+        if cola is None:
+            return None
+        if time.monotonic() - cola.cargada_en > self.ttl_s:
+            del self._colas[turno]
+            return None
+        self._colas.move_to_end(turno)
+        return cola
+
+    def cargada(self, turno: Turno) -> bool:
+        with self._lock:
+            return self._cola(turno) is not None
+
+    def cargar(self, turno: Turno, filas) -> None:
+        """Armar la cola del turno con las filas de consulta_turno (O(n))"""
+        cola = _Cola(time.monotonic())
+        for fila in filas:
+            cola.por_personas.setdefault(fila.numero_personas, []).append(
+                candidata(fila)
+            )
+        for monticulo in cola.por_personas.values():
+            heapq.heapify(monticulo)
+        with self._lock:
+            self._colas[turno] = cola
+            self._colas.move_to_end(turno)
+            while len(self._colas) > self.max_turnos:
+                self._colas.popitem(last=False)
+
+    def agregar(self, turno: Turno, fila) -> None:
+        """Reflejar una entrada nueva; solo toca turnos ya cargados"""
+        self.devolver(turno, candidata(fila))
+
+    def devolver(self, turno: Turno, entrada: Candidata) -> None:
+        with self._lock:
+            cola = self._cola(turno)
+            if cola is not None:
+                heapq.heappush(
+                    cola.por_personas.setdefault(entrada.personas, []), entrada
+                )
+
+    def sacar(self, turno: Turno, capacidad: int) -> Optional[Candidata]:
+        """
+        Sacar la mejor entrada del turno con personas <= capacidad
+        (None si no hay ninguna o el turno no está cargado)
+        """
+        with self._lock:
+            cola = self._cola(turno)
+            if cola is None:
+                return None
+            mejor = None
+            for personas, monticulo in cola.por_personas.items():
+                if personas <= capacidad and monticulo:
+                    if mejor is None or monticulo[0] < mejor:
+                        mejor = monticulo[0]
+            if mejor is None:
+                return None
+            return heapq.heappop(cola.por_personas[mejor.personas])
+
+    def descartar(self, turno: Turno) -> None:
+        """Olvidar la cola del turno (se recarga de la base al usarla)"""
+        with self._lock:
+            self._colas.pop(turno, None)
+
+    def promovida(self) -> None:
+        with self._lock:
+            self._promovidas += 1
+
+    def resumen(self) -> Dict:
+        with self._lock:
+            return {
+                "turnos": len(self._colas),
+                "esperando": sum(len(cola) for cola in self._colas.values()),
+                "promovidas": self._promovidas,
+                "ttl_s": self.ttl_s,
+            }
+
+
+colas_espera = ColasEspera()
@@ -0,0 +1,297 @@
+"""
+Tablero del restaurante (resúmenes para el encargado)
+
+Los cuatro resúmenes de un rango de días salen de una sola consulta con
+GROUP BY GROUPING SETS que agrega en Postgres:
+
+- por turno (inicio_reserva): reservas, vigentes y comensales
+- por estado
+- por mesa: reservas, comensales, minutos ocupados, uso del horario de
+  apertura y llenado de asientos
+- por método de pago
+
+así que viajan unas decenas de filas en lugar de todas las reservas.
+
+El resultado se cachea por (restaurante, desde, hasta). Toda escritura de
+reservas de este proceso (ReservaCRUD, asignación de mesas) invalida los
+rangos de su restaurante; cada entrada caduca además a los TABLERO_TTL_S
+segundos, lo que acota el desfase frente a otras instancias y a cambios
+de mesas u horarios.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from database.models.mesa import Mesa
+from database.models.reserva import Reserva
+from database.models.restaurante import Restaurante
+from services.disponibilidad import minutos
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+TABLERO_TTL_S = float(os.getenv("TABLERO_TTL_S", "30"))
+TABLERO_MAX_ENTRADAS = int(os.getenv("TABLERO_MAX_ENTRADAS", "5000"))
+TABLERO_MAX_DIAS = 366
+
+ClaveTablero = Tuple[UUID, date, date]
+
+_vigente = Reserva.estado != "cancelada"
+
+
+def _rango(desde: date, hasta: date) -> Tuple[datetime, datetime]:
+    """[desde, hasta] en días -> [inicio, fin) sobre inicio_reserva"""
+    if hasta < desde:
+        raise ValueError("'hasta' no puede ser anterior a 'desde'")
+    if (hasta - desde).days >= TABLERO_MAX_DIAS:
+        raise ValueError(f"El rango no puede superar {TABLERO_MAX_DIAS} días")
+    inicio = datetime(desde.year, desde.month, desde.day, tzinfo=timezone.utc)
+    return inicio, inicio + timedelta(days=(hasta - desde).days + 1)
+
+
+def _consulta_horario(restaurante_id: UUID):
+    return select(Restaurante.horario_apertura, Restaurante.horario_cierre).where(
+        Restaurante.id_restaurante == restaurante_id
+    )
+
+
+def _consulta_tablero(restaurante_id: UUID, inicio: datetime, fin: datetime):
+    """
+    Una fila por grupo; grouping(col) = 0 indica a qué resumen pertenece
+    (por mesa se agrupa también número y capacidad para no consultarlos)
+    """
+    return (
+        select(
+            func.grouping(Reserva.inicio_reserva).label("g_turno"),
+            func.grouping(Reserva.estado).label("g_estado"),
+            func.grouping(Reserva.mesa_id).label("g_mesa"),
+            Reserva.inicio_reserva,
+            Reserva.estado,
+            Reserva.mesa_id,
+            Mesa.numero_mesa,
+            Mesa.capacidad,
+            Reserva.metodo_pago,
+            func.count().label("reservas"),
+            func.count().filter(_vigente).label("vigentes"),
+            func.coalesce(func.sum(Reserva.numero_personas).filter(_vigente), 0).label(
+                "comensales"
+            ),
+            func.coalesce(func.sum(Reserva.duracion_minutos).filter(_vigente), 0).label(
+                "minutos"
+            ),
+        )
+        .select_from(Reserva)
+        .outerjoin(Mesa, Mesa.id_mesa == Reserva.mesa_id)
+        .where(
+            Reserva.restaurante_id == restaurante_id,
+            Reserva.inicio_reserva >= inicio,
+            Reserva.inicio_reserva < fin,
+        )
+        .group_by(
+            func.grouping_sets(
+                tuple_(Reserva.inicio_reserva),
+                tuple_(Reserva.estado),
+                tuple_(Reserva.mesa_id, Mesa.numero_mesa, Mesa.capacidad),
+                tuple_(Reserva.metodo_pago),
+            )
+        )
+    )
+
+
+def _minutos_abierto(horario) -> int:
+    """Minutos de apertura por día (el cierre puede pasar la medianoche)"""
+    try:
+        abierto = (
+            minutos(horario.horario_cierre) - minutos(horario.horario_apertura)
+        ) % 1440
+    except ValueError:
+        return 1440
+    return abierto or 1440
+
+
+def _armar(filas, dias: int, minutos_dia: int) -> Dict:
+    por_turno, por_estado, por_mesa, por_metodo = [], [], [], []
+    sin_mesa = 0
+    disponible = dias * minutos_dia
+    for fila in filas:
+        if fila.g_turno == 0:
+            por_turno.append(
+                {
+                    "inicio": fila.inicio_reserva,
+                    "reservas": fila.reservas,
+                    "vigentes": fila.vigentes,
+                    "comensales": fila.comensales,
+                }
+            )
+        elif fila.g_estado == 0:
+            por_estado.append(
+                {
+                    "estado": fila.estado,
+                    "reservas": fila.reservas,
+                    "comensales": fila.comensales,
+                }
+            )
+        elif fila.g_mesa == 0:
+            if fila.mesa_id is None:
+                sin_mesa = fila.reservas
+                continue
+            asientos = fila.vigentes * (fila.capacidad or 0)
+            por_mesa.append(
+                {
+                    "mesa_id": fila.mesa_id,
+                    "numero_mesa": fila.numero_mesa,
+                    "capacidad": fila.capacidad,
+                    "reservas": fila.reservas,
+                    "comensales": fila.comensales,
+                    "minutos_ocupados": fila.minutos,
+                    "utilizacion": round(fila.minutos / disponible, 4),
+                    "llenado": (
+                        round(fila.comensales / asientos, 4) if asientos else None
+                    ),
+                }
+            )
+        else:
+            por_metodo.append(
+                {
+                    "metodo_pago": fila.metodo_pago,
+                    "reservas": fila.reservas,
+                    "comensales": fila.comensales,
+                }
+            )
+    por_turno.sort(key=lambda turno: turno["inicio"])
+    por_estado.sort(key=lambda grupo: grupo["estado"] or "")
+    por_mesa.sort(key=lambda mesa: mesa["numero_mesa"])
+    por_metodo.sort(key=lambda grupo: -grupo["reservas"])
+    return {
+        "total_reservas": sum(grupo["reservas"] for grupo in por_estado),
+        "sin_mesa": sin_mesa,
+        "por_turno": por_turno,
+        "por_estado": por_estado,
+        "por_mesa": por_mesa,
+        "por_metodo_pago": por_metodo,
+    }
+
+
+class CacheTablero:
+    """Tableros calculados por (restaurante, desde, hasta)"""
+
+    def __init__(
+        self, ttl_s: float = TABLERO_TTL_S, max_entradas: int = TABLERO_MAX_ENTRADAS
+    ):
+        self.ttl_s = ttl_s
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[ClaveTablero, Tuple[float, Dict]]" = OrderedDict()
+        # Se incrementan en cada invalidación (global y por restaurante): un
+        # cálculo que empezó antes no guarda un resultado viejo
+        self._generacion_global = 0
+        self._generacion: Dict[UUID, int] = {}
+        self._aciertos = 0
+        self._fallos = 0
+        self._invalidaciones = 0
+        self._lock = threading.Lock()
+
+    def _generacion_de(self, restaurante_id: UUID) -> Tuple[int, int]:
+        return self._generacion_global, self._generacion.get(restaurante_id, 0)
+
+    def obtener(self, clave: ClaveTablero) -> Tuple[Optional[Dict], Tuple[int, int]]:
+        """(tablero o None, generación con la que guardarlo si hay que calcularlo)"""
+        with self._lock:
+            generacion = self._generacion_de(clave[0])
+            entrada = self._entradas.get(clave)
+            if entrada is not None and time.monotonic() - entrada[0] <= self.ttl_s:
+                self._entradas.move_to_end(clave)
+                self._aciertos += 1
+                return entrada[1], generacion
+            self._entradas.pop(clave, None)
+            self._fallos += 1
+            return None, generacion
+
+    def guardar(
+        self, clave: ClaveTablero, tablero: Dict, generacion: Tuple[int, int]
+    ) -> None:
+        with self._lock:
+            if self._generacion_de(clave[0]) != generacion:
+                return
+            self._entradas[clave] = (time.monotonic(), tablero)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, restaurante_id: UUID) -> None:
+        """Olvidar todos los rangos de un restaurante (tras escribir reservas)"""
+        with self._lock:
+            self._invalidaciones += 1
+            self._generacion[restaurante_id] = (
+                self._generacion.get(restaurante_id, 0) + 1
+            )
+            for clave in [c for c in self._entradas if c[0] == restaurante_id]:
+                del self._entradas[clave]
+
+    def invalidar_todo(self) -> None:
+        with self._lock:
+            self._invalidaciones += 1
+            self._generacion_global += 1
+            self._entradas.clear()
+
+    def resumen(self) -> Dict:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "invalidaciones": self._invalidaciones,
+                "ttl_s": self.ttl_s,
+            }
+
+
+cache_tablero = CacheTablero()
+
+
+def tablero_restaurante(
+    db: Session, restaurante_id: UUID, desde: date, hasta: date
+) -> Tuple[Dict, bool]:
+    """
+    Tablero de las reservas con inicio entre los días desde y hasta
+    (inclusive) y si salió de la caché.
+
+    Raises:
+        LookupError: si el restaurante no existe
+        ValueError: si el rango no es válido
+    """
+    inicio, fin = _rango(desde, hasta)
+    clave = (restaurante_id, desde, hasta)
+    tablero, generacion = cache_tablero.obtener(clave)
+    if tablero is not None:
+        return tablero, True
+    horario = db.execute(_consulta_horario(restaurante_id)).first()
+    if horario is None:
+        raise LookupError("Restaurante no encontrado")
+    filas = db.execute(_consulta_tablero(restaurante_id, inicio, fin)).all()
+    tablero = _armar(filas, (fin - inicio).days, _minutos_abierto(horario))
+    cache_tablero.guardar(clave, tablero, generacion)
+    return tablero, False
+
+
+async def tablero_restaurante_async(
+    db: "AsyncSession", restaurante_id: UUID, desde: date, hasta: date
+) -> Tuple[Dict, bool]:
+    inicio, fin = _rango(desde, hasta)
+    clave = (restaurante_id, desde, hasta)
+    tablero, generacion = cache_tablero.obtener(clave)
+    if tablero is not None:
+        return tablero, True
+    horario = (await db.execute(_consulta_horario(restaurante_id))).first()
+    if horario is None:
+        raise LookupError("Restaurante no encontrado")
+    filas = (await db.execute(_consulta_tablero(restaurante_id, inicio, fin))).all()
+    tablero = _armar(filas, (fin - inicio).days, _minutos_abierto(horario))
+    cache_tablero.guardar(clave, tablero, generacion)
+    return tablero, False
@@ -0,0 +1,411 @@
+"""
+Persistencia en disco del sistema de reservas en memoria (consola)
+
+Dos archivos en un directorio:
+
+- diario: registro binario de solo anexado con cada alta, cambio o baja.
+  Cada registro lleva el estado completo de la reserva (o solo el ID en
+  las bajas) y un CRC32, así que repetirlo es idempotente y un registro a
+  medio escribir por un corte se detecta y se descarta al abrir.
+- instantanea: todas las reservas y el contador de IDs en formato
+  compacto. Se reescribe cada DIARIO_COMPACTAR_CADA registros y el diario
+  vuelve a empezar vacío.
+
+Al abrir se carga la instantánea y se repite la cola del diario. Ambos
+archivos llevan una generación: un diario de una generación anterior a la
+instantánea ya está incluido en ella (corte a mitad de una compactación)
+y se ignora. La instantánea se escribe en un temporal y se renombra
+encima, así que un corte deja la anterior o la nueva completa; si aun así
+está dañada (CRC, cabecera o largo) se aparta como instantanea.danada y
+se carga solo el diario.
+
+Los registros se encolan en el diario bajo el mismo lock que la
+compactación: cada uno queda en el diario de la generación que le
+corresponde y nunca se repite encima de una instantánea que ya lo incluye.
+
+Escritura con commit en grupo: los registros se encolan y un hilo los
+escribe y hace un único fsync por tanda; mientras dura un fsync se juntan
+los registros siguientes. Con DIARIO_SINCRONO cada operación espera a que
+su tanda esté en disco; sin él, un corte puede perder las operaciones de
+la última tanda (milisegundos) pero nunca deja el diario inconsistente.
+"""
+
+import gc
+import os
+import struct
+import threading
+import time
+import zlib
+
+from src.restaurante import METODOS_PAGO
+
+DIARIO_SINCRONO = os.getenv("DIARIO_SINCRONO", "true").lower() == "true"
+DIARIO_COMPACTAR_CADA = int(os.getenv("DIARIO_COMPACTAR_CADA", "100000"))
+
+ALTA, CAMBIO, BAJA = 1, 2, 3
+
+_CABECERA_DIARIO = struct.Struct("<4sBQ")  # marca, versión, generación
+_CABECERA_INSTANTANEA = struct.Struct("<4sBQQQ")  # ... contador_id, cantidad
+_MARCA_DIARIO = b"RSVD"
+_MARCA_INSTANTANEA = b"RSVS"
+_VERSION = 1
+
+# crc32, operación, id, hora, método, largo del nombre; sigue el nombre
+_REGISTRO = struct.Struct("<IBIBBH")
+# id, hora, método, largo del nombre; sigue el nombre
+_RESERVA = struct.Struct("<IBBH")
+
+_INDICE_METODO = {metodo: i for i, metodo in enumerate(METODOS_PAGO)}
+
+
+def codificar_registro(
+    operacion, id_reserva, nombre_completo="", hora=0, metodo_pago=None
+):
+    """Registro del diario listo para anexar"""
+    nombre = nombre_completo.encode("utf-8")
+    metodo = 0 if metodo_pago is None else _INDICE_METODO[metodo_pago]
+    cuerpo = _REGISTRO.pack(0, operacion, id_reserva, hora, metodo, len(nombre))[4:]
+    cuerpo += nombre
+    return struct.pack("<I", zlib.crc32(cuerpo)) + cuerpo
+
+
+def leer_registros(datos, desde):
+    """
+    Recorrer los registros válidos de datos[desde:]. Devuelve la lista de
+    (operación, id, nombre, hora, método) y el desplazamiento donde
+    termina el último registro completo y con CRC correcto.
+    """
+    registros = []
+    unpack = _REGISTRO.unpack_from
+    crc32 = zlib.crc32
+    tamano = _REGISTRO.size
+    fin = len(datos)
+    posicion = desde
+    while posicion + tamano <= fin:
+        crc, operacion, id_reserva, hora, metodo, largo = unpack(datos, posicion)
+        siguiente = posicion + tamano + largo
+        if siguiente > fin or crc32(datos[posicion + 4 : siguiente]) != crc:
+            break
+        nombre = datos[posicion + tamano : siguiente].decode("utf-8")
+        registros.append((operacion, id_reserva, nombre, hora, METODOS_PAGO[metodo]))
+        posicion = siguiente
+    return registros, posicion
+
+
+def _sincronizar_directorio(directorio):
+    """fsync del directorio para que un rename sobreviva a un corte"""
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _reemplazar(ruta, contenido):
+    """Escribir a un temporal, fsync y renombrar encima de ruta"""
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(contenido)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    _sincronizar_directorio(os.path.dirname(ruta) or ".")
+
+
+class Diario:
+    """Archivo de solo anexado con commit en grupo (un hilo escritor)"""
+
+    def __init__(self, ruta):
+        self._archivo = open(ruta, "ab")
+        self._pendientes = []
+        self._encolados = 0
+        self._sincronizados = 0
+        self._error = None
+        self._cerrando = False
+        self.tandas = 0
+        self._condicion = threading.Condition()
+        self._hilo = threading.Thread(
+            target=self._escritor, name="diario-reservas", daemon=True
+        )
+        self._hilo.start()
+
+    def anexar(self, registro):
+        """Encolar un registro; devuelve su número para esperar()"""
+        with self._condicion:
+            if self._error is not None:
+                raise self._error
+            self._pendientes.append(registro)
+            self._encolados += 1
+            self._condicion.notify_all()
+            return self._encolados
+
+    def esperar(self, numero):
+        """Volver cuando el registro número esté en disco"""
+        with self._condicion:
+            self._esperar(numero)
+
+    def sincronizar(self):
+        """Esperar a que todo lo encolado esté en disco"""
+        with self._condicion:
+            self._esperar(self._encolados)
+
+    def _esperar(self, numero):
+        while self._sincronizados < numero and self._error is None:
+            self._condicion.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _escritor(self):
+        while True:
+            with self._condicion:
+                while not self._pendientes and not self._cerrando:
+                    self._condicion.wait()
+                if not self._pendientes:
+                    return
+                tanda, self._pendientes = self._pendientes, []
+                hasta = self._encolados
+            try:
+                self._archivo.write(b"".join(tanda))
+                self._archivo.flush()
+                os.fsync(self._archivo.fileno())
+            except OSError as e:
+                with self._condicion:
+                    self._error = e
+                    self._condicion.notify_all()
+                return
+            with self._condicion:
+                self._sincronizados = hasta
+                self.tandas += 1
+                self._condicion.notify_all()
+
+    def cerrar(self):
+        with self._condicion:
+            self._cerrando = True
+            self._condicion.notify_all()
+        self._hilo.join()
+        self._archivo.close()
+        if self._error is not None:
+            raise self._error
+
+
+class Persistencia:
+    """
+    Instantánea + diario de un Restaurante. Uso:
+
+        persistencia = Persistencia("datos_reservas")
+        persistencia.abrir(sistema)   # carga y empieza a registrar
+        ...
+        persistencia.cerrar()
+    """
+
+    def __init__(
+        self,
+        directorio,
+        sincrono=DIARIO_SINCRONO,
+        compactar_cada=DIARIO_COMPACTAR_CADA,
+    ):
+        self.directorio = directorio
+        self.sincrono = sincrono
+        self.compactar_cada = compactar_cada
+        self.ruta_diario = os.path.join(directorio, "diario")
+        self.ruta_instantanea = os.path.join(directorio, "instantanea")
+        self.restaurante = None
+        self.generacion = 0
+        self._diario = None
+        self._desde_compactacion = 0
+        self._lock = threading.RLock()
+
+    # ---------- ARRANQUE ----------
+    def abrir(self, restaurante):
+        """
+        Cargar instantánea y diario en un Restaurante vacío y empezar a
+        registrar sus cambios. Devuelve cuánto se cargó y cuánto tardó.
+        """
+        inicio = time.perf_counter()
+        os.makedirs(self.directorio, exist_ok=True)
+        # Cargar crea millones de objetos sin ciclos: el recolector cíclico
+        # solo recorrería el heap una y otra vez (duplica el tiempo)
+        recolector = gc.isenabled()
+        gc.disable()
+        try:
+            en_instantanea = self._cargar_instantanea(restaurante)
+            repetidos = self._repetir_diario(restaurante)
+        finally:
+            if recolector:
+                gc.enable()
+        self._diario = Diario(self.ruta_diario)
+        self._desde_compactacion = repetidos
+        self.restaurante = restaurante
+        restaurante.persistencia = self
+        return {
+            "instantanea": en_instantanea,
+            "repetidos": repetidos,
+            "reservas": len(restaurante.reservas),
+            "segundos": time.perf_counter() - inicio,
+        }
+
+    def _leer_instantanea(self):
+        """Cuerpo de la instantánea con CRC y cabecera verificados"""
+        with open(self.ruta_instantanea, "rb") as archivo:
+            datos = archivo.read()
+        if len(datos) < _CABECERA_INSTANTANEA.size + 4:
+            raise ValueError(f"{self.ruta_instantanea} está incompleta")
+        cuerpo, crc = datos[:-4], struct.unpack("<I", datos[-4:])[0]
+        marca, version = _CABECERA_INSTANTANEA.unpack_from(cuerpo)[:2]
+        if marca != _MARCA_INSTANTANEA or version != _VERSION:
+            raise ValueError(f"{self.ruta_instantanea} no es una instantánea válida")
+        if zlib.crc32(cuerpo) != crc:
+            raise ValueError(f"{self.ruta_instantanea} está dañada (CRC)")
+        return cuerpo
+
+    def _cargar_instantanea(self, restaurante):
+        if not os.path.exists(self.ruta_instantanea):
+            return 0
+        try:
+            cuerpo = self._leer_instantanea()
+        except ValueError as e:
+            # Se conserva para recuperarla a mano; la próxima compactación
+            # escribe una nueva
+            danada = self.ruta_instantanea + ".danada"
+            os.replace(self.ruta_instantanea, danada)
+            print(f"⚠️ {e}; se aparta como {danada} y se carga solo el diario")
+            return 0
+        _, _, generacion, contador_id, cantidad = _CABECERA_INSTANTANEA.unpack_from(
+            cuerpo
+        )
+
+        unpack = _RESERVA.unpack_from
+        tamano = _RESERVA.size
+        posicion = _CABECERA_INSTANTANEA.size
+        restaurar = restaurante._restaurar
+        for _ in range(cantidad):
+            id_reserva, hora, metodo, largo = unpack(cuerpo, posicion)
+            posicion += tamano
+            nombre = cuerpo[posicion : posicion + largo].decode("utf-8")
+            posicion += largo
+            restaurar(id_reserva, nombre, hora, METODOS_PAGO[metodo])
+        restaurante.contador_id = contador_id
+        self.generacion = generacion
+        return cantidad
+
+    def _repetir_diario(self, restaurante):
+        """Repetir los registros válidos y recortar una cola incompleta"""
+        if not os.path.exists(self.ruta_diario):
+            self._nuevo_diario()
+            return 0
+        with open(self.ruta_diario, "rb") as archivo:
+            datos = archivo.read()
+        if len(datos) < _CABECERA_DIARIO.size:
+            self._nuevo_diario()
+            return 0
+        marca, version, generacion = _CABECERA_DIARIO.unpack_from(datos)
+        if marca != _MARCA_DIARIO or version != _VERSION:
+            raise ValueError(f"{self.ruta_diario} no es un diario válido")
+        if generacion < self.generacion:
+            # Ya incluido en la instantánea
+            self._nuevo_diario()
+            return 0
+        # Sin instantánea válida la generación es la del diario
+        self.generacion = generacion
+
+        registros, fin = leer_registros(datos, _CABECERA_DIARIO.size)
+        for operacion, id_reserva, nombre, hora, metodo in registros:
+            if operacion == BAJA:
+                restaurante._olvidar(id_reserva)
+            else:
+                restaurante._restaurar(id_reserva, nombre, hora, metodo)
+        if fin < len(datos):
+            print(
+                f"⚠️ Diario con {len(datos) - fin} bytes incompletos al final; se descartan"
+            )
+            with open(self.ruta_diario, "r+b") as archivo:
+                archivo.truncate(fin)
+                os.fsync(archivo.fileno())
+        return len(registros)
+
+    def _nuevo_diario(self):
+        _reemplazar(
+            self.ruta_diario,
+            _CABECERA_DIARIO.pack(_MARCA_DIARIO, _VERSION, self.generacion),
+        )
+
+    # ---------- REGISTRO ----------
+    def registrar(
+        self, operacion, id_reserva, nombre_completo="", hora=0, metodo_pago=None
+    ):
+        """Anotar una operación en el diario antes de aplicarla en memoria"""
+        registro = codificar_registro(
+            operacion, id_reserva, nombre_completo, hora, metodo_pago
+        )
+        with self._lock:
+            if self.compactar_cada and self._desde_compactacion >= self.compactar_cada:
+                self.compactar()
+            self._desde_compactacion += 1
+            diario = self._diario
+            numero = diario.anexar(registro)
+        # La espera del fsync va fuera del lock para que otros hilos sumen
+        # sus registros a la misma tanda
+        if self.sincrono:
+            diario.esperar(numero)
+
+    def alta(self, id_reserva, nombre_completo, hora, metodo_pago):
+        self.registrar(ALTA, id_reserva, nombre_completo, hora, metodo_pago)
+
+    def cambio(self, id_reserva, nombre_completo, hora, metodo_pago):
+        self.registrar(CAMBIO, id_reserva, nombre_completo, hora, metodo_pago)
+
+    def baja(self, id_reserva):
+        self.registrar(BAJA, id_reserva)
+
+    def compactar(self):
+        """Escribir una instantánea del estado actual y vaciar el diario"""
+        with self._lock:
+            self._diario.sincronizar()
+            restaurante = self.restaurante
+            partes = [
+                _CABECERA_INSTANTANEA.pack(
+                    _MARCA_INSTANTANEA,
+                    _VERSION,
+                    self.generacion + 1,
+                    restaurante.contador_id,
+                    len(restaurante.reservas),
+                )
+            ]
+            pack = _RESERVA.pack
+            for reserva in restaurante.reservas:
+                nombre = reserva.nombre_completo.encode("utf-8")
+                partes.append(
+                    pack(
+                        reserva.id_reserva,
+                        reserva.hora,
+                        _INDICE_METODO[reserva.metodo_pago],
+                        len(nombre),
+                    )
+                )
+                partes.append(nombre)
+            cuerpo = b"".join(partes)
+            _reemplazar(
+                self.ruta_instantanea, cuerpo + struct.pack("<I", zlib.crc32(cuerpo))
+            )
+
+            # Desde aquí el diario viejo está incluido en la instantánea
+            self.generacion += 1
+            self._diario.cerrar()
+            self._nuevo_diario()
+            self._diario = Diario(self.ruta_diario)
+            self._desde_compactacion = 0
+
+    def sincronizar(self):
+        with self._lock:
+            diario = self._diario
+        diario.sincronizar()
+
+    def cerrar(self):
+        """Llevar a disco lo pendiente y soltar el Restaurante"""
+        with self._lock:
+            if self._diario is not None:
+                self._diario.cerrar()
+                self._diario = None
+            if self.restaurante is not None:
+                self.restaurante.persistencia = None
+                self.restaurante = None
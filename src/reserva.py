@@ -1,17 +1,26 @@
 class Reserva:
+    # Sin __dict__ por instancia: con millones de reservas en memoria la
+    # diferencia es de cientos de bytes por reserva
+    __slots__ = ("id_reserva", "nombre_completo", "hora", "metodo_pago")
+
     def __init__(self, id_reserva, nombre_completo, hora, metodo_pago):
         self.id_reserva = id_reserva
         self.nombre_completo = nombre_completo
         self.hora = hora
         self.metodo_pago = metodo_pago
-    
+
     def __str__(self):
         return f"ID: {self.id_reserva} | Nombre: {self.nombre_completo} | Hora: {self.hora} | Método de pago: {self.metodo_pago}"
-    
+
     def modificar_reserva(self, nombre_completo=None, hora=None, metodo_pago=None):
+        """
+        Cambiar los datos de una reserva suelta. Si ya está registrada en un
+        Restaurante, usar Restaurante.actualizar_reserva para que los
+        índices por hora y método de pago sigan al día.
+        """
         if nombre_completo is not None:
             self.nombre_completo = nombre_completo
         if hora is not None:
             self.hora = hora
         if metodo_pago is not None:
-            self.metodo_pago = metodo_pago
\ No newline at end of file
+            self.metodo_pago = metodo_pago
@@ -1,16 +1,113 @@
 from src.reserva import Reserva
 
+METODOS_PAGO = ("efectivo", "transferencia", "tarjeta credito")
+
+
 class Restaurante:
+    """
+    Reservas en memoria con índices:
+
+    - id -> reserva (dict en orden de alta): buscar, eliminar y modificar
+      por ID en O(1); la "posición" es el orden de alta
+    - lista de IDs en orden de alta: reserva por posición en O(1). Una baja
+      por ID la invalida y se rearma en la siguiente consulta por posición;
+      una baja por posición la mantiene al día
+    - hora -> {id: reserva}: contar y listar las reservas de una hora sin
+      recorrer todas
+    - método de pago -> cantidad, mantenido en cada alta, baja o cambio
+
+    Si tiene una persistencia (src.persistencia) cada alta, baja o cambio
+    se anota en su diario antes de aplicarse en memoria.
+    """
+
     def __init__(self, nombre):
         self.nombre = nombre
-        self.reservas = []
+        self._por_id = {}
+        self._por_hora = {}
+        self._por_metodo = {}
+        self._orden = []  # IDs por posición; None hasta rearmarla
         self.contador_id = 1
+        self.persistencia = None
+
+    @property
+    def reservas(self):
+        """Vista (sin copiar) de las reservas en orden de alta"""
+        return self._por_id.values()
+
+    # ---------- ÍNDICES ----------
+    def _indexar(self, reserva):
+        self._por_id[reserva.id_reserva] = reserva
+        if self._orden is not None:
+            self._orden.append(reserva.id_reserva)
+        self._por_hora.setdefault(reserva.hora, {})[reserva.id_reserva] = reserva
+        self._por_metodo[reserva.metodo_pago] = (
+            self._por_metodo.get(reserva.metodo_pago, 0) + 1
+        )
+
+    def _desindexar(self, reserva, posicion=None):
+        del self._por_id[reserva.id_reserva]
+        if posicion is None or self._orden is None:
+            self._orden = None
+        else:
+            del self._orden[posicion]
+        del self._por_hora[reserva.hora][reserva.id_reserva]
+        self._descontar_metodo(reserva.metodo_pago)
+
+    def _descontar_metodo(self, metodo_pago):
+        if self._por_metodo[metodo_pago] == 1:
+            del self._por_metodo[metodo_pago]
+        else:
+            self._por_metodo[metodo_pago] -= 1
+
+    def _restaurar(self, id_reserva, nombre_completo, hora, metodo_pago):
+        """Dejar una reserva con estos datos (carga desde disco, sin anotar)"""
+        reserva = self._por_id.get(id_reserva)
+        if reserva is None:
+            self._indexar(Reserva(id_reserva, nombre_completo, hora, metodo_pago))
+        else:
+            self._reubicar(reserva, nombre_completo, hora, metodo_pago)
+        if id_reserva >= self.contador_id:
+            self.contador_id = id_reserva + 1
+
+    def _olvidar(self, id_reserva):
+        """Quitar una reserva si existe (carga desde disco, sin anotar)"""
+        reserva = self._por_id.get(id_reserva)
+        if reserva is not None:
+            self._desindexar(reserva)
+
+    def _reubicar(self, reserva, nombre_completo, hora, metodo_pago):
+        # Solo se tocan los índices secundarios: reinsertar en _por_id
+        # mandaría la reserva al final y cambiaría su posición
+        del self._por_hora[reserva.hora][reserva.id_reserva]
+        self._descontar_metodo(reserva.metodo_pago)
+        reserva.modificar_reserva(nombre_completo, hora, metodo_pago)
+        self._por_hora.setdefault(hora, {})[reserva.id_reserva] = reserva
+        self._por_metodo[metodo_pago] = self._por_metodo.get(metodo_pago, 0) + 1
 
+    def contar_por_hora(self, hora):
+        """Método para contar las reservas de una hora en O(1)"""
+        return len(self._por_hora.get(hora, ()))
+
+    def obtener_reservas_por_hora(self, hora):
+        """Método para obtener las reservas de una hora (en orden de alta)"""
+        return list(self._por_hora.get(hora, {}).values())
+
+    def contar_por_metodo(self):
+        """Método para obtener cuántas reservas hay por método de pago"""
+        return dict(self._por_metodo)
+
+    # ---------- ALTAS ----------
     def agregar_reserva(self, nombre_completo, hora, metodo_pago):
         """Método para agregar una nueva reserva"""
         if self._validar_datos_reserva(nombre_completo, hora, metodo_pago):
-            nueva_reserva = Reserva(self.contador_id, nombre_completo, hora, metodo_pago)
-            self.reservas.append(nueva_reserva)
+            nueva_reserva = Reserva(
+                self.contador_id, nombre_completo, hora, metodo_pago
+            )
+            if self.persistencia is not None:
+                self.persistencia.alta(
+                    self.contador_id, nombre_completo, hora, metodo_pago
+                )
+            self._indexar(nueva_reserva)
             self.contador_id += 1
             return True
         return False
@@ -23,28 +120,33 @@ class Restaurante:
         if not isinstance(hora, int) or hora < 12 or hora > 22:
             return False
 
-        metodos_validos = ["efectivo", "transferencia", "tarjeta credito"]
-        if metodo_pago not in metodos_validos:
+        if metodo_pago not in METODOS_PAGO:
             return False
 
         return True
 
     def validar_reservas(self):
         """Método para mostrar todas las reservas existentes"""
-        if not self.reservas:
+        if not self._por_id:
             print("No hay reservas registradas.")
             return
 
         print("\n=== RESERVAS EXISTENTES EN MI RESTAURANTE ===")
-        print(f"Total de reservas: {len(self.reservas)}")
+        print(f"Total de reservas: {len(self._por_id)}")
         for i, reserva in enumerate(self.reservas):
-            print(f"Posición {i}: ID: {reserva.id_reserva} | Nombre: {reserva.nombre_completo} | Hora: {reserva.hora} | Método de pago: {reserva.metodo_pago}")
+            print(
+                f"Posición {i}: ID: {reserva.id_reserva} | Nombre: {reserva.nombre_completo} | Hora: {reserva.hora} | Método de pago: {reserva.metodo_pago}"
+            )
 
+    # ---------- BAJAS ----------
     def eliminar_reserva(self, posicion):
         """Método para eliminar una reserva por posición"""
-        if 0 <= posicion < len(self.reservas):
-            reserva_eliminada = self.reservas.pop(posicion)
-            print(f"Reserva eliminada: {reserva_eliminada}")
+        reserva = self.obtener_reserva_por_posicion(posicion)
+        if reserva is not None:
+            if self.persistencia is not None:
+                self.persistencia.baja(reserva.id_reserva)
+            self._desindexar(reserva, posicion)
+            print(f"Reserva eliminada: {reserva}")
             return True
         else:
             print("Posición inválida. No se pudo eliminar la reserva.")
@@ -52,38 +154,73 @@ class Restaurante:
 
     def eliminar_reserva_por_id(self, id_reserva):
         """Método para eliminar una reserva por ID"""
-        for i, reserva in enumerate(self.reservas):
-            if reserva.id_reserva == id_reserva:
-                reserva_eliminada = self.reservas.pop(i)
-                print(f"Reserva eliminada: {reserva_eliminada}")
-                return True
+        reserva = self._por_id.get(id_reserva)
+        if reserva is not None:
+            if self.persistencia is not None:
+                self.persistencia.baja(reserva.id_reserva)
+            self._desindexar(reserva)
+            print(f"Reserva eliminada: {reserva}")
+            return True
 
         print(f"No se encontró una reserva con ID {id_reserva}.")
         return False
 
+    # ---------- CAMBIOS ----------
+    def actualizar_reserva(
+        self, id_reserva, nombre_completo=None, hora=None, metodo_pago=None
+    ):
+        """
+        Método para cambiar datos de una reserva manteniendo los índices.
+        Los valores None se conservan; devuelve False si la reserva no
+        existe o algún dato nuevo no es válido.
+        """
+        reserva = self._por_id.get(id_reserva)
+        if reserva is None:
+            return False
+        nuevo_nombre = (
+            reserva.nombre_completo if nombre_completo is None else nombre_completo
+        )
+        nueva_hora = reserva.hora if hora is None else hora
+        nuevo_metodo = reserva.metodo_pago if metodo_pago is None else metodo_pago
+        if not self._validar_datos_reserva(nuevo_nombre, nueva_hora, nuevo_metodo):
+            return False
+
+        if self.persistencia is not None:
+            self.persistencia.cambio(id_reserva, nuevo_nombre, nueva_hora, nuevo_metodo)
+        self._reubicar(reserva, nuevo_nombre, nueva_hora, nuevo_metodo)
+        return True
+
     def modificar_reserva(self, posicion):
         """Método para modificar una reserva existente"""
-        if 0 <= posicion < len(self.reservas):
-            reserva = self.reservas[posicion]
+        reserva = self.obtener_reserva_por_posicion(posicion)
+        if reserva is not None:
             print(f"\nModificando reserva: {reserva}")
 
             # Solicitar nuevos datos
-            nuevo_nombre = input("Nuevo nombre completo (Enter para mantener el actual): ").strip()
-            nueva_hora = input("Nueva hora (12-22, Enter para mantener la actual): ").strip()
-            nuevo_metodo = input("Nuevo método de pago (efectivo/transferencia/tarjeta credito, Enter para mantener el actual): ").strip()
+            nuevo_nombre = input(
+                "Nuevo nombre completo (Enter para mantener el actual): "
+            ).strip()
+            nueva_hora = input(
+                "Nueva hora (12-22, Enter para mantener la actual): "
+            ).strip()
+            nuevo_metodo = input(
+                "Nuevo método de pago (efectivo/transferencia/tarjeta credito, Enter para mantener el actual): "
+            ).strip()
 
             # Aplicar cambios solo si se proporcionan nuevos valores
+            cambios = {}
             if nuevo_nombre:
-                reserva.nombre_completo = nuevo_nombre
+                cambios["nombre_completo"] = nuevo_nombre
 
             if nueva_hora and nueva_hora.isdigit():
                 hora_int = int(nueva_hora)
                 if 12 <= hora_int <= 22:
-                    reserva.hora = hora_int
+                    cambios["hora"] = hora_int
 
-            if nuevo_metodo in ["efectivo", "transferencia", "tarjeta credito"]:
-                reserva.metodo_pago = nuevo_metodo
+            if nuevo_metodo in METODOS_PAGO:
+                cambios["metodo_pago"] = nuevo_metodo
 
+            self.actualizar_reserva(reserva.id_reserva, **cambios)
             print("Reserva modificada exitosamente.")
             return True
         else:
@@ -95,13 +232,18 @@ class Restaurante:
         reserva = self.obtener_reserva_por_id(id_reserva)
         if reserva:
             print(f"\nModificando reserva: {reserva}")
+            cambios = {}
 
             # Solicitar nuevos datos
-            nuevo_nombre = input("Nuevo nombre completo (Enter para mantener el actual): ").strip()
+            nuevo_nombre = input(
+                "Nuevo nombre completo (Enter para mantener el actual): "
+            ).strip()
 
             # Validar y solicitar la nueva hora en un bucle
             while True:
-                nueva_hora = input("Nueva hora (12-22, Enter para mantener la actual): ").strip()
+                nueva_hora = input(
+                    "Nueva hora (12-22, Enter para mantener la actual): "
+                ).strip()
                 if not nueva_hora:
                     break  # Mantener la hora actual si se presiona Enter
                 if not nueva_hora.isdigit():
@@ -109,7 +251,7 @@ class Restaurante:
                     continue
                 hora_int = int(nueva_hora)
                 if 12 <= hora_int <= 22:
-                    reserva.hora = hora_int
+                    cambios["hora"] = hora_int
                     break
                 else:
                     print("La hora debe estar entre 12 y 22 (12 PM a 10 PM).")
@@ -120,41 +262,43 @@ class Restaurante:
                 print("1. efectivo")
                 print("2. transferencia")
                 print("3. tarjeta credito")
-                nuevo_metodo_numero = input("Ingrese el número del nuevo método de pago (1, 2 o 3, Enter para mantener el actual): ").strip()
+                nuevo_metodo_numero = input(
+                    "Ingrese el número del nuevo método de pago (1, 2 o 3, Enter para mantener el actual): "
+                ).strip()
 
-                if not nuevo_metodo_numero:  # Mantener el método de pago actual si se presiona Enter
-                    break
-                if nuevo_metodo_numero == "1":
-                    reserva.metodo_pago = "efectivo"
+                if (
+                    not nuevo_metodo_numero
+                ):  # Mantener el método de pago actual si se presiona Enter
                     break
-                elif nuevo_metodo_numero == "2":
-                    reserva.metodo_pago = "transferencia"
-                    break
-                elif nuevo_metodo_numero == "3":
-                    reserva.metodo_pago = "tarjeta credito"
+                if nuevo_metodo_numero in ("1", "2", "3"):
+                    cambios["metodo_pago"] = METODOS_PAGO[int(nuevo_metodo_numero) - 1]
                     break
                 else:
                     print("Por favor ingrese una opción válida (1, 2 o 3).")
 
             # Aplicar cambios solo si se proporcionan nuevos valores
             if nuevo_nombre:
-                reserva.nombre_completo = nuevo_nombre
+                cambios["nombre_completo"] = nuevo_nombre
 
+            self.actualizar_reserva(id_reserva, **cambios)
             print("Reserva modificada exitosamente.")
             return True
         else:
             print(f"No se encontró una reserva con ID {id_reserva}.")
             return False
 
+    # ---------- CONSULTAS ----------
     def obtener_reserva_por_id(self, id_reserva):
         """Método para buscar una reserva por ID"""
-        for reserva in self.reservas:
-            if reserva.id_reserva == id_reserva:
-                return reserva
-        return None
+        return self._por_id.get(id_reserva)
 
     def obtener_reserva_por_posicion(self, posicion):
-        """Método para obtener una reserva por posición"""
-        if 0 <= posicion < len(self.reservas):
-            return self.reservas[posicion]
-        return None
\ No newline at end of file
+        """
+        Método para obtener una reserva por posición (orden de alta).
+        Indexa la lista de IDs (rearmada solo si hubo bajas por ID).
+        """
+        if isinstance(posicion, int) and 0 <= posicion < len(self._por_id):
+            if self._orden is None:
+                self._orden = list(self._por_id)
+            return self._por_id[self._orden[posicion]]
+        return None
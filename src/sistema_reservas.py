@@ -1,9 +1,11 @@
+from services.columnas import calcular, columnas_de_memoria
 from src.restaurante import Restaurante
 
 class SistemaReservas(Restaurante):
     def __init__(self, nombre):
         super().__init__(nombre)
         self.horarios_disponibles = list(range(12, 23))  # 12 PM a 10 PM
+        self.capacidad_por_hora = 5
     
     def agregar_reserva(self, nombre_completo, hora, metodo_pago):
         """Sobrescribe el método de la clase padre con validaciones adicionales"""
@@ -19,21 +21,18 @@ class SistemaReservas(Restaurante):
         if hora not in self.horarios_disponibles:
             return False
         
-        # Contar cuántas reservas ya existen para esa hora específica
-        reservas_por_hora = sum(1 for reserva in self.reservas if reserva.hora == hora)
-        
-        # Definir capacidad máxima por hora (5 reservas)
-        capacidad_maxima = 5
-        
-        # Retornar True si hay espacio disponible
-        return reservas_por_hora < capacidad_maxima
+        # Contador por hora mantenido por Restaurante (sin recorrer reservas)
+        return self.contar_por_hora(hora) < self.capacidad_por_hora
     
     def mostrar_disponibilidad_por_hora(self):
         """Método para mostrar cuántas reservas hay por cada hora"""
         print(f"\n=== DISPONIBILIDAD POR HORA ===")
+        por_hora = {
+            fila["hora"]: fila["reservas"]
+            for fila in calcular(columnas_de_memoria(self))["por_hora"]
+        }
         for hora in self.horarios_disponibles:
-            reservas_por_hora = sum(1 for reserva in self.reservas if reserva.hora == hora)
-            espacios_disponibles = 5 - reservas_por_hora
+            espacios_disponibles = self.capacidad_por_hora - por_hora.get(hora, 0)
             estado = "COMPLETO" if espacios_disponibles == 0 else f"{espacios_disponibles} espacios"
             print(f"Hora {hora}:00 - {estado}")
     
@@ -58,15 +57,14 @@ class SistemaReservas(Restaurante):
             print("No hay reservas para mostrar estadísticas.")
             return
         
+        estadisticas = calcular(columnas_de_memoria(self))
         print(f"\n=== ESTADÍSTICAS DE RESERVAS ===")
-        print(f"Total de reservas: {len(self.reservas)}")
-        
-        # Contar métodos de pago
-        metodos_count = {}
-        for reserva in self.reservas:
-            metodo = reserva.metodo_pago
-            metodos_count[metodo] = metodos_count.get(metodo, 0) + 1
+        print(f"Total de reservas: {estadisticas['total_reservas']}")
         
         print("Métodos de pago utilizados:")
-        for metodo, cantidad in metodos_count.items():
-            print(f"  {metodo}: {cantidad} reservas")
\ No newline at end of file
+        for fila in estadisticas["metodos_pago"]:
+            print(f"  {fila['metodo_pago']}: {fila['reservas']} reservas ({fila['proporcion']:.0%})")
+        
+        print("Reservas por hora:")
+        for fila in estadisticas["por_hora"]:
+            print(f"  {fila['hora']}:00: {fila['reservas']} reservas")
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Configuración común de las pruebas
+
+Los módulos que no usan la base solo necesitan que DATABASE_URL exista
+para importar database.config. Las pruebas con PostgreSQL crean una base
+desechable en el servidor de DATABASE_URL (y se saltan si no hay
+servidor).
+
+La API (main, database.config) lee DATABASE_URL al importarse, así que
+antes de recolectar las pruebas se crea una base desechable para toda la
+sesión y DATABASE_URL pasa a apuntar a ella. Los endpoints y el CRUD se
+prueban en los modos de API_MODO_ASYNC y CRUD_MODO_RETURNING:
+
+    API_MODO_ASYNC=true CRUD_MODO_RETURNING=true python -m pytest -q tests
+"""
+
+import os
+import uuid
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/pruebas")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+_BASE_API = {}
+
+
+def _servidor():
+    url = make_url(os.environ["DATABASE_URL"]).set(drivername="postgresql+psycopg2")
+    return url, create_engine(
+        url.set(database="postgres"), isolation_level="AUTOCOMMIT"
+    )
+
+
+def _crear_base(admin, prefijo="pruebas"):
+    nombre = f"{prefijo}_{uuid.uuid4().hex[:12]}"
+    with admin.connect() as conexion:
+        conexion.execute(text(f"CREATE DATABASE {nombre}"))
+    return nombre
+
+
+def _eliminar_base(admin, nombre):
+    with admin.connect() as conexion:
+        conexion.execute(text(f"DROP DATABASE IF EXISTS {nombre} WITH (FORCE)"))
+
+
+def pytest_configure(config):
+    os.environ.setdefault("HASH_PROCESOS", "2")
+    url, admin = _servidor()
+    try:
+        nombre = _crear_base(admin, "pruebas_api")
+    except OperationalError:
+        return
+    finally:
+        admin.dispose()
+    _BASE_API["nombre"] = nombre
+    original = make_url(os.environ["DATABASE_URL"])
+    os.environ["DATABASE_URL"] = original.set(database=nombre).render_as_string(
+        hide_password=False
+    )
+
+
+def pytest_unconfigure(config):
+    nombre = _BASE_API.pop("nombre", None)
+    if nombre is not None:
+        _, admin = _servidor()
+        _eliminar_base(admin, nombre)
+        admin.dispose()
+
+
+@pytest.fixture(scope="session")
+def api():
+    """TestClient de la aplicación sobre la base desechable de la sesión"""
+    if "nombre" not in _BASE_API:
+        pytest.skip("PostgreSQL no disponible en DATABASE_URL")
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+@pytest.fixture
+def local(api):
+    """Usuario, restaurante 12:00-23:00 y una mesa de 4 creados por la API"""
+    from types import SimpleNamespace
+
+    sufijo = uuid.uuid4().hex[:8]
+    usuario = api.post(
+        "/usuarios/",
+        json={
+            "nombre": "Ana",
+            "apellido": "Pérez",
+            "nombre_usuario": f"ana_{sufijo}",
+            "email": f"ana_{sufijo}@example.com",
+            "contrasena": "Secreta#123",
+        },
+    )
+    assert usuario.status_code == 201, usuario.text
+    restaurante = api.post(
+        "/restaurantes/",
+        json={
+            "nombre": f"Restaurante {sufijo}",
+            "direccion": "Calle 1",
+            "capacidad_maxima": 40,
+            "horario_apertura": "12:00",
+            "horario_cierre": "23:00",
+            "usuario_admin_id": usuario.json()["id_usuario"],
+        },
+    )
+    assert restaurante.status_code == 201, restaurante.text
+    mesa = api.post(
+        "/mesas/",
+        json={
+            "numero_mesa": 1,
+            "capacidad": 4,
+            "restaurante_id": restaurante.json()["id_restaurante"],
+        },
+    )
+    assert mesa.status_code == 201, mesa.text
+    return SimpleNamespace(
+        nombre_usuario=f"ana_{sufijo}",
+        contrasena="Secreta#123",
+        id_usuario=usuario.json()["id_usuario"],
+        id_restaurante=restaurante.json()["id_restaurante"],
+        id_mesa=mesa.json()["id_mesa"],
+    )
+
+
+@pytest.fixture
+def base_vacia():
+    """Motor sobre una base nueva y vacía, que se elimina al terminar"""
+    url, admin = _servidor()
+    try:
+        nombre = _crear_base(admin)
+    except OperationalError:
+        admin.dispose()
+        pytest.skip("PostgreSQL no disponible en DATABASE_URL")
+    motor = create_engine(url.set(database=nombre))
+    try:
+        yield motor
+    finally:
+        motor.dispose()
+        _eliminar_base(admin, nombre)
+        admin.dispose()
+
+
+@pytest.fixture
+def base_migrada(base_vacia):
+    """Base desechable con todas las migraciones aplicadas"""
+    from database.migraciones import aplicar_migraciones
+
+    aplicar_migraciones(base_vacia)
+    return base_vacia
+
+
+@pytest.fixture
+def abrir_sesion(base_migrada):
+    """Fábrica de sesiones sobre la base desechable"""
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=base_migrada, autoflush=False)
+
+
+@pytest.fixture
+def restaurante(abrir_sesion):
+    """Restaurante 12:00-23:00 con una mesa de 4 (ids como SimpleNamespace)"""
+    from types import SimpleNamespace
+
+    import database.models.all_models  # noqa: F401
+    from database.models.mesa import Mesa
+    from database.models.restaurante import Restaurante
+    from database.models.usuario import Usuario
+
+    with abrir_sesion() as db:
+        usuario = Usuario(
+            nombre="Ana",
+            apellido="Pérez",
+            nombre_usuario="ana",
+            email="ana@example.com",
+            contrasena="-",
+        )
+        db.add(usuario)
+        db.flush()
+        local = Restaurante(
+            nombre="Pruebas",
+            direccion="Calle 1",
+            horario_apertura="12:00",
+            horario_cierre="23:00",
+            usuario_admin_id=usuario.id_usuario,
+        )
+        db.add(local)
+        db.flush()
+        mesa = Mesa(numero_mesa=1, capacidad=4, restaurante_id=local.id_restaurante)
+        db.add(mesa)
+        db.commit()
+        return SimpleNamespace(
+            id_usuario=usuario.id_usuario,
+            id_restaurante=local.id_restaurante,
+            id_mesa=mesa.id_mesa,
+        )
+
+
+@pytest.fixture
+def correr_async(base_migrada):
+    """
+    Correr funcion(fabrica de AsyncSession) con un motor asyncpg sobre la
+    base desechable (creado y cerrado dentro del mismo event loop)
+    """
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from database.config import _url_async
+
+    def correr(funcion):
+        async def principal():
+            motor = create_async_engine(_url_async(base_migrada.url))
+            try:
+                return await funcion(
+                    async_sessionmaker(motor, autoflush=False, expire_on_commit=False)
+                )
+            finally:
+                await motor.dispose()
+
+        return asyncio.run(principal())
+
+    return correr
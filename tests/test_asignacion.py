@@ -0,0 +1,180 @@
+"""
+Asignación de mesas (sin base de datos): reasignar por ubicación, días
+vecinos que cruzan medianoche, bloqueos y orden del objetivo
+"""
+
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+from services.asignacion import (
+    MesaPlan,
+    ReservaPlan,
+    _armar,
+    _cambios,
+    _grandes_primero,
+    _heuristica,
+    _Ocupacion,
+    _parejas_bloqueo,
+    _valor,
+    asignar,
+)
+
+Fila = namedtuple(
+    "Fila",
+    "id_reserva restaurante_id hora_reserva inicio_reserva numero_personas "
+    "duracion_minutos estado mesa_id",
+)
+MesaFila = namedtuple("MesaFila", "id_mesa numero_mesa capacidad ubicacion")
+
+RESTAURANTE = uuid.uuid4()
+SALON_4 = uuid.uuid4()
+TERRAZA_2 = uuid.uuid4()
+DIA = date(2026, 11, 2)
+
+
+def _fila(hora, personas, mesa_id=None, dia=DIA, minuto=0):
+    return Fila(
+        uuid.uuid4(),
+        RESTAURANTE,
+        f"{hora:02d}:{minuto:02d}",
+        datetime(dia.year, dia.month, dia.day, hora, minuto, tzinfo=timezone.utc),
+        personas,
+        120,
+        "confirmada",
+        mesa_id,
+    )
+
+
+def _reserva(inicio, fin, personas):
+    return ReservaPlan(uuid.uuid4(), inicio, fin, personas)
+
+
+def test_reasignar_en_una_ubicacion_conserva_mesas_de_otras():
+    en_salon = _fila(20, 4, SALON_4)
+    en_terraza = _fila(20, 2, TERRAZA_2)
+    sin_mesa = _fila(13, 2)
+    # Solo se cargan las mesas de la terraza (ubicacion=terraza)
+    mesas = [MesaFila(TERRAZA_2, 7, 2, "terraza")]
+
+    reservas, mesas_plan, por_id = _armar(
+        [en_salon, en_terraza, sin_mesa], mesas, DIA, None, None, reasignar=True
+    )
+    fijas = {r.id_reserva: r.mesa_id for r in reservas if r.mesa_id is not None}
+    assert fijas == {en_salon.id_reserva: SALON_4}
+
+    plan = asignar(reservas, mesas_plan)
+    cambios = _cambios(plan, por_id, mesas_plan)
+    assert en_salon.id_reserva not in cambios
+    assert en_salon.id_reserva not in plan.sin_mesa
+    assert plan.asignaciones[sin_mesa.id_reserva] == TERRAZA_2
+
+
+def test_reasignar_quita_la_mesa_solo_si_es_del_plan():
+    primera = _fila(20, 2, TERRAZA_2)
+    segunda = _fila(20, 2, TERRAZA_2)  # mismo hueco: una queda sin mesa
+    mesas = [MesaFila(TERRAZA_2, 7, 2, "terraza")]
+
+    reservas, mesas_plan, por_id = _armar(
+        [primera, segunda], mesas, DIA, None, None, reasignar=True
+    )
+    plan = asignar(reservas, mesas_plan)
+    cambios = _cambios(plan, por_id, mesas_plan)
+    assert len(plan.sin_mesa) == 1
+    assert cambios == {plan.sin_mesa[0]: None}
+
+
+def test_reserva_del_dia_anterior_que_pasa_de_medianoche_ocupa_la_mesa():
+    # 23:00 del día anterior + 120 min: ocupa la mesa hasta la 01:00
+    anterior = _fila(23, 2, TERRAZA_2, dia=DIA - timedelta(days=1))
+    madrugada = _fila(0, 2, minuto=30)
+    mesas = [MesaFila(TERRAZA_2, 7, 2, "terraza")]
+
+    reservas, mesas_plan, _ = _armar(
+        [anterior, madrugada], mesas, DIA, None, None, False
+    )
+    assert [(r.inicio, r.fin, r.mesa_id) for r in reservas if r.mesa_id] == [
+        (-60, 60, TERRAZA_2)
+    ]
+    plan = asignar(reservas, mesas_plan)
+    assert plan.sin_mesa == [madrugada.id_reserva]
+
+
+def test_turno_tardio_no_pisa_reserva_del_dia_siguiente():
+    tarde = _fila(23, 2)  # hasta la 01:00 del día siguiente
+    siguiente = _fila(0, 2, TERRAZA_2, dia=DIA + timedelta(days=1), minuto=30)
+    mesas = [MesaFila(TERRAZA_2, 7, 2, "terraza")]
+
+    reservas, mesas_plan, _ = _armar([tarde, siguiente], mesas, DIA, None, None, False)
+    plan = asignar(reservas, mesas_plan)
+    assert plan.sin_mesa == [tarde.id_reserva]
+
+
+def test_reservas_de_dias_vecinos_nunca_se_mueven():
+    anterior = _fila(20, 2, TERRAZA_2, dia=DIA - timedelta(days=1))
+    siguiente = _fila(20, 2, TERRAZA_2, dia=DIA + timedelta(days=1))
+    mesas = [MesaFila(TERRAZA_2, 7, 2, "terraza")]
+
+    reservas, mesas_plan, por_id = _armar(
+        [anterior, siguiente], mesas, DIA, None, None, reasignar=True
+    )
+    assert all(r.mesa_id == TERRAZA_2 for r in reservas)
+    plan = asignar(reservas, mesas_plan)
+    assert plan.asignaciones == {} and _cambios(plan, por_id, mesas_plan) == {}
+
+
+def test_bloqueos_cubren_el_dia_y_el_siguiente():
+    mesas = [MesaPlan(SALON_4, 1, 4), MesaPlan(TERRAZA_2, 7, 2)]
+    assert set(_parejas_bloqueo(mesas, DIA)) == {
+        (mesa_id, dia)
+        for mesa_id in (SALON_4, TERRAZA_2)
+        for dia in (DIA, DIA + timedelta(days=1))
+    }
+
+
+def test_valor_prioriza_comensales_y_luego_desperdicio():
+    cuatro, dos = MesaPlan(SALON_4, 1, 4), MesaPlan(TERRAZA_2, 7, 2)
+    grupo = _reserva(0, 120, 2)
+    otro = _reserva(0, 120, 3)
+    # Mismos comensales: gana el que desperdicia menos
+    assert _valor([grupo], {grupo.id_reserva: dos}) > _valor(
+        [grupo], {grupo.id_reserva: cuatro}
+    )
+    # Más comensales gana aunque desperdicie más
+    assert _valor([grupo, otro], {otro.id_reserva: cuatro}) > _valor(
+        [grupo, otro], {grupo.id_reserva: dos}
+    )
+
+
+def test_el_plan_no_sienta_menos_que_la_primera_mesa_libre():
+    mesa = MesaPlan(SALON_4, 1, 4)
+    # Llegada: dos grupos de 3 que no se solapan entre sí, y uno de 4
+    # que se solapa con ambos
+    temprano = _reserva(17 * 60, 19 * 60 + 30, 3)
+    tarde = _reserva(21 * 60, 23 * 60, 3)
+    grande = _reserva(19 * 60, 21 * 60 + 30, 4)
+    llegada = [temprano, tarde, grande]
+
+    # Grupos grandes primero, solo, sienta 4
+    solo_grandes = _heuristica(_Ocupacion(), _grandes_primero(llegada), [mesa])
+    assert _valor(llegada, solo_grandes) == (4, 0)
+
+    plan = asignar(llegada, [mesa], exacta_max=0)
+    assert (plan.comensales, plan.desperdicio) == (6, 2)
+    assert set(plan.asignaciones) == {temprano.id_reserva, tarde.id_reserva}
+
+
+def test_en_empate_de_comensales_gana_el_menor_desperdicio():
+    mesas = [MesaPlan(SALON_4, 1, 4), MesaPlan(TERRAZA_2, 2, 6)]
+    llegada = [
+        _reserva(18 * 60, 20 * 60, 2),
+        _reserva(19 * 60, 21 * 60, 4),
+        _reserva(20 * 60, 22 * 60, 3),
+    ]
+    # Grupos grandes primero sienta a los 9 desperdiciando 7 asientos; la
+    # primera mesa libre en orden de llegada, a los 9 con 5
+    solo_grandes = _heuristica(_Ocupacion(), _grandes_primero(llegada), mesas)
+    assert _valor(llegada, solo_grandes) == (9, -7)
+
+    plan = asignar(llegada, mesas, exacta_max=0)
+    assert (plan.comensales, plan.desperdicio) == (9, 5)
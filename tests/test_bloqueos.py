@@ -0,0 +1,184 @@
+"""
+Reservas concurrentes sobre la misma mesa: bloqueos consultivos por
+(mesa, día) y respuesta 409 ante solapes
+"""
+
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from crud.bloqueos import _claves, bloquear, clave_bloqueo
+from crud.reserva_crud import ReservaCRUD, ReservaEnConflicto
+
+FECHA = datetime(2031, 3, 4, tzinfo=timezone.utc)
+
+
+def test_claves_estables_y_ordenadas():
+    mesa = uuid.uuid4()
+    clave = clave_bloqueo(mesa, date(2031, 3, 4))
+    assert clave == clave_bloqueo(mesa, date(2031, 3, 4))
+    assert -(2**63) <= clave < 2**63
+    assert clave != clave_bloqueo(mesa, date(2031, 3, 5))
+    assert clave != clave_bloqueo(uuid.uuid4(), date(2031, 3, 4))
+    parejas = [(uuid.uuid4(), date(2031, 3, dia)) for dia in range(1, 6)]
+    claves = _claves(parejas + parejas)
+    assert claves == sorted(claves) and len(claves) == 5
+
+
+def _crear(db, restaurante, hora, mesa_id=None):
+    return ReservaCRUD(db).crear_reserva(
+        nombre_completo="Cliente",
+        telefono=None,
+        email=None,
+        fecha_reserva=FECHA,
+        hora_reserva=hora,
+        numero_personas=2,
+        metodo_pago="efectivo",
+        estado="confirmada",
+        observaciones=None,
+        usuario_id=None,
+        restaurante_id=restaurante.id_restaurante,
+        mesa_id=mesa_id or restaurante.id_mesa,
+    )
+
+
+def _en_hilo(funcion):
+    resultado = {}
+
+    def correr():
+        try:
+            resultado["valor"] = funcion()
+        except Exception as e:
+            resultado["error"] = e
+
+    hilo = threading.Thread(target=correr)
+    hilo.start()
+    return hilo, resultado
+
+
+def test_la_segunda_reserva_espera_y_ve_la_primera(abrir_sesion, restaurante):
+    with abrir_sesion() as primera, abrir_sesion() as segunda:
+        # La primera transacción toma el bloqueo de la mesa para ese día
+        bloquear(primera, [(restaurante.id_mesa, FECHA.date())])
+        hilo, resultado = _en_hilo(lambda: _crear(segunda, restaurante, "20:30"))
+        hilo.join(0.5)
+        assert hilo.is_alive(), "la segunda reserva no esperó al bloqueo"
+
+        # Al confirmar la primera se libera el bloqueo y la segunda choca
+        _crear(primera, restaurante, "20:00")
+        hilo.join(10)
+        assert not hilo.is_alive()
+        assert isinstance(resultado.get("error"), ReservaEnConflicto)
+
+    with abrir_sesion() as db:
+        del_dia = ReservaCRUD(db).obtener_reservas_solapadas(
+            FECHA, FECHA + timedelta(days=1), mesa_id=restaurante.id_mesa
+        )
+        assert [reserva.hora_reserva for reserva in del_dia] == ["20:00"]
+
+
+def test_otra_mesa_no_espera(abrir_sesion, restaurante):
+    from database.models.mesa import Mesa
+
+    with abrir_sesion() as db:
+        otra = Mesa(
+            numero_mesa=2, capacidad=4, restaurante_id=restaurante.id_restaurante
+        )
+        db.add(otra)
+        db.commit()
+        otra_id = otra.id_mesa
+
+    with abrir_sesion() as primera, abrir_sesion() as segunda:
+        bloquear(primera, [(restaurante.id_mesa, FECHA.date())])
+        hilo, resultado = _en_hilo(
+            lambda: _crear(segunda, restaurante, "20:00", mesa_id=otra_id)
+        )
+        hilo.join(10)
+        assert not hilo.is_alive() and "valor" in resultado
+        primera.rollback()
+
+
+def test_carrera_de_reservas_solo_una_gana(abrir_sesion, restaurante):
+    sesiones = [abrir_sesion() for _ in range(6)]
+    barrera = threading.Barrier(len(sesiones))
+
+    def reservar(db, hora):
+        barrera.wait()
+        return _crear(db, restaurante, hora)
+
+    hilos = [
+        _en_hilo(lambda db=db, i=i: reservar(db, f"20:{i * 5:02d}"))
+        for i, db in enumerate(sesiones)
+    ]
+    for hilo, _ in hilos:
+        hilo.join(20)
+    for db in sesiones:
+        db.close()
+    resultados = [resultado for _, resultado in hilos]
+    assert sum("valor" in r for r in resultados) == 1
+    assert all(
+        isinstance(r["error"], ReservaEnConflicto) for r in resultados if "error" in r
+    )
+
+
+# ---------- API ----------
+def test_api_responde_409_ante_solapes(api, local):
+    rid = local.id_restaurante
+    otra = api.post(
+        "/mesas/", json={"numero_mesa": 2, "capacidad": 4, "restaurante_id": rid}
+    ).json()["id_mesa"]
+
+    def datos(hora, mesa=local.id_mesa, **extra):
+        return {
+            "nombre_completo": "Cliente",
+            "fecha_reserva": "2031-03-04T00:00:00+00:00",
+            "hora_reserva": hora,
+            "numero_personas": 2,
+            "metodo_pago": "efectivo",
+            "restaurante_id": rid,
+            "mesa_id": mesa,
+            **extra,
+        }
+
+    a = api.post("/reservas/", json=datos("18:00"))
+    assert a.status_code == 201, a.text
+    a = a.json()
+    r = api.post("/reservas/", json=datos("19:30"))
+    assert r.status_code == 409 and "reservada" in r.json()["detail"]
+    b = api.post("/reservas/", json=datos("20:00")).json()
+    assert api.post("/reservas/", json=datos("19:00", mesa=otra)).status_code == 201
+    # Una reserva cancelada no ocupa la mesa
+    assert (
+        api.post("/reservas/", json=datos("19:00", estado="cancelada")).status_code
+        == 201
+    )
+
+    # Mover b choca con a (misma mesa) o con la reserva de la otra mesa
+    ruta_b = f"/reservas/{b['id_reserva']}"
+    assert api.put(ruta_b, json={"hora_reserva": "19:00"}).status_code == 409
+    assert api.put(ruta_b, json={"mesa_id": otra}).status_code == 409
+    assert api.put(ruta_b, json={"hora_reserva": "20:30"}).status_code == 200
+
+    # Cancelar a libera el hueco y reactivarla vuelve a chocar
+    ruta_a = f"/reservas/{a['id_reserva']}"
+    assert api.put(ruta_a, json={"estado": "cancelada"}).status_code == 200
+    assert api.post("/reservas/", json=datos("18:30")).status_code == 201
+    assert api.put(ruta_a, json={"estado": "pendiente"}).status_code == 409
+
+
+def test_api_lote_con_solape_interno(api, local):
+    def datos(hora):
+        return {
+            "nombre_completo": "Cliente",
+            "fecha_reserva": "2031-03-05T00:00:00+00:00",
+            "hora_reserva": hora,
+            "numero_personas": 2,
+            "metodo_pago": "efectivo",
+            "restaurante_id": local.id_restaurante,
+            "mesa_id": local.id_mesa,
+        }
+
+    r = api.post("/reservas/bulk", json=[datos("13:00"), datos("14:00")])
+    assert r.status_code == 409 and "Elemento 1" in r.json()["detail"], r.text
+    r = api.post("/reservas/bulk", json=[datos("13:00"), datos("15:00")])
+    assert r.status_code == 201, r.text
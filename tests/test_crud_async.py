@@ -0,0 +1,86 @@
+"""
+CRUD asíncrono sobre AsyncSession: mismas validaciones y resultados que el
+síncrono
+"""
+
+import pytest
+
+from crud.mesa_crud import MesaAsyncCRUD, MesaCRUD
+from crud.restaurante_crud import RestauranteAsyncCRUD
+
+
+def test_ciclo_de_vida_de_una_mesa(correr_async, abrir_sesion, restaurante):
+    async def ciclo(abrir):
+        async with abrir() as db:
+            crud = MesaAsyncCRUD(db)
+            mesa = await crud.crear_mesa(
+                numero_mesa=2,
+                capacidad=6,
+                ubicacion="terraza",
+                activa=True,
+                restaurante_id=restaurante.id_restaurante,
+            )
+            id_mesa = mesa.id_mesa
+            actualizada = await crud.actualizar_mesa(id_mesa, capacidad=8)
+            leida = await crud.obtener_mesa(id_mesa)
+            return id_mesa, actualizada.capacidad, leida.ubicacion
+
+    id_mesa, capacidad, ubicacion = correr_async(ciclo)
+    assert (capacidad, ubicacion) == (8, "terraza")
+
+    # Lo escrito por el CRUD asíncrono lo ve el síncrono
+    with abrir_sesion() as db:
+        assert MesaCRUD(db).obtener_mesa(id_mesa).capacidad == 8
+
+    async def eliminar(abrir):
+        async with abrir() as db:
+            crud = MesaAsyncCRUD(db)
+            return await crud.eliminar_mesa(id_mesa), await crud.eliminar_mesa(id_mesa)
+
+    assert correr_async(eliminar) == (True, False)
+
+
+def test_paginas_iguales_al_crud_sincrono(correr_async, abrir_sesion, restaurante):
+    with abrir_sesion() as db:
+        crud = MesaCRUD(db)
+        for numero in range(2, 7):
+            crud.crear_mesa(
+                numero_mesa=numero,
+                capacidad=2,
+                ubicacion=None,
+                activa=True,
+                restaurante_id=restaurante.id_restaurante,
+            )
+        pagina, cursor = crud.obtener_mesas_pagina(limit=4)
+        sincrono = [m.id_mesa for m in pagina]
+
+    async def leer(abrir):
+        async with abrir() as db:
+            crud = MesaAsyncCRUD(db)
+            pagina, siguiente = await crud.obtener_mesas_pagina(limit=4)
+            resto, fin = await crud.obtener_mesas_pagina(limit=4, cursor=siguiente)
+            return [m.id_mesa for m in pagina], siguiente, len(resto), fin
+
+    asincrono, siguiente, resto, fin = correr_async(leer)
+    assert asincrono == sincrono
+    assert siguiente == cursor
+    assert (resto, fin) == (2, None)
+
+
+def test_validacion_compartida(correr_async, restaurante):
+    async def crear(abrir):
+        async with abrir() as db:
+            await RestauranteAsyncCRUD(db).crear_restaurante(
+                nombre="Sin lugar",
+                direccion="Calle 2",
+                telefono=None,
+                email=None,
+                capacidad_maxima=0,
+                horario_apertura="12:00",
+                horario_cierre="23:00",
+                activo=True,
+                usuario_admin_id=restaurante.id_usuario,
+            )
+
+    with pytest.raises(ValueError):
+        correr_async(crear)
@@ -0,0 +1,235 @@
+"""
+Motor de disponibilidad: ventanas y solapes en memoria, y el endpoint
+/restaurantes/{id}/disponibilidad con reservas que cruzan medianoche
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from services.disponibilidad import (
+    MesaLibre,
+    MotorDisponibilidad,
+    _Local,
+    _solapa,
+    _ventana,
+    minutos,
+)
+
+ID = uuid.uuid4()
+
+
+def test_minutos():
+    assert minutos("00:00") == 0
+    assert minutos("19:30") == 1170
+    for hora in ("24:00", "12:60", "doce", "12"):
+        with pytest.raises(ValueError):
+            minutos(hora)
+
+
+def test_solapa_con_intervalos_semiabiertos():
+    intervalos = [(600, 720, ID), (900, 960, ID)]
+    assert _solapa(intervalos, 700, 800, 120)
+    assert not _solapa(intervalos, 720, 900, 120)  # se tocan sin cortarse
+    assert _solapa(intervalos, 500, 1000, 120)
+    assert not _solapa([], 0, 100, 0)
+
+
+def test_ventana_dentro_del_horario():
+    local = _Local(12 * 60, 23 * 60, 120, ())
+    assert _ventana(local, "20:00", None) == (1200, 1320, 120, [])
+    assert _ventana(local, "22:00", 60) == (1320, 1380, 60, [])
+    for hora in ("11:00", "22:00", "23:30"):
+        with pytest.raises(ValueError):
+            _ventana(local, hora, None)
+
+
+def test_ventana_que_cruza_medianoche():
+    # 18:00-02:00: el cierre se guarda como 26:00
+    local = _Local(18 * 60, 26 * 60, 120, ())
+    # Las reservas de la noche anterior pueden llegar a cualquier hora
+    assert _ventana(local, "23:00", None) == (1380, 1500, 120, [-1, 1])
+    # 00:00 es la madrugada del servicio del día anterior
+    assert _ventana(local, "00:00", None) == (0, 120, 120, [-1])
+    for hora in ("00:30", "03:00", "17:00"):
+        with pytest.raises(ValueError):
+            _ventana(local, hora, None)
+
+
+def _reserva(mesa, hora, dia=date(2031, 5, 5), duracion=120, estado="confirmada"):
+    return SimpleNamespace(
+        id_reserva=uuid.uuid4(),
+        restaurante_id=ID,
+        mesa_id=mesa.id_mesa,
+        estado=estado,
+        inicio_reserva=datetime(dia.year, dia.month, dia.day, tzinfo=timezone.utc)
+        + timedelta(minutes=minutos(hora)),
+        duracion_minutos=duracion,
+    )
+
+
+def test_actualizacion_incremental_del_indice():
+    motor = MotorDisponibilidad()
+    chica = MesaLibre(uuid.uuid4(), 1, 2, None)
+    grande = MesaLibre(uuid.uuid4(), 2, 6, "terraza")
+    local = _Local(12 * 60, 23 * 60, 120, (chica, grande))
+    dia = date(2031, 5, 5)
+    # Restaurante y día cargados, con la mesa chica ocupada de 19:00 a 21:00
+    motor._locales[ID] = local
+    motor._guardar(ID, dia, local, [_reserva(chica, "19:00")], 0)
+
+    def libres(hora, personas=2):
+        # Todo está en caché: no hace falta sesión
+        mesas, _ = motor.mesas_libres(None, ID, dia, hora, personas)
+        return [mesa.numero_mesa for mesa in mesas]
+
+    assert libres("20:00") == [2]
+    assert libres("21:00") == [1, 2]
+    assert libres("20:00", personas=3) == [2]
+
+    nueva = _reserva(grande, "20:30", duracion=30)
+    motor.registrar(vars(nueva))
+    assert libres("20:00") == []
+    assert libres("21:00") == [1, 2]
+
+    # Cancelar libera la mesa; borrar quita el intervalo reactivado
+    nueva.estado = "cancelada"
+    motor.registrar(nueva)
+    assert libres("20:00") == [2]
+    nueva.estado = "confirmada"
+    motor.registrar(nueva)
+    motor.quitar(nueva.id_reserva)
+    assert libres("20:00") == [2]
+
+    # Las reservas de días sin cargar no se guardan
+    motor.registrar(_reserva(chica, "13:00", dia=date(2031, 5, 6)))
+    assert motor.resumen()["dias"] == 1
+    assert motor.resumen()["reservas"] == 1
+
+
+def test_los_dias_caducan_por_ttl():
+    motor = MotorDisponibilidad(ttl_s=0)
+    local = _Local(12 * 60, 23 * 60, 120, ())
+    motor._guardar(ID, date(2031, 5, 5), local, [], 0)
+    motor._dias[(ID, date(2031, 5, 5))].cargado_en -= 1
+    assert motor._dia((ID, date(2031, 5, 5))) is None
+    assert motor.resumen()["dias"] == 0
+
+
+# ---------- ENDPOINT ----------
+def _libres(api, restaurante_id, hora, fecha, personas=2):
+    r = api.get(
+        f"/restaurantes/{restaurante_id}/disponibilidad",
+        params={"fecha": fecha, "hora": hora, "personas": personas},
+    )
+    assert r.status_code == 200, r.text
+    return [mesa["numero_mesa"] for mesa in r.json()["mesas"]]
+
+
+def _reservar(api, restaurante_id, mesa_id, fecha, hora, **extra):
+    r = api.post(
+        "/reservas/",
+        json={
+            "nombre_completo": "Cliente",
+            "fecha_reserva": f"{fecha}T00:00:00Z",
+            "hora_reserva": hora,
+            "numero_personas": 2,
+            "metodo_pago": "efectivo",
+            "restaurante_id": restaurante_id,
+            "mesa_id": mesa_id,
+            **extra,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_endpoint_sigue_las_escrituras(api, local):
+    rid = local.id_restaurante
+    mesas = [local.id_mesa]
+    for numero, capacidad in ((2, 2), (3, 6)):
+        r = api.post(
+            "/mesas/",
+            json={"numero_mesa": numero, "capacidad": capacidad, "restaurante_id": rid},
+        )
+        assert r.status_code == 201, r.text
+        mesas.append(r.json()["id_mesa"])
+    fecha = "2031-05-05"
+
+    r = api.get(
+        f"/restaurantes/{rid}/disponibilidad",
+        params={"fecha": fecha, "hora": "20:00", "personas": 2},
+    )
+    assert r.status_code == 200
+    assert r.json()["duracion_minutos"] == 120
+    # De menor a mayor capacidad
+    assert [m["numero_mesa"] for m in r.json()["mesas"]] == [2, 1, 3]
+
+    reserva = _reservar(api, rid, mesas[1], fecha, "19:00")
+    assert _libres(api, rid, "20:00", fecha) == [1, 3]
+    assert _libres(api, rid, "21:00", fecha) == [2, 1, 3]
+
+    r = api.put(f"/reservas/{reserva['id_reserva']}", json={"mesa_id": mesas[2]})
+    assert r.status_code == 200, r.text
+    assert _libres(api, rid, "20:00", fecha) == [2, 1]
+
+    r = api.put(f"/reservas/{reserva['id_reserva']}", json={"estado": "cancelada"})
+    assert r.status_code == 200, r.text
+    assert _libres(api, rid, "20:00", fecha) == [2, 1, 3]
+
+    # Desactivar una mesa invalida los datos fijos del restaurante
+    assert _libres(api, rid, "20:00", fecha, personas=5) == [3]
+    r = api.put(f"/mesas/{mesas[2]}", json={"activa": False})
+    assert r.status_code == 200, r.text
+    assert _libres(api, rid, "20:00", fecha, personas=5) == []
+
+
+def test_endpoint_errores(api, local):
+    rid = local.id_restaurante
+    consulta = lambda restaurante, hora: api.get(
+        f"/restaurantes/{restaurante}/disponibilidad",
+        params={"fecha": "2031-05-05", "hora": hora, "personas": 2},
+    )
+    assert consulta(rid, "10:00").status_code == 400  # antes de abrir
+    assert consulta(rid, "22:30").status_code == 400  # termina tras el cierre
+    assert consulta(rid, "25:00").status_code == 400
+    assert consulta(uuid.uuid4(), "20:00").status_code == 404
+    assert "dias" in api.get("/health/disponibilidad").json()
+
+
+def test_endpoint_pasada_la_medianoche(api, local):
+    r = api.post(
+        "/restaurantes/",
+        json={
+            "nombre": "Nocturno",
+            "direccion": "Calle 2",
+            "capacidad_maxima": 40,
+            "horario_apertura": "18:00",
+            "horario_cierre": "02:00",
+            "usuario_admin_id": local.id_usuario,
+        },
+    )
+    assert r.status_code == 201, r.text
+    rid = r.json()["id_restaurante"]
+    mesa_a, mesa_b = (
+        api.post(
+            "/mesas/",
+            json={"numero_mesa": numero, "capacidad": 4, "restaurante_id": rid},
+        ).json()["id_mesa"]
+        for numero in (1, 2)
+    )
+
+    assert _libres(api, rid, "23:45", "2031-06-02") == [1, 2]
+    assert _libres(api, rid, "00:00", "2031-06-03") == [1, 2]
+
+    # Madrugada del día 3: ocupa la mesa 1 para el turno tardío del día 2
+    _reservar(api, rid, mesa_a, "2031-06-03", "00:30", duracion_minutos=60)
+    assert _libres(api, rid, "23:45", "2031-06-02") == [2]
+    assert _libres(api, rid, "22:00", "2031-06-02") == [1, 2]
+
+    # 23:00 del día 2 hasta la 01:00 del día 3
+    _reservar(api, rid, mesa_b, "2031-06-02", "23:00")
+    assert _libres(api, rid, "00:00", "2031-06-03") == []
+    assert _libres(api, rid, "00:00", "2031-06-02") == [1, 2]
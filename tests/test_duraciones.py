@@ -0,0 +1,131 @@
+"""
+Duración de las reservas y consultas de solape sobre el periodo
+(tstzrange con índice GiST)
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from crud.reserva_crud import ReservaCRUD, periodo_reserva
+
+
+def _hora(h, m=0):
+    return datetime(2031, 4, 9, h, m, tzinfo=timezone.utc)
+
+
+def test_periodo_semiabierto():
+    periodo = periodo_reserva(_hora(0), "19:30", 90)
+    assert (periodo.lower, periodo.upper) == (_hora(19, 30), _hora(21))
+    assert periodo.bounds == "[)"
+
+
+def test_duraciones_por_restaurante_y_por_reserva(api, local):
+    rid = local.id_restaurante
+    assert (
+        api.put(f"/restaurantes/{rid}", json={"duracion_reserva_min": 90}).status_code
+        == 200
+    )
+
+    def reservar(hora, **extra):
+        return api.post(
+            "/reservas/",
+            json={
+                "nombre_completo": "Cliente",
+                "fecha_reserva": "2031-04-09T00:00:00+00:00",
+                "hora_reserva": hora,
+                "numero_personas": 2,
+                "metodo_pago": "efectivo",
+                "restaurante_id": rid,
+                "mesa_id": local.id_mesa,
+                **extra,
+            },
+        )
+
+    a = reservar("19:00")
+    assert a.status_code == 201 and a.json()["duracion_minutos"] == 90
+    # Termina justo cuando empieza la siguiente: no se solapan
+    assert reservar("20:30").status_code == 201
+    assert reservar("17:45", duracion_minutos=90).status_code == 409
+    assert reservar("17:30", duracion_minutos=90).status_code == 201
+    assert reservar("12:00", duracion_minutos=5).status_code == 422
+
+    b = reservar("22:00", duracion_minutos=60).json()
+    ruta_b = f"/reservas/{b['id_reserva']}"
+    assert api.put(ruta_b, json={"duracion_minutos": 180}).status_code == 200
+    # Con tres horas, empezar a las 21:30 pisaría la de las 20:30
+    assert api.put(ruta_b, json={"hora_reserva": "21:30"}).status_code == 409
+
+    # La disponibilidad usa la duración del restaurante o la pedida
+    disponibilidad = lambda hora, **extra: api.get(
+        f"/restaurantes/{rid}/disponibilidad",
+        params={"fecha": "2031-04-09", "hora": hora, "personas": 2, **extra},
+    ).json()
+    r = disponibilidad("20:00")
+    assert r["duracion_minutos"] == 90 and r["mesas"] == []
+    assert [m["id_mesa"] for m in disponibilidad("12:00", duracion=300)["mesas"]] == [
+        local.id_mesa
+    ]
+    assert disponibilidad("13:00", duracion=300)["mesas"] == []
+
+
+def test_consultas_de_solape(abrir_sesion, restaurante):
+    with abrir_sesion() as db:
+        crud = ReservaCRUD(db)
+        for hora, duracion, estado in (
+            ("17:30", 90, "confirmada"),
+            ("19:00", 90, "confirmada"),
+            ("20:30", 90, "confirmada"),
+            ("20:00", 60, "cancelada"),
+        ):
+            crud.crear_reserva(
+                nombre_completo="Cliente",
+                telefono=None,
+                email=None,
+                fecha_reserva=_hora(0),
+                hora_reserva=hora,
+                numero_personas=2,
+                metodo_pago="efectivo",
+                estado=estado,
+                observaciones=None,
+                usuario_id=None,
+                restaurante_id=restaurante.id_restaurante,
+                mesa_id=restaurante.id_mesa,
+                duracion_minutos=duracion,
+            )
+
+        solapadas = crud.obtener_reservas_solapadas(
+            _hora(20), _hora(20, 45), mesa_id=restaurante.id_mesa
+        )
+        assert [r.hora_reserva for r in solapadas] == ["19:00", "20:30"]
+        con_canceladas = crud.obtener_reservas_solapadas(
+            _hora(20),
+            _hora(20, 45),
+            restaurante_id=restaurante.id_restaurante,
+            incluir_canceladas=True,
+        )
+        assert len(con_canceladas) == 3
+
+        assert crud.mesa_ocupada(restaurante.id_mesa, _hora(20), _hora(20, 10))
+        assert not crud.mesa_ocupada(restaurante.id_mesa, _hora(12), _hora(17, 30))
+        # Excluyendo la propia reserva (al moverla) el hueco queda libre
+        propia = solapadas[0].id_reserva
+        assert not crud.mesa_ocupada(
+            restaurante.id_mesa, _hora(19), _hora(20, 30), excluir=propia
+        )
+        with pytest.raises(ValueError):
+            crud.obtener_reservas_solapadas(_hora(21), _hora(20))
+
+
+def test_solape_usa_el_indice_gist(abrir_sesion):
+    with abrir_sesion() as db:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = db.execute(
+            text(
+                "EXPLAIN SELECT id_reserva FROM reservas WHERE periodo && "
+                "tstzrange(:desde, :hasta, '[)')"
+            ),
+            {"desde": _hora(20), "hasta": _hora(21)},
+        ).scalars()
+        assert "ix_reservas_periodo" in "\n".join(plan)
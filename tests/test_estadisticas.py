@@ -0,0 +1,105 @@
+"""
+Estadísticas columnares (services.columnas): filas de la base y reservas
+en memoria de la consola, sin base de datos
+"""
+
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from services.columnas import (
+    DIAS_SEMANA,
+    calcular,
+    columnas_de_filas,
+    columnas_de_memoria,
+)
+from src.sistema_reservas import SistemaReservas
+
+_HORA = 3600
+
+
+def _instante(dia, hora):
+    return datetime(2030, 1, dia, hora, tzinfo=timezone.utc).timestamp()
+
+
+def test_filas_de_la_base():
+    # 2030-01-07 es lunes, 2030-01-12 sábado
+    lunes, sabado = _instante(7, 20), _instante(12, 13)
+    filas = [
+        (lunes, lunes - 2 * _HORA, 2, "efectivo", False),
+        (lunes, lunes - 30 * _HORA, 4, "tarjeta credito", False),
+        (sabado, sabado + _HORA, 3, "efectivo", False),  # cargada tarde
+        (sabado, sabado - 800 * _HORA, 6, "transferencia", True),
+    ]
+    resultado = calcular(columnas_de_filas(filas))
+
+    assert resultado["total_reservas"] == 4
+    assert resultado["canceladas"] == 1
+    assert resultado["comensales"] == 9  # sin la cancelada
+    assert resultado["por_hora"] == [
+        {"hora": 13, "reservas": 1, "comensales": 3},
+        {"hora": 20, "reservas": 2, "comensales": 6},
+    ]
+    por_dia = {fila["dia"]: fila["reservas"] for fila in resultado["por_dia_semana"]}
+    assert por_dia == dict.fromkeys(DIAS_SEMANA, 0) | {"lunes": 2, "sábado": 1}
+    assert resultado["ocupacion_dia_hora"][0][20] == 2
+    assert resultado["ocupacion_dia_hora"][5][13] == 1
+    tramos = [fila["reservas"] for fila in resultado["anticipacion"]]
+    assert tramos == [1, 1, 0, 1, 0, 0, 1]
+    assert resultado["anticipacion_mediana_h"] == 16.0
+    assert [fila["metodo_pago"] for fila in resultado["metodos_pago"]] == [
+        "efectivo",
+        "tarjeta credito",
+        "transferencia",
+    ]
+
+
+def test_sin_filas():
+    resultado = calcular(columnas_de_filas([]))
+    assert resultado["total_reservas"] == 0
+    assert resultado["tasa_cancelacion"] is None
+    assert resultado["por_hora"] == []
+    assert len(resultado["por_dia_semana"]) == 7
+    assert resultado["anticipacion_mediana_h"] is None
+
+
+def test_memoria_coincide_con_los_contadores_de_la_consola():
+    sistema = SistemaReservas("Prueba")
+    for nombre, hora, metodo in (
+        ("Ana", 12, "efectivo"),
+        ("Luis", 12, "tarjeta credito"),
+        ("Eva", 20, "efectivo"),
+        ("Juan", 21, "transferencia"),
+    ):
+        assert sistema.agregar_reserva(nombre, hora, metodo)
+    sistema.eliminar_reserva_por_id(4)
+
+    resultado = calcular(columnas_de_memoria(sistema))
+
+    assert resultado["total_reservas"] == 3
+    assert {
+        fila["metodo_pago"]: fila["reservas"] for fila in resultado["metodos_pago"]
+    } == sistema.contar_por_metodo()
+    assert {fila["hora"]: fila["reservas"] for fila in resultado["por_hora"]} == {
+        hora: sistema.contar_por_hora(hora) for hora in (12, 20)
+    }
+    # La consola no sabe el día ni la anticipación
+    assert resultado["por_dia_semana"] == []
+    assert resultado["anticipacion"] == []
+
+
+def test_memoria_vacia():
+    resultado = calcular(columnas_de_memoria(SistemaReservas("Vacío")))
+    assert resultado["total_reservas"] == 0
+    assert resultado["metodos_pago"] == []
+
+
+def test_la_consola_no_importa_la_capa_de_datos():
+    codigo = (
+        "import sys\n"
+        "import services.columnas, src.sistema_reservas\n"
+        "assert 'sqlalchemy' not in sys.modules, 'sqlalchemy'\n"
+        "assert 'database.config' not in sys.modules, 'database'\n"
+    )
+    entorno = {"PATH": "", "PYTHONPATH": "."}
+    subprocess.run([sys.executable, "-c", codigo], check=True, env=entorno)
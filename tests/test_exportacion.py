@@ -0,0 +1,100 @@
+"""
+Exportación en streaming: varias tandas del cursor y cierre de la sesión
+propia del stream
+"""
+
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database.config import _url_async
+from database.models.reserva import Reserva
+from services.exportacion import exportar, exportar_async
+
+RESERVAS = 25
+TANDA = 10  # tres tandas del cursor
+
+
+@pytest.fixture
+def reservas(abrir_sesion, restaurante):
+    inicio = datetime(2030, 1, 1, 20, tzinfo=timezone.utc)
+    with abrir_sesion() as db:
+        db.execute(
+            insert(Reserva),
+            [
+                dict(
+                    nombre_completo=f"Cliente {i}",
+                    fecha_reserva=inicio + timedelta(days=i),
+                    hora_reserva="20:00",
+                    inicio_reserva=inicio + timedelta(days=i),
+                    numero_personas=2,
+                    metodo_pago="efectivo",
+                    restaurante_id=restaurante.id_restaurante,
+                )
+                for i in range(RESERVAS)
+            ],
+        )
+        db.commit()
+    return restaurante
+
+
+def test_ndjson_recorre_varias_tandas_y_cierra_la_sesion(
+    base_migrada, abrir_sesion, reservas
+):
+    bloques = exportar(
+        "ndjson",
+        TANDA,
+        abrir_sesion,
+        restaurante_id=reservas.id_restaurante,
+    )
+    partes = list(bloques)
+    assert len(partes) == 3  # un bloque por tanda
+    filas = [json.loads(linea) for linea in b"".join(partes).splitlines()]
+    assert [fila["nombre_completo"] for fila in filas] == [
+        f"Cliente {i}" for i in range(RESERVAS)
+    ]
+    assert base_migrada.pool.checkedout() == 0
+
+
+def test_csv_incluye_encabezado_y_todas_las_filas(abrir_sesion, reservas):
+    texto = b"".join(exportar("csv", TANDA, abrir_sesion)).decode()
+    filas = list(csv.DictReader(io.StringIO(texto)))
+    assert len(filas) == RESERVAS
+    assert filas[0]["hora_reserva"] == "20:00"
+
+
+def test_abandonar_el_stream_devuelve_la_conexion(base_migrada, abrir_sesion, reservas):
+    bloques = exportar("ndjson", TANDA, abrir_sesion)
+    assert base_migrada.pool.checkedout() == 1
+    next(bloques)
+    bloques.close()  # lo que hace el recolector si el cliente se va
+    assert base_migrada.pool.checkedout() == 0
+
+
+def test_formato_invalido_falla_antes_de_enviar(base_migrada, abrir_sesion):
+    with pytest.raises(ValueError):
+        exportar("xml", TANDA, abrir_sesion)
+    assert base_migrada.pool.checkedout() == 0
+
+
+def test_async_recorre_varias_tandas(base_migrada, reservas):
+    motor = create_async_engine(_url_async(base_migrada.url))
+
+    async def recorrer():
+        try:
+            bloques = await exportar_async(
+                "ndjson", TANDA, async_sessionmaker(motor, expire_on_commit=False)
+            )
+            return [bloque async for bloque in bloques]
+        finally:
+            await motor.dispose()
+
+    partes = asyncio.run(recorrer())
+    assert len(partes) == 3
+    assert len(b"".join(partes).splitlines()) == RESERVAS
@@ -0,0 +1,95 @@
+"""
+Filtros y orden de reservas resueltos en la base
+"""
+
+import pytest
+
+
+@pytest.fixture
+def reservas(api, local):
+    lote = [
+        {
+            "nombre_completo": f"Cliente {i}",
+            "fecha_reserva": f"2030-06-{1 + i % 10:02d}T00:00:00Z",
+            "hora_reserva": ("13:00", "20:00", "21:30")[i % 3],
+            "numero_personas": 2,
+            "metodo_pago": "efectivo",
+            "estado": "confirmada" if i % 4 == 0 else "pendiente",
+            "restaurante_id": local.id_restaurante,
+            "mesa_id": local.id_mesa if i % 2 and i < 10 else None,  # un día cada una
+            "usuario_id": local.id_usuario if i % 5 == 0 else None,
+        }
+        for i in range(30)
+    ]
+    respuesta = api.post("/reservas/bulk", json=lote)
+    assert respuesta.status_code == 201, respuesta.text
+    return respuesta.json()["items"]
+
+
+def _listar(api, **params):
+    filas, cursor = [], None
+    while True:
+        respuesta = api.get(
+            "/reservas/",
+            params={"limit": 7, **params, **({"cursor": cursor} if cursor else {})},
+        )
+        assert respuesta.status_code == 200, respuesta.text
+        filas += respuesta.json()
+        cursor = respuesta.headers.get("x-next-cursor")
+        if not cursor:
+            return filas
+
+
+def _ids(filas):
+    return sorted(fila["id_reserva"] for fila in filas)
+
+
+def test_filtros(api, local, reservas):
+    rid = local.id_restaurante
+    assert len(_listar(api, restaurante_id=rid)) == 30
+    assert _ids(_listar(api, restaurante_id=rid, estado="confirmada")) == _ids(
+        r for r in reservas if r["estado"] == "confirmada"
+    )
+    assert _ids(_listar(api, mesa_id=local.id_mesa)) == _ids(
+        r for r in reservas if r["mesa_id"]
+    )
+    assert _ids(_listar(api, usuario_id=local.id_usuario)) == _ids(
+        r for r in reservas if r["usuario_id"]
+    )
+    rango = _listar(
+        api,
+        restaurante_id=rid,
+        desde="2030-06-03T00:00:00Z",
+        hasta="2030-06-05T00:00:00Z",
+    )
+    assert {fila["fecha_reserva"][:10] for fila in rango} == {
+        "2030-06-03",
+        "2030-06-04",
+    }
+    franja = _listar(api, restaurante_id=rid, hora_desde="20:00", hora_hasta="21:00")
+    assert {fila["hora_reserva"] for fila in franja} == {"20:00"}
+    assert len(franja) == 10
+
+
+def test_orden_ascendente_y_descendente(api, local, reservas):
+    ascendente = _listar(api, restaurante_id=local.id_restaurante)
+    inicios = [fila["inicio_reserva"] for fila in ascendente]
+    assert inicios == sorted(inicios)
+    descendente = _listar(api, restaurante_id=local.id_restaurante, orden="desc")
+    assert [fila["id_reserva"] for fila in descendente] == [
+        fila["id_reserva"] for fila in reversed(ascendente)
+    ]
+
+
+@pytest.mark.parametrize(
+    "params, codigo",
+    [
+        ({"estado": "rara"}, 400),
+        ({"desde": "2030-06-05T00:00:00Z", "hasta": "2030-06-01T00:00:00Z"}, 400),
+        ({"hora_desde": "21:00", "hora_hasta": "20:00"}, 400),
+        ({"hora_desde": "8pm"}, 422),
+        ({"orden": "x"}, 422),
+    ],
+)
+def test_filtros_invalidos(api, params, codigo):
+    assert api.get("/reservas/", params=params).status_code == codigo
@@ -0,0 +1,111 @@
+"""
+Formato autodescriptivo de los hashes de contraseña, rehash en el login y
+calibración del costo
+"""
+
+import hashlib
+
+import pytest
+from sqlalchemy import select, update
+
+import auth.calibracion as calibracion
+import auth.security as security
+from auth.security import PasswordManager, analizar
+from database.config import SessionLocal
+from database.models.usuario import Usuario
+
+CLAVE = "Secreta#123"
+
+
+def _legado(clave=CLAVE):
+    salt = "ab" * 32
+    calculado = hashlib.pbkdf2_hmac("sha256", clave.encode(), salt.encode(), 100000)
+    return f"{salt}:{calculado.hex()}"
+
+
+@pytest.fixture
+def scrypt_liviano(monkeypatch):
+    monkeypatch.setattr(security, "HASH_ALGORITMO", "scrypt")
+    monkeypatch.setattr(security, "HASH_SCRYPT_N", 1024)
+
+
+def test_formato_pbkdf2():
+    guardado = PasswordManager.hash_password(CLAVE)
+    algoritmo, parametros, salt, clave = analizar(guardado)
+    assert guardado.startswith(f"$pbkdf2-sha256$i={security.HASH_PBKDF2_ITERACIONES}$")
+    assert (algoritmo, len(salt), len(clave)) == ("pbkdf2-sha256", 16, 32)
+    assert PasswordManager.verify_password(CLAVE, guardado)
+    assert not PasswordManager.verify_password("Otra#123", guardado)
+    assert not PasswordManager.necesita_rehash(guardado)
+    # Mismo texto, salt distinto
+    assert PasswordManager.hash_password(CLAVE) != guardado
+
+
+def test_formato_legado_se_acepta_y_pide_rehash():
+    assert PasswordManager.verify_password(CLAVE, _legado())
+    assert not PasswordManager.verify_password("Otra#123", _legado())
+    assert PasswordManager.necesita_rehash(_legado())
+
+
+def test_scrypt_y_cambio_de_configuracion(scrypt_liviano, monkeypatch):
+    guardado = PasswordManager.hash_password(CLAVE)
+    assert guardado.startswith("$scrypt$n=1024,r=8,p=1$")
+    assert PasswordManager.verify_password(CLAVE, guardado)
+    assert not PasswordManager.necesita_rehash(guardado)
+
+    # Subir el costo marca los hashes viejos; siguen verificando
+    monkeypatch.setattr(security, "HASH_SCRYPT_N", 2048)
+    assert PasswordManager.necesita_rehash(guardado)
+    assert PasswordManager.verify_password(CLAVE, guardado)
+    monkeypatch.setattr(security, "HASH_ALGORITMO", "pbkdf2-sha256")
+    assert PasswordManager.necesita_rehash(guardado)
+
+
+@pytest.mark.parametrize(
+    "guardado", ["", "basura", "$md5$i=1$abc$def", "$pbkdf2-sha256$i=x$a$b"]
+)
+def test_hash_ilegible(guardado):
+    assert not PasswordManager.verify_password(CLAVE, guardado)
+    assert PasswordManager.necesita_rehash(guardado)
+
+
+def test_calibracion_pbkdf2(monkeypatch):
+    # Modelo lineal: 2.5 µs por iteración
+    monkeypatch.setattr(calibracion, "medir", lambda _, p, *a: p["i"] * 2.5e-6)
+    assert calibracion.calibrar_pbkdf2(0.5) == {"i": 200000}
+    # Nunca por debajo del mínimo aunque el objetivo sea menor
+    assert calibracion.calibrar_pbkdf2(0.01) == {"i": calibracion.MINIMO_PBKDF2}
+
+
+def test_calibracion_scrypt(monkeypatch):
+    monkeypatch.setattr(calibracion, "medir", lambda _, p, *a: p["n"] * 1e-5)
+    # N = 2^15 tarda 0.33 s; 2^16 se pasaría de 0.5 s
+    assert calibracion.calibrar_scrypt(0.5) == {"n": 1 << 15, "r": 8, "p": 1}
+    assert calibracion.calibrar_scrypt(0.01)["n"] == calibracion.MINIMO_SCRYPT_N
+
+
+def test_login_actualiza_el_hash_legado(api, local):
+    def contrasena():
+        with SessionLocal() as db:
+            return db.scalar(
+                select(Usuario.contrasena).where(Usuario.id_usuario == local.id_usuario)
+            )
+
+    with SessionLocal() as db:
+        db.execute(
+            update(Usuario)
+            .where(Usuario.id_usuario == local.id_usuario)
+            .values(contrasena=_legado())
+        )
+        db.commit()
+
+    datos = {"nombre_usuario": local.nombre_usuario, "contrasena": "Mala#1234"}
+    assert api.post("/usuarios/login", json=datos).status_code == 401
+    assert contrasena() == _legado()
+
+    datos["contrasena"] = CLAVE
+    assert api.post("/usuarios/login", json=datos).status_code == 200
+    actualizado = contrasena()
+    assert actualizado.startswith("$pbkdf2-sha256$")
+    assert api.post("/usuarios/login", json=datos).status_code == 200
+    assert contrasena() == actualizado
@@ -0,0 +1,79 @@
+"""
+Servicio de hashing: tope de hilos bloqueados en la API síncrona
+(sin arrancar el pool de procesos)
+"""
+
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from auth.hashing import ServicioHash, ServicioHashSaturado
+
+
+def _servicio_detenido(procesos):
+    """Servicio cuyo envío devuelve futuros que el test resuelve a mano"""
+    servicio = ServicioHash(procesos=procesos, max_en_cola=10)
+    pendientes = []
+
+    def enviar(operacion, funcion, *args):
+        tarea = Future()
+        pendientes.append(tarea)
+        return tarea
+
+    servicio._enviar = enviar
+    return servicio, pendientes
+
+
+def _esperar_en_hilo(servicio, resultados):
+    hilo = threading.Thread(
+        target=lambda: resultados.append(servicio.hash_password_sync("clave"))
+    )
+    hilo.start()
+    return hilo
+
+
+def test_esperas_sincronas_acotadas_a_los_procesos():
+    servicio, pendientes = _servicio_detenido(procesos=2)
+    resultados = []
+    hilos = [_esperar_en_hilo(servicio, resultados) for _ in range(2)]
+    while len(pendientes) < 2:
+        threading.Event().wait(0.001)
+
+    # Un tercer hilo no queda bloqueado: se rechaza al instante
+    with pytest.raises(ServicioHashSaturado):
+        servicio.verify_password_sync("clave", "hash")
+    assert servicio.rechazadas == 1
+
+    for tarea in pendientes:
+        tarea.set_result("hash")
+    for hilo in hilos:
+        hilo.join(timeout=5)
+    assert resultados == ["hash", "hash"]
+
+    # Liberados los cupos se puede volver a esperar
+    pendientes.clear()
+    hilo = _esperar_en_hilo(servicio, resultados)
+    while not pendientes:
+        threading.Event().wait(0.001)
+    pendientes[0].set_result("otro")
+    hilo.join(timeout=5)
+    assert resultados[-1] == "otro"
+
+
+def test_error_del_worker_libera_el_cupo():
+    servicio, pendientes = _servicio_detenido(procesos=1)
+
+    def fallar(cantidad):
+        while len(pendientes) < cantidad:
+            threading.Event().wait(0.001)
+        pendientes[-1].set_exception(RuntimeError("worker caído"))
+
+    for cantidad in (1, 2):
+        hilo = threading.Thread(target=fallar, args=(cantidad,))
+        hilo.start()
+        # La segunda vez también llega al worker: el cupo se liberó
+        with pytest.raises(RuntimeError):
+            servicio.hash_password_sync("clave")
+        hilo.join(timeout=5)
+    assert servicio.rechazadas == 0
@@ -0,0 +1,133 @@
+"""
+inicio_reserva: relleno de la migración 0007 sobre reservas existentes y
+filtros de los listados por instante y por hora del día
+"""
+
+from sqlalchemy import text
+
+import database.migraciones as migraciones
+from database.migraciones import aplicar_migraciones
+
+
+def test_migracion_rellena_las_reservas_existentes(base_vacia, monkeypatch):
+    todas = migraciones.cargar_migraciones()
+    monkeypatch.setattr(
+        migraciones,
+        "cargar_migraciones",
+        lambda: [migracion for migracion in todas if migracion.VERSION < 7],
+    )
+    assert aplicar_migraciones(base_vacia) == [1, 2, 3, 4, 5, 6]
+
+    # Reservas escritas antes de existir la columna: con periodo y una con
+    # hora no interpretable (sin periodo)
+    with base_vacia.begin() as conexion:
+        usuario = conexion.execute(
+            text(
+                "INSERT INTO usuarios (id_usuario, nombre, apellido,"
+                " nombre_usuario, email, contrasena)"
+                " VALUES (gen_random_uuid(), 'a', 'b', 'c', 'd', 'e')"
+                " RETURNING id_usuario"
+            )
+        ).scalar()
+        restaurante = conexion.execute(
+            text(
+                "INSERT INTO restaurantes (id_restaurante, nombre, direccion,"
+                " horario_apertura, horario_cierre, usuario_admin_id)"
+                " VALUES (gen_random_uuid(), 'r', 'd', '12:00', '23:00', :u)"
+                " RETURNING id_restaurante"
+            ),
+            {"u": usuario},
+        ).scalar()
+        conexion.execute(
+            text(
+                "INSERT INTO reservas (id_reserva, nombre_completo,"
+                " fecha_reserva, hora_reserva, numero_personas, metodo_pago,"
+                " restaurante_id, periodo)"
+                " SELECT gen_random_uuid(), 'x', '2030-01-01', h, 2, 'efectivo',"
+                " :r, CASE WHEN h = 'tarde' THEN NULL ELSE tstzrange("
+                " ('2030-01-01 ' || h || '+00')::timestamptz,"
+                " ('2030-01-01 ' || h || '+00')::timestamptz + interval '2 hours')"
+                " END FROM unnest(ARRAY['19:00', '20:30', 'tarde']) h"
+            ),
+            {"r": restaurante},
+        )
+
+    monkeypatch.undo()
+    assert aplicar_migraciones(base_vacia) == [
+        m.VERSION for m in todas if m.VERSION >= 7
+    ]
+
+    with base_vacia.connect() as conexion:
+        inicios = dict(
+            conexion.execute(
+                text("SELECT hora_reserva, inicio_reserva::text FROM reservas")
+            ).all()
+        )
+        assert inicios == {
+            "19:00": "2030-01-01 19:00:00+00",
+            "20:30": "2030-01-01 20:30:00+00",
+            "tarde": "2030-01-01 00:00:00+00",  # toma fecha_reserva
+        }
+        nula = conexion.execute(
+            text(
+                "SELECT is_nullable FROM information_schema.columns"
+                " WHERE table_name = 'reservas' AND column_name = 'inicio_reserva'"
+            )
+        ).scalar()
+        assert nula == "NO"
+        # El CHECK temporal no queda en el esquema
+        assert not conexion.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :nombre"),
+            {"nombre": "ck_reservas_inicio_no_nulo"},
+        ).scalar()
+
+
+def test_listados_filtran_por_inicio_y_hora(api, local):
+    creadas = []
+    for dia in (1, 2, 3):
+        for hora in ("13:00", "19:00", "20:30", "21:00"):
+            r = api.post(
+                "/reservas/",
+                json={
+                    "nombre_completo": "Cliente",
+                    "fecha_reserva": f"2031-12-0{dia}T00:00:00+00:00",
+                    "hora_reserva": hora,
+                    "numero_personas": 2,
+                    "metodo_pago": "efectivo",
+                    "restaurante_id": local.id_restaurante,
+                },
+            )
+            assert r.status_code == 201, r.text
+            creadas.append(r.json())
+    assert creadas[1]["inicio_reserva"].startswith("2031-12-01T19:00")
+
+    def listar(**filtros):
+        r = api.get(
+            "/reservas/", params={"restaurante_id": local.id_restaurante, **filtros}
+        )
+        assert r.status_code == 200, r.text
+        return [(x["fecha_reserva"][:10], x["hora_reserva"]) for x in r.json()]
+
+    # Hora del día [19:00, 21:00) entre el 1 y el 3 (sin incluir)
+    assert listar(
+        desde="2031-12-01T00:00:00Z",
+        hasta="2031-12-03T00:00:00Z",
+        hora_desde="19:00",
+        hora_hasta="21:00",
+    ) == [
+        ("2031-12-01", "19:00"),
+        ("2031-12-01", "20:30"),
+        ("2031-12-02", "19:00"),
+        ("2031-12-02", "20:30"),
+    ]
+    # desde/hasta acotan el instante exacto, no el día
+    assert listar(desde="2031-12-01T19:30:00Z", hasta="2031-12-01T21:00:00Z") == [
+        ("2031-12-01", "20:30")
+    ]
+    r = api.get("/reservas/", params={"hora_desde": "21:00", "hora_hasta": "19:00"})
+    assert r.status_code == 400
+
+    # Cambiar la hora recalcula el inicio
+    r = api.put(f"/reservas/{creadas[0]['id_reserva']}", json={"hora_reserva": "12:15"})
+    assert r.status_code == 200, r.text
+    assert r.json()["inicio_reserva"].startswith("2031-12-01T12:15")
@@ -0,0 +1,91 @@
+"""
+Instrumentación SQL por request: conteo, N+1, consultas lentas y
+encabezados de respuesta
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import ProgrammingError
+
+import database.instrumentacion as instrumentacion
+from database.instrumentacion import (
+    EstadisticasConsultas,
+    finalizar_medicion,
+    forma_parametros,
+    iniciar_medicion,
+    instrumentar_engine,
+    resumen_encabezados,
+)
+
+
+@pytest.fixture
+def motor(base_vacia):
+    motor = create_engine(base_vacia.url)
+    instrumentar_engine(motor)
+    yield motor
+    motor.dispose()
+
+
+def test_cuenta_las_consultas_del_request(motor):
+    token = iniciar_medicion()
+    try:
+        with motor.connect() as conexion:
+            for numero in range(6):
+                conexion.execute(text("SELECT :n"), {"n": numero})
+            conexion.execute(text("SELECT 1"))
+    finally:
+        estadisticas = finalizar_medicion(token)
+
+    assert estadisticas.total == 7
+    assert estadisticas.tiempo_s > 0
+    assert estadisticas.repetidas(umbral=5) == [("SELECT %(n)s", 6)]
+    # Fuera de un request no se mide nada
+    with motor.connect() as conexion:
+        conexion.execute(text("SELECT 1"))
+    assert estadisticas.total == 7
+
+
+def test_consulta_lenta_registra_tipos_y_no_valores(motor, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentacion, "SQL_LENTA_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="restaurante.sql.lentas"):
+        with motor.connect() as conexion:
+            conexion.execute(text("SELECT :correo"), {"correo": "ana@example.com"})
+    assert "{'correo': 'str'}" in caplog.text
+    assert "ana@example.com" not in caplog.text
+
+
+def test_sentencia_fallida_no_desbalancea_los_tiempos(motor):
+    with motor.connect() as conexion:
+        with pytest.raises(ProgrammingError):
+            conexion.execute(text("SELECT * FROM no_existe"))
+        assert conexion.info["inicio_consulta"] == []
+
+
+def test_forma_de_parametros_en_lote():
+    filas = [{"id": 1, "nombre": "a"}, {"id": 2, "nombre": "b"}]
+    assert forma_parametros(filas, executemany=True) == {
+        "filas": 2,
+        "forma": {"id": "int", "nombre": "str"},
+    }
+    assert forma_parametros((1, "a"), executemany=False) == ["int", "str"]
+
+
+def test_encabezados_y_aviso_de_n_mas_1(caplog):
+    estadisticas = EstadisticasConsultas()
+    for _ in range(instrumentacion.SQL_N_MAS_1_UMBRAL):
+        estadisticas.registrar("SELECT mesa", 0.001)
+    with caplog.at_level(logging.WARNING, logger="restaurante.sql.n_mas_1"):
+        encabezados = resumen_encabezados(estadisticas, "/mesas/")
+    assert encabezados["X-DB-Queries"] == str(instrumentacion.SQL_N_MAS_1_UMBRAL)
+    assert encabezados["X-DB-N-Plus-1"] == "1"
+    assert encabezados["Server-Timing"].startswith("db;dur=")
+    assert "/mesas/" in caplog.text
+
+
+def test_encabezados_en_la_api(api, local):
+    respuesta = api.get(f"/restaurantes/{local.id_restaurante}")
+    assert int(respuesta.headers["x-db-queries"]) >= 1
+    assert "total;dur=" in respuesta.headers["server-timing"]
+    assert api.get("/").headers["x-db-queries"] == "0"
@@ -0,0 +1,138 @@
+"""
+Pruebas del limitador de intentos de login (ventana deslizante)
+"""
+
+import pytest
+
+import api.endpoints.usuarios as usuarios_sync
+import api.endpoints_async.usuarios as usuarios_async
+from auth.limitador import LimiteExcedido, LimitadorLogin, VentanaDeslizante
+
+
+def test_limite_y_espera_en_la_misma_ventana():
+    ventana = VentanaDeslizante(limite=3, ventana_s=60, max_claves=100)
+    assert [ventana.reservar("ana", ahora=t) for t in (0, 1, 2)] == [None] * 3
+    # La ventana actual está llena: hay que esperar a que pase a ser la
+    # anterior y su peso baje
+    espera = ventana.reservar("ana", ahora=10)
+    assert espera == 50 + 20
+    # Otra clave no se ve afectada
+    assert ventana.reservar("luis", ahora=10) is None
+
+
+def test_la_ventana_anterior_pesa_segun_lo_transcurrido():
+    ventana = VentanaDeslizante(limite=4, ventana_s=60, max_claves=100)
+    for t in range(4):
+        assert ventana.reservar("ana", ahora=t) is None
+    # A mitad de la ventana siguiente la anterior cuenta 4 * 0.5 = 2
+    assert ventana.reservar("ana", ahora=90) is None
+    assert ventana.reservar("ana", ahora=90) is None
+    assert ventana.reservar("ana", ahora=90) is not None
+    # Dos ventanas después el contador empieza de cero
+    assert ventana.reservar("ana", ahora=250) is None
+
+
+def test_devolver_y_reiniciar():
+    ventana = VentanaDeslizante(limite=1, ventana_s=60, max_claves=100)
+    assert ventana.reservar("ana", ahora=0) is None
+    assert ventana.reservar("ana", ahora=1) is not None
+    ventana.devolver("ana")
+    assert ventana.reservar("ana", ahora=2) is None
+    ventana.reiniciar("ana")
+    assert len(ventana) == 0
+
+
+def test_memoria_acotada():
+    ventana = VentanaDeslizante(limite=5, ventana_s=60, max_claves=3)
+    for i in range(10):
+        ventana.reservar(f"ip-{i}", ahora=i)
+    assert len(ventana) == 3
+    # Las claves inactivas durante dos ventanas se eliminan al pasar
+    ventana.reservar("nueva", ahora=200)
+    assert len(ventana) == 1
+
+
+def test_limite_invalido():
+    with pytest.raises(ValueError):
+        VentanaDeslizante(limite=0, ventana_s=60, max_claves=10)
+
+
+def test_rechazo_por_ip_no_consume_intentos_del_usuario():
+    limitador = LimitadorLogin(
+        max_por_usuario=5, ventana_usuario_s=300, max_por_ip=2, ventana_ip_s=60
+    )
+    limitador.verificar("ana", "10.0.0.1")
+    limitador.verificar("luis", "10.0.0.1")
+    with pytest.raises(LimiteExcedido) as error:
+        limitador.verificar("marta", "10.0.0.1")
+    assert error.value.reintentar_en >= 1
+    assert limitador.rechazos == {"usuario": 0, "ip": 1}
+    # La clave del usuario es insensible a mayúsculas y espacios
+    limitador.verificar(" ANA ", "10.0.0.2")
+    assert limitador.resumen()["usuario"]["claves"] == 2
+
+
+def test_exito_libera_la_ip_y_reinicia_al_usuario():
+    limitador = LimitadorLogin(
+        max_por_usuario=2, ventana_usuario_s=300, max_por_ip=3, ventana_ip_s=60
+    )
+    limitador.verificar("ana", "10.0.0.1")
+    limitador.verificar("ana", "10.0.0.1")
+    limitador.exito("ana", "10.0.0.1")
+    # Sin el éxito tanto la IP como el usuario rechazarían estos intentos
+    limitador.verificar("ana", "10.0.0.1")
+    limitador.verificar("ana", "10.0.0.1")
+    with pytest.raises(LimiteExcedido):
+        limitador.verificar("ana", "10.0.0.1")
+
+
+@pytest.fixture
+def limitador(monkeypatch):
+    """Limitador propio para no compartir contadores con otras pruebas"""
+    nuevo = LimitadorLogin(
+        max_por_usuario=5, ventana_usuario_s=300, max_por_ip=100, ventana_ip_s=60
+    )
+    monkeypatch.setattr(usuarios_sync, "limitador_login", nuevo)
+    monkeypatch.setattr(usuarios_async, "limitador_login", nuevo)
+    return nuevo
+
+
+def test_login_devuelve_429_con_retry_after(api, local, limitador):
+    mal = {"nombre_usuario": local.nombre_usuario.upper(), "contrasena": "Mala#1234"}
+    codigos = [api.post("/usuarios/login", json=mal).status_code for _ in range(5)]
+    assert codigos == [401] * 5
+
+    # Ni siquiera la contraseña correcta pasa mientras dure el bloqueo
+    r = api.post(
+        "/usuarios/login",
+        json={"nombre_usuario": local.nombre_usuario, "contrasena": local.contrasena},
+    )
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) >= 1
+    assert limitador.rechazos["usuario"] == 1
+
+    # Un usuario inexistente también consume intentos
+    fantasma = {"nombre_usuario": "no_existe", "contrasena": "Mala#1234"}
+    for _ in range(5):
+        assert api.post("/usuarios/login", json=fantasma).status_code == 401
+    assert api.post("/usuarios/login", json=fantasma).status_code == 429
+
+
+def test_login_correcto_reinicia_el_contador(api, local, limitador):
+    mal = {"nombre_usuario": local.nombre_usuario, "contrasena": "Mala#1234"}
+    bien = {"nombre_usuario": local.nombre_usuario, "contrasena": local.contrasena}
+    for _ in range(4):
+        assert api.post("/usuarios/login", json=mal).status_code == 401
+    assert api.post("/usuarios/login", json=bien).status_code == 200
+    for _ in range(5):
+        assert api.post("/usuarios/login", json=mal).status_code == 401
+    assert api.post("/usuarios/login", json=mal).status_code == 429
+
+
+def test_health_y_metricas(api):
+    resumen = api.get("/health/login").json()
+    assert set(resumen) == {"usuario", "ip"}
+    assert {"limite", "ventana_s", "claves", "rechazos"} <= set(resumen["ip"])
+    metricas = api.get("/metrics").text
+    assert 'login_throttled_total{clave="usuario"}' in metricas
+    assert 'login_throttle_keys{clave="ip"}' in metricas
@@ -0,0 +1,181 @@
+"""
+Lista de espera: orden de las colas por turno y promoción al cancelar o
+eliminar una reserva con mesa
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from services.lista_espera import ColasEspera
+
+TURNO = (uuid.uuid4(), datetime(2031, 12, 10, 20, tzinfo=timezone.utc))
+FECHA = "2031-12-10T00:00:00+00:00"
+
+
+def _fila(personas, prioridad=0, segundos=0):
+    return SimpleNamespace(
+        id_espera=uuid.uuid4(),
+        numero_personas=personas,
+        prioridad=prioridad,
+        fecha_creacion=datetime(2031, 1, 1, tzinfo=timezone.utc)
+        + timedelta(seconds=segundos),
+    )
+
+
+def test_sacar_por_prioridad_antiguedad_y_capacidad():
+    colas = ColasEspera()
+    primera, segunda = _fila(2, segundos=1), _fila(2, segundos=2)
+    urgente, grande = _fila(3, prioridad=5, segundos=3), _fila(6, prioridad=9)
+    colas.cargar(TURNO, [segunda, grande, primera, urgente])
+
+    assert colas.sacar(TURNO, 2).id_espera == primera.id_espera
+    assert colas.sacar(TURNO, 4).id_espera == urgente.id_espera
+    assert colas.sacar(TURNO, 4).id_espera == segunda.id_espera
+    # La de 6 no cabe en una mesa de 4
+    assert colas.sacar(TURNO, 4) is None
+    assert colas.sacar(TURNO, 6).id_espera == grande.id_espera
+
+
+def test_agregar_y_devolver_solo_en_turnos_cargados():
+    colas = ColasEspera()
+    colas.agregar(TURNO, _fila(2))
+    assert not colas.cargada(TURNO)
+    assert colas.sacar(TURNO, 4) is None
+
+    colas.cargar(TURNO, [])
+    nueva = _fila(2, prioridad=1)
+    colas.agregar(TURNO, nueva)
+    sacada = colas.sacar(TURNO, 2)
+    assert sacada.id_espera == nueva.id_espera
+    colas.devolver(TURNO, sacada)
+    assert colas.resumen()["esperando"] == 1
+
+
+def test_caducidad_y_tope_de_turnos():
+    colas = ColasEspera(ttl_s=0, max_turnos=2)
+    colas.cargar(TURNO, [_fila(2)])
+    colas._colas[TURNO].cargada_en -= 1
+    assert not colas.cargada(TURNO)
+
+    colas = ColasEspera(max_turnos=2)
+    turnos = [(uuid.uuid4(), TURNO[1]) for _ in range(3)]
+    for turno in turnos:
+        colas.cargar(turno, [])
+    assert not colas.cargada(turnos[0])
+    assert colas.cargada(turnos[2]) and colas.resumen()["turnos"] == 2
+
+
+# ---------- API ----------
+def _mesa(api, local, numero, capacidad):
+    r = api.post(
+        "/mesas/",
+        json={
+            "numero_mesa": numero,
+            "capacidad": capacidad,
+            "restaurante_id": local.id_restaurante,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id_mesa"]
+
+
+def _reservar(api, local, mesa_id, hora="20:00"):
+    r = api.post(
+        "/reservas/",
+        json={
+            "nombre_completo": "Cliente",
+            "fecha_reserva": FECHA,
+            "hora_reserva": hora,
+            "numero_personas": 2,
+            "metodo_pago": "efectivo",
+            "restaurante_id": local.id_restaurante,
+            "mesa_id": mesa_id,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _esperar(api, local, nombre, personas, prioridad=0, **extra):
+    r = api.post(
+        "/lista-espera/",
+        json={
+            "nombre_completo": nombre,
+            "fecha_reserva": FECHA,
+            "hora_reserva": "20:00",
+            "numero_personas": personas,
+            "metodo_pago": "efectivo",
+            "restaurante_id": local.id_restaurante,
+            "prioridad": prioridad,
+            **extra,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _estado(api, entrada):
+    r = api.get(f"/lista-espera/{entrada['id_espera']}")
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_promocion_al_cancelar_y_eliminar(api, local):
+    mesa_4, mesa_2 = local.id_mesa, _mesa(api, local, 2, 2)
+    de_4, de_2 = _reservar(api, local, mesa_4), _reservar(api, local, mesa_2)
+
+    b = _esperar(api, local, "B", 2)
+    a = _esperar(api, local, "A", 4)
+    c = _esperar(api, local, "C", 3, prioridad=5)
+    _esperar(api, local, "D", 6, prioridad=9)
+    larga = _esperar(api, local, "L", 2, prioridad=50, duracion_minutos=600)
+    assert b["estado"] == "esperando"
+    assert b["inicio_reserva"].startswith("2031-12-10T20:00")
+    lista = api.get("/lista-espera/", params={"restaurante_id": local.id_restaurante})
+    assert [x["nombre_completo"] for x in lista.json()] == ["L", "D", "C", "B", "A"]
+
+    # Cancelar la de 4: D no cabe, L tiene la mayor prioridad de las que sí
+    r = api.put(f"/reservas/{de_4['id_reserva']}", json={"estado": "cancelada"})
+    assert r.status_code == 200, r.text
+    larga = _estado(api, larga)
+    assert larga["estado"] == "promovida" and larga["reserva_id"]
+    nueva = api.get(f"/reservas/{larga['reserva_id']}").json()
+    assert nueva["mesa_id"] == mesa_4
+    assert nueva["estado"] == "confirmada" and nueva["duracion_minutos"] == 600
+
+    # Eliminar la promovida: C (3 personas, prioridad 5) es la siguiente
+    assert api.delete(f"/reservas/{larga['reserva_id']}").status_code == 204
+    assert _estado(api, c)["estado"] == "promovida"
+
+    # En la mesa de 2 solo cabe B
+    assert api.delete(f"/reservas/{de_2['id_reserva']}").status_code == 204
+    b = _estado(api, b)
+    assert b["estado"] == "promovida"
+    assert api.get(f"/reservas/{b['reserva_id']}").json()["mesa_id"] == mesa_2
+
+    # Retirar
+    assert api.delete(f"/lista-espera/{a['id_espera']}").status_code == 204
+    assert api.delete(f"/lista-espera/{a['id_espera']}").status_code == 409
+    assert api.delete(f"/lista-espera/{uuid.uuid4()}").status_code == 404
+    lista = api.get("/lista-espera/", params={"restaurante_id": local.id_restaurante})
+    assert [x["nombre_completo"] for x in lista.json()] == ["D"]
+
+    # Una cancelación sin nadie que quepa no falla
+    otra = _reservar(api, local, mesa_2, hora="13:00")
+    r = api.put(f"/reservas/{otra['id_reserva']}", json={"estado": "cancelada"})
+    assert r.status_code == 200
+    assert api.get("/health/espera").json()["promovidas"] >= 3
+
+
+def test_la_que_no_cabe_en_el_hueco_sigue_esperando(api, local):
+    primera = _reservar(api, local, local.id_mesa)
+    _reservar(api, local, local.id_mesa, hora="22:00")
+    # La de mayor prioridad dura demasiado: chocaría con la de las 22:00
+    larga = _esperar(api, local, "L", 2, prioridad=50, duracion_minutos=180)
+    corta = _esperar(api, local, "C", 3, prioridad=5)
+
+    r = api.put(f"/reservas/{primera['id_reserva']}", json={"estado": "cancelada"})
+    assert r.status_code == 200, r.text
+    assert _estado(api, corta)["estado"] == "promovida"
+    assert _estado(api, larga)["estado"] == "esperando"
@@ -0,0 +1,100 @@
+"""
+Altas en lote de mesas, menús y reservas: una sola sentencia y todo o
+nada
+"""
+
+import uuid
+
+from sqlalchemy import func, select
+
+from api.schemas.lote_schema import MAX_LOTE
+from database.config import SessionLocal
+from database.models.mesa import Mesa
+
+
+def _mesas(restaurante_id):
+    with SessionLocal() as db:
+        return db.scalar(
+            select(func.count())
+            .select_from(Mesa)
+            .where(Mesa.restaurante_id == restaurante_id)
+        )
+
+
+def _reserva(local, **cambios):
+    return {
+        "nombre_completo": "Cliente",
+        "fecha_reserva": "2030-03-04T00:00:00Z",
+        "hora_reserva": "20:00",
+        "numero_personas": 2,
+        "metodo_pago": "efectivo",
+        "restaurante_id": local.id_restaurante,
+        **cambios,
+    }
+
+
+def test_mesas_en_una_sentencia(api, local):
+    lote = [
+        {"numero_mesa": i, "capacidad": 4, "restaurante_id": local.id_restaurante}
+        for i in range(2, 62)
+    ]
+    respuesta = api.post("/mesas/bulk", json=lote)
+    assert respuesta.status_code == 201, respuesta.text
+    assert respuesta.json()["creados"] == 60
+    assert len({m["id_mesa"] for m in respuesta.json()["items"]}) == 60
+    # Un INSERT para todo el lote (más las consultas fijas del request)
+    assert int(respuesta.headers["x-db-queries"]) <= 5
+    assert _mesas(local.id_restaurante) == 61
+
+
+def test_elemento_invalido_no_crea_ninguno(api, local):
+    lote = [
+        {"numero_mesa": 2, "capacidad": 4, "restaurante_id": local.id_restaurante},
+        {"numero_mesa": 3, "capacidad": 4},
+    ]
+    respuesta = api.post("/mesas/bulk", json=lote)
+    assert respuesta.status_code == 422
+    errores = respuesta.json()["detail"]["errores"]
+    assert [error["indice"] for error in errores] == [1]
+    assert _mesas(local.id_restaurante) == 1
+
+
+def test_limites_del_lote(api, local):
+    assert api.post("/mesas/bulk", json=[]).status_code == 400
+    lote = [{"numero_mesa": 1}] * (MAX_LOTE + 1)
+    assert api.post("/mesas/bulk", json=lote).status_code == 400
+
+
+def test_menus_en_lote(api, local):
+    categoria = api.post("/categorias/", json={"nombre": f"Cat {uuid.uuid4().hex}"})
+    lote = [
+        {
+            "nombre": f"Plato {i}",
+            "precio": 9.5,
+            "categoria_id": categoria.json()["id_categoria"],
+            "restaurante_id": local.id_restaurante,
+        }
+        for i in range(50)
+    ]
+    respuesta = api.post("/menus/bulk", json=lote)
+    assert respuesta.status_code == 201, respuesta.text
+    assert respuesta.json()["creados"] == 50
+
+
+def test_reservas_en_lote_normalizadas(api, local):
+    lote = [_reserva(local, metodo_pago=" Efectivo ")] * 3
+    respuesta = api.post("/reservas/bulk", json=lote)
+    assert respuesta.status_code == 201, respuesta.text
+    items = respuesta.json()["items"]
+    assert [item["metodo_pago"] for item in items] == ["efectivo"] * 3
+    assert all(item["fecha_creacion"] for item in items)
+
+
+def test_fila_rechazada_por_la_base_revierte_el_lote(api, local):
+    # La clave foránea falla en el INSERT, después de validar el lote
+    lote = [_reserva(local), _reserva(local, restaurante_id=str(uuid.uuid4()))]
+    respuesta = api.post("/reservas/bulk", json=lote)
+    assert respuesta.status_code == 500
+    assert respuesta.json()["detail"].startswith("Error al crear reservas")
+    listado = api.get("/reservas/", params={"restaurante_id": local.id_restaurante})
+    assert listado.json() == []
@@ -0,0 +1,66 @@
+"""
+Métricas en formato Prometheus: registro por plantilla de ruta y /metrics
+"""
+
+import uuid
+
+from monitoring.metricas import RegistroMetricas, linea
+
+
+def _familias(texto):
+    """Familias declaradas (# TYPE) y nombre de la familia de cada muestra"""
+    familias, muestras, actual = [], [], None
+    for fila in texto.splitlines():
+        if fila.startswith("# TYPE"):
+            actual = fila.split()[2]
+            familias.append(actual)
+        elif fila and not fila.startswith("#"):
+            muestras.append((fila.split("{")[0].split()[0], actual))
+    return familias, muestras
+
+
+def test_linea_escapa_etiquetas():
+    assert linea("x", 1) == "x 1"
+    assert linea("x", 2, ruta='a"b\\c') == 'x{ruta="a\\"b\\\\c"} 2'
+
+
+def test_registro_por_ruta_y_status():
+    registro = RegistroMetricas()
+    registro.observar("GET", "/mesas/{mesa_id}", 200, 0.003)
+    registro.observar("GET", "/mesas/{mesa_id}", 200, 0.2)
+    registro.observar("GET", "/mesas/{mesa_id}", 404, 0.001)
+    registro.registrar_coleccionista(lambda: ["# TYPE extra gauge", "extra 7"])
+    texto = registro.exponer()
+
+    assert (
+        'http_requests_total{method="GET",route="/mesas/{mesa_id}",status="200"} 2'
+        in texto
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/mesas/{mesa_id}"} 3'
+        in texto
+    )
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",'
+        'route="/mesas/{mesa_id}",le="0.005"} 2' in texto
+    )
+    assert texto.endswith("extra 7\n")
+
+
+def test_endpoint_agrupa_por_plantilla(api, local):
+    for _ in range(2):
+        api.get(f"/mesas/{uuid.uuid4()}")  # 404, una serie para todas
+    api.get("/no/existe")
+    texto = api.get("/metrics").text
+
+    assert 'route="/mesas/{mesa_id}",status="404"} ' in texto
+    assert 'route="sin_ruta"' in texto
+    assert str(local.id_mesa) not in texto
+
+    # Cada familia se declara una vez y sus muestras van debajo
+    familias, muestras = _familias(texto)
+    assert len(familias) == len(set(familias))
+    assert "db_pool_connections" in familias
+    assert "password_hash_in_flight" in familias
+    for nombre, familia in muestras:
+        assert familia in (nombre, nombre.rsplit("_", 1)[0]), (nombre, familia)
@@ -0,0 +1,106 @@
+"""
+Migraciones: replay sobre una base vacía y relleno por lotes
+"""
+
+from sqlalchemy import text
+
+from database.migraciones import (
+    aplicar_migraciones,
+    cargar_migraciones,
+    rellenar_por_lotes,
+)
+import database.migraciones.m0006_periodo_reservas as m0006
+
+
+def _indices(motor):
+    with motor.connect() as conexion:
+        return set(
+            conexion.execute(
+                text("SELECT indexname FROM pg_indexes WHERE schemaname = 'public'")
+            ).scalars()
+        )
+
+
+def test_replay_en_base_vacia_aplica_todo_una_vez(base_vacia):
+    versiones = [migracion.VERSION for migracion in cargar_migraciones()]
+    assert aplicar_migraciones(base_vacia) == versiones
+    assert aplicar_migraciones(base_vacia) == []
+
+    indices = _indices(base_vacia)
+    # Los de la versión 0002 que reemplazaron 0003/0004/0007 o quitó 0009
+    assert "ix_reservas_fecha" not in indices
+    assert "ix_reservas_restaurante_fecha_id" not in indices
+    assert "ix_usuarios_activos" not in indices
+    assert "ix_categorias_activas" not in indices
+    assert {
+        "ix_reservas_periodo",
+        "ix_reservas_restaurante_inicio_id",
+        "ix_usuarios_admin_activos",
+        "ix_lista_espera_turno",
+        "ix_tokens_revocados_expira",
+    } <= indices
+
+
+def test_relleno_por_lotes_recorre_toda_la_tabla(base_migrada):
+    with base_migrada.begin() as conexion:
+        usuario = conexion.execute(
+            text(
+                "INSERT INTO usuarios (id_usuario, nombre, apellido,"
+                " nombre_usuario, email, contrasena)"
+                " VALUES (gen_random_uuid(), 'a', 'b', 'c', 'd', 'e')"
+                " RETURNING id_usuario"
+            )
+        ).scalar()
+        restaurante = conexion.execute(
+            text(
+                "INSERT INTO restaurantes (id_restaurante, nombre, direccion,"
+                " horario_apertura, horario_cierre, usuario_admin_id)"
+                " VALUES (gen_random_uuid(), 'r', 'd', '12:00', '23:00', :u)"
+                " RETURNING id_restaurante"
+            ),
+            {"u": usuario},
+        ).scalar()
+        # 10 reservas, una con hora no interpretable
+        conexion.execute(
+            text(
+                "INSERT INTO reservas (id_reserva, nombre_completo,"
+                " fecha_reserva, hora_reserva, numero_personas, metodo_pago,"
+                " restaurante_id, inicio_reserva)"
+                " SELECT gen_random_uuid(), 'x', '2030-01-01',"
+                " CASE WHEN g = 1 THEN 'tarde' ELSE '20:00' END, 2, 'efectivo',"
+                " :r, now() FROM generate_series(1, 10) g"
+            ),
+            {"r": restaurante},
+        )
+
+    with base_migrada.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as conexion:
+        rellenas = rellenar_por_lotes(
+            conexion,
+            "reservas",
+            "id_reserva",
+            m0006.RELLENO,
+            m0006.RELLENO_CONDICION,
+            lote=3,
+        )
+        assert rellenas == 9
+        periodos = conexion.execute(
+            text("SELECT DISTINCT periodo::text FROM reservas")
+        ).scalars()
+        assert set(periodos) == {
+            None,
+            '["2030-01-01 20:00:00+00","2030-01-01 22:00:00+00")',
+        }
+        # Nada pendiente: una segunda pasada no toca filas
+        assert (
+            rellenar_por_lotes(
+                conexion,
+                "reservas",
+                "id_reserva",
+                m0006.RELLENO,
+                m0006.RELLENO_CONDICION,
+                lote=3,
+            )
+            == 0
+        )
@@ -0,0 +1,126 @@
+"""
+Paginación por cursor (keyset) en los listados
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from crud.paginacion import codificar_cursor, decodificar_cursor
+from database.models.reserva import Reserva
+
+_CLAVES_RESERVAS = (Reserva.inicio_reserva, Reserva.id_reserva)
+
+
+def _cursor(valores):
+    texto = json.dumps({"v": valores}).encode()
+    return base64.urlsafe_b64encode(texto).decode().rstrip("=")
+
+
+def _recorrer(api, ruta, limit, **params):
+    filas, cursor, paginas = [], None, 0
+    while True:
+        respuesta = api.get(
+            ruta,
+            params={"limit": limit, **params, **({"cursor": cursor} if cursor else {})},
+        )
+        assert respuesta.status_code == 200, respuesta.text
+        filas += respuesta.json()
+        paginas += 1
+        cursor = respuesta.headers.get("x-next-cursor")
+        if not cursor:
+            return filas, paginas
+
+
+def test_cursor_ida_y_vuelta():
+    valores = [datetime(2030, 1, 1, 20, tzinfo=timezone.utc), uuid.uuid4()]
+    cursor = codificar_cursor(valores, descendente=True)
+    assert decodificar_cursor(cursor, _CLAVES_RESERVAS, descendente=True) == valores
+    with pytest.raises(ValueError, match="orden"):
+        decodificar_cursor(cursor, _CLAVES_RESERVAS)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "basura!",
+        _cursor(["2030-01-01T20:00:00+00:00"]),
+        _cursor(["2030-01-01T20:00:00+00:00", 5]),
+        _cursor([None, None]),
+        _cursor([["x"], {}]),
+        _cursor("x"),
+    ],
+)
+def test_cursores_invalidos(cursor):
+    with pytest.raises(ValueError, match="Cursor"):
+        decodificar_cursor(cursor, _CLAVES_RESERVAS)
+
+
+def test_recorrido_completo_sin_saltos_ni_repetidos(api, local):
+    api.post(
+        "/mesas/bulk",
+        json=[
+            {"numero_mesa": i, "capacidad": 2, "restaurante_id": local.id_restaurante}
+            for i in range(2, 27)
+        ],
+    )
+    filas, paginas = _recorrer(api, "/mesas/", 7)
+    completo = api.get("/mesas/", params={"limit": 1000}).json()
+    assert filas == completo
+    assert paginas > 3
+
+    # Modo offset heredado
+    legado = api.get("/mesas/", params={"skip": 7, "limit": 7}).json()
+    assert legado == completo[7:14]
+
+
+def test_altas_entre_paginas_no_repiten_filas(api, local):
+    for hora in ("19:00", "20:00", "21:00"):
+        api.post(
+            "/reservas/",
+            json={
+                "nombre_completo": "Cliente",
+                "fecha_reserva": "2030-05-02T00:00:00Z",
+                "hora_reserva": hora,
+                "numero_personas": 2,
+                "metodo_pago": "efectivo",
+                "restaurante_id": local.id_restaurante,
+            },
+        )
+    params = {"restaurante_id": local.id_restaurante, "orden": "desc", "limit": 2}
+    primera = api.get("/reservas/", params=params)
+    horas = [fila["hora_reserva"] for fila in primera.json()]
+    assert horas == ["21:00", "20:00"]
+
+    # Una reserva nueva que ordena antes del cursor no aparece en la siguiente
+    api.post(
+        "/reservas/",
+        json={
+            "nombre_completo": "Tarde",
+            "fecha_reserva": "2030-05-02T00:00:00Z",
+            "hora_reserva": "22:00",
+            "numero_personas": 2,
+            "metodo_pago": "efectivo",
+            "restaurante_id": local.id_restaurante,
+        },
+    )
+    segunda = api.get(
+        "/reservas/", params={**params, "cursor": primera.headers["x-next-cursor"]}
+    )
+    assert [fila["hora_reserva"] for fila in segunda.json()] == ["19:00"]
+    assert "x-next-cursor" not in segunda.headers
+
+
+def test_errores_de_paginacion(api):
+    assert api.get("/mesas/", params={"cursor": "basura!"}).status_code == 400
+    assert api.get("/usuarios/", params={"cursor": _cursor([5])}).status_code == 400
+    combinado = api.get("/mesas/", params={"cursor": _cursor(["x"]), "skip": 3})
+    assert combinado.status_code == 400
+    assert api.get("/mesas/", params={"limit": 0}).status_code == 422
+    # Un cursor ascendente no sirve para el orden descendente
+    cursor = codificar_cursor(["2030-01-01T20:00:00+00:00", str(uuid.uuid4())])
+    respuesta = api.get("/reservas/", params={"cursor": cursor, "orden": "desc"})
+    assert respuesta.status_code == 400
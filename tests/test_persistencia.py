@@ -0,0 +1,130 @@
+"""
+Instantánea + diario de las reservas de la consola: repetición al abrir,
+compactación, cortes a mitad de escritura y registro concurrente
+"""
+
+import os
+import threading
+
+from src.persistencia import (
+    ALTA,
+    Persistencia,
+    _CABECERA_DIARIO,
+    leer_registros,
+)
+from src.restaurante import Restaurante
+
+
+def _abrir(directorio, **opciones):
+    restaurante = Restaurante("Prueba")
+    persistencia = Persistencia(str(directorio), **opciones)
+    carga = persistencia.abrir(restaurante)
+    return restaurante, persistencia, carga
+
+
+def _estado(restaurante):
+    return [
+        (r.id_reserva, r.nombre_completo, r.hora, r.metodo_pago)
+        for r in restaurante.reservas
+    ], restaurante.contador_id
+
+
+def _cargar_ejemplo(restaurante):
+    restaurante.agregar_reserva("Ana", 12, "efectivo")
+    restaurante.agregar_reserva("Luis", 13, "transferencia")
+    restaurante.agregar_reserva("Eva", 20, "tarjeta credito")
+    restaurante.actualizar_reserva(2, hora=21)
+    restaurante.eliminar_reserva_por_id(1)
+
+
+def test_reabrir_repite_el_diario(tmp_path, capsys):
+    restaurante, persistencia, _ = _abrir(tmp_path)
+    _cargar_ejemplo(restaurante)
+    esperado = _estado(restaurante)
+    persistencia.cerrar()
+
+    copia, persistencia, carga = _abrir(tmp_path)
+    assert _estado(copia) == esperado
+    assert carga["repetidos"] == 5
+    persistencia.cerrar()
+
+
+def test_compactacion_y_reapertura(tmp_path, capsys):
+    restaurante, persistencia, _ = _abrir(tmp_path, compactar_cada=2)
+    _cargar_ejemplo(restaurante)
+    restaurante.agregar_reserva("Juan", 15, "efectivo")
+    esperado = _estado(restaurante)
+    persistencia.cerrar()
+
+    copia, persistencia, carga = _abrir(tmp_path, compactar_cada=2)
+    assert _estado(copia) == esperado
+    assert carga["instantanea"] > 0
+    assert carga["repetidos"] < 6
+    persistencia.cerrar()
+
+
+def test_cola_incompleta_del_diario_se_descarta(tmp_path, capsys):
+    restaurante, persistencia, _ = _abrir(tmp_path)
+    _cargar_ejemplo(restaurante)
+    esperado = _estado(restaurante)
+    persistencia.cerrar()
+    with open(tmp_path / "diario", "ab") as archivo:
+        archivo.write(b"\x01\x02\x03")  # registro a medio escribir
+
+    copia, persistencia, _ = _abrir(tmp_path)
+    assert _estado(copia) == esperado
+    persistencia.cerrar()
+    assert "incompletos" in capsys.readouterr().out
+
+
+def test_instantanea_danada_carga_el_diario(tmp_path, capsys):
+    restaurante, persistencia, _ = _abrir(tmp_path)
+    restaurante.agregar_reserva("Ana", 12, "efectivo")
+    persistencia.compactar()
+    restaurante.agregar_reserva("Luis", 13, "transferencia")
+    persistencia.cerrar()
+    ruta = tmp_path / "instantanea"
+    ruta.write_bytes(ruta.read_bytes()[:10])  # instantánea truncada
+
+    copia, persistencia, carga = _abrir(tmp_path)
+    assert carga["instantanea"] == 0
+    assert _estado(copia)[0] == [(2, "Luis", 13, "transferencia")]
+    assert (tmp_path / "instantanea.danada").exists()
+    assert "se carga solo el diario" in capsys.readouterr().out
+
+    # La generación sigue la del diario: compactar y reabrir no pierde nada
+    copia.agregar_reserva("Eva", 20, "efectivo")
+    persistencia.compactar()
+    esperado = _estado(copia)
+    persistencia.cerrar()
+    otra, persistencia, _ = _abrir(tmp_path)
+    assert _estado(otra) == esperado
+    persistencia.cerrar()
+
+
+def test_registro_concurrente_con_compactacion(tmp_path):
+    restaurante, persistencia, _ = _abrir(tmp_path, sincrono=True, compactar_cada=7)
+    hilos_cantidad, por_hilo = 8, 50
+
+    def registrar(hilo):
+        for i in range(por_hilo):
+            persistencia.registrar(ALTA, hilo * por_hilo + i + 1, "x", 12, "efectivo")
+
+    hilos = [
+        threading.Thread(target=registrar, args=(h,)) for h in range(hilos_cantidad)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(timeout=30)
+    assert not any(hilo.is_alive() for hilo in hilos)
+    pendientes = persistencia._desde_compactacion
+    persistencia.cerrar()
+
+    # El diario vigente tiene justo los registros posteriores a la última
+    # compactación: ninguno cayó en un diario ya descartado
+    with open(os.path.join(tmp_path, "diario"), "rb") as archivo:
+        datos = archivo.read()
+    registros, fin = leer_registros(datos, _CABECERA_DIARIO.size)
+    assert fin == len(datos)
+    assert len(registros) == pendientes
@@ -0,0 +1,112 @@
+"""
+Perfiles del pool de conexiones, estadísticas de checkout y su histograma
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from database.pool import (
+    NullPoolMedido,
+    QueuePoolMedido,
+    configuracion_pool,
+    lineas_metricas_pool,
+    opciones_pool,
+    resumen_pool,
+)
+from monitoring.histograma import Histograma
+
+
+@pytest.fixture
+def entorno_pool(monkeypatch):
+    for nombre in (
+        "DB_POOL_PERFIL",
+        "DB_POOL_CLASE",
+        "DB_POOL_SIZE",
+        "DB_MAX_OVERFLOW",
+        "DB_POOL_TIMEOUT",
+    ):
+        monkeypatch.delenv(nombre, raising=False)
+    return monkeypatch
+
+
+def test_perfil_por_defecto_y_sobrescrituras(entorno_pool):
+    assert configuracion_pool() == {
+        "perfil": "default",
+        "clase": "queue",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+    }
+    entorno_pool.setenv("DB_POOL_PERFIL", "lifo")
+    entorno_pool.setenv("DB_POOL_SIZE", "3")
+    opciones = opciones_pool()
+    assert opciones["poolclass"] is QueuePoolMedido
+    assert opciones["pool_size"] == 3
+    assert opciones["pool_use_lifo"] is True
+
+
+def test_perfil_pgbouncer_sin_pool_propio(entorno_pool):
+    entorno_pool.setenv("DB_POOL_PERFIL", "pgbouncer")
+    entorno_pool.setenv("DB_POOL_SIZE", "50")  # se ignora
+    assert opciones_pool() == {"poolclass": NullPoolMedido}
+
+
+@pytest.mark.parametrize(
+    "variable, valor", [("DB_POOL_PERFIL", "enorme"), ("DB_POOL_CLASE", "pila")]
+)
+def test_valores_invalidos(entorno_pool, variable, valor):
+    entorno_pool.setenv(variable, valor)
+    with pytest.raises(ValueError):
+        configuracion_pool()
+
+
+def test_histograma_percentiles_y_cubeta_infinita():
+    histograma = Histograma(limites=(0.1, 1.0))
+    assert histograma.percentil(99) == 0.0
+    for valor in (0.05, 0.05, 0.5, 5.0):
+        histograma.observar(valor)
+    assert histograma.acumulado() == [2, 3, 4]
+    assert histograma.percentil(50) == 0.1
+    assert histograma.percentil(75) == 1.0
+    # Más allá del último límite no hay valor serializable
+    assert histograma.percentil(99) is None
+    resumen = histograma.resumen()
+    assert resumen["cubetas"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert resumen["total"] == 4
+
+
+def test_estadisticas_en_vivo_y_timeouts(base_vacia):
+    motor = create_engine(
+        base_vacia.url,
+        poolclass=QueuePoolMedido,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        with motor.connect():
+            ocupado = resumen_pool(motor)
+            with pytest.raises(PoolTimeoutError):
+                motor.connect()
+        resumen = resumen_pool(motor)
+        lineas = lineas_metricas_pool({"sincrono": motor})
+    finally:
+        motor.dispose()
+
+    assert ocupado["conexiones_en_uso"] == 1
+    assert ocupado["utilizacion"] == 1.0
+    assert resumen["conexiones_en_uso"] == 0
+    assert resumen["timeouts"] == 1
+    assert resumen["espera_checkout"]["total"] == 1
+    assert 'db_pool_timeouts_total{engine="sincrono"} 1' in lineas
+    assert any(l.startswith("db_pool_checkout_wait_seconds_bucket") for l in lineas)
+
+
+def test_endpoint_con_esperas_fuera_de_las_cubetas(api):
+    from database.config import engine
+
+    engine.pool.estadisticas.registrar_espera(120.0)
+    respuesta = api.get("/health/pool")
+    assert respuesta.status_code == 200
+    assert respuesta.json()["sincrono"]["espera_checkout"]["cubetas"]["+Inf"] >= 1
@@ -0,0 +1,51 @@
+"""
+Reservas en memoria de la consola: índices por ID, hora, método de pago y
+posición
+"""
+
+import pytest
+
+from src.restaurante import Restaurante
+
+
+@pytest.fixture
+def restaurante(capsys):
+    restaurante = Restaurante("Prueba")
+    for i in range(6):
+        assert restaurante.agregar_reserva(f"Cliente {i}", 12 + i % 3, "efectivo")
+    return restaurante
+
+
+def _ids_por_posicion(restaurante):
+    return [
+        restaurante.obtener_reserva_por_posicion(p).id_reserva
+        for p in range(len(restaurante.reservas))
+    ]
+
+
+def test_posicion_sigue_el_orden_de_alta(restaurante):
+    assert _ids_por_posicion(restaurante) == [1, 2, 3, 4, 5, 6]
+    assert restaurante.obtener_reserva_por_posicion(6) is None
+    assert restaurante.obtener_reserva_por_posicion(-1) is None
+    assert restaurante.obtener_reserva_por_posicion("0") is None
+
+
+def test_bajas_por_posicion_y_por_id(restaurante):
+    assert restaurante.eliminar_reserva(0)
+    assert _ids_por_posicion(restaurante) == [2, 3, 4, 5, 6]
+    assert restaurante.eliminar_reserva_por_id(4)
+    assert restaurante.eliminar_reserva(2)  # la 5 tras rearmar el orden
+    assert _ids_por_posicion(restaurante) == [2, 3, 6]
+    restaurante.agregar_reserva("Nueva", 20, "transferencia")
+    assert _ids_por_posicion(restaurante) == [2, 3, 6, 7]
+    assert not restaurante.eliminar_reserva(4)
+
+
+def test_cambio_no_mueve_la_posicion_y_actualiza_contadores(restaurante):
+    assert restaurante.actualizar_reserva(1, hora=22, metodo_pago="tarjeta credito")
+    assert _ids_por_posicion(restaurante)[0] == 1
+    assert restaurante.contar_por_hora(12) == 1
+    assert restaurante.contar_por_hora(22) == 1
+    assert restaurante.contar_por_metodo() == {"efectivo": 5, "tarjeta credito": 1}
+    assert not restaurante.actualizar_reserva(1, hora=9)
+    assert not restaurante.actualizar_reserva(99, hora=13)
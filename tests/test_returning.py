@@ -0,0 +1,105 @@
+"""
+Escrituras de una sola sentencia con RETURNING
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select
+
+from crud.returning import (
+    ejecutar,
+    sentencia_actualizar,
+    sentencia_eliminar,
+    sentencia_insertar,
+)
+from database.models.mesa import Mesa
+from database.models.reserva import Reserva
+
+
+def test_insertar_devuelve_la_fila_con_defaults(abrir_sesion, restaurante):
+    with abrir_sesion() as db:
+        fila = ejecutar(
+            db,
+            sentencia_insertar(
+                Mesa,
+                {
+                    "numero_mesa": 2,
+                    "capacidad": 6,
+                    "restaurante_id": restaurante.id_restaurante,
+                },
+            ),
+        )
+    assert fila.id_mesa is not None
+    assert fila.fecha_creacion is not None
+    assert fila.activa is True
+
+
+def test_actualizar_ignora_claves_ajenas_y_detecta_inexistentes(
+    abrir_sesion, restaurante
+):
+    condicion = Mesa.id_mesa == restaurante.id_mesa
+    with abrir_sesion() as db:
+        fila = ejecutar(
+            db, sentencia_actualizar(Mesa, condicion, {"capacidad": 8, "otra": 1})
+        )
+        assert fila.capacidad == 8
+        # Sin cambios: la fila actual, sin UPDATE
+        assert ejecutar(db, sentencia_actualizar(Mesa, condicion, {})).capacidad == 8
+        inexistente = Mesa.id_mesa == uuid.uuid4()
+        assert (
+            ejecutar(db, sentencia_actualizar(Mesa, inexistente, {"capacidad": 2}))
+            is None
+        )
+
+
+def test_eliminar_desvincula_las_reservas(abrir_sesion, restaurante):
+    inicio = datetime(2030, 1, 1, 20, tzinfo=timezone.utc)
+    with abrir_sesion() as db:
+        id_reserva = db.execute(
+            insert(Reserva)
+            .values(
+                nombre_completo="Cliente",
+                fecha_reserva=inicio,
+                hora_reserva="20:00",
+                inicio_reserva=inicio,
+                numero_personas=2,
+                metodo_pago="efectivo",
+                restaurante_id=restaurante.id_restaurante,
+                mesa_id=restaurante.id_mesa,
+            )
+            .returning(Reserva.id_reserva)
+        ).scalar_one()
+        db.commit()
+
+        condicion = Mesa.id_mesa == restaurante.id_mesa
+        assert ejecutar(db, sentencia_eliminar(Mesa, condicion)) == (
+            restaurante.id_mesa,
+        )
+        assert ejecutar(db, sentencia_eliminar(Mesa, condicion)) is None
+        mesa_id = db.scalar(
+            select(Reserva.mesa_id).where(Reserva.id_reserva == id_reserva)
+        )
+    assert mesa_id is None
+
+
+def test_api_escrituras_y_no_encontrados(api, local):
+    respuesta = api.put(f"/mesas/{local.id_mesa}", json={"capacidad": 8})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["capacidad"] == 8
+    assert respuesta.json()["fecha_edicion"] is not None
+
+    assert api.put(f"/mesas/{uuid.uuid4()}", json={"capacidad": 2}).status_code == 404
+    assert api.delete(f"/mesas/{local.id_mesa}").status_code == 204
+    assert api.delete(f"/mesas/{local.id_mesa}").status_code == 404
+
+
+def test_contrasena_de_usuario_inexistente_no_se_hashea(api):
+    from auth.hashing import servicio_hash
+
+    antes = servicio_hash.duracion["hash"].total
+    respuesta = api.put(
+        f"/usuarios/{uuid.uuid4()}", json={"contrasena": "Otra#Clave123"}
+    )
+    assert respuesta.status_code == 404
+    assert servicio_hash.duracion["hash"].total == antes
@@ -0,0 +1,86 @@
+"""
+Monitor de salud: verificación en segundo plano y estado cacheado
+"""
+
+import asyncio
+
+import pytest
+
+import monitoring.salud as salud
+from monitoring.salud import MonitorSalud
+
+
+@pytest.fixture
+def pings(monkeypatch):
+    """Reemplaza el SELECT 1; cada elemento de fallas se consume por ping"""
+    registro = {"cantidad": 0, "fallas": [], "demora": 0.0}
+
+    async def ping():
+        registro["cantidad"] += 1
+        await asyncio.sleep(registro["demora"])
+        if registro["fallas"]:
+            raise registro["fallas"].pop(0)
+
+    monkeypatch.setattr(salud, "_ping", ping)
+    return registro
+
+
+def test_verificaciones_concurrentes_comparten_el_ping(pings):
+    pings["demora"] = 0.05
+    monitor = MonitorSalud(intervalo=60)
+
+    async def verificar():
+        return await asyncio.gather(*(monitor.verificar_ahora() for _ in range(10)))
+
+    estados = asyncio.run(verificar())
+    assert pings["cantidad"] == 1
+    assert {estado["database"] for estado in estados} == {"conectada"}
+
+
+def test_estado_cacheado_no_consulta_la_base(pings):
+    monitor = MonitorSalud(intervalo=60)
+    assert monitor.estado()["database"] == "desconocida"
+    assert monitor.estado()["edad_s"] is None
+    asyncio.run(monitor.verificar_ahora())
+    for _ in range(5):
+        estado = monitor.estado()
+    assert pings["cantidad"] == 1
+    assert estado["database"] == "conectada"
+    assert estado["obsoleto"] is False
+
+
+def test_error_y_timeout(pings):
+    monitor = MonitorSalud(intervalo=60, timeout=0.01)
+    pings["fallas"].append(ConnectionError("sin red"))
+    assert asyncio.run(monitor.verificar_ahora())["database"] == "desconectada"
+
+    # Recuperada: se conserva el último error para diagnóstico
+    estado = asyncio.run(monitor.verificar_ahora())
+    assert estado["database"] == "conectada"
+    assert estado["ultimo_error"] == "sin red"
+
+    pings["demora"] = 0.5
+    estado = asyncio.run(monitor.verificar_ahora())
+    assert estado["database"] == "desconectada"
+    assert estado["ultimo_error"].startswith("Timeout")
+
+
+def test_bucle_periodico_y_obsolescencia(pings):
+    monitor = MonitorSalud(intervalo=0.01)
+
+    async def correr():
+        await monitor.iniciar()
+        await asyncio.sleep(0.1)
+        await monitor.detener()
+
+    asyncio.run(correr())
+    assert pings["cantidad"] >= 3
+    monitor._ultima_verificacion -= 1  # sin verificar hace 1 s
+    assert monitor.estado()["obsoleto"] is True
+
+
+def test_endpoints(api):
+    assert api.get("/health").json()["database"] == "conectada"
+    profundo = api.get("/health/deep").json()
+    assert profundo["database"] == "conectada"
+    assert profundo["edad_s"] < 1
@@ -0,0 +1,201 @@
+"""
+Tablero del restaurante: agregados en Postgres y caché por rango con
+invalidación en las escrituras de reservas
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from services.tablero import CacheTablero, _minutos_abierto, _rango
+
+FECHA = "2031-11-02T00:00:00+00:00"
+RANGO = {"desde": "2031-11-02", "hasta": "2031-11-02"}
+
+
+def test_rango_en_dias_inclusivo():
+    inicio, fin = _rango(date(2031, 11, 2), date(2031, 11, 3))
+    assert inicio == datetime(2031, 11, 2, tzinfo=timezone.utc)
+    assert fin == datetime(2031, 11, 4, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        _rango(date(2031, 11, 3), date(2031, 11, 2))
+    with pytest.raises(ValueError):
+        _rango(date(2031, 1, 1), date(2032, 1, 2))
+
+
+def test_minutos_abierto():
+    horario = lambda apertura, cierre: SimpleNamespace(
+        horario_apertura=apertura, horario_cierre=cierre
+    )
+    assert _minutos_abierto(horario("12:00", "23:00")) == 660
+    assert _minutos_abierto(horario("18:00", "02:00")) == 480
+    assert _minutos_abierto(horario("00:00", "00:00")) == 1440
+    assert _minutos_abierto(horario("mediodía", "23:00")) == 1440
+
+
+def test_cache_no_guarda_un_calculo_anterior_a_la_invalidacion():
+    cache = CacheTablero()
+    restaurante = uuid.uuid4()
+    clave = (restaurante, date(2031, 11, 2), date(2031, 11, 2))
+
+    tablero, generacion = cache.obtener(clave)
+    assert tablero is None
+    # Una escritura llega mientras se calculaba: el resultado ya es viejo
+    cache.invalidar(restaurante)
+    cache.guardar(clave, {"total_reservas": 1}, generacion)
+    assert cache.obtener(clave)[0] is None
+
+    _, generacion = cache.obtener(clave)
+    cache.guardar(clave, {"total_reservas": 2}, generacion)
+    assert cache.obtener(clave)[0] == {"total_reservas": 2}
+    # Invalidar otro restaurante no la toca; invalidar todo sí
+    cache.invalidar(uuid.uuid4())
+    assert cache.obtener(clave)[0] is not None
+    cache.invalidar_todo()
+    assert cache.obtener(clave)[0] is None
+    assert cache.resumen()["invalidaciones"] == 3
+
+
+def test_cache_caduca_y_esta_acotada():
+    cache = CacheTablero(ttl_s=0)
+    clave = (uuid.uuid4(), date(2031, 11, 2), date(2031, 11, 2))
+    _, generacion = cache.obtener(clave)
+    cache.guardar(clave, {}, generacion)
+    cache._entradas[clave] = (cache._entradas[clave][0] - 1, {})
+    assert cache.obtener(clave)[0] is None
+
+    cache = CacheTablero(max_entradas=2)
+    claves = [(uuid.uuid4(), date(2031, 11, 2), date(2031, 11, 2)) for _ in range(3)]
+    for clave in claves:
+        cache.guardar(clave, {}, cache.obtener(clave)[1])
+    assert cache.resumen()["entradas"] == 2
+    assert cache.obtener(claves[0])[0] is None
+
+
+# ---------- API ----------
+def _reservar(api, restaurante_id, hora, personas, metodo, mesa=None):
+    r = api.post(
+        "/reservas/",
+        json={
+            "nombre_completo": "Cliente",
+            "fecha_reserva": FECHA,
+            "hora_reserva": hora,
+            "numero_personas": personas,
+            "metodo_pago": metodo,
+            "restaurante_id": restaurante_id,
+            "mesa_id": mesa,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _tablero(api, restaurante_id, params=RANGO):
+    r = api.get(f"/restaurantes/{restaurante_id}/tablero", params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+@pytest.fixture
+def tablero_local(api, local):
+    """Restaurante 12:00-23:00 con mesas de 4 y de 2, aparte de `local`"""
+    r = api.post(
+        "/restaurantes/",
+        json={
+            "nombre": "Tablero",
+            "direccion": "Calle 3",
+            "capacidad_maxima": 40,
+            "horario_apertura": "12:00",
+            "horario_cierre": "23:00",
+            "usuario_admin_id": local.id_usuario,
+        },
+    )
+    assert r.status_code == 201, r.text
+    rid = r.json()["id_restaurante"]
+    mesas = {}
+    for numero, capacidad in ((4, 4), (2, 2)):
+        r = api.post(
+            "/mesas/",
+            json={"numero_mesa": numero, "capacidad": capacidad, "restaurante_id": rid},
+        )
+        mesas[numero] = r.json()["id_mesa"]
+    return SimpleNamespace(id_restaurante=rid, mesas=mesas, otro=local.id_restaurante)
+
+
+def test_agregados(api, tablero_local):
+    rid, mesas = tablero_local.id_restaurante, tablero_local.mesas
+    _reservar(api, rid, "19:30", 2, "efectivo", mesas[4])
+    _reservar(api, rid, "19:30", 2, "tarjeta credito", mesas[2])
+    _reservar(api, rid, "21:30", 4, "efectivo", mesas[4])
+    _reservar(api, rid, "13:00", 2, "transferencia")
+
+    tablero = _tablero(api, rid)
+    assert not tablero["en_cache"]
+    assert tablero["total_reservas"] == 4 and tablero["sin_mesa"] == 1
+    assert [
+        (turno["inicio"][11:16], turno["reservas"], turno["comensales"])
+        for turno in tablero["por_turno"]
+    ] == [("13:00", 1, 2), ("19:30", 2, 4), ("21:30", 1, 4)]
+
+    assert [mesa["numero_mesa"] for mesa in tablero["por_mesa"]] == [2, 4]
+    mesa_4 = tablero["por_mesa"][1]
+    assert (mesa_4["reservas"], mesa_4["comensales"]) == (2, 6)
+    # 240 de 660 minutos abiertos; 6 comensales en 2 x 4 asientos
+    assert mesa_4["minutos_ocupados"] == 240 and mesa_4["utilizacion"] == 0.3636
+    assert mesa_4["llenado"] == 0.75
+    assert tablero["por_mesa"][0]["llenado"] == 1.0
+
+    assert {
+        grupo["metodo_pago"]: grupo["reservas"] for grupo in tablero["por_metodo_pago"]
+    } == {"efectivo": 2, "tarjeta credito": 1, "transferencia": 1}
+    assert sum(grupo["reservas"] for grupo in tablero["por_estado"]) == 4
+    # Sin rango: el día de hoy, que no tiene reservas
+    assert _tablero(api, rid, params={})["total_reservas"] == 0
+
+
+def test_invalidacion_por_escrituras(api, tablero_local):
+    rid = tablero_local.id_restaurante
+    _reservar(api, rid, "19:30", 2, "efectivo", tablero_local.mesas[4])
+    suelta = _reservar(api, rid, "13:00", 2, "transferencia")
+    assert not _tablero(api, rid)["en_cache"]
+    assert _tablero(api, rid)["en_cache"]
+
+    # Escribir en otro restaurante no invalida
+    _reservar(api, tablero_local.otro, "13:00", 2, "efectivo")
+    assert _tablero(api, rid)["en_cache"]
+
+    r = api.put(f"/reservas/{suelta['id_reserva']}", json={"estado": "cancelada"})
+    assert r.status_code == 200, r.text
+    tablero = _tablero(api, rid)
+    assert not tablero["en_cache"]
+    assert tablero["por_turno"][0]["comensales"] == 0
+    assert {g["estado"]: g["reservas"] for g in tablero["por_estado"]}["cancelada"] == 1
+
+    assert api.delete(f"/reservas/{suelta['id_reserva']}").status_code == 204
+    tablero = _tablero(api, rid)
+    assert not tablero["en_cache"] and tablero["total_reservas"] == 1
+
+    # Aplicar una asignación de mesas también invalida
+    _reservar(api, rid, "15:00", 2, "efectivo")
+    assert _tablero(api, rid)["sin_mesa"] == 1
+    r = api.post(
+        f"/restaurantes/{rid}/asignacion",
+        params={"fecha": "2031-11-02", "aplicar": "true"},
+    )
+    assert r.status_code == 200, r.text
+    tablero = _tablero(api, rid)
+    assert not tablero["en_cache"] and tablero["sin_mesa"] == 0
+
+
+def test_errores(api, tablero_local):
+    rid = tablero_local.id_restaurante
+    r = api.get(
+        f"/restaurantes/{rid}/tablero",
+        params={"desde": "2031-11-03", "hasta": "2031-11-02"},
+    )
+    assert r.status_code == 400
+    r = api.get(f"/restaurantes/{uuid.uuid4()}/tablero", params=RANGO)
+    assert r.status_code == 404
+    assert "aciertos" in api.get("/health/tablero").json()
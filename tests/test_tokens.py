@@ -0,0 +1,115 @@
+"""
+Tokens de acceso firmados y lista de revocación
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import auth.tokens as tokens
+from auth.tokens import (
+    Credencial,
+    ListaRevocacion,
+    TokenInvalido,
+    emitir_token,
+    verificar_token,
+)
+
+
+@pytest.fixture
+def lista(monkeypatch):
+    """Lista de revocación propia (verificar_token usa la del módulo)"""
+    nueva = ListaRevocacion(intervalo=60)
+    monkeypatch.setattr(tokens, "lista_revocacion", nueva)
+    return nueva
+
+
+def test_emitir_y_verificar(lista):
+    usuario = uuid.uuid4()
+    token, expira = emitir_token(usuario, es_admin=True)
+    credencial = verificar_token(token)
+    assert credencial.usuario_id == usuario
+    assert credencial.es_admin is True
+    assert credencial.expira == expira
+    # Cada token lleva su propio jti
+    assert verificar_token(emitir_token(usuario, True)[0]).jti != credencial.jti
+
+
+def test_firma_alterada_y_mal_formado(lista):
+    token, _ = emitir_token(uuid.uuid4(), es_admin=False)
+    payload, firma = token.split(".")
+    otro, _ = emitir_token(uuid.uuid4(), es_admin=True)
+    with pytest.raises(TokenInvalido, match="Firma"):
+        verificar_token(f"{otro.split('.')[0]}.{firma}")
+    for basura in ("", "basura", "a.b.c", f"{payload}.", "ñ.ñ"):
+        with pytest.raises(TokenInvalido):
+            verificar_token(basura)
+
+
+def test_expirado(lista, monkeypatch):
+    monkeypatch.setattr(tokens, "TOKEN_DURACION_S", -1)
+    token, _ = emitir_token(uuid.uuid4(), es_admin=False)
+    with pytest.raises(TokenInvalido, match="expirado"):
+        verificar_token(token)
+
+
+def _credencial(usuario_id, segundos=3600):
+    return Credencial(
+        usuario_id=usuario_id,
+        es_admin=False,
+        jti=uuid.uuid4().hex,
+        expira=datetime.now(timezone.utc) + timedelta(seconds=segundos),
+    )
+
+
+def test_revocacion_entre_instancias(api, local, monkeypatch):
+    # api aplica las migraciones (tokens_revocados) en la base de la sesión;
+    # el motor asíncrono de la app pertenece al event loop del TestClient,
+    # así que aquí se recarga por la vía síncrona
+    monkeypatch.setattr(tokens, "async_engine", None)
+    usuario = uuid.UUID(local.id_usuario)
+    aqui, otra = ListaRevocacion(intervalo=60), ListaRevocacion(intervalo=60)
+    vigente, vencida = _credencial(usuario), _credencial(usuario, segundos=-1)
+
+    aqui.revocar(vigente)
+    aqui.revocar(vencida)
+    assert aqui.revocado(vigente.jti)
+
+    # La otra instancia la ve en su próxima recarga; las vencidas se purgan
+    assert not otra.revocado(vigente.jti)
+    asyncio.run(otra.recargar())
+    assert otra.revocado(vigente.jti)
+    assert not otra.revocado(vencida.jti)
+
+
+def test_revocacion_local_sobrevive_a_una_recarga_vieja(monkeypatch):
+    lista = ListaRevocacion(intervalo=60)
+    credencial = _credencial(uuid.uuid4())
+    lista._agregar(credencial)  # revocada aquí, aún no visible en la consulta
+
+    monkeypatch.setattr(tokens, "async_engine", None)
+    monkeypatch.setattr(tokens, "_cargar_sincrono", lambda: set())
+    asyncio.run(lista.recargar())
+    assert lista.revocado(credencial.jti)
+
+
+def test_login_me_y_logout(api, local):
+    login = api.post(
+        "/usuarios/login",
+        json={"nombre_usuario": local.nombre_usuario, "contrasena": local.contrasena},
+    )
+    assert login.status_code == 200
+    assert login.json()["token_type"] == "bearer"
+    encabezado = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    assert api.get("/usuarios/me", headers=encabezado).json()["id_usuario"] == (
+        local.id_usuario
+    )
+    assert api.get("/usuarios/me").status_code == 401
+    malo = {"Authorization": encabezado["Authorization"][:-2] + "xx"}
+    assert api.get("/usuarios/me", headers=malo).status_code == 401
+
+    assert api.post("/usuarios/logout", headers=encabezado).status_code == 204
+    assert api.get("/usuarios/me", headers=encabezado).status_code == 401